@@ -0,0 +1,10 @@
+"""Performance benchmarks for TODO Notifier. These are not part of the distributed
+package and are meant to be run manually from the repository root.
+
+- `benchmarks.corpus`: Seeded generator of synthetic repositories
+- `benchmarks.harness`: Times each pipeline stage at several scales and writes JSON results
+- `benchmarks.bench_html`: Scaling of html report building
+- `benchmarks.bench_import`: Import time of the package
+- `benchmarks.bench_history`: Time and database growth of daily history snapshots
+- `benchmarks.bench_smtp`: Email delivery throughput with and without a reused SMTP session
+"""
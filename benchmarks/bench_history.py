@@ -0,0 +1,91 @@
+"""Benchmark of recording daily snapshots of todo items with `HistoryStore`.
+
+A synthetic set of todo items is recorded once per simulated day, with a small share of
+todo items resolved and added every day. The time taken by each snapshot and the growth
+of the database are printed, showing the cost of keeping a daily history.
+
+Usage: python -m benchmarks.bench_history [--todos 100000] [--days 5] [--churn 0.01]
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from todonotifier.history import HistoryStore
+from todonotifier.models import POSITION, TODO, USER
+from todonotifier.todo_index import TodoIndex
+
+NUM_USERS = 40
+NUM_MODULES = 2000
+
+
+def _generate_todos(start: int, num_todos: int) -> Dict[str, List[TODO]]:
+    """Generates `num_todos` todo items numbered from `start`
+
+    Args:
+        start (int): Number of the first todo item
+        num_todos (int): Number of todo items
+
+    Returns:
+        Dict[str, List[TODO]]: Key-value pair where key is module and value is list of its todo items
+    """
+    all_todos_objs = {}
+    for todo_no in range(start, start + num_todos):
+        module = f"pkg_{todo_no % 50}/module_{todo_no % NUM_MODULES}.py"
+        completion_date = (datetime(2024, 1, 1) + timedelta(days=todo_no % 365)).date()
+        todo_obj = TODO(f"Refactor the handling of case {todo_no}", USER(f"user_{todo_no % NUM_USERS}"), str(completion_date), module, POSITION(todo_no % 500))
+        all_todos_objs.setdefault(module, []).append(todo_obj)
+
+    return all_todos_objs
+
+
+def _get_db_size(db_file: str) -> int:
+    """Returns the size of the database along with its write-ahead log
+
+    Args:
+        db_file (str): SQLite database file
+
+    Returns:
+        int: Size in bytes
+    """
+    return sum(os.path.getsize(f) for f in (db_file, f"{db_file}-wal") if os.path.isfile(f))
+
+
+def run(num_todos: int, days: int, churn: float) -> None:
+    """Runs the benchmark and prints the time and database growth of each snapshot
+
+    Args:
+        num_todos (int): Number of todo items in every snapshot
+        days (int): Number of daily snapshots recorded
+        churn (float): Share of todo items resolved and added every day
+    """
+    num_churned = int(num_todos * churn)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        history_store = HistoryStore(os.path.join(tmpdir, "history.sqlite3"))
+        print(f"{'day':>4} | {'todos':>8} | {'seconds':>8} | {'db size (MiB)':>13} | {'growth (MiB)':>12}")
+
+        db_size = 0
+        for day in range(days):
+            todo_index = TodoIndex(_generate_todos(day * num_churned, num_todos))
+            start = time.perf_counter()
+            history_store.record_run(todo_index, "benchmark", datetime(2024, 1, 1) + timedelta(days=day))
+            elapsed = time.perf_counter() - start
+
+            new_db_size = _get_db_size(history_store.db_file)
+            print(f"{day:>4} | {len(todo_index):>8} | {elapsed:>8.2f} | {new_db_size / 2**20:>13.1f} | {(new_db_size - db_size) / 2**20:>12.1f}")
+            db_size = new_db_size
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--todos", type=int, default=100000, help="Number of todo items in every snapshot")
+    arg_parser.add_argument("--days", type=int, default=5, help="Number of daily snapshots recorded")
+    arg_parser.add_argument("--churn", type=float, default=0.01, help="Share of todo items resolved and added every day")
+    args = arg_parser.parse_args()
+
+    logging.getLogger("todonotifier").setLevel(logging.WARNING)
+    run(args.todos, args.days, args.churn)
@@ -0,0 +1,100 @@
+"""Benchmark of html report building by the default summary generators and
+`BaseNotifier._aggregate_all_summaries`.
+
+It renders reports of increasing number of rows (up to 100k) and prints the time taken
+per row for each scale. Time per row staying flat across scales shows that building
+reports scales linearly with number of rows.
+
+Usage: python -m benchmarks.bench_html [--rows 25000 50000 100000] [--repeat 3]
+"""
+
+import argparse
+import logging
+import time
+from typing import Callable, List, Tuple
+
+from todonotifier.notifier import BaseNotifier
+from todonotifier.summary_generators import (
+    BaseSummaryGenerator,
+    ByModuleSummaryGenerator,
+    ExpiredTodosByUserSummaryGenerator,
+    UpcomingWeekTodosByUserSummaryGenerator,
+)
+
+ROWS_PER_KEY = 20
+
+
+class _BenchNotifier(BaseNotifier):
+    """Notifier only used to access `_aggregate_all_summaries`"""
+
+    def notify(self, summary: List[Tuple[str, str]]) -> None:
+        pass
+
+
+def _fill_container(summary_generator: BaseSummaryGenerator, num_rows: int) -> None:
+    """Fills the container of `summary_generator` with `num_rows` synthetic rows spread over keys of `ROWS_PER_KEY` rows each
+
+    Args:
+        summary_generator (BaseSummaryGenerator): Summary generator whose container needs to be filled
+        num_rows (int): Number of rows to add
+    """
+    container = summary_generator.container
+    for row_no in range(num_rows):
+        key = f"key-{row_no // ROWS_PER_KEY}"
+        container.setdefault(key, []).append([f"user-{row_no % 7}", f"message-{row_no}", row_no, "2022-09-22"])
+
+
+def _best_of(func: Callable[[], None], repeat: int) -> float:
+    """Runs `func` `repeat` times and returns the best wall time in seconds
+
+    Args:
+        func (Callable[[], None]): Function to be timed
+        repeat (int): Number of times to run `func`
+
+    Returns:
+        float: Best wall time in seconds
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def run(rows: List[int], repeat: int) -> None:
+    """Runs the benchmark for each scale in `rows` and prints the results
+
+    Args:
+        rows (List[int]): Number of rows of each scale
+        repeat (int): Number of times each measurement is repeated
+    """
+    notifier = _BenchNotifier()
+    print(f"{'stage':<45}{'rows':>10}{'seconds':>12}{'us/row':>10}")
+    for summary_generator_class in (ByModuleSummaryGenerator, ExpiredTodosByUserSummaryGenerator, UpcomingWeekTodosByUserSummaryGenerator):
+        for num_rows in rows:
+            summary_generator = summary_generator_class()
+            _fill_container(summary_generator, num_rows)
+            seconds = _best_of(summary_generator.generate_html, repeat)
+            print(f"{summary_generator_class.__name__ + '.generate_html':<45}{num_rows:>10}{seconds:>12.4f}{seconds / num_rows * 1e6:>10.3f}")
+
+    for num_rows in rows:
+        summary_generator = ByModuleSummaryGenerator()
+        _fill_container(summary_generator, num_rows)
+        summary_generator.generate_html()
+        # Aggregate the same report multiple times to mimic multiple summaries
+        summary = [(f"summary-{idx}", summary_generator.html) for idx in range(3)]
+        seconds = _best_of(lambda: notifier._aggregate_all_summaries(summary), repeat)
+        print(f"{'BaseNotifier._aggregate_all_summaries':<45}{num_rows:>10}{seconds:>12.4f}{seconds / num_rows * 1e6:>10.3f}")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--rows", type=int, nargs="+", default=[25000, 50000, 100000], help="Number of rows of each scale")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Number of times each measurement is repeated")
+    args = arg_parser.parse_args()
+
+    # Per report logging would otherwise dominate the output
+    logging.getLogger("todonotifier").setLevel(logging.WARNING)
+    run(args.rows, args.repeat)
@@ -0,0 +1,60 @@
+"""Benchmark of the time taken to import TODO Notifier.
+
+Each measurement runs in a fresh interpreter so that no module is cached. The
+`eager` scenario additionally imports the heavy dependencies that used to be imported
+eagerly by the package (GitPython, dateutil, smtplib, ssl and the email MIME stack) to
+show the startup reduction of importing them lazily at first use.
+
+Usage: python -m benchmarks.bench_import [--repeat 10]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+HEAVY_DEPENDENCIES_IMPORT = "import git.repo, dateutil.parser, smtplib, ssl, email.mime.multipart, email.mime.text"
+SCENARIOS: Dict[str, str] = {
+    "lazy (import todonotifier.driver)": "import todonotifier.driver",
+    "eager (driver + heavy dependencies)": f"{HEAVY_DEPENDENCIES_IMPORT}; import todonotifier.driver",
+}
+TIMER_SCRIPT = "import time; start = time.perf_counter(); {statement}; print(time.perf_counter() - start)"
+
+
+def _time_import(statement: str, repeat: int) -> List[float]:
+    """Times `statement` in `repeat` fresh interpreters
+
+    Args:
+        statement (str): Import statement to time
+        repeat (int): Number of fresh interpreters to run
+
+    Returns:
+        List[float]: Wall time in seconds of each run
+    """
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", TIMER_SCRIPT.format(statement=statement)], check=True, capture_output=True, text=True)
+        timings.append(float(output.stdout.strip()))
+
+    return timings
+
+
+def run(repeat: int) -> None:
+    """Runs the benchmark for all scenarios and prints the results
+
+    Args:
+        repeat (int): Number of fresh interpreters to run per scenario
+    """
+    print(f"{'scenario':<40}{'median ms':>12}{'min ms':>10}")
+    for scenario, statement in SCENARIOS.items():
+        timings = _time_import(statement, repeat)
+        print(f"{scenario:<40}{statistics.median(timings) * 1e3:>12.1f}{min(timings) * 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--repeat", type=int, default=10, help="Number of fresh interpreters to run per scenario")
+    args = arg_parser.parse_args()
+
+    run(args.repeat)
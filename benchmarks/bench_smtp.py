@@ -0,0 +1,81 @@
+"""Benchmark of email delivery throughput of `EmailNotifier`.
+
+Emails are sent to a local SMTP stand-in (`tests.mocks.FakeSMTPServer`) which waits
+`--connect-delay` seconds before greeting each new connection to simulate the cost of
+the TLS handshake and login with a real provider. The `one-shot` scenario opens a new
+connection per email like `EmailNotifier` without a session does, while the `session`
+scenario reuses one `SMTPSession` across all emails sent in batches of `--batch-size`.
+
+Usage: python -m benchmarks.bench_smtp [--emails 200] [--connect-delay 0.02] [--batch-size 20]
+"""
+
+import argparse
+import logging
+import time
+from typing import Callable, Dict
+
+from tests.mocks import FakeSMTPServer
+from todonotifier.notifier import EmailNotifier, SMTPSession
+
+SUMMARY = [("Benchmark Summary", "<table><tr><td>benchmark</td></tr></table>")]
+
+
+def _send_one_shot(fake_smtp_server: FakeSMTPServer, emails: int, batch_size: int) -> None:
+    """Sends `emails` emails opening a new connection for each of them
+
+    Args:
+        fake_smtp_server (FakeSMTPServer): Server receiving the emails
+        emails (int): Number of emails to be sent
+        batch_size (int): Unused, connections aren't reused
+    """
+    for _ in range(emails):
+        with SMTPSession(fake_smtp_server.host, fake_smtp_server.port, use_ssl=False) as session:
+            EmailNotifier("bench-sender", None, None, None, ["bench-receiver"], session=session).notify(SUMMARY)
+
+
+def _send_with_session(fake_smtp_server: FakeSMTPServer, emails: int, batch_size: int) -> None:
+    """Sends `emails` emails reusing one connection in batches of `batch_size`
+
+    Args:
+        fake_smtp_server (FakeSMTPServer): Server receiving the emails
+        emails (int): Number of emails to be sent
+        batch_size (int): Number of emails queued before sending them together
+    """
+    with SMTPSession(fake_smtp_server.host, fake_smtp_server.port, use_ssl=False) as session:
+        email_notifier = EmailNotifier("bench-sender", None, None, None, ["bench-receiver"], session=session, batch_size=batch_size)
+        for _ in range(emails):
+            email_notifier.notify(SUMMARY)
+        email_notifier.flush()
+
+
+SCENARIOS: Dict[str, Callable[[FakeSMTPServer, int, int], None]] = {"one-shot": _send_one_shot, "session": _send_with_session}
+
+
+def run(emails: int, connect_delay: float, batch_size: int) -> None:
+    """Runs the benchmark and prints the throughput of each scenario
+
+    Args:
+        emails (int): Number of emails sent per scenario
+        connect_delay (float): Seconds waited by the server before greeting each new connection
+        batch_size (int): Number of emails queued before sending them together in the `session` scenario
+    """
+    print(f"{'scenario':>10} | {'emails':>7} | {'connections':>11} | {'seconds':>8} | {'emails/s':>9}")
+    for scenario, send in SCENARIOS.items():
+        with FakeSMTPServer(connect_delay=connect_delay) as fake_smtp_server:
+            start = time.perf_counter()
+            send(fake_smtp_server, emails, batch_size)
+            elapsed = time.perf_counter() - start
+
+        print(f"{scenario:>10} | {len(fake_smtp_server.messages):>7} | {fake_smtp_server.num_connections:>11} | {elapsed:>8.3f} | {emails / elapsed:>9.1f}")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--emails", type=int, default=200, help="Number of emails sent per scenario")
+    arg_parser.add_argument("--connect-delay", type=float, default=0.02, help="Seconds waited by the server before greeting each new connection")
+    arg_parser.add_argument("--batch-size", type=int, default=20, help="Number of emails queued before sending them together over the session")
+    args = arg_parser.parse_args()
+
+    # Logging of every opened connection would otherwise dominate the output
+    logging.getLogger("todonotifier").setLevel(logging.WARNING)
+    run(args.emails, args.connect_delay, args.batch_size)
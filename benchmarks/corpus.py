@@ -0,0 +1,164 @@
+"""Seeded generator of synthetic repositories used by the benchmarks.
+
+Same parameters, seed and base date always produce the same repository so that runs on
+different machines or commits can be compared. Completion dates are spread around the
+base date (today by default) so that the share of expired and upcoming todo items stays
+the same whenever the benchmark is run.
+
+Usage: python -m benchmarks.corpus TARGET_DIR [--files 1000] [--lines 200] [--seed 0]
+"""
+
+import argparse
+import json
+import os
+import random
+from datetime import date, timedelta
+from typing import Dict, List, Union
+
+from todonotifier.constants import DEFAULT_EXCLUDE_DIRS
+
+USER_NAMES = ["alice", "bob", "carol", "dave", "erin", "frank", "grace", "heidi"]
+CODE_LINES = [
+    "def function_{n}(arg):",
+    "    return arg + {n}",
+    "class Class{n}:",
+    "    value = {n}",
+    "import os  # module {n}",
+    "result = [item * {n} for item in range(10)]",
+    "",
+]
+
+
+class CorpusSpec:
+    """Parameters describing a synthetic repository"""
+
+    def __init__(
+        self,
+        num_files: int = 1000,
+        lines_per_file: int = 200,
+        todo_density: float = 0.02,
+        dir_depth: int = 3,
+        dirs_per_level: int = 4,
+        excluded_dir_ratio: float = 0.1,
+        seed: int = 0,
+    ) -> None:
+        """Initializer for `CorpusSpec` class
+
+        Args:
+            num_files (int, optional): Number of files to generate. Defaults to 1000.
+            lines_per_file (int, optional): Number of lines in each file. Defaults to 200.
+            todo_density (float, optional): Fraction of lines holding a todo item. Defaults to 0.02.
+            dir_depth (int, optional): Maximum depth of directories in which files are placed. Defaults to 3.
+            dirs_per_level (int, optional): Number of sub-directories at each level. Defaults to 4.
+            excluded_dir_ratio (float, optional): Fraction of files placed inside directories excluded by default. Defaults to 0.1.
+            seed (int, optional): Seed of the random generator. Defaults to 0.
+        """
+        self.num_files = num_files
+        self.lines_per_file = lines_per_file
+        self.todo_density = todo_density
+        self.dir_depth = dir_depth
+        self.dirs_per_level = dirs_per_level
+        self.excluded_dir_ratio = excluded_dir_ratio
+        self.seed = seed
+
+    def to_dict(self) -> Dict[str, float]:
+        """Returns the parameters as a dictionary
+
+        Returns:
+            Dict[str, float]: Parameters of the synthetic repository
+        """
+        return dict(vars(self))
+
+
+def _todo_line(rnd: random.Random, line_no: int, base_date: date) -> str:
+    """Returns a line holding a todo item with random completion date and user
+
+    Args:
+        rnd (random.Random): Seeded random generator
+        line_no (int): Line number used to make the message unique
+        base_date (date): Date around which completion dates are spread
+
+    Returns:
+        str: Line with a todo item
+    """
+    parts = ["# TODO"]
+    if rnd.random() < 0.8:
+        parts.append("{" + str(base_date + timedelta(days=rnd.randint(-365, 365))) + "}")
+    if rnd.random() < 0.6:
+        parts.append("@" + rnd.choice(USER_NAMES))
+    parts.append(f"synthetic message {line_no}")
+
+    return " ".join(parts)
+
+
+def _file_dir(rnd: random.Random, spec: CorpusSpec) -> List[str]:
+    """Returns path components of a random directory for a file
+
+    Args:
+        rnd (random.Random): Seeded random generator
+        spec (CorpusSpec): Parameters of the synthetic repository
+
+    Returns:
+        List[str]: Path components relative to the repository root
+    """
+    path_parts = [f"pkg_{rnd.randrange(spec.dirs_per_level)}" for _ in range(rnd.randint(0, spec.dir_depth))]
+    if rnd.random() < spec.excluded_dir_ratio:
+        path_parts.insert(rnd.randint(0, len(path_parts)), rnd.choice(DEFAULT_EXCLUDE_DIRS["NAME"][:8]))
+
+    return path_parts
+
+
+def generate_corpus(target_dir: str, spec: CorpusSpec, base_date: Union[date, None] = None) -> Dict[str, int]:
+    """Generates a synthetic repository of python files into `target_dir`
+
+    Args:
+        target_dir (str): Directory into which the repository is generated
+        spec (CorpusSpec): Parameters of the synthetic repository
+        base_date (Union[date, None], optional): Date around which completion dates are spread. Defaults to today.
+
+    Returns:
+        Dict[str, int]: Statistics of the generated repository
+    """
+    rnd = random.Random(spec.seed)
+    base_date = base_date or date.today()
+    stats = {"files": 0, "excluded_files": 0, "todos": 0, "bytes": 0}
+
+    for file_no in range(spec.num_files):
+        path_parts = _file_dir(rnd, spec)
+        file_dir = os.path.join(target_dir, *path_parts)
+        os.makedirs(file_dir, exist_ok=True)
+
+        lines = []
+        for line_no in range(spec.lines_per_file):
+            if rnd.random() < spec.todo_density:
+                lines.append(_todo_line(rnd, line_no, base_date))
+                stats["todos"] += 1
+            else:
+                lines.append(rnd.choice(CODE_LINES).format(n=line_no))
+        content = "\n".join(lines) + "\n"
+
+        with open(os.path.join(file_dir, f"module_{file_no}.py"), "w") as f:
+            f.write(content)
+
+        stats["files"] += 1
+        stats["bytes"] += len(content)
+        if any(path_part in DEFAULT_EXCLUDE_DIRS["NAME"] for path_part in path_parts):
+            stats["excluded_files"] += 1
+
+    return stats
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("target_dir", help="Directory into which the repository is generated")
+    arg_parser.add_argument("--files", type=int, default=1000, help="Number of files")
+    arg_parser.add_argument("--lines", type=int, default=200, help="Number of lines per file")
+    arg_parser.add_argument("--todo-density", type=float, default=0.02, help="Fraction of lines holding a todo item")
+    arg_parser.add_argument("--depth", type=int, default=3, help="Maximum depth of directories")
+    arg_parser.add_argument("--excluded-dir-ratio", type=float, default=0.1, help="Fraction of files inside excluded directories")
+    arg_parser.add_argument("--seed", type=int, default=0, help="Seed of the random generator")
+    arg_parser.add_argument("--base-date", type=date.fromisoformat, default=None, help="Date (YYYY-MM-DD) around which completion dates are spread")
+    args = arg_parser.parse_args()
+
+    corpus_spec = CorpusSpec(args.files, args.lines, args.todo_density, args.depth, excluded_dir_ratio=args.excluded_dir_ratio, seed=args.seed)
+    print(json.dumps(generate_corpus(args.target_dir, corpus_spec, args.base_date), indent=2))
@@ -0,0 +1,174 @@
+"""Harness timing each stage of the TODO Notifier pipeline on synthetic repositories.
+
+For each scale (number of files), a synthetic repository is generated with
+`benchmarks.corpus` and the following stages are timed: discovering files
+(`get_files_in_dir`), parsing (`parse_files_for_todo_items`), building the `TodoIndex`,
+summarizing and rendering html with each default summary generator and storing the
+html reports (`store_html`). Results are written as JSON so that runs can be compared.
+
+Usage:
+    python -m benchmarks.harness [--scales 100 1000 5000] [--repeat 3] [--output results.json]
+    python -m benchmarks.harness --compare baseline.json candidate.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, TypeVar
+
+from benchmarks.corpus import CorpusSpec, generate_corpus
+from todonotifier.config import DefaultConfig
+from todonotifier.summary_generators import (
+    ByModuleSummaryGenerator,
+    ExpiredTodosByUserSummaryGenerator,
+    UpcomingWeekTodosByUserSummaryGenerator,
+)
+from todonotifier.todo_index import TodoIndex
+from todonotifier.todo_notifier import parse_files_for_todo_items
+from todonotifier.utils import get_files_in_dir, store_html
+
+R = TypeVar("R")
+
+SUMMARY_GENERATOR_CLASSES = [ByModuleSummaryGenerator, ExpiredTodosByUserSummaryGenerator, UpcomingWeekTodosByUserSummaryGenerator]
+
+
+def _timed(func: Callable[[], R], timings: Dict[str, List[float]], stage: str) -> R:
+    """Calls `func` and records its wall time in seconds against `stage`
+
+    Args:
+        func (Callable[[], R]): Function to be timed
+        timings (Dict[str, List[float]]): Key-value pair where key is stage and value is list of wall times of its runs
+        stage (str): Name of the stage
+
+    Returns:
+        R: Whatever is returned by `func`
+    """
+    start = time.perf_counter()
+    result = func()
+    timings.setdefault(stage, []).append(time.perf_counter() - start)
+
+    return result
+
+
+def _run_pipeline(project_parent_dir: str, project_dir: str, report_dir: str, timings: Dict[str, List[float]]) -> None:
+    """Runs all stages of the pipeline once over `project_dir` recording wall time of each stage
+
+    Args:
+        project_parent_dir (str): Parent directory of the project directory
+        project_dir (str): Directory of the synthetic repository
+        report_dir (str): Directory into which html reports are stored
+        timings (Dict[str, List[float]]): Key-value pair where key is stage and value is list of wall times of its runs
+    """
+    config = DefaultConfig(flag_default_summary_generators=False)
+    files = _timed(lambda: get_files_in_dir(project_dir, "py", config.exclude_dirs, config.exclude_files), timings, "discover")
+    all_todos_objs = _timed(lambda: parse_files_for_todo_items(project_parent_dir, files, False), timings, "parse")
+    todo_index = _timed(lambda: TodoIndex(all_todos_objs), timings, "index")
+
+    for summary_generator_class in SUMMARY_GENERATOR_CLASSES:
+        summary_generator = summary_generator_class()
+        summary_generator.todo_index = todo_index
+        name = summary_generator_class.__name__
+        _timed(lambda: summary_generator.generate_summary(all_todos_objs), timings, f"summarize:{name}")
+        _timed(summary_generator.generate_html, timings, f"render:{name}")
+        _timed(lambda: store_html(summary_generator.html, name, report_dir), timings, f"store:{name}")
+
+
+def run(scales: List[int], repeat: int, base_spec: CorpusSpec) -> Dict:
+    """Runs the pipeline `repeat` times for each scale and returns the results
+
+    Args:
+        scales (List[int]): Number of files of each scale
+        repeat (int): Number of times the pipeline is run per scale
+        base_spec (CorpusSpec): Parameters of the synthetic repository except number of files
+
+    Returns:
+        Dict: Results along with metadata about the run
+    """
+    results = []
+    for num_files in scales:
+        spec = CorpusSpec(**{**base_spec.to_dict(), "num_files": num_files})
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_dir = os.path.join(temp_dir, "project")
+            report_dir = os.path.join(temp_dir, "reports")
+            os.makedirs(report_dir)
+            corpus_stats = generate_corpus(project_dir, spec)
+
+            timings = {}
+            for _ in range(repeat):
+                _run_pipeline(temp_dir, project_dir, report_dir, timings)
+
+        for stage, stage_timings in timings.items():
+            results.append(
+                {
+                    "scale": num_files,
+                    "stage": stage,
+                    "corpus": corpus_stats,
+                    "seconds": stage_timings,
+                    "min": min(stage_timings),
+                    "median": statistics.median(stage_timings),
+                }
+            )
+            print(f"{num_files:>8} {stage:<55}{min(stage_timings):>10.4f}s")
+
+    return {
+        "metadata": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "corpus_spec": base_spec.to_dict(),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline_file: str, candidate_file: str) -> None:
+    """Prints the ratio of median wall time of each stage of `candidate_file` to that of `baseline_file`
+
+    Args:
+        baseline_file (str): JSON results of the baseline run
+        candidate_file (str): JSON results of the candidate run
+    """
+    with open(baseline_file) as f:
+        baseline = {(result["scale"], result["stage"]): result["median"] for result in json.load(f)["results"]}
+    with open(candidate_file) as f:
+        candidate = {(result["scale"], result["stage"]): result["median"] for result in json.load(f)["results"]}
+
+    print(f"{'scale':>8} {'stage':<55}{'baseline':>10}{'candidate':>11}{'ratio':>8}")
+    for key in sorted(baseline.keys() & candidate.keys()):
+        ratio = candidate[key] / baseline[key] if baseline[key] else float("inf")
+        print(f"{key[0]:>8} {key[1]:<55}{baseline[key]:>10.4f}{candidate[key]:>11.4f}{ratio:>8.2f}")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--scales", type=int, nargs="+", default=[100, 1000, 5000], help="Number of files of each scale")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Number of times the pipeline is run per scale")
+    arg_parser.add_argument("--lines", type=int, default=200, help="Number of lines per file")
+    arg_parser.add_argument("--todo-density", type=float, default=0.02, help="Fraction of lines holding a todo item")
+    arg_parser.add_argument("--depth", type=int, default=3, help="Maximum depth of directories")
+    arg_parser.add_argument("--excluded-dir-ratio", type=float, default=0.1, help="Fraction of files inside excluded directories")
+    arg_parser.add_argument("--seed", type=int, default=0, help="Seed of the random generator")
+    arg_parser.add_argument("--output", default="bench_results.json", help="File into which JSON results are written")
+    arg_parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CANDIDATE"), help="Compare two JSON result files instead of running")
+    args = arg_parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+    else:
+        # Per module logging would otherwise dominate the timings
+        logging.getLogger("todonotifier").setLevel(logging.WARNING)
+        corpus_spec = CorpusSpec(
+            lines_per_file=args.lines, todo_density=args.todo_density, dir_depth=args.depth, excluded_dir_ratio=args.excluded_dir_ratio, seed=args.seed
+        )
+        bench_results = run(args.scales, args.repeat, corpus_spec)
+        with open(args.output, "w") as f:
+            json.dump(bench_results, f, indent=2)
+        print(f"Results written to {args.output}")
@@ -1,8 +1,16 @@
-from typing import Dict, List, TypeVar, Union
+import socketserver
+import threading
+import time
+from typing import Dict, List, Tuple, TypeVar, Union
 
+from todonotifier.attribution import BlameAttributor
 from todonotifier.config import BaseConfig
+from todonotifier.exporters import BaseExporter
+from todonotifier.history import HistoryStore
 from todonotifier.notifier import BaseNotifier
 from todonotifier.summary_generators import BaseSummaryGenerator
+from todonotifier.todo_age import TodoAgeTracker
+from todonotifier.todo_notifier import ScanOptions
 
 P = TypeVar("P")
 
@@ -19,6 +27,19 @@ class MockTestConfig(BaseConfig):
         save_html_reports: bool = True,
         ignore_todo_case: bool = False,
         notifier: Union[BaseNotifier, None] = None,
+        stream_html_reports: bool = False,
+        max_workers: int = 1,
+        profile: bool = False,
+        track_memory: bool = False,
+        memory_budget: Union[int, None] = None,
+        memory_budget_action: str = "abort",
+        exporters: Union[List[BaseExporter], None] = None,
+        history_store: Union[HistoryStore, None] = None,
+        attributor: Union[BlameAttributor, None] = None,
+        age_tracker: Union[TodoAgeTracker, None] = None,
+        extensions: Union[List[str], None] = None,
+        report_dir: Union[str, None] = None,
+        scan_options: Union[ScanOptions, None] = None,
     ) -> None:
         """Initializer for `TestConfig` class
 
@@ -29,8 +50,42 @@ class MockTestConfig(BaseConfig):
             generate_html (bool, optional): Boolean controlling whether to generate HTML report for each summary generator. Defaults to True
             save_html_reports (bool, optional): Boolean controlling whether to store the generated HTML reports by each summary generator. Defaults to True
             ignore_todo_case (bool, optional): Boolean controlling whether to skip considering the case of todo like whether to consider Todo, todo etc.
+            stream_html_reports (bool, optional): Boolean controlling whether to render html reports in chunks. Defaults to False
+            max_workers (int, optional): Maximum number of workers used by stages that can run in parallel. Defaults to 1
+            profile (bool, optional): Boolean controlling whether to profile each stage of a run. Defaults to False
+            track_memory (bool, optional): Boolean controlling whether to track peak memory of each stage. Defaults to False
+            memory_budget (Union[int, None], optional): Maximum RSS of the process in bytes. Defaults to None
+            memory_budget_action (str, optional): Action on exceeding `memory_budget`. Defaults to "abort"
+            exporters (Union[List[BaseExporter], None], optional): Exporters to which todo items are streamed. Defaults to None
+            history_store (Union[HistoryStore, None], optional): Store to which a snapshot of todo items of every run is appended. Defaults to None
+            attributor (Union[BlameAttributor, None], optional): Attributor of todo items without a user. Defaults to None
+            age_tracker (Union[TodoAgeTracker, None], optional): Tracker of commits that introduced todo items. Defaults to None
+            extensions (Union[List[str], None], optional): Extensions of files parsed for todo items. Defaults to None
+            report_dir (Union[str, None], optional): Directory in which html reports and profiles are stored. Defaults to None
+            scan_options (Union[ScanOptions, None], optional): Options controlling how files are read. Defaults to None
         """
-        super().__init__(exclude_dirs or {}, exclude_files or {}, summary_generators or [], generate_html, save_html_reports, ignore_todo_case, notifier)
+        super().__init__(
+            exclude_dirs or {},
+            exclude_files or {},
+            summary_generators or [],
+            generate_html,
+            save_html_reports,
+            ignore_todo_case,
+            notifier,
+            stream_html_reports=stream_html_reports,
+            max_workers=max_workers,
+            profile=profile,
+            track_memory=track_memory,
+            memory_budget=memory_budget,
+            memory_budget_action=memory_budget_action,
+            exporters=exporters,
+            history_store=history_store,
+            attributor=attributor,
+            age_tracker=age_tracker,
+            extensions=extensions,
+            report_dir=report_dir,
+            scan_options=scan_options,
+        )
 
 
 class MockSummaryGenerator:
@@ -80,3 +135,117 @@ class FakeContextManager:
     def __exit__(self, *args, **kargs) -> None:
         """Fakes the `__exit__` method of the context manager"""
         pass
+
+
+class _FakeSMTPHandler(socketserver.StreamRequestHandler):
+    """Handles one SMTP connection to `FakeSMTPServer` implementing just enough of the protocol for `smtplib`"""
+
+    def _reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self) -> None:
+        server: "FakeSMTPServer" = self.server.fake_smtp_server
+        server._on_connect()
+        time.sleep(server.connect_delay)
+        self._reply("220 localhost fake smtp")
+
+        mail_from, rcpt_to = None, []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+
+            if verb == "EHLO":
+                self.wfile.write(b"250-localhost\r\n250 AUTH PLAIN LOGIN\r\n")
+            elif verb == "HELO":
+                self._reply("250 localhost")
+            elif verb == "AUTH":
+                self._reply("235 Authentication successful")
+            elif verb == "MAIL":
+                mail_from, rcpt_to = command.split(":", 1)[1].strip().strip("<>"), []
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                rcpt_to.append(command.split(":", 1)[1].strip().strip("<>"))
+                self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while True:
+                    data_line = self.rfile.readline()
+                    if not data_line or data_line == b".\r\n":
+                        break
+                    data.append(data_line)
+                self._reply("250 OK")
+                if server._on_message(mail_from, rcpt_to, b"".join(data).decode()):
+                    # Simulates the server dropping the connection e.g. on reaching its limit of messages per connection
+                    return
+            elif verb in ("RSET", "NOOP"):
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class FakeSMTPServer:
+    """Local SMTP server running in a background thread recording the received messages"""
+
+    def __init__(self, connect_delay: float = 0, disconnect_after: Union[int, None] = None) -> None:
+        """Initializer for `FakeSMTPServer`
+
+        Args:
+            connect_delay (float, optional): Seconds waited before greeting a new connection to simulate the cost of a handshake. Defaults to 0
+            disconnect_after (Union[int, None], optional): Number of messages after which a connection is dropped by the server. Defaults to None
+        """
+        self.connect_delay = connect_delay
+        self.disconnect_after = disconnect_after
+        self.messages: List[Tuple[str, List[str], str]] = []
+        self.num_connections = 0
+        self._messages_on_connection: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _FakeSMTPHandler)
+        self._server.daemon_threads = True
+        self._server.fake_smtp_server = self
+        self._thread = None
+
+    @property
+    def host(self) -> str:
+        return self._server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def _on_connect(self) -> None:
+        with self._lock:
+            self.num_connections += 1
+            self._messages_on_connection[threading.get_ident()] = 0
+
+    def _on_message(self, mail_from: str, rcpt_to: List[str], data: str) -> bool:
+        """Records a received message
+
+        Returns:
+            bool: Boolean whether the connection should be dropped
+        """
+        with self._lock:
+            self.messages.append((mail_from, rcpt_to, data))
+            count = self._messages_on_connection[threading.get_ident()] = self._messages_on_connection[threading.get_ident()] + 1
+            return bool(self.disconnect_after) and count >= self.disconnect_after
+
+    def start(self) -> "FakeSMTPServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeSMTPServer":
+        return self.start()
+
+    def __exit__(self, *args, **kwargs) -> None:
+        self.stop()
@@ -0,0 +1,112 @@
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+from git import Actor
+from git.repo import Repo
+
+from todonotifier.attribution import (
+    BlameAttributor,
+    BlameCache,
+    _get_line_ranges,
+    _parse_line_porcelain,
+)
+from todonotifier.constants import UNKNOWN_USER_NAME
+from todonotifier.todo_notifier import parse_files_for_todo_items
+
+BLAME_OUTPUT = """1111111111111111111111111111111111111111 3 3 2
+author alice
+author-mail <alice@example.com>
+summary unittest-summary
+filename unittest.py
+\t# TODO unittest-msg-1
+1111111111111111111111111111111111111111 4 4
+author alice
+author-mail <alice@example.com>
+summary unittest-summary
+filename unittest.py
+\t# TODO unittest-msg-2
+0000000000000000000000000000000000000000 9 9 1
+author Not Committed Yet
+author-mail <not.committed.yet>
+summary Version of unittest.py from unittest.py
+filename unittest.py
+\t# TODO unittest-msg-3
+"""
+
+
+class TestHelpers(unittest.TestCase):
+    def test_get_line_ranges_should_merge_consecutive_lines(self):
+        self.assertEqual([(1, 2), (5, 5), (7, 9)], _get_line_ranges([9, 1, 8, 2, 5, 7, 7]))
+
+    def test_parse_line_porcelain_should_return_authors_of_committed_lines(self):
+        self.assertEqual({3: "alice", 4: "alice"}, _parse_line_porcelain(BLAME_OUTPUT))
+
+
+class TestBlameCache(unittest.TestCase):
+    def test_get_should_return_cached_authors_and_missing_lines(self):
+        blame_cache = BlameCache()
+        blame_cache.put("unittest-sha", {1: "alice", 3: "bob"})
+
+        self.assertEqual(({1: "alice"}, [2]), blame_cache.get("unittest-sha", [1, 2]))
+        self.assertEqual((1, 1), (blame_cache.hits, blame_cache.misses))
+
+    def test_save_should_keep_cache_across_instances_and_retain_should_evict_blobs(self):
+        with TemporaryDirectory() as tmpdir:
+            cache_file = os.path.join(tmpdir, "unittest-dir", "blame.json")
+            blame_cache = BlameCache(cache_file)
+            blame_cache.put("unittest-sha-1", {1: "alice"})
+            blame_cache.put("unittest-sha-2", {2: "bob"})
+            blame_cache.retain(["unittest-sha-1"])
+            blame_cache.save()
+
+            loaded_blame_cache = BlameCache(cache_file)
+
+            self.assertEqual(1, len(loaded_blame_cache))
+            self.assertEqual(({1: "alice"}, []), loaded_blame_cache.get("unittest-sha-1", [1]))
+
+
+class TestBlameAttributor(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()
+        self._repo_dir = os.path.join(self._temp_dir.name, "unittest-project")
+        os.makedirs(self._repo_dir)
+        self._file = os.path.join(self._repo_dir, "unittest.py")
+        with open(self._file, "w") as f:
+            f.write("# TODO unittest-msg-1\nx = 1\n# TODO @bob unittest-msg-2\n# TODO unittest-msg-3\n")
+
+        repo = Repo.init(self._repo_dir)
+        repo.index.add(["unittest.py"])
+        repo.index.commit("unittest-commit", author=Actor("alice", "alice@example.com"), committer=Actor("alice", "alice@example.com"))
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _parse(self):
+        return parse_files_for_todo_items(self._temp_dir.name, [self._file], False)
+
+    def test_attribute_should_attribute_todo_items_without_user_to_author_of_line(self):
+        all_todos_objs = self._parse()
+
+        num_attributed = BlameAttributor().attribute(self._repo_dir, self._temp_dir.name, all_todos_objs)
+
+        self.assertEqual(2, num_attributed)
+        self.assertEqual(["alice", "bob", "alice"], [todo_obj.user.user_name for todo_obj in all_todos_objs[os.path.join("unittest-project", "unittest.py")]])
+
+    def test_attribute_should_not_blame_lines_cached_for_unchanged_file(self):
+        blame_attributor = BlameAttributor()
+        blame_attributor.attribute(self._repo_dir, self._temp_dir.name, self._parse())
+
+        all_todos_objs = self._parse()
+        blame_attributor.attribute(self._repo_dir, self._temp_dir.name, all_todos_objs)
+
+        self.assertEqual((2, 2), (blame_attributor.blame_cache.hits, blame_attributor.blame_cache.misses))
+        self.assertNotIn(UNKNOWN_USER_NAME, [todo_obj.user.user_name for todos in all_todos_objs.values() for todo_obj in todos])
+
+    def test_attribute_should_leave_todo_items_of_untracked_files_unattributed(self):
+        untracked_file = os.path.join(self._repo_dir, "untracked.py")
+        with open(untracked_file, "w") as f:
+            f.write("# TODO unittest-msg\n")
+        all_todos_objs = parse_files_for_todo_items(self._temp_dir.name, [untracked_file], False)
+
+        self.assertEqual(0, BlameAttributor().attribute(self._repo_dir, self._temp_dir.name, all_todos_objs))
@@ -0,0 +1,46 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+from tempfile import TemporaryDirectory
+
+from todonotifier.burndown import BurndownSummaryGenerator
+from todonotifier.history import HistoryStore
+from todonotifier.models import POSITION, TODO, USER
+from todonotifier.todo_index import TodoIndex
+
+
+class TestBurndownSummaryGenerator(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()
+        self._history_store = HistoryStore(os.path.join(self._temp_dir.name, "history.sqlite3"))
+        self._all_todos_objs = {"unittest-module": [TODO("unittest-msg", USER("unittest-user"), "2024-01-10", "unittest-module", POSITION(1))]}
+        self._history_store.record_run(TodoIndex(self._all_todos_objs), "unittest-project", datetime.today() - timedelta(days=7))
+        self._history_store.record_run(TodoIndex({}), "unittest-project")
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_generate_summary_should_collect_weekly_counts_per_module_and_user(self):
+        summary_generator = BurndownSummaryGenerator(self._history_store, "unittest-project")
+
+        summary_generator.generate_summary({})
+
+        self.assertEqual(["unittest-module", "unittest-user"], [rows[0][1] for rows in summary_generator.container.values()])
+        self.assertEqual([[1, 0, 1], [0, 1, 0]], [row[2:] for row in summary_generator.container["user"]])
+
+    def test_generate_summary_should_only_collect_weeks_reported(self):
+        summary_generator = BurndownSummaryGenerator(self._history_store, "unittest-project", weeks=1)
+
+        summary_generator.generate_summary({})
+
+        self.assertEqual([[0, 1, 0]], [row[2:] for row in summary_generator.container["module"]])
+
+    def test_generate_html_should_render_one_table_per_group(self):
+        summary_generator = BurndownSummaryGenerator(self._history_store, "unittest-project")
+        summary_generator.generate_summary({})
+
+        summary_generator.generate_html()
+
+        self.assertIn("Burndown by Module", summary_generator.html)
+        self.assertIn("Burndown by User Name", summary_generator.html)
+        self.assertEqual(2, summary_generator.html.count("<table>"))
@@ -0,0 +1,109 @@
+import os
+import subprocess
+import sys
+import unittest
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from todonotifier.cli import _get_connect_method, _get_project_dir_name, main
+from todonotifier.connect import Connect
+from todonotifier.driver import TODOException
+
+
+class TestImport(unittest.TestCase):
+    def test_import_should_not_import_driver_before_parsing_arguments(self):
+        script = "import sys; import todonotifier.cli; print(sorted(m for m in ('todonotifier.driver', 'todonotifier.config', 'git') if m in sys.modules))"
+
+        output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True).stdout.strip()
+
+        self.assertEqual("[]", output)
+
+
+class TestHelpers(unittest.TestCase):
+    def test_get_connect_method_should_detect_local_directories_files_and_urls(self):
+        with TemporaryDirectory() as tmpdir:
+            file = os.path.join(tmpdir, "unittest.py")
+            open(file, "w").close()
+
+            self.assertEqual(["DRY_RUN_DIR", "DRY_RUN_FILE", "GIT_CLONE"], [_get_connect_method(source) for source in (tmpdir, file, "git@host:org/repo.git")])
+
+    def test_get_project_dir_name_should_return_name_of_source_without_git_suffix(self):
+        self.assertEqual("repo", _get_project_dir_name("git@host:repo.git"))
+        self.assertEqual("repo", _get_project_dir_name("https://host/org/repo.git"))
+        self.assertEqual("project", _get_project_dir_name("/path/to/project/"))
+
+
+class TestMain(unittest.TestCase):
+    def test_main_should_exit_with_error_if_incremental_is_set_without_cache_dir(self):
+        with patch("sys.stderr"), self.assertRaises(SystemExit) as context:
+            main(["unittest-source", "--incremental"])
+
+        self.assertEqual(2, context.exception.code)
+
+    def test_main_should_exit_with_error_if_cache_dir_is_set_without_incremental(self):
+        with patch("sys.stderr"), self.assertRaises(SystemExit) as context:
+            main(["unittest-source", "--cache-dir", "unittest-cache-dir"])
+
+        self.assertEqual(2, context.exception.code)
+
+    def test_main_should_store_outputs_of_requested_formats(self):
+        with TemporaryDirectory() as tmpdir:
+            project_dir = os.path.join(tmpdir, "unittest-project")
+            os.makedirs(project_dir)
+            for file_name in ("unittest.py", "unittest.js", "unittest.txt"):
+                with open(os.path.join(project_dir, file_name), "w") as f:
+                    f.write("# TODO {2024-01-01} @alice unittest-msg\n")
+            output_dir = os.path.join(tmpdir, "unittest-output")
+            cache_dir = os.path.join(tmpdir, "unittest-cache")
+
+            with patch("sys.stdout"):
+                exit_code = main(
+                    [
+                        project_dir,
+                        "--extensions",
+                        "py",
+                        "js",
+                        "--format",
+                        "html",
+                        "jsonl",
+                        "--output-dir",
+                        output_dir,
+                        "--cache-dir",
+                        cache_dir,
+                        "--incremental",
+                    ]
+                )
+
+            self.assertEqual(0, exit_code)
+            with open(os.path.join(output_dir, "todos.jsonl")) as f:
+                self.assertEqual(2, len(f.readlines()))
+            self.assertIn("Module-wise Summary.html", os.listdir(output_dir))
+            self.assertTrue(os.path.isdir(os.path.join(cache_dir, "workspace", "unittest-project")))
+
+    def test_main_should_scan_current_directory_and_directory_with_trailing_slash(self):
+        with TemporaryDirectory() as tmpdir:
+            project_dir = os.path.join(tmpdir, "unittest-project")
+            os.makedirs(project_dir)
+            with open(os.path.join(project_dir, "unittest.py"), "w") as f:
+                f.write("# TODO {2024-01-01} @alice unittest-msg\n")
+            cwd = os.getcwd()
+            os.chdir(project_dir)
+            try:
+                for source in (".", f"{project_dir}{os.sep}"):
+                    output_dir = os.path.join(tmpdir, "unittest-output")
+                    with patch("sys.stdout"), patch("todonotifier.connect.Connect.__init__", autospec=True, side_effect=Connect.__init__) as spy_init:
+                        exit_code = main([source, "--format", "jsonl", "--output-dir", output_dir])
+
+                    self.assertEqual(0, exit_code)
+                    self.assertEqual("unittest-project", spy_init.call_args.kwargs["project_dir_name"])
+                    with open(os.path.join(output_dir, "todos.jsonl")) as f:
+                        self.assertEqual(1, len(f.readlines()))
+            finally:
+                os.chdir(cwd)
+
+    @patch("todonotifier.driver.run")
+    def test_main_should_return_1_if_run_fails(self, stub_run):
+        stub_run.side_effect = TODOException("unittest-exception")
+
+        with patch("sys.stderr"):
+            self.assertEqual(1, main(["unittest-source", "--connect-method", "DRY_RUN_DIR"]))
@@ -1,8 +1,9 @@
 import unittest
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from todonotifier.config import BaseConfig, DefaultConfig, default_config
 from todonotifier.constants import DEFAULT_EXCLUDE_DIRS, DEFAULT_EXCLUDE_FILES
+from todonotifier.todo_notifier import ScanOptions
 
 
 class TestBaseConfig(unittest.TestCase):
@@ -74,6 +75,9 @@ class TestBaseConfig(unittest.TestCase):
 
         self.assertEqual(expected_value, actual_value)
 
+    def test_stream_html_reports_should_be_false_by_default(self):
+        self.assertFalse(self._base_config.stream_html_reports)
+
 
 class TestDefaultConfig(unittest.TestCase):
     def setUp(self):
@@ -134,6 +138,54 @@ class TestDefaultConfig(unittest.TestCase):
 
         self.assertEqual(dummy_summary_generators, actual_value)
 
+    def test_default_config_should_shard_default_by_module_summary_generator_if_set(self):
+        default_config = DefaultConfig(shard_module_report=True, modules_per_shard=10)
+        by_module_summary_generator = default_config.summary_generators[0]
+
+        self.assertTrue(by_module_summary_generator.shard)
+        self.assertEqual(10, by_module_summary_generator.modules_per_shard)
+
+    def test_default_config_should_pass_max_workers(self):
+        default_config = DefaultConfig(max_workers=4)
+
+        self.assertEqual(4, default_config.max_workers)
+
+    def test_default_config_should_pass_stream_html_reports(self):
+        default_config = DefaultConfig(stream_html_reports=True)
+
+        self.assertTrue(default_config.stream_html_reports)
+
+    def test_default_config_should_pass_profiling_and_memory_options(self):
+        default_config = DefaultConfig(profile=True, track_memory=True, memory_budget=1024, memory_budget_action="degrade")
+
+        self.assertTrue(default_config.profile)
+        self.assertTrue(default_config.track_memory)
+        self.assertEqual(1024, default_config.memory_budget)
+        self.assertEqual("degrade", default_config.memory_budget_action)
+
+    def test_default_config_should_pass_exporters(self):
+        dummy_exporters = [Mock()]
+
+        self.assertEqual(dummy_exporters, DefaultConfig(exporters=dummy_exporters).exporters)
+        self.assertEqual([], DefaultConfig().exporters)
+
+    def test_default_config_should_pass_history_store(self):
+        dummy_history_store = Mock()
+
+        self.assertIs(dummy_history_store, DefaultConfig(history_store=dummy_history_store).history_store)
+        self.assertIsNone(DefaultConfig().history_store)
+
+    def test_default_config_should_default_extensions_to_py_and_pass_report_dir(self):
+        self.assertEqual(["py"], DefaultConfig().extensions)
+        self.assertEqual(["py", "js"], DefaultConfig(extensions=["py", "js"]).extensions)
+        self.assertEqual("unittest-report-dir", DefaultConfig(report_dir="unittest-report-dir").report_dir)
+
+    def test_default_config_should_default_scan_options(self):
+        dummy_scan_options = ScanOptions(max_file_size=1)
+
+        self.assertIs(dummy_scan_options, DefaultConfig(scan_options=dummy_scan_options).scan_options)
+        self.assertIsNone(DefaultConfig().scan_options.max_file_size)
+
 
 class TestDefaultConfigInstance(unittest.TestCase):
     def test_default_config_instance_should_exist(self):
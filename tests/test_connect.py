@@ -32,6 +32,20 @@ class TestConnect(unittest.TestCase):
 
         assert dummy_project_dir_name == actual_value
 
+    def test_url_should_return_url(self):
+        connect = Connect(connect_method=ConnectMethod.DRY_RUN_DIR, project_dir_name="unittest-project-dir-name", url="unittest-url")
+
+        actual_value = connect.url
+
+        assert "unittest-url" == actual_value
+
+    def test_connect_method_should_return_connect_method(self):
+        connect = Connect(connect_method=ConnectMethod.DRY_RUN_DIR, project_dir_name="unittest-project-dir-name", url="")
+
+        actual_value = connect.connect_method
+
+        assert ConnectMethod.DRY_RUN_DIR == actual_value
+
     def test___str___should_return_string_representation_of_connect(self):
         dummy_url = "unittest-url"
         dummy_target_dir = "unittest-target-dir"
@@ -89,6 +103,75 @@ class TestConnect(unittest.TestCase):
         with self.assertRaises(ConnectException):
             connect.pull_repository("")
 
+    @patch("todonotifier.connect.Connect.pull_repository")
+    def test_update_repository_should_pull_repository_if_not_pulled_yet(self, spy_pull_repository):
+        connect = Connect(connect_method=ConnectMethod.DRY_RUN_DIR, project_dir_name="", url="")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dummy_target_dir = os.path.join(temp_dir, "unittest-target-dir")
+            connect.update_repository(dummy_target_dir)
+
+        spy_pull_repository.assert_called_once_with(dummy_target_dir)
+
+    @patch("git.repo.Repo")
+    def test_update_repository_should_git_pull_if_already_cloned(self, spy_repo):
+        connect = Connect(connect_method=ConnectMethod.GIT_CLONE, project_dir_name="", url="")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            connect.update_repository(temp_dir)
+
+        spy_repo.assert_called_once_with(temp_dir)
+        spy_repo.return_value.remotes.origin.pull.assert_called_once_with()
+
+    def test_update_repository_should_only_copy_changed_files_and_remove_deleted_files_of_dir(self):
+        with tempfile.TemporaryDirectory() as src_dir, tempfile.TemporaryDirectory() as temp_dir:
+            for file_name, content in (("unchanged.py", "# unchanged"), ("changed.py", "# old"), ("deleted.py", "# deleted")):
+                with open(os.path.join(src_dir, file_name), "w") as f:
+                    f.write(content)
+            connect = Connect(connect_method=ConnectMethod.DRY_RUN_DIR, project_dir_name="", url=src_dir)
+            target_dir = os.path.join(temp_dir, "unittest-target-dir")
+            connect.pull_repository(target_dir)
+            copied_dir = os.path.join(target_dir, os.path.basename(src_dir))
+            unchanged_mtime_ns = os.stat(os.path.join(copied_dir, "unchanged.py")).st_mtime_ns
+
+            with open(os.path.join(src_dir, "changed.py"), "w") as f:
+                f.write("# new content")
+            os.remove(os.path.join(src_dir, "deleted.py"))
+            os.makedirs(os.path.join(src_dir, "new_dir"))
+            with open(os.path.join(src_dir, "new_dir", "new.py"), "w") as f:
+                f.write("# new")
+            connect.update_repository(target_dir)
+
+            self.assertEqual(["changed.py", "new_dir", "unchanged.py"], sorted(os.listdir(copied_dir)))
+            with open(os.path.join(copied_dir, "changed.py")) as f:
+                self.assertEqual("# new content", f.read())
+            self.assertTrue(os.path.isfile(os.path.join(copied_dir, "new_dir", "new.py")))
+            self.assertEqual(unchanged_mtime_ns, os.stat(os.path.join(copied_dir, "unchanged.py")).st_mtime_ns)
+
+    def test_update_repository_should_copy_file_again_if_changed(self):
+        with tempfile.TemporaryDirectory() as src_dir, tempfile.TemporaryDirectory() as target_dir:
+            src_file = os.path.join(src_dir, "unittest-file.py")
+            with open(src_file, "w") as f:
+                f.write("# old")
+            connect = Connect(connect_method=ConnectMethod.DRY_RUN_FILE, project_dir_name="unittest-project", url=src_file)
+            connect.pull_repository(target_dir)
+
+            with open(src_file, "w") as f:
+                f.write("# new content")
+            connect.update_repository(target_dir)
+
+            with open(os.path.join(target_dir, "unittest-project", "unittest-file.py")) as f:
+                self.assertEqual("# new content", f.read())
+
+    @patch("todonotifier.connect.Connect._update_dir_for_dry_run")
+    def test_update_repository_should_raise_connect_exception_if_any_exception_in_updating(self, stub__update_dir_for_dry_run):
+        stub__update_dir_for_dry_run.side_effect = Exception("unittest-update-exception")
+        connect = Connect(connect_method=ConnectMethod.DRY_RUN_DIR, project_dir_name="", url="")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with self.assertRaises(ConnectException):
+                connect.update_repository(temp_dir)
+
     # NOTE: This test runs over internet
     def test__pull_using_git_clone_should_pull_git_repository(self):
         dummy_url = "https://github.com/ashu-tosh-kumar/Interesting-ML-Models.git"
@@ -0,0 +1,151 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+from tests.mocks import MockTestConfig
+from todonotifier.daemon import Daemon, ScheduledProject
+from todonotifier.driver import TODOException
+from todonotifier.notifier import EmailNotifier
+
+
+class TestScheduledProject(unittest.TestCase):
+    def test_scheduled_project_should_default_name_to_project_dir_name(self):
+        dummy_connect = Mock()
+        dummy_connect.project_dir_name = "unittest-project"
+
+        scheduled_project = ScheduledProject(dummy_connect, MockTestConfig(), interval_seconds=60)
+
+        self.assertEqual("unittest-project", scheduled_project.name)
+        self.assertIsNone(scheduled_project.last_result)
+
+    def test_scheduled_project_should_raise_value_error_for_non_positive_interval(self):
+        with self.assertRaises(ValueError):
+            ScheduledProject(Mock(), MockTestConfig(), interval_seconds=0)
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._dummy_connect = Mock()
+        self._dummy_connect.project_dir_name = "unittest-project"
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_daemon_should_raise_value_error_for_duplicate_project_names(self):
+        with self.assertRaises(ValueError):
+            Daemon([ScheduledProject(self._dummy_connect), ScheduledProject(self._dummy_connect)], self._temp_dir.name)
+
+    def test_daemon_should_size_worker_pool_to_host_by_default(self):
+        daemon = Daemon([], self._temp_dir.name)
+
+        self.assertEqual(os.cpu_count() or 1, daemon.max_workers)
+
+    @patch("todonotifier.daemon.run")
+    def test_run_project_should_run_with_warm_workspace_and_parse_cache(self, spy_run):
+        dummy_config = MockTestConfig()
+        scheduled_project = ScheduledProject(self._dummy_connect, dummy_config)
+        daemon = Daemon([scheduled_project], self._temp_dir.name)
+
+        actual_value = daemon.run_project(scheduled_project)
+
+        expected_workspace_dir = os.path.join(self._temp_dir.name, "unittest-project")
+        spy_run.assert_called_once_with(
+            self._dummy_connect, dummy_config, workspace_dir=expected_workspace_dir, parse_cache=scheduled_project.parse_cache, flush_notifier=False
+        )
+        self.assertTrue(os.path.isdir(expected_workspace_dir))
+        self.assertIs(spy_run.return_value, actual_value)
+        self.assertIs(spy_run.return_value, scheduled_project.last_result)
+
+    @patch("todonotifier.daemon.run")
+    def test_run_project_should_return_none_if_run_fails(self, stub_run):
+        stub_run.side_effect = TODOException("unittest-exception")
+        scheduled_project = ScheduledProject(self._dummy_connect, MockTestConfig())
+
+        actual_value = Daemon([scheduled_project], self._temp_dir.name).run_project(scheduled_project)
+
+        self.assertIsNone(actual_value)
+        self.assertIsNone(scheduled_project.last_result)
+
+    @patch("todonotifier.daemon.run")
+    def test_run_forever_should_run_projects_repeatedly_on_their_interval_until_stopped(self, stub_run):
+        other_connect = Mock()
+        other_connect.project_dir_name = "unittest-other-project"
+        fast_project = ScheduledProject(self._dummy_connect, MockTestConfig(), interval_seconds=0.01)
+        slow_project = ScheduledProject(other_connect, MockTestConfig(), interval_seconds=60)
+        daemon = Daemon([fast_project, slow_project], self._temp_dir.name, max_workers=2)
+        runs_done = threading.Event()
+        run_connects = []
+
+        def _run(connect, *args, **kwargs):
+            run_connects.append(connect)
+            if run_connects.count(self._dummy_connect) >= 3:
+                runs_done.set()
+
+        stub_run.side_effect = _run
+        runner = threading.Thread(target=daemon.run_forever)
+        runner.start()
+        self.assertTrue(runs_done.wait(timeout=5))
+        daemon.stop()
+        runner.join(timeout=5)
+
+        self.assertFalse(runner.is_alive())
+        self.assertGreaterEqual(run_connects.count(self._dummy_connect), 3)
+        self.assertEqual(1, run_connects.count(other_connect))
+
+    @patch("todonotifier.daemon.run")
+    def test_run_forever_should_flush_notifiers_once_stopped(self, stub_run):
+        spy_notifier = Mock(pending_count=1)
+        daemon = Daemon([ScheduledProject(self._dummy_connect, MockTestConfig(notifier=spy_notifier))], self._temp_dir.name)
+        stub_run.side_effect = lambda *args, **kwargs: daemon.stop()
+
+        daemon.run_forever()
+
+        spy_notifier.flush.assert_called_once_with()
+
+    @patch("todonotifier.daemon.run")
+    def test_run_forever_should_send_emails_queued_by_round_of_runs_without_being_stopped(self, stub_run):
+        sent_event = threading.Event()
+        spy_session = Mock()
+        spy_session.send.side_effect = lambda *args: sent_event.set()
+        email_notifier = EmailNotifier("unittest-sender-email", None, None, None, ["unittest-receiver"], session=spy_session, batch_size=5)
+        stub_run.side_effect = lambda connect, config, **kwargs: config.notifier.notify([("unittest-summary", "unittest-html")])
+        daemon = Daemon([ScheduledProject(self._dummy_connect, MockTestConfig(notifier=email_notifier), interval_seconds=60)], self._temp_dir.name)
+        runner = threading.Thread(target=daemon.run_forever)
+        runner.start()
+
+        try:
+            self.assertTrue(sent_event.wait(5))
+        finally:
+            daemon.stop()
+            runner.join(5)
+
+        spy_session.send.assert_called_once()
+        self.assertEqual(0, email_notifier.pending_count)
+
+    def test_flush_notifiers_should_flush_other_notifiers_if_one_fails(self):
+        other_connect = Mock()
+        other_connect.project_dir_name = "unittest-other-project"
+        stub_failing_notifier = Mock(pending_count=1)
+        stub_failing_notifier.flush.side_effect = Exception("unittest-exception")
+        spy_notifier = Mock(pending_count=1)
+        idle_notifier = Mock(pending_count=0)
+        daemon = Daemon(
+            [
+                ScheduledProject(self._dummy_connect, MockTestConfig(notifier=stub_failing_notifier)),
+                ScheduledProject(other_connect, MockTestConfig(notifier=spy_notifier)),
+                ScheduledProject(other_connect, MockTestConfig(notifier=idle_notifier), name="unittest-idle-project"),
+            ],
+            self._temp_dir.name,
+        )
+
+        daemon.flush_notifiers()
+
+        spy_notifier.flush.assert_called_once_with()
+        idle_notifier.flush.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,16 @@
+import os
+import subprocess
+import sys
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, call, patch
 
 from tests.mocks import MockSummaryGenerator, MockTestConfig
-from todonotifier.driver import TODOException, run
+from todonotifier.connect import ConnectMethod
+from todonotifier.constants import UNKNOWN_USER_NAME
+from todonotifier.driver import RunResult, TODOException, run
+from todonotifier.models import POSITION, TODO, USER
+from todonotifier.profiling import NULL_PROFILER
+from todonotifier.summary_generators import ByModuleSummaryGenerator
 
 
 class TestTodoException(unittest.TestCase):
@@ -11,11 +19,25 @@ class TestTodoException(unittest.TestCase):
             raise TODOException
 
 
+class TestImport(unittest.TestCase):
+    def test_import_should_not_import_heavy_dependencies_or_configure_logging(self):
+        script = (
+            "import logging, sys; import todonotifier.driver; "
+            "print(sorted(m for m in ('git', 'dateutil', 'smtplib', 'ssl', 'email.mime') if m in sys.modules)); "
+            "print(len(logging.getLogger().handlers))"
+        )
+
+        output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True).stdout.split()
+
+        self.assertEqual(["[]", "0"], output)
+
+
 class TestRun(unittest.TestCase):
+    @patch("todonotifier.driver.TodoIndex")
     @patch("todonotifier.driver.generate_summary")
     @patch("todonotifier.driver.parse_files_for_todo_items")
     @patch("todonotifier.driver.get_files_in_dir")
-    def test_run_should_generate_summary(self, stub_get_files_in_dir, stub_parse_files_for_todo_items, spy_generate_summary):
+    def test_run_should_generate_summary(self, stub_get_files_in_dir, stub_parse_files_for_todo_items, spy_generate_summary, stub_todo_index):
         dummy_all_todos_items = {"unittest-module-1": ["unittest-todo-obj-1"]}
         dummy_connect = Mock()
         dummy_connect.project_dir_name = ""
@@ -25,10 +47,34 @@ class TestRun(unittest.TestCase):
 
         run(dummy_connect, dummy_config)
 
-        spy_generate_summary.assert_called_once_with(dummy_all_todos_items, dummy_config.summary_generators, dummy_config.generate_html)
+        stub_todo_index.assert_called_once_with(dummy_all_todos_items)
+        spy_generate_summary.assert_called_once_with(
+            dummy_all_todos_items,
+            dummy_config.summary_generators,
+            dummy_config.generate_html,
+            todo_index=stub_todo_index.return_value,
+            profiler=NULL_PROFILER,
+        )
+
+    @patch("todonotifier.driver.TodoIndex")
+    @patch("todonotifier.driver.generate_summary")
+    @patch("todonotifier.driver.parse_files_for_todo_items", Mock())
+    @patch("todonotifier.driver.get_files_in_dir", Mock())
+    def test_run_should_return_run_result(self, stub_generate_summary, stub_todo_index):
+        dummy_connect = Mock()
+        dummy_connect.project_dir_name = ""
+        stub_generate_summary.return_value = ["unittest-summary-result"]
+
+        actual_value = run(dummy_connect, MockTestConfig())
+
+        self.assertIsInstance(actual_value, RunResult)
+        self.assertEqual(("unittest-summary-result",), actual_value.summaries)
+        self.assertIs(stub_todo_index.return_value, actual_value.todo_index)
+        self.assertEqual((), actual_value.stages)
 
     @patch("todonotifier.driver.store_html")
-    @patch("todonotifier.driver.generate_summary", Mock())
+    @patch("todonotifier.driver.TodoIndex", Mock())
+    @patch("todonotifier.driver.generate_summary", Mock(return_value=[]))
     @patch("todonotifier.driver.parse_files_for_todo_items", Mock())
     @patch("todonotifier.driver.get_files_in_dir", Mock())
     def test_run_should_store_summary(self, spy_store_html):
@@ -41,7 +87,8 @@ class TestRun(unittest.TestCase):
         spy_store_html.assert_called()
 
     @patch("todonotifier.driver.store_html", Mock())
-    @patch("todonotifier.driver.generate_summary", Mock())
+    @patch("todonotifier.driver.TodoIndex", Mock())
+    @patch("todonotifier.driver.generate_summary", Mock(return_value=[]))
     @patch("todonotifier.driver.parse_files_for_todo_items", Mock())
     @patch("todonotifier.driver.get_files_in_dir", Mock())
     def test_run_should_notify(self):
@@ -54,6 +101,336 @@ class TestRun(unittest.TestCase):
 
         spy_notifier.notify.assert_called()
 
+    @patch("todonotifier.driver.TodoIndex", Mock())
+    @patch("todonotifier.driver.generate_summary", Mock(return_value=[]))
+    @patch("todonotifier.driver.parse_files_for_todo_items", Mock())
+    @patch("todonotifier.driver.get_files_in_dir", Mock())
+    def test_run_should_flush_queued_notifications_unless_disabled(self):
+        dummy_connect = Mock()
+        dummy_connect.project_dir_name = ""
+        spy_notifier = Mock(pending_count=1)
+        dummy_config = MockTestConfig(notifier=spy_notifier)
+
+        run(dummy_connect, dummy_config, flush_notifier=False)
+        spy_notifier.flush.assert_not_called()
+
+        run(dummy_connect, dummy_config)
+        spy_notifier.flush.assert_called_once_with()
+
+    @patch("todonotifier.driver.store_html", Mock())
+    @patch("todonotifier.driver.TodoIndex", Mock())
+    @patch("todonotifier.driver.generate_summary", Mock(return_value=[]))
+    @patch("todonotifier.driver.parse_files_for_todo_items")
+    @patch("todonotifier.driver.get_files_in_dir", Mock())
+    def test_run_should_stream_todo_items_to_exporters_while_parsing(self, stub_parse_files_for_todo_items):
+        dummy_connect = Mock()
+        dummy_connect.project_dir_name = ""
+        dummy_todo = Mock()
+        stub_parse_files_for_todo_items.side_effect = lambda *args, on_todo, **kwargs: on_todo(dummy_todo) or {}
+        spy_exporter = Mock()
+
+        run(dummy_connect, MockTestConfig(exporters=[spy_exporter]))
+
+        self.assertEqual([call.open(), call.write(dummy_todo), call.close()], spy_exporter.method_calls)
+
+    @patch("todonotifier.driver.store_html", Mock())
+    @patch("todonotifier.driver.TodoIndex", Mock())
+    @patch("todonotifier.driver.generate_summary", Mock(return_value=[]))
+    @patch("todonotifier.driver.parse_files_for_todo_items")
+    @patch("todonotifier.driver.get_files_in_dir", Mock())
+    def test_run_should_pass_scan_options_and_report_skipped_files(self, stub_parse_files_for_todo_items):
+        dummy_connect = Mock()
+        dummy_connect.project_dir_name = ""
+        dummy_skipped_file = Mock()
+        stub_parse_files_for_todo_items.side_effect = lambda *args, on_skip, **kwargs: on_skip(dummy_skipped_file) or {}
+        config = MockTestConfig()
+
+        run_result = run(dummy_connect, config)
+
+        self.assertIs(config.scan_options, stub_parse_files_for_todo_items.call_args.kwargs["scan_options"])
+        self.assertEqual((dummy_skipped_file,), run_result.skipped_files)
+
+    @patch("todonotifier.driver.store_html", Mock())
+    @patch("todonotifier.driver.TodoIndex", Mock())
+    @patch("todonotifier.driver.generate_summary", Mock(return_value=[]))
+    @patch("todonotifier.driver.parse_files_for_todo_items")
+    @patch("todonotifier.driver.get_files_in_dir", Mock())
+    def test_run_should_attach_parse_diagnostics_to_run_result(self, stub_parse_files_for_todo_items):
+        dummy_connect = Mock()
+        dummy_connect.project_dir_name = ""
+        stub_parse_files_for_todo_items.side_effect = lambda *args, diagnostics, **kwargs: diagnostics.record(ValueError(), "unittest-module.py", 1) or {}
+
+        run_result = run(dummy_connect, MockTestConfig())
+
+        self.assertEqual({"ValueError": 1}, run_result.diagnostics.counts)
+        self.assertEqual([("ValueError", "unittest-module.py", 1)], run_result.diagnostics.samples)
+
+    @patch("todonotifier.driver.store_html", Mock())
+    @patch("todonotifier.driver.TodoIndex")
+    @patch("todonotifier.driver.generate_summary", Mock(return_value=[]))
+    @patch("todonotifier.driver.parse_files_for_todo_items", Mock())
+    @patch("todonotifier.driver.get_files_in_dir", Mock())
+    def test_run_should_record_run_into_history_store_if_set(self, stub_todo_index):
+        dummy_connect = Mock()
+        dummy_connect.project_dir_name = "unittest-project"
+        spy_history_store = Mock()
+
+        run(dummy_connect, MockTestConfig(history_store=spy_history_store))
+
+        spy_history_store.record_run.assert_called_once_with(stub_todo_index.return_value, "unittest-project")
+
+    @patch("todonotifier.driver.store_html", Mock())
+    @patch("todonotifier.driver.TodoIndex", Mock())
+    @patch("todonotifier.driver.generate_summary", Mock(return_value=[]))
+    @patch("todonotifier.driver.parse_files_for_todo_items")
+    @patch("todonotifier.driver.get_files_in_dir", Mock())
+    def test_run_should_attribute_todo_items_only_for_git_clone(self, stub_parse_files_for_todo_items):
+        dummy_connect = Mock()
+        dummy_connect.project_dir_name = "unittest-project"
+        spy_attributor = Mock()
+        dummy_config = MockTestConfig(attributor=spy_attributor)
+
+        dummy_connect.connect_method = ConnectMethod.DRY_RUN_DIR
+        run(dummy_connect, dummy_config)
+        spy_attributor.attribute.assert_not_called()
+
+        dummy_connect.connect_method = ConnectMethod.GIT_CLONE
+        run(dummy_connect, dummy_config)
+        repo_dir, project_parent_dir, all_todos_items = spy_attributor.attribute.call_args.args
+        self.assertEqual((os.path.join(project_parent_dir, "unittest-project"), stub_parse_files_for_todo_items.return_value), (repo_dir, all_todos_items))
+
+    @patch("todonotifier.driver.store_html", Mock())
+    @patch("todonotifier.driver.TodoIndex", Mock())
+    @patch("todonotifier.driver.generate_summary", Mock(return_value=[]))
+    @patch("todonotifier.driver.parse_files_for_todo_items")
+    @patch("todonotifier.driver.get_files_in_dir", Mock())
+    def test_run_should_export_todo_items_after_attribution(self, stub_parse_files_for_todo_items):
+        dummy_connect = Mock()
+        dummy_connect.project_dir_name = "unittest-project"
+        dummy_connect.connect_method = ConnectMethod.GIT_CLONE
+        unattributed_todo = TODO("unittest-msg", USER(UNKNOWN_USER_NAME), "", "unittest-module.py", POSITION(1))
+        stub_parse_files_for_todo_items.side_effect = lambda *args, on_todo=None, **kwargs: {"unittest-module.py": [unattributed_todo]}
+
+        def _attribute(repo_dir, project_parent_dir, all_todos_items):
+            all_todos_items["unittest-module.py"][0] = TODO("unittest-msg", USER("unittest-author"), "", "unittest-module.py", POSITION(1))
+
+        stub_attributor = Mock()
+        stub_attributor.attribute.side_effect = _attribute
+        spy_exporter = Mock()
+
+        run(dummy_connect, MockTestConfig(attributor=stub_attributor, exporters=[spy_exporter]))
+
+        self.assertNotIn("on_todo", stub_parse_files_for_todo_items.call_args.kwargs)
+        self.assertEqual(["unittest-author"], [todo_obj.user.user_name for todo_obj in spy_exporter.export.call_args.args[0]])
+
+    @patch("todonotifier.driver.store_html", Mock())
+    @patch("todonotifier.driver.TodoIndex", Mock())
+    @patch("todonotifier.driver.generate_summary", Mock(return_value=[]))
+    @patch("todonotifier.driver.parse_files_for_todo_items")
+    @patch("todonotifier.driver.get_files_in_dir", Mock())
+    def test_run_should_export_todo_items_after_annotating_introduction(self, stub_parse_files_for_todo_items):
+        dummy_connect = Mock()
+        dummy_connect.project_dir_name = "unittest-project"
+        dummy_connect.connect_method = ConnectMethod.GIT_CLONE
+        dummy_introduction = Mock()
+        stub_parse_files_for_todo_items.side_effect = lambda *args, **kwargs: {
+            "unittest-module.py": [TODO("unittest-msg", USER("unittest-user"), "", "unittest-module.py", POSITION(1))]
+        }
+
+        def _annotate(repo_dir, project_parent_dir, all_todos_items, ignore_todo_case):
+            all_todos_items["unittest-module.py"][0] = TODO("unittest-msg", USER("unittest-user"), "", "unittest-module.py", POSITION(1), dummy_introduction)
+
+        stub_age_tracker = Mock()
+        stub_age_tracker.annotate.side_effect = _annotate
+        spy_exporter = Mock()
+
+        run(dummy_connect, MockTestConfig(age_tracker=stub_age_tracker, exporters=[spy_exporter]))
+
+        self.assertEqual([dummy_introduction], [todo_obj.introduction for todo_obj in spy_exporter.export.call_args.args[0]])
+
+    @patch("todonotifier.driver.store_html", Mock())
+    @patch("todonotifier.driver.TodoIndex", Mock())
+    @patch("todonotifier.driver.generate_summary", Mock(return_value=[]))
+    @patch("todonotifier.driver.parse_files_for_todo_items")
+    @patch("todonotifier.driver.get_files_in_dir", Mock())
+    def test_run_should_annotate_todo_items_with_introduction_only_for_git_clone(self, stub_parse_files_for_todo_items):
+        dummy_connect = Mock()
+        dummy_connect.project_dir_name = "unittest-project"
+        spy_age_tracker = Mock()
+        dummy_config = MockTestConfig(ignore_todo_case=True, age_tracker=spy_age_tracker)
+
+        dummy_connect.connect_method = ConnectMethod.DRY_RUN_DIR
+        run(dummy_connect, dummy_config)
+        spy_age_tracker.annotate.assert_not_called()
+
+        dummy_connect.connect_method = ConnectMethod.GIT_CLONE
+        run(dummy_connect, dummy_config)
+        repo_dir, project_parent_dir, all_todos_items, ignore_todo_case = spy_age_tracker.annotate.call_args.args
+        self.assertEqual(
+            (os.path.join(project_parent_dir, "unittest-project"), stub_parse_files_for_todo_items.return_value, True),
+            (repo_dir, all_todos_items, ignore_todo_case),
+        )
+
+    @patch("todonotifier.driver.TodoIndex", Mock())
+    @patch("todonotifier.driver.generate_summary", Mock(return_value=[]))
+    @patch("todonotifier.driver.parse_files_for_todo_items")
+    @patch("todonotifier.driver.get_files_in_dir", Mock())
+    def test_run_should_abort_exporters_if_parsing_fails(self, stub_parse_files_for_todo_items):
+        dummy_connect = Mock()
+        dummy_connect.project_dir_name = ""
+        stub_parse_files_for_todo_items.side_effect = Exception("unittest-exception")
+        spy_exporter = Mock()
+
+        with self.assertRaises(TODOException):
+            run(dummy_connect, MockTestConfig(exporters=[spy_exporter]))
+
+        self.assertEqual([call.open(), call.abort()], spy_exporter.method_calls)
+
+    @patch("todonotifier.driver.store_html", Mock())
+    @patch("todonotifier.driver.TodoIndex")
+    @patch("todonotifier.driver.generate_summary", Mock(return_value=[]))
+    @patch("todonotifier.driver.parse_files_for_todo_items", Mock())
+    @patch("todonotifier.driver.get_files_in_dir", Mock())
+    def test_run_should_bind_todo_index_to_notifier(self, stub_todo_index):
+        dummy_connect = Mock()
+        dummy_connect.project_dir_name = ""
+        spy_notifier = Mock()
+        dummy_config = MockTestConfig(notifier=spy_notifier)
+
+        run(dummy_connect, dummy_config)
+
+        self.assertEqual(stub_todo_index.return_value, spy_notifier.todo_index)
+
+    @patch("todonotifier.driver.store_html")
+    @patch("todonotifier.driver.TodoIndex", Mock())
+    @patch("todonotifier.driver.generate_summary")
+    @patch("todonotifier.driver.parse_files_for_todo_items", Mock())
+    @patch("todonotifier.driver.get_files_in_dir", Mock())
+    def test_run_should_stream_html_reports_if_set(self, spy_generate_summary, spy_store_html):
+        dummy_connect = Mock()
+        dummy_connect.project_dir_name = ""
+        stub_summary_generator = Mock()
+        stub_summary_generator.name = "unittest-summary-generator"
+        spy_notifier = Mock()
+        dummy_config = MockTestConfig(summary_generators=[stub_summary_generator], notifier=spy_notifier, stream_html_reports=True)
+
+        run(dummy_connect, dummy_config)
+
+        self.assertFalse(spy_generate_summary.call_args.args[2])
+        spy_store_html.assert_called_once_with(stub_summary_generator.iter_html.return_value, "unittest-summary-generator", target_dir=None)
+        spy_notifier.notify.assert_called_once_with([("unittest-summary-generator", stub_summary_generator.iter_html.return_value)])
+
+    @patch("todonotifier.driver.store_html")
+    @patch("todonotifier.driver.store_sharded_html")
+    @patch("todonotifier.driver.TodoIndex", Mock())
+    @patch("todonotifier.driver.generate_summary", Mock(return_value=[]))
+    @patch("todonotifier.driver.parse_files_for_todo_items", Mock())
+    @patch("todonotifier.driver.get_files_in_dir", Mock())
+    def test_run_should_store_sharded_report_if_shard_is_set(self, spy_store_sharded_html, spy_store_html):
+        dummy_connect = Mock()
+        dummy_connect.project_dir_name = ""
+        dummy_summary_generator = ByModuleSummaryGenerator(shard=True)
+        dummy_config = MockTestConfig(summary_generators=[dummy_summary_generator], max_workers=2)
+
+        run(dummy_connect, dummy_config)
+
+        spy_store_sharded_html.assert_called_once_with(dummy_summary_generator, dummy_summary_generator.name, target_dir=None, max_workers=2)
+        spy_store_html.assert_not_called()
+
+    @patch("todonotifier.driver.get_report_dir")
+    @patch("todonotifier.driver.StageProfiler")
+    @patch("todonotifier.driver.TodoIndex", Mock())
+    @patch("todonotifier.driver.generate_summary")
+    @patch("todonotifier.driver.parse_files_for_todo_items", Mock())
+    @patch("todonotifier.driver.get_files_in_dir", Mock())
+    def test_run_should_profile_stages_and_dump_profile_if_profile_is_set(self, spy_generate_summary, stub_stage_profiler, stub_get_report_dir):
+        dummy_connect = Mock()
+        dummy_connect.project_dir_name = ""
+        spy_profiler = stub_stage_profiler.return_value
+        spy_profiler.enabled = True
+
+        run(dummy_connect, MockTestConfig(notifier=Mock()), profile=True)
+
+        stage_names = [call.args[0] for call in spy_profiler.stage.call_args_list]
+        self.assertEqual(["copy", "walk", "parse", "index", "store", "notify"], stage_names)
+        self.assertIs(spy_profiler, spy_generate_summary.call_args.kwargs["profiler"])
+        spy_profiler.dump.assert_called_once_with(stub_get_report_dir.return_value)
+
+    @patch("todonotifier.driver.StageProfiler")
+    @patch("todonotifier.driver.TodoIndex", Mock())
+    @patch("todonotifier.driver.generate_summary", Mock(return_value=[]))
+    @patch("todonotifier.driver.parse_files_for_todo_items", Mock())
+    @patch("todonotifier.driver.get_files_in_dir", Mock())
+    def test_run_should_not_profile_if_profile_is_overridden(self, spy_stage_profiler):
+        dummy_connect = Mock()
+        dummy_connect.project_dir_name = ""
+
+        run(dummy_connect, MockTestConfig(profile=True), profile=False)
+
+        spy_stage_profiler.assert_not_called()
+
+    @patch("todonotifier.driver.StageProfiler")
+    @patch("todonotifier.driver.TodoIndex", Mock())
+    @patch("todonotifier.driver.generate_summary", Mock(return_value=[]))
+    @patch("todonotifier.driver.parse_files_for_todo_items", Mock())
+    @patch("todonotifier.driver.get_files_in_dir", Mock())
+    @patch("todonotifier.driver.get_report_dir", Mock())
+    def test_run_should_track_memory_without_cprofile_if_only_track_memory_is_set(self, spy_stage_profiler):
+        dummy_connect = Mock()
+        dummy_connect.project_dir_name = ""
+
+        run(dummy_connect, MockTestConfig(track_memory=True))
+
+        spy_stage_profiler.assert_called_once_with(use_cprofile=False, track_memory=True)
+
+    @patch("todonotifier.profiling.get_rss_bytes", Mock(return_value=2048))
+    @patch("todonotifier.driver.generate_summary")
+    @patch("todonotifier.driver.parse_files_for_todo_items")
+    @patch("todonotifier.driver.get_files_in_dir", Mock())
+    def test_run_should_abort_with_todo_exception_if_memory_budget_exceeded(self, spy_parse_files_for_todo_items, spy_generate_summary):
+        dummy_connect = Mock()
+        dummy_connect.project_dir_name = ""
+
+        with self.assertRaisesRegex(TODOException, "Memory budget"):
+            run(dummy_connect, MockTestConfig(memory_budget=1024))
+
+        spy_parse_files_for_todo_items.assert_not_called()
+        spy_generate_summary.assert_not_called()
+
+    @patch("todonotifier.profiling.get_rss_bytes", Mock(return_value=2048))
+    @patch("todonotifier.driver.store_html")
+    @patch("todonotifier.driver.TodoIndex", Mock())
+    @patch("todonotifier.driver.generate_summary")
+    @patch("todonotifier.driver.parse_files_for_todo_items", Mock())
+    @patch("todonotifier.driver.get_files_in_dir", Mock())
+    def test_run_should_stream_html_reports_if_memory_budget_exceeded_with_degrade(self, spy_generate_summary, spy_store_html):
+        dummy_connect = Mock()
+        dummy_connect.project_dir_name = ""
+        stub_summary_generator = Mock()
+        stub_summary_generator.name = "unittest-summary-generator"
+        dummy_config = MockTestConfig(summary_generators=[stub_summary_generator], memory_budget=1024, memory_budget_action="degrade")
+
+        run(dummy_connect, dummy_config)
+
+        self.assertFalse(spy_generate_summary.call_args.args[2])
+        spy_store_html.assert_called_once_with(stub_summary_generator.iter_html.return_value, "unittest-summary-generator", target_dir=None)
+
+    @patch("todonotifier.driver.TodoIndex", Mock())
+    @patch("todonotifier.driver.generate_summary", Mock(return_value=[]))
+    @patch("todonotifier.driver.parse_files_for_todo_items")
+    @patch("todonotifier.driver.get_files_in_dir", Mock())
+    def test_run_should_update_repository_in_workspace_dir_if_passed(self, spy_parse_files_for_todo_items):
+        spy_connect = Mock()
+        spy_connect.project_dir_name = "unittest-project"
+        dummy_parse_cache = Mock()
+
+        run(spy_connect, MockTestConfig(), workspace_dir="unittest-workspace-dir", parse_cache=dummy_parse_cache)
+
+        spy_connect.update_repository.assert_called_once_with(target_dir=os.path.join("unittest-workspace-dir", "unittest-project"))
+        spy_connect.pull_repository.assert_not_called()
+        self.assertEqual("unittest-workspace-dir", spy_parse_files_for_todo_items.call_args.args[0])
+        self.assertIs(dummy_parse_cache, spy_parse_files_for_todo_items.call_args.kwargs["parse_cache"])
+
     def test_run_should_raise_todo_exception_if_any_exception_in_connect(self):
         stub_connect = Mock()
         stub_connect.project_dir_name = ""
@@ -81,6 +458,7 @@ class TestRun(unittest.TestCase):
         with self.assertRaises(TODOException):
             run(dummy_connect, MockTestConfig())
 
+    @patch("todonotifier.driver.TodoIndex", Mock())
     @patch("todonotifier.driver.generate_summary")
     @patch("todonotifier.driver.parse_files_for_todo_items", Mock())
     @patch("todonotifier.driver.get_files_in_dir", Mock())
@@ -0,0 +1,122 @@
+import csv
+import json
+import os
+import sqlite3
+import unittest
+from datetime import datetime
+from tempfile import TemporaryDirectory
+
+from todonotifier.exporters import (
+    RECORD_FIELDS,
+    CSVExporter,
+    JSONLinesExporter,
+    SQLiteExporter,
+    todo_to_record,
+)
+from todonotifier.models import INTRODUCTION, POSITION, TODO, USER
+
+
+def _todos(n: int):
+    return [TODO(f"unittest-msg-{i}", USER(f"unittest-user-{i % 3}"), "2024-06-15", f"unittest-module-{i % 2}", POSITION(i + 1)) for i in range(n)]
+
+
+class TestTodoToRecord(unittest.TestCase):
+    def test_todo_to_record_should_return_record_of_todo(self):
+        self.assertEqual(
+            {
+                "module": "unittest-module-0",
+                "line_no": 1,
+                "user_name": "unittest-user-0",
+                "msg": "unittest-msg-0",
+                "completion_date": "2024-06-15",
+                "introduction_sha": None,
+                "introduced_at": None,
+            },
+            todo_to_record(_todos(1)[0]),
+        )
+
+    def test_todo_to_record_should_include_introduction_if_known(self):
+        todo_obj = TODO("unittest-msg", USER("unittest-user"), "", "unittest-module", POSITION(1), INTRODUCTION("unittest-sha", datetime(2024, 6, 1, 12)))
+
+        record = todo_to_record(todo_obj)
+
+        self.assertEqual(("unittest-sha", "2024-06-01T12:00:00"), (record["introduction_sha"], record["introduced_at"]))
+
+
+class TestJSONLinesExporter(unittest.TestCase):
+    def test_export_should_write_one_json_object_per_line(self):
+        with TemporaryDirectory() as tmpdir:
+            exporter = JSONLinesExporter(target_dir=tmpdir)
+
+            exporter.export(_todos(3))
+
+            with open(os.path.join(tmpdir, "todos.jsonl")) as f:
+                records = [json.loads(line) for line in f]
+            self.assertEqual([todo_to_record(todo_obj) for todo_obj in _todos(3)], records)
+            self.assertEqual(["todos.jsonl"], os.listdir(tmpdir))
+
+    def test_abort_should_keep_previous_export(self):
+        with TemporaryDirectory() as tmpdir:
+            exporter = JSONLinesExporter(target_dir=tmpdir)
+            exporter.export(_todos(2))
+
+            exporter.open()
+            exporter.write(_todos(1)[0])
+            exporter.abort()
+
+            with open(os.path.join(tmpdir, "todos.jsonl")) as f:
+                self.assertEqual(2, len(f.readlines()))
+            self.assertEqual(["todos.jsonl"], os.listdir(tmpdir))
+
+
+class TestCSVExporter(unittest.TestCase):
+    def test_export_should_write_header_and_one_row_per_todo(self):
+        with TemporaryDirectory() as tmpdir:
+            exporter = CSVExporter("unittest.csv", target_dir=tmpdir)
+
+            exporter.export(_todos(3))
+
+            with open(os.path.join(tmpdir, "unittest.csv"), newline="") as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual([{k: "" if v is None else str(v) for k, v in todo_to_record(todo_obj).items()} for todo_obj in _todos(3)], rows)
+
+
+class TestSQLiteExporter(unittest.TestCase):
+    def test_init_should_raise_value_error_if_table_name_is_invalid(self):
+        with self.assertRaises(ValueError):
+            SQLiteExporter(table_name="todos; DROP TABLE todos")
+
+    def test_export_should_replace_rows_of_table_in_batches(self):
+        with TemporaryDirectory() as tmpdir:
+            exporter = SQLiteExporter(target_dir=tmpdir, batch_size=4)
+            exporter.export(_todos(20))
+
+            exporter.export(_todos(10))
+
+            with sqlite3.connect(os.path.join(tmpdir, "todos.sqlite3")) as connection:
+                rows = connection.execute(f"SELECT {', '.join(RECORD_FIELDS)} FROM todos ORDER BY line_no").fetchall()
+            self.assertEqual([tuple(todo_to_record(todo_obj).values()) for todo_obj in _todos(10)], rows)
+
+    def test_abort_should_roll_back_to_previous_rows(self):
+        with TemporaryDirectory() as tmpdir:
+            exporter = SQLiteExporter(target_dir=tmpdir, batch_size=2)
+            exporter.export(_todos(3))
+
+            exporter.open()
+            for todo_obj in _todos(5):
+                exporter.write(todo_obj)
+            exporter.abort()
+
+            with sqlite3.connect(os.path.join(tmpdir, "todos.sqlite3")) as connection:
+                self.assertEqual(3, connection.execute("SELECT COUNT(*) FROM todos").fetchone()[0])
+
+    def test_export_should_store_introduction_of_todo(self):
+        with TemporaryDirectory() as tmpdir:
+            todo_obj = TODO("unittest-msg", USER("unittest-user"), "", "unittest-module", POSITION(1), INTRODUCTION("unittest-sha", datetime(2024, 6, 1)))
+
+            SQLiteExporter(target_dir=tmpdir).export([todo_obj])
+
+            with sqlite3.connect(os.path.join(tmpdir, "todos.sqlite3")) as connection:
+                row = connection.execute("SELECT introduction_sha, introduced_at FROM todos").fetchone()
+            connection.close()
+            self.assertEqual(("unittest-sha", "2024-06-01T00:00:00"), row)
@@ -0,0 +1,134 @@
+import os
+import sqlite3
+import unittest
+from datetime import date, datetime
+from tempfile import TemporaryDirectory
+
+from todonotifier.history import HistoryStore
+from todonotifier.models import POSITION, TODO, USER
+from todonotifier.todo_index import TodoIndex
+
+
+def _todo_index(*todos):
+    all_todos_objs = {}
+    for msg, user_name, module, completion_date in todos:
+        all_todos_objs.setdefault(module, []).append(TODO(msg, USER(user_name), completion_date, module, POSITION(len(all_todos_objs.get(module, [])) + 1)))
+    return TodoIndex(all_todos_objs)
+
+
+class TestHistoryStore(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()
+        self._history_store = HistoryStore(os.path.join(self._temp_dir.name, "unittest-dir", "history.sqlite3"))
+        self._todo_index_1 = _todo_index(
+            ("unittest-msg-1", "alice", "unittest-module-1", "2024-01-10"),
+            ("unittest-msg-2", "bob", "unittest-module-1", "2024-01-20"),
+            ("unittest-msg-3", "alice", "unittest-module-2", "2024-02-01"),
+        )
+        self._todo_index_2 = _todo_index(
+            ("unittest-msg-1", "alice", "unittest-module-1", "2024-01-15"),
+            ("unittest-msg-3", "alice", "unittest-module-2", "2024-02-01"),
+            ("unittest-msg-4", "carol", "unittest-module-3", "2024-03-01"),
+        )
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_record_run_should_record_runs(self):
+        run_id_1 = self._history_store.record_run(self._todo_index_1, "unittest-project", datetime(2024, 1, 1))
+        run_id_2 = self._history_store.record_run(self._todo_index_2, "unittest-project", datetime(2024, 1, 2))
+        self._history_store.record_run(self._todo_index_2, "unittest-other-project", datetime(2024, 1, 2))
+
+        self.assertEqual(
+            [(run_id_1, "unittest-project", datetime(2024, 1, 1), 3), (run_id_2, "unittest-project", datetime(2024, 1, 2), 3)],
+            self._history_store.runs("unittest-project"),
+        )
+        self.assertEqual(3, len(self._history_store.runs()))
+
+    def test_record_run_should_store_every_todo_item_and_name_once(self):
+        self._history_store.record_run(self._todo_index_1, "unittest-project", datetime(2024, 1, 1))
+        self._history_store.record_run(self._todo_index_2, "unittest-project", datetime(2024, 1, 2))
+
+        with sqlite3.connect(self._history_store.db_file) as connection:
+            self.assertEqual(4, connection.execute("SELECT COUNT(*) FROM todos").fetchone()[0])
+            self.assertEqual(3, connection.execute("SELECT COUNT(*) FROM users").fetchone()[0])
+            self.assertEqual(3, connection.execute("SELECT COUNT(*) FROM modules").fetchone()[0])
+            self.assertEqual(6, connection.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0])
+
+    def test_run_todo_ids_should_return_todo_items_of_run_with_completion_date(self):
+        run_id_1 = self._history_store.record_run(self._todo_index_1, "unittest-project", datetime(2024, 1, 1))
+        run_id_2 = self._history_store.record_run(self._todo_index_2, "unittest-project", datetime(2024, 1, 2))
+
+        run_todo_ids_1 = self._history_store.run_todo_ids(run_id_1)
+        run_todo_ids_2 = self._history_store.run_todo_ids(run_id_2)
+
+        self.assertEqual(2, len(set(run_todo_ids_1) & set(run_todo_ids_2)))
+        self.assertIn(date(2024, 1, 15), run_todo_ids_2.values())
+        details = self._history_store.todo_details(run_todo_ids_2)
+        self.assertEqual({("unittest-module-1", "alice"), ("unittest-module-2", "alice"), ("unittest-module-3", "carol")}, set(details.values()))
+
+    def test_record_run_should_store_reassigned_todo_item_with_its_new_user(self):
+        self._history_store.record_run(_todo_index(("unittest-msg", "alice", "unittest-module", "2024-01-10")), "unittest-project", datetime(2024, 1, 1))
+        run_id = self._history_store.record_run(_todo_index(("unittest-msg", "bob", "unittest-module", "2024-01-10")), "unittest-project", datetime(2024, 1, 2))
+
+        details = self._history_store.todo_details(self._history_store.run_todo_ids(run_id))
+
+        self.assertEqual([("unittest-module", "bob")], list(details.values()))
+
+    def test_counts_over_time_should_count_todo_items_per_group_in_every_run(self):
+        self._history_store.record_run(self._todo_index_1, "unittest-project", datetime(2024, 1, 1))
+        self._history_store.record_run(self._todo_index_2, "unittest-project", datetime(2024, 1, 2))
+
+        counts = self._history_store.counts_over_time("user", "unittest-project")
+
+        self.assertEqual(
+            {(datetime(2024, 1, 1), "alice", 2), (datetime(2024, 1, 1), "bob", 1), (datetime(2024, 1, 2), "alice", 2), (datetime(2024, 1, 2), "carol", 1)},
+            set(counts),
+        )
+        self.assertEqual(5, len(self._history_store.counts_over_time("module")))
+
+    def test_counts_over_time_should_raise_value_error_if_group_by_is_invalid(self):
+        with self.assertRaises(ValueError):
+            self._history_store.counts_over_time("unittest-group-by")
+
+    def test_record_run_should_handle_more_todo_items_than_query_params(self):
+        todo_index = _todo_index(*[(f"unittest-msg-{i}", f"user-{i % 7}", f"unittest-module-{i % 1500}", "2024-01-10") for i in range(2500)])
+
+        run_id = self._history_store.record_run(todo_index, "unittest-project")
+
+        self.assertEqual(2500, len(self._history_store.run_todo_ids(run_id)))
+
+    def test_update_burndown_should_count_opened_closed_and_expired_todo_items_per_week(self):
+        self._history_store.record_run(self._todo_index_1, "unittest-project", datetime(2024, 1, 9))
+        self._history_store.record_run(self._todo_index_2, "unittest-project", datetime(2024, 1, 16))
+
+        self.assertEqual(2, self._history_store.update_burndown("unittest-project"))
+
+        self.assertEqual(
+            [
+                (date(2024, 1, 8), "alice", 2, 0, 0),
+                (date(2024, 1, 8), "bob", 1, 0, 0),
+                (date(2024, 1, 15), "alice", 0, 0, 1),
+                (date(2024, 1, 15), "bob", 0, 1, 0),
+                (date(2024, 1, 15), "carol", 1, 0, 0),
+            ],
+            self._history_store.burndown("unittest-project", "user"),
+        )
+        self.assertEqual(2, len(self._history_store.burndown("unittest-project", "module", since=date(2024, 1, 17))))
+
+    def test_update_burndown_should_only_count_runs_recorded_since_last_update(self):
+        self._history_store.record_run(self._todo_index_1, "unittest-project", datetime(2024, 1, 9))
+        self._history_store.update_burndown("unittest-project")
+
+        self.assertEqual(0, self._history_store.update_burndown("unittest-project"))
+
+        self._history_store.record_run(self._todo_index_2, "unittest-project", datetime(2024, 1, 10))
+        self.assertEqual(1, self._history_store.update_burndown("unittest-project"))
+        self.assertEqual(
+            [(date(2024, 1, 8), "alice", 2, 0, 0), (date(2024, 1, 8), "bob", 1, 1, 0), (date(2024, 1, 8), "carol", 1, 0, 0)],
+            self._history_store.burndown("unittest-project", "user"),
+        )
+
+    def test_burndown_should_raise_value_error_if_group_by_is_invalid(self):
+        with self.assertRaises(ValueError):
+            self._history_store.burndown("unittest-project", "unittest-group-by")
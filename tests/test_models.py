@@ -1,9 +1,16 @@
 import unittest
+from datetime import datetime
 
 from dateutil import parser
 
 from todonotifier.constants import DEFAULT_COMPLETION_DATE
-from todonotifier.models import POSITION, TODO, USER
+from todonotifier.models import (
+    INTRODUCTION,
+    POSITION,
+    TODO,
+    USER,
+    parse_completion_date,
+)
 
 
 class TestUser(unittest.TestCase):
@@ -32,6 +39,20 @@ class TestPosition(unittest.TestCase):
         self.assertEqual(expected_value, str(self._position))
 
 
+class TestIntroduction(unittest.TestCase):
+    def setUp(self):
+        self._dummy_commit_sha = "unittest-dummy-commit-sha"
+        self._dummy_introduced_at = datetime(2022, 9, 22, 10, 30)
+        self._introduction = INTRODUCTION(self._dummy_commit_sha, self._dummy_introduced_at)
+
+    def test_commit_sha_and_introduced_at_should_return_correct_values(self):
+        self.assertEqual((self._dummy_commit_sha, self._dummy_introduced_at), (self._introduction.commit_sha, self._introduction.introduced_at))
+
+    def test___str__(self):
+        expected_value = f"Introduction: {repr(self._introduction)} commit_sha: {self._dummy_commit_sha} introduced_at: {self._dummy_introduced_at}"
+        self.assertEqual(expected_value, str(self._introduction))
+
+
 class TestTodo(unittest.TestCase):
     def setUp(self):
         self._dummy_msg = "unittest-dummy-msg"
@@ -65,10 +86,26 @@ class TestTodo(unittest.TestCase):
     def test_position_should_return_correct_position(self):
         self.assertAlmostEqual(self._dummy_position, self._todo.position)
 
+    def test_introduction_should_default_to_none(self):
+        self.assertIsNone(self._todo.introduction)
+
     def test___str__(self):
         expected_value = f"""TODO: {repr(self._todo)} msg: {self._todo.msg} user: {str(self._todo.user)} completion date: {self._todo.completion_date} module: {self._todo.module} position: {str(self._todo.position)}"""  # noqa
         self.assertEqual(expected_value, str(self._todo))
 
 
+class TestParseCompletionDate(unittest.TestCase):
+    def test_parse_completion_date_should_parse_iso_date(self):
+        self.assertEqual(parser.parse("2022-05-03").date(), parse_completion_date("2022-05-03"))
+
+    def test_parse_completion_date_should_fall_back_to_dateutil_for_other_formats(self):
+        for completion_date_str in ["05-03", "2022/05/03", "3 May 2022"]:
+            self.assertEqual(parser.parse(completion_date_str).date(), parse_completion_date(completion_date_str))
+
+    def test_parse_completion_date_should_return_default_completion_date_for_invalid_dates(self):
+        for completion_date_str in ["", "2022-13-01", "2022-13", "random-message"]:
+            self.assertEqual(parser.parse(DEFAULT_COMPLETION_DATE).date(), parse_completion_date(completion_date_str))
+
+
 if __name__ == "__main__":
     unittest.main()
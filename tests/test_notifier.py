@@ -1,10 +1,24 @@
+import gzip
+import io
+import time
 import unittest
+import zipfile
+from datetime import date, timedelta
+from email import message_from_string
 from typing import List
 from unittest.mock import MagicMock, Mock, patch
 
-from tests.mocks import FakeContextManager
-from todonotifier.notifier import BaseNotifier, EmailNotifier
+from tests.mocks import FakeContextManager, FakeSMTPServer
+from todonotifier.models import POSITION, TODO, USER
+from todonotifier.notifier import (
+    BaseNotifier,
+    EmailNotifier,
+    PerUserEmailNotifier,
+    RateLimiter,
+    SMTPSession,
+)
 from todonotifier.summary_generators import BaseSummaryGenerator
+from todonotifier.todo_index import TodoIndex
 
 
 class MockBaseNotifier(BaseNotifier):
@@ -47,20 +61,27 @@ class TestBaseNotifier(unittest.TestCase):
         )
         self.assertEqual(expected_value, actual_value)
 
+    def test__aggregate_all_summaries_should_aggregate_summaries_passed_in_chunks(self):
+        base_notifier = MockBaseNotifier()
+        expected_value = base_notifier._aggregate_all_summaries([("mock-summary-generator-1", "unittest-html-1")])
+
+        actual_value = base_notifier._aggregate_all_summaries([("mock-summary-generator-1", iter(["unittest-", "html-1"]))])
+
+        self.assertEqual(expected_value, actual_value)
+
 
 class TestEmailNotifier(unittest.TestCase):
-    @patch("todonotifier.notifier.smtplib")
-    @patch("todonotifier.notifier.ssl", Mock())
-    @patch("todonotifier.notifier.MIMEText", Mock())
+    @patch("smtplib.SMTP_SSL", FakeContextManager)
+    @patch("ssl.create_default_context", Mock())
+    @patch("email.mime.text.MIMEText", Mock())
     @patch("todonotifier.notifier.datetime", Mock())
-    @patch("todonotifier.notifier.MIMEMultipart")
+    @patch("email.mime.multipart.MIMEMultipart")
     @patch("todonotifier.notifier.EmailNotifier._aggregate_all_summaries", Mock())
-    def test_notify_should_notify(self, stub_mime_multipart, stub_smtplib):
+    def test_notify_should_notify(self, stub_mime_multipart):
         dummy_sender_email = "unittest-sender-email"
         dummy_password = "unittest-password"
         dummy_receivers = ["unittest-receiver-1", "unittest-receiver-2"]
         spy_server = Mock()
-        stub_smtplib.SMTP_SSL = FakeContextManager
         FakeContextManager.return_value = spy_server
         stub_mime_multipart.return_value = MagicMock()
 
@@ -69,3 +90,281 @@ class TestEmailNotifier(unittest.TestCase):
 
         spy_server.login.assert_called_once_with(dummy_sender_email, dummy_password)
         spy_server.sendmail.assert_called_once_with(dummy_sender_email, dummy_receivers, stub_mime_multipart.return_value.as_string.return_value)
+
+    def test_notify_should_reuse_session_connection_across_notify_calls(self):
+        with FakeSMTPServer() as fake_smtp_server:
+            session = SMTPSession(fake_smtp_server.host, fake_smtp_server.port, "unittest-sender-email", "unittest-password", use_ssl=False)
+            email_notifier_1 = EmailNotifier("unittest-sender-email", None, None, None, ["unittest-receiver-1"], session=session)
+            email_notifier_2 = EmailNotifier("unittest-sender-email", None, None, None, ["unittest-receiver-2"], session=session)
+
+            email_notifier_1.notify([("unittest-summary", "unittest-html-1")])
+            email_notifier_2.notify([("unittest-summary", "unittest-html-2")])
+            email_notifier_1.notify([("unittest-summary", "unittest-html-3")])
+            session.close()
+
+        self.assertEqual(1, fake_smtp_server.num_connections)
+        self.assertEqual(1, session.num_connections)
+        self.assertEqual([["unittest-receiver-1"], ["unittest-receiver-2"], ["unittest-receiver-1"]], [rcpt_to for _, rcpt_to, _ in fake_smtp_server.messages])
+        self.assertIn("unittest-html-2", fake_smtp_server.messages[1][2])
+
+    def test_notify_should_queue_emails_until_batch_size_is_reached(self):
+        with FakeSMTPServer() as fake_smtp_server:
+            session = SMTPSession(fake_smtp_server.host, fake_smtp_server.port, use_ssl=False)
+            email_notifier = EmailNotifier("unittest-sender-email", None, None, None, ["unittest-receiver"], session=session, batch_size=3)
+
+            email_notifier.notify([("unittest-summary", "unittest-html")])
+            email_notifier.notify([("unittest-summary", "unittest-html")])
+            self.assertEqual(0, len(fake_smtp_server.messages))
+            self.assertFalse(session.connected)
+
+            email_notifier.notify([("unittest-summary", "unittest-html")])
+            email_notifier.notify([("unittest-summary", "unittest-html")])
+            self.assertEqual(3, len(fake_smtp_server.messages))
+
+            email_notifier.close()
+            self.assertEqual(4, len(fake_smtp_server.messages))
+            self.assertFalse(session.connected)
+
+    def test_flush_should_queue_unsent_emails_again_if_sending_fails(self):
+        stub_session = Mock()
+        stub_session.send.side_effect = [None, Exception("unittest-exception")]
+        email_notifier = EmailNotifier("unittest-sender-email", None, None, None, ["unittest-receiver"], session=stub_session, batch_size=5)
+        for idx in range(3):
+            email_notifier.notify([("unittest-summary", f"unittest-html-{idx}")])
+
+        with self.assertRaises(Exception):
+            email_notifier.flush()
+        self.assertEqual(2, email_notifier.pending_count)
+
+        stub_session.send.side_effect = None
+        email_notifier.flush()
+
+        self.assertEqual(0, email_notifier.pending_count)
+        sent_messages = [call_args.args[2] for call_args in stub_session.send.call_args_list]
+        self.assertEqual(4, len(sent_messages))
+        for expected_html, sent_message in zip(["unittest-html-0", "unittest-html-1", "unittest-html-1", "unittest-html-2"], sent_messages):
+            self.assertIn(expected_html, sent_message)
+
+    def test_notify_should_reconnect_transparently_on_server_disconnect(self):
+        with FakeSMTPServer(disconnect_after=2) as fake_smtp_server:
+            with SMTPSession(fake_smtp_server.host, fake_smtp_server.port, use_ssl=False) as session:
+                email_notifier = EmailNotifier("unittest-sender-email", None, None, None, ["unittest-receiver"], session=session)
+                for _ in range(5):
+                    email_notifier.notify([("unittest-summary", "unittest-html")])
+
+        self.assertEqual(5, len(fake_smtp_server.messages))
+        self.assertEqual(3, session.num_connections)
+
+    def _send_with_attach_reports_above(self, summary, attach_reports_above, attachment_format="gzip", todo_index=None):
+        with FakeSMTPServer() as fake_smtp_server:
+            with SMTPSession(fake_smtp_server.host, fake_smtp_server.port, use_ssl=False) as session:
+                email_notifier = EmailNotifier(
+                    "unittest-sender-email",
+                    None,
+                    None,
+                    None,
+                    ["unittest-receiver"],
+                    session=session,
+                    attach_reports_above=attach_reports_above,
+                    attachment_format=attachment_format,
+                )
+                email_notifier.todo_index = todo_index
+                email_notifier.notify(summary)
+
+        return message_from_string(fake_smtp_server.messages[0][2])
+
+    def test_init_should_raise_value_error_if_attachment_format_is_invalid(self):
+        with self.assertRaises(ValueError):
+            EmailNotifier("unittest-sender-email", None, None, None, attachment_format="unittest-format")
+
+    def test_notify_should_inline_reports_below_attach_reports_above(self):
+        message = self._send_with_attach_reports_above([("unittest-summary", iter(["unittest-", "html"]))], 1000)
+
+        self.assertEqual("multipart/alternative", message.get_content_type())
+        parts = message.get_payload()
+        self.assertEqual(1, len(parts))
+        self.assertIn("unittest-html", parts[0].get_payload(decode=True).decode())
+
+    def test_notify_should_not_compress_reports_below_attach_reports_above(self):
+        with patch.object(EmailNotifier, "_compress_reports") as spy_compress_reports:
+            self._send_with_attach_reports_above([("unittest-summary", "unittest-html")], 1000)
+
+        spy_compress_reports.assert_not_called()
+
+    def test_notify_should_attach_whole_reports_given_in_chunks_if_exceeding_attach_reports_above_midway(self):
+        summary = [("unittest-summary-1", iter(["unittest-html-1 "] * 100)), ("unittest-summary-2", iter(["unittest-html-2 "] * 100))]
+
+        message = self._send_with_attach_reports_above(summary, 1000)
+
+        _, attachment_1, attachment_2 = message.get_payload()
+        self.assertEqual("unittest-html-1 " * 100, gzip.decompress(attachment_1.get_payload(decode=True)).decode())
+        self.assertEqual("unittest-html-2 " * 100, gzip.decompress(attachment_2.get_payload(decode=True)).decode())
+
+    def test_notify_should_attach_reports_as_gzip_above_attach_reports_above(self):
+        summary = [("unittest summary 1", "unittest-html-1 " * 100), ("unittest summary 2", iter(["unittest-html-2 "] * 100))]
+
+        message = self._send_with_attach_reports_above(summary, 1000)
+
+        self.assertEqual("multipart/mixed", message.get_content_type())
+        body, attachment_1, attachment_2 = message.get_payload()
+        self.assertIn("unittest summary 1", body.get_payload(decode=True).decode())
+        self.assertNotIn("unittest-html-1", body.get_payload(decode=True).decode())
+        self.assertEqual("unittest_summary_1.html.gz", attachment_1.get_filename())
+        self.assertEqual("unittest-html-1 " * 100, gzip.decompress(attachment_1.get_payload(decode=True)).decode())
+        self.assertEqual("unittest_summary_2.html.gz", attachment_2.get_filename())
+        self.assertEqual("unittest-html-2 " * 100, gzip.decompress(attachment_2.get_payload(decode=True)).decode())
+
+    def test_notify_should_attach_reports_as_zip_with_todo_counts_in_body(self):
+        stub_todo_index = MagicMock()
+        stub_todo_index.__len__.return_value = 42
+        summary = [("unittest-summary-1", "unittest-html-1 " * 100), ("unittest-summary-2", "unittest-html-2")]
+
+        message = self._send_with_attach_reports_above(summary, 0, attachment_format="zip", todo_index=stub_todo_index)
+
+        body, attachment = message.get_payload()
+        self.assertIn("42 TODO items", body.get_payload(decode=True).decode())
+        self.assertEqual("todo_reports.zip", attachment.get_filename())
+        with zipfile.ZipFile(io.BytesIO(attachment.get_payload(decode=True))) as zip_file:
+            self.assertEqual(["unittest-summary-1.html", "unittest-summary-2.html"], zip_file.namelist())
+            self.assertEqual(b"unittest-html-2", zip_file.read("unittest-summary-2.html"))
+
+    def test_notify_should_attach_reports_with_same_sanitized_name_as_separate_files(self):
+        summary = [("unittest summary", "unittest-html-1"), ("unittest/summary", "unittest-html-2"), ("unittest_summary", "unittest-html-3")]
+
+        message = self._send_with_attach_reports_above(summary, 0, attachment_format="zip")
+
+        _, attachment = message.get_payload()
+        with zipfile.ZipFile(io.BytesIO(attachment.get_payload(decode=True))) as zip_file:
+            self.assertEqual(["unittest_summary.html", "unittest_summary_1.html", "unittest_summary_2.html"], zip_file.namelist())
+            self.assertEqual([b"unittest-html-1", b"unittest-html-2", b"unittest-html-3"], [zip_file.read(name) for name in zip_file.namelist()])
+
+
+class TestSMTPSession(unittest.TestCase):
+    def test_send_batch_should_renew_connection_after_max_messages_per_connection(self):
+        with FakeSMTPServer() as fake_smtp_server:
+            with SMTPSession(fake_smtp_server.host, fake_smtp_server.port, use_ssl=False, max_messages_per_connection=2) as session:
+                session.send_batch([("unittest-sender-email", ["unittest-receiver"], "unittest-message")] * 5)
+
+        self.assertEqual(5, len(fake_smtp_server.messages))
+        self.assertEqual(3, fake_smtp_server.num_connections)
+
+    def test_close_should_allow_sending_again_over_new_connection(self):
+        with FakeSMTPServer() as fake_smtp_server:
+            session = SMTPSession(fake_smtp_server.host, fake_smtp_server.port, use_ssl=False)
+            session.send("unittest-sender-email", ["unittest-receiver"], "unittest-message")
+            session.close()
+            session.send("unittest-sender-email", ["unittest-receiver"], "unittest-message")
+            session.close()
+
+        self.assertEqual(2, len(fake_smtp_server.messages))
+        self.assertEqual(2, session.num_connections)
+
+    @patch("smtplib.SMTP")
+    def test_send_should_raise_if_server_disconnects_again_after_reconnecting(self, stub_smtp):
+        import smtplib
+
+        stub_smtp.return_value.sendmail.side_effect = smtplib.SMTPServerDisconnected()
+        session = SMTPSession("unittest-host", 25, use_ssl=False)
+
+        with self.assertRaises(smtplib.SMTPServerDisconnected):
+            session.send("unittest-sender-email", ["unittest-receiver"], "unittest-message")
+        self.assertEqual(2, session.num_connections)
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_init_should_raise_value_error_if_rate_is_not_positive(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(0)
+
+    def test_acquire_should_limit_rate_after_burst(self):
+        rate_limiter = RateLimiter(50, capacity=5)
+
+        start = time.monotonic()
+        for _ in range(10):
+            rate_limiter.acquire()
+        elapsed = time.monotonic() - start
+
+        # First 5 tokens are the burst, remaining 5 need 0.1s at 50 per second
+        self.assertGreaterEqual(elapsed, 0.09)
+        self.assertLess(elapsed, 1)
+
+
+class TestPerUserEmailNotifier(unittest.TestCase):
+    def setUp(self):
+        today = date.today()
+        expired_date = str(today - timedelta(days=3))
+        upcoming_date = str(today + timedelta(days=3))
+        later_date = str(today + timedelta(days=30))
+        self._todo_index = TodoIndex(
+            {
+                "unittest-module-1": [
+                    TODO("unittest-expired-alice", USER("alice"), expired_date, "unittest-module-1", POSITION(1)),
+                    TODO("unittest-upcoming-bob", USER("bob"), upcoming_date, "unittest-module-1", POSITION(2)),
+                    TODO("unittest-later-carol", USER("carol"), later_date, "unittest-module-1", POSITION(3)),
+                ],
+                "unittest-module-2": [
+                    TODO("unittest-upcoming-alice", USER("alice"), upcoming_date, "unittest-module-2", POSITION(1)),
+                    TODO("unittest-expired-dave", USER("dave"), expired_date, "unittest-module-2", POSITION(2)),
+                ],
+            }
+        )
+        self._user_emails = {"alice": "alice@unittest.com", "bob": "bob@unittest.com", "carol": "carol@unittest.com", "erin": "erin@unittest.com"}
+
+    def test_notify_should_send_every_user_only_their_own_todo_items(self):
+        with FakeSMTPServer() as fake_smtp_server:
+            per_user_email_notifier = PerUserEmailNotifier(
+                "unittest-sender-email", "unittest-password", fake_smtp_server.host, fake_smtp_server.port, self._user_emails, use_ssl=False, max_workers=2
+            )
+            per_user_email_notifier.todo_index = self._todo_index
+            per_user_email_notifier.notify([])
+
+        messages = {rcpt_to[0]: data for _, rcpt_to, data in fake_smtp_server.messages}
+        # carol has nothing expired or upcoming, dave has no email and erin has no todo items
+        self.assertEqual({"alice@unittest.com", "bob@unittest.com"}, set(messages))
+        self.assertIn("unittest-expired-alice", messages["alice@unittest.com"])
+        self.assertIn("unittest-upcoming-alice", messages["alice@unittest.com"])
+        self.assertNotIn("bob", messages["alice@unittest.com"])
+        self.assertIn("unittest-upcoming-bob", messages["bob@unittest.com"])
+        self.assertNotIn("Expired TODOs", messages["bob@unittest.com"])
+        self.assertNotIn("alice", messages["bob@unittest.com"])
+        self.assertEqual([], per_user_email_notifier.failed_users)
+        self.assertLessEqual(fake_smtp_server.num_connections, 2)
+
+    def test_notify_should_record_failed_users_and_continue(self):
+        with FakeSMTPServer() as fake_smtp_server:
+            per_user_email_notifier = PerUserEmailNotifier(
+                "unittest-sender-email", "unittest-password", fake_smtp_server.host, fake_smtp_server.port, self._user_emails, use_ssl=False, max_workers=1
+            )
+            per_user_email_notifier.todo_index = self._todo_index
+            with patch.object(SMTPSession, "send", side_effect=[Exception("unittest-exception"), None]):
+                per_user_email_notifier.notify([])
+
+        self.assertEqual(["alice"], per_user_email_notifier.failed_users)
+
+    def test_notify_should_record_failed_users_and_continue_if_building_email_fails(self):
+        with FakeSMTPServer() as fake_smtp_server:
+            per_user_email_notifier = PerUserEmailNotifier(
+                "unittest-sender-email", "unittest-password", fake_smtp_server.host, fake_smtp_server.port, self._user_emails, use_ssl=False, max_workers=1
+            )
+            per_user_email_notifier.todo_index = self._todo_index
+            original_build_message = per_user_email_notifier._build_message
+
+            def stub_build_message(user_name, summary):
+                if user_name == "alice":
+                    raise Exception("unittest-exception")
+                return original_build_message(user_name, summary)
+
+            with patch.object(per_user_email_notifier, "_build_message", side_effect=stub_build_message):
+                per_user_email_notifier.notify([])
+
+        self.assertEqual(["alice"], per_user_email_notifier.failed_users)
+        self.assertEqual([["bob@unittest.com"]], [rcpt_to for _, rcpt_to, _ in fake_smtp_server.messages])
+
+    def test_notify_should_not_send_if_todo_index_is_not_bound(self):
+        with FakeSMTPServer() as fake_smtp_server:
+            per_user_email_notifier = PerUserEmailNotifier(
+                "unittest-sender-email", "unittest-password", fake_smtp_server.host, fake_smtp_server.port, self._user_emails, use_ssl=False
+            )
+            per_user_email_notifier.notify([])
+
+        self.assertEqual(0, fake_smtp_server.num_connections)
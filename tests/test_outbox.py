@@ -0,0 +1,177 @@
+import os
+import threading
+import time
+import unittest
+from tempfile import TemporaryDirectory
+from typing import List, Tuple
+from unittest.mock import Mock
+
+from todonotifier.notifier import BaseNotifier, EmailNotifier
+from todonotifier.outbox import Outbox, OutboxNotifier
+
+
+class SpyNotifier(BaseNotifier):
+    """Notifier recording the summaries it is asked to deliver and failing the first `failures` times"""
+
+    def __init__(self, failures: int = 0, delay: float = 0) -> None:
+        super().__init__()
+        self.failures = failures
+        self.delay = delay
+        self.delivered: List[List[Tuple[str, str]]] = []
+        self.delivered_event = threading.Event()
+
+    def notify(self, summary: List[Tuple[str, str]]) -> None:
+        time.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            raise Exception("unittest-exception")
+        self.delivered.append(summary)
+        self.delivered_event.set()
+
+
+class TestOutbox(unittest.TestCase):
+    def test_put_should_store_summary_as_pending_entry(self):
+        with TemporaryDirectory() as outbox_dir:
+            outbox = Outbox(outbox_dir)
+
+            entry_id = outbox.put([("unittest-summary-1", "unittest-html-1"), ("unittest-summary-2", iter(["unittest-", "html-2"]))])
+
+            self.assertEqual([entry_id], outbox.pending())
+            self.assertEqual([("unittest-summary-1", "unittest-html-1"), ("unittest-summary-2", "unittest-html-2")], outbox.read_summary(entry_id))
+            self.assertEqual(0, outbox.read_meta(entry_id)["attempts"])
+            self.assertEqual([], os.listdir(os.path.join(outbox_dir, "tmp")))
+
+    def test_pending_should_return_entries_in_order_they_were_added(self):
+        with TemporaryDirectory() as outbox_dir:
+            outbox = Outbox(outbox_dir)
+
+            entry_ids = [outbox.put([("unittest-summary", str(i))]) for i in range(5)]
+
+            self.assertEqual(entry_ids, outbox.pending())
+
+    def test_record_failure_should_update_attempts_and_next_attempt(self):
+        with TemporaryDirectory() as outbox_dir:
+            outbox = Outbox(outbox_dir)
+            entry_id = outbox.put([])
+
+            outbox.record_failure(entry_id, "unittest-error", 123.0)
+            attempts = outbox.record_failure(entry_id, "unittest-error", 456.0)
+
+            self.assertEqual(2, attempts)
+            self.assertEqual({"names": [], "attempts": 2, "next_attempt_at": 456.0, "last_error": "unittest-error"}, outbox.read_meta(entry_id))
+
+    def test_remove_and_move_to_dead_should_remove_entry_from_pending(self):
+        with TemporaryDirectory() as outbox_dir:
+            outbox = Outbox(outbox_dir)
+            entry_id_1 = outbox.put([])
+            entry_id_2 = outbox.put([])
+
+            outbox.remove(entry_id_1)
+            outbox.move_to_dead(entry_id_2)
+
+            self.assertEqual([], outbox.pending())
+            self.assertEqual([entry_id_2], outbox.dead())
+
+
+class TestOutboxNotifier(unittest.TestCase):
+    def test_notify_should_return_without_waiting_for_delivery(self):
+        with TemporaryDirectory() as outbox_dir:
+            spy_notifier = SpyNotifier(delay=0.5)
+            outbox_notifier = OutboxNotifier(spy_notifier, outbox_dir)
+
+            start = time.monotonic()
+            outbox_notifier.notify([("unittest-summary", "unittest-html")])
+            self.assertLess(time.monotonic() - start, 0.4)
+
+            self.assertTrue(spy_notifier.delivered_event.wait(5))
+            outbox_notifier.close()
+
+        self.assertEqual([[("unittest-summary", "unittest-html")]], spy_notifier.delivered)
+
+    def test_deliver_ready_should_retry_with_exponential_backoff(self):
+        with TemporaryDirectory() as outbox_dir:
+            spy_notifier = SpyNotifier(failures=2)
+            outbox_notifier = OutboxNotifier(spy_notifier, outbox_dir, base_delay_seconds=10, start_worker=False)
+            outbox_notifier.notify([("unittest-summary", "unittest-html")])
+            entry_id = outbox_notifier.outbox.pending()[0]
+
+            start = time.time()
+            next_attempt_at = outbox_notifier.deliver_ready()
+            self.assertAlmostEqual(start + 10, next_attempt_at, delta=1)
+            # Not due yet
+            self.assertEqual(next_attempt_at, outbox_notifier.deliver_ready())
+            self.assertEqual(1, outbox_notifier.outbox.read_meta(entry_id)["attempts"])
+
+            outbox_notifier.outbox.record_failure(entry_id, "unittest-error", 0)
+            next_attempt_at = outbox_notifier.deliver_ready()
+            # Third attempt is delayed by 10 * 2 ** 2 seconds
+            self.assertAlmostEqual(start + 40, next_attempt_at, delta=1)
+
+            outbox_notifier.outbox.record_failure(entry_id, "unittest-error", 0)
+            self.assertIsNone(outbox_notifier.deliver_ready())
+            self.assertEqual([], outbox_notifier.outbox.pending())
+            self.assertEqual(1, len(spy_notifier.delivered))
+
+    def test_deliver_ready_should_flush_notifier_and_retry_if_flushing_fails(self):
+        with TemporaryDirectory() as outbox_dir:
+            spy_notifier = Mock()
+            spy_notifier.flush.side_effect = [Exception("unittest-exception"), None]
+            outbox_notifier = OutboxNotifier(spy_notifier, outbox_dir, base_delay_seconds=0, start_worker=False)
+            outbox_notifier.notify([("unittest-summary", "unittest-html")])
+            entry_id = outbox_notifier.outbox.pending()[0]
+
+            outbox_notifier.deliver_ready()
+            self.assertEqual(1, outbox_notifier.outbox.read_meta(entry_id)["attempts"])
+
+            outbox_notifier.deliver_ready()
+            self.assertEqual([], outbox_notifier.outbox.pending())
+            self.assertEqual(2, spy_notifier.flush.call_count)
+
+    def test_deliver_ready_should_send_batched_email_once_if_retried_after_failure(self):
+        with TemporaryDirectory() as outbox_dir:
+            spy_session = Mock()
+            spy_session.send.side_effect = [Exception("unittest-exception"), None, None]
+            email_notifier = EmailNotifier("unittest-sender-email", None, None, None, ["unittest-receiver"], session=spy_session, batch_size=5)
+            outbox_notifier = OutboxNotifier(email_notifier, outbox_dir, base_delay_seconds=0, start_worker=False)
+            outbox_notifier.notify([("unittest-summary", "unittest-html")])
+
+            outbox_notifier.deliver_ready()
+            outbox_notifier.deliver_ready()
+
+            self.assertEqual([], outbox_notifier.outbox.pending())
+            self.assertEqual(2, spy_session.send.call_count)
+            self.assertEqual(0, email_notifier.pending_count)
+
+    def test_deliver_ready_should_move_entry_to_dead_after_max_attempts(self):
+        with TemporaryDirectory() as outbox_dir:
+            spy_notifier = SpyNotifier(failures=5)
+            outbox_notifier = OutboxNotifier(spy_notifier, outbox_dir, max_attempts=2, base_delay_seconds=0, start_worker=False)
+            outbox_notifier.notify([("unittest-summary", "unittest-html")])
+
+            outbox_notifier.deliver_ready()
+            outbox_notifier.deliver_ready()
+
+            self.assertEqual([], outbox_notifier.outbox.pending())
+            self.assertEqual(1, len(outbox_notifier.outbox.dead()))
+            self.assertEqual(2, outbox_notifier.outbox.read_meta(outbox_notifier.outbox.dead()[0], "dead")["attempts"])
+
+    def test_start_should_deliver_entries_left_pending_by_earlier_worker(self):
+        with TemporaryDirectory() as outbox_dir:
+            Outbox(outbox_dir).put([("unittest-summary", "unittest-html")])
+            spy_notifier = SpyNotifier()
+
+            outbox_notifier = OutboxNotifier(spy_notifier, outbox_dir)
+            self.assertTrue(spy_notifier.delivered_event.wait(5))
+            outbox_notifier.close()
+
+            self.assertEqual([], outbox_notifier.outbox.pending())
+
+    def test_flush_should_deliver_due_entries_in_calling_thread(self):
+        with TemporaryDirectory() as outbox_dir:
+            spy_notifier = Mock()
+            outbox_notifier = OutboxNotifier(spy_notifier, outbox_dir, start_worker=False)
+            outbox_notifier.notify([("unittest-summary", "unittest-html")])
+
+            self.assertTrue(outbox_notifier.flush())
+
+            spy_notifier.notify.assert_called_once_with([("unittest-summary", "unittest-html")])
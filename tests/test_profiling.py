@@ -0,0 +1,192 @@
+import os
+import pstats
+import tempfile
+import threading
+import tracemalloc
+import unittest
+from unittest.mock import patch
+
+from todonotifier.profiling import (
+    NULL_PROFILER,
+    PSTATS_FILE_NAME,
+    STAGES_FILE_NAME,
+    MemoryBudget,
+    MemoryBudgetExceededException,
+    StageProfiler,
+    get_rss_bytes,
+)
+
+
+class TestGetRssBytes(unittest.TestCase):
+    def test_get_rss_bytes_should_return_positive_rss(self):
+        self.assertGreater(get_rss_bytes(), 0)
+
+
+class TestNullProfiler(unittest.TestCase):
+    def test_stage_should_return_same_no_op_context_manager_for_all_stages(self):
+        with NULL_PROFILER.stage("unittest-stage-1") as stage1:
+            pass
+
+        self.assertIsNone(stage1)
+        self.assertIs(NULL_PROFILER.stage("unittest-stage-1"), NULL_PROFILER.stage("unittest-stage-2"))
+        self.assertFalse(NULL_PROFILER.enabled)
+        self.assertEqual([], NULL_PROFILER.stages)
+
+    def test_dump_should_not_write_anything(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            NULL_PROFILER.dump(temp_dir)
+
+            self.assertEqual([], os.listdir(temp_dir))
+
+
+class TestStageProfiler(unittest.TestCase):
+    def test_stage_should_record_stats_of_each_stage_in_order_of_completion(self):
+        profiler = StageProfiler()
+
+        with profiler.stage("unittest-stage-1"):
+            with profiler.stage("unittest-stage-2"):
+                sum(range(1000))
+
+        self.assertEqual(["unittest-stage-2", "unittest-stage-1"], [stage_stats.name for stage_stats in profiler.stages])
+        self.assertGreaterEqual(profiler.stages[1].wall_seconds, profiler.stages[0].wall_seconds)
+        self.assertGreaterEqual(profiler.stages[0].cpu_seconds, 0)
+
+    def test_stage_should_record_stats_even_if_stage_raises_exception(self):
+        profiler = StageProfiler(use_cprofile=False)
+
+        with self.assertRaises(ValueError):
+            with profiler.stage("unittest-stage"):
+                raise ValueError("unittest-exception")
+
+        self.assertEqual(["unittest-stage"], [stage_stats.name for stage_stats in profiler.stages])
+
+    def test_stage_should_not_track_memory_by_default(self):
+        profiler = StageProfiler(use_cprofile=False)
+
+        with profiler.stage("unittest-stage"):
+            pass
+
+        self.assertIsNone(profiler.stages[0].peak_traced_bytes)
+        self.assertIsNone(profiler.stages[0].rss_bytes)
+
+    def test_stage_should_track_peak_memory_of_each_stage_including_nested_stages(self):
+        profiler = StageProfiler(use_cprofile=False, track_memory=True)
+
+        with profiler.stage("unittest-outer-stage"):
+            with profiler.stage("unittest-inner-stage"):
+                dummy_allocation = bytearray(8 * 1024 * 1024)
+                del dummy_allocation
+            with profiler.stage("unittest-small-stage"):
+                pass
+
+        inner_stage, small_stage, outer_stage = profiler.stages
+        self.assertGreaterEqual(inner_stage.peak_traced_bytes, 8 * 1024 * 1024)
+        self.assertLess(small_stage.peak_traced_bytes, 1024 * 1024)
+        self.assertGreaterEqual(outer_stage.peak_traced_bytes, inner_stage.peak_traced_bytes)
+        self.assertGreater(outer_stage.rss_bytes, 0)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_stage_should_run_stages_tracking_memory_in_parallel_one_at_a_time(self):
+        profiler_1 = StageProfiler(use_cprofile=False, track_memory=True)
+        profiler_2 = StageProfiler(use_cprofile=False, track_memory=True)
+        entered_event, release_event, stage_2_entered_event = threading.Event(), threading.Event(), threading.Event()
+
+        def run_stage_1():
+            with profiler_1.stage("unittest-stage-1"):
+                dummy_allocation = bytearray(8 * 1024 * 1024)
+                entered_event.set()
+                release_event.wait(5)
+                del dummy_allocation
+
+        def run_stage_2():
+            with profiler_2.stage("unittest-stage-2"):
+                stage_2_entered_event.set()
+
+        thread_1 = threading.Thread(target=run_stage_1)
+        thread_1.start()
+        self.assertTrue(entered_event.wait(5))
+        thread_2 = threading.Thread(target=run_stage_2)
+        thread_2.start()
+
+        self.assertFalse(stage_2_entered_event.wait(0.1))
+        release_event.set()
+        thread_1.join(5)
+        thread_2.join(5)
+
+        self.assertTrue(stage_2_entered_event.is_set())
+        self.assertGreaterEqual(profiler_1.stages[0].peak_traced_bytes, 8 * 1024 * 1024)
+        self.assertLess(profiler_2.stages[0].peak_traced_bytes, 1024 * 1024)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_format_stages_should_add_memory_columns_if_memory_is_tracked(self):
+        profiler = StageProfiler(use_cprofile=False, track_memory=True)
+        with profiler.stage("unittest-stage"):
+            pass
+
+        self.assertIn("Peak traced (MiB)", profiler.format_stages())
+
+    def test_dump_should_write_stages_table_and_pstats(self):
+        profiler = StageProfiler()
+        with profiler.stage("unittest-stage"):
+            sum(range(1000))
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target_dir = os.path.join(temp_dir, "unittest-report")
+            profiler.dump(target_dir)
+
+            with open(os.path.join(target_dir, STAGES_FILE_NAME)) as f:
+                stages_table = f.read()
+            stats = pstats.Stats(os.path.join(target_dir, PSTATS_FILE_NAME))
+
+        self.assertIn("unittest-stage", stages_table)
+        self.assertTrue(stats.total_calls > 0)
+
+    def test_dump_should_not_write_pstats_if_cprofile_is_not_used(self):
+        profiler = StageProfiler(use_cprofile=False)
+        with profiler.stage("unittest-stage"):
+            pass
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            profiler.dump(temp_dir)
+
+            self.assertEqual([STAGES_FILE_NAME], os.listdir(temp_dir))
+
+
+class TestMemoryBudget(unittest.TestCase):
+    def test_memory_budget_should_raise_value_error_for_unsupported_action(self):
+        with self.assertRaises(ValueError):
+            MemoryBudget(1024, "unittest-action")
+
+    @patch("todonotifier.profiling.get_rss_bytes")
+    def test_check_should_return_false_if_within_budget(self, stub_get_rss_bytes):
+        stub_get_rss_bytes.return_value = 1024
+        memory_budget = MemoryBudget(1024)
+
+        self.assertFalse(memory_budget.check("unittest-stage"))
+        self.assertFalse(memory_budget.degraded)
+
+    @patch("todonotifier.profiling.get_rss_bytes")
+    def test_check_should_raise_exception_naming_stage_if_budget_exceeded_with_abort(self, stub_get_rss_bytes):
+        stub_get_rss_bytes.return_value = 2048
+        memory_budget = MemoryBudget(1024, "abort")
+
+        with self.assertRaisesRegex(MemoryBudgetExceededException, "unittest-stage"):
+            memory_budget.check("unittest-stage")
+
+    @patch("todonotifier.profiling.get_rss_bytes")
+    def test_check_should_degrade_if_budget_exceeded_with_degrade(self, stub_get_rss_bytes):
+        stub_get_rss_bytes.return_value = 2048
+        memory_budget = MemoryBudget(1024, "degrade")
+
+        self.assertTrue(memory_budget.check("unittest-stage"))
+        self.assertTrue(memory_budget.degraded)
+
+    @patch("todonotifier.profiling.get_rss_bytes")
+    def test_check_should_return_false_if_rss_is_unknown(self, stub_get_rss_bytes):
+        stub_get_rss_bytes.return_value = None
+
+        self.assertFalse(MemoryBudget(1024).check("unittest-stage"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+import os
+import unittest
+from datetime import date, timedelta
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock
+
+from todonotifier.models import POSITION, TODO, USER
+from todonotifier.notifier import EmailNotifier
+from todonotifier.state import (
+    DUE_STATUS,
+    EXPIRED_STATUS,
+    OPEN_STATUS,
+    DeltaNotifier,
+    StateStore,
+    compute_state,
+    diff_states,
+    get_status,
+    iter_todo_identities,
+    render_state_diff,
+)
+from todonotifier.todo_index import TodoIndex
+
+CURR_DATE = date(2024, 6, 15)
+
+
+def _todo(msg: str, user_name: str, completion_date: date, module: str = "unittest-module", line_no: int = 1) -> TODO:
+    return TODO(msg, USER(user_name), str(completion_date), module, POSITION(line_no))
+
+
+class TestIdentities(unittest.TestCase):
+    def test_iter_todo_identities_should_not_depend_on_line_no(self):
+        todo_index_1 = TodoIndex({"unittest-module": [_todo("unittest-msg", "alice", CURR_DATE, line_no=1)]})
+        todo_index_2 = TodoIndex({"unittest-module": [_todo("unittest-msg", "alice", CURR_DATE, line_no=10)]})
+
+        self.assertEqual([identity for identity, _ in iter_todo_identities(todo_index_1)], [identity for identity, _ in iter_todo_identities(todo_index_2)])
+
+    def test_iter_todo_identities_should_be_unique_for_identical_todo_items(self):
+        todo_index = TodoIndex(
+            {
+                "unittest-module-1": [_todo("unittest-msg", "alice", CURR_DATE, "unittest-module-1")] * 2,
+                "unittest-module-2": [_todo("unittest-msg", "alice", CURR_DATE, "unittest-module-2")],
+            }
+        )
+
+        identities = [identity for identity, _ in iter_todo_identities(todo_index)]
+
+        self.assertEqual(3, len(set(identities)))
+
+    def test_iter_todo_identities_should_not_depend_on_user(self):
+        todo_index_1 = TodoIndex({"unittest-module": [_todo("unittest-msg", "alice", CURR_DATE)]})
+        todo_index_2 = TodoIndex({"unittest-module": [_todo("unittest-msg", "bob", CURR_DATE)]})
+
+        self.assertEqual([identity for identity, _ in iter_todo_identities(todo_index_1)], [identity for identity, _ in iter_todo_identities(todo_index_2)])
+        self.assertNotEqual(
+            [identity for identity, _ in iter_todo_identities(todo_index_1, include_user=True)],
+            [identity for identity, _ in iter_todo_identities(todo_index_2, include_user=True)],
+        )
+
+    def test_get_status_should_return_status_on_curr_date(self):
+        self.assertEqual(EXPIRED_STATUS, get_status(CURR_DATE - timedelta(days=1), CURR_DATE, 7))
+        self.assertEqual(DUE_STATUS, get_status(CURR_DATE, CURR_DATE, 7))
+        self.assertEqual(DUE_STATUS, get_status(CURR_DATE + timedelta(days=7), CURR_DATE, 7))
+        self.assertEqual(OPEN_STATUS, get_status(CURR_DATE + timedelta(days=8), CURR_DATE, 7))
+
+
+class TestDiffStates(unittest.TestCase):
+    def test_diff_states_should_return_new_newly_expired_newly_due_and_resolved_todo_items(self):
+        previous_todo_index = TodoIndex(
+            {
+                "unittest-module": [
+                    _todo("unittest-expiring", "alice", CURR_DATE + timedelta(days=2)),
+                    _todo("unittest-becoming-due", "bob", CURR_DATE + timedelta(days=10)),
+                    _todo("unittest-resolved", "carol", CURR_DATE),
+                    _todo("unittest-unchanged", "dave", CURR_DATE - timedelta(days=30)),
+                ]
+            }
+        )
+        previous_state = compute_state(previous_todo_index, CURR_DATE)
+        current_todo_index = TodoIndex(
+            {
+                "unittest-module": [
+                    _todo("unittest-expiring", "alice", CURR_DATE + timedelta(days=2), line_no=5),
+                    _todo("unittest-becoming-due", "bob", CURR_DATE + timedelta(days=10)),
+                    _todo("unittest-unchanged", "dave", CURR_DATE - timedelta(days=30)),
+                    _todo("unittest-new", "erin", CURR_DATE + timedelta(days=100)),
+                ]
+            }
+        )
+        current_state = compute_state(current_todo_index, CURR_DATE + timedelta(days=5))
+
+        state_diff = diff_states(previous_state, current_state)
+
+        self.assertEqual(["unittest-new"], [s["msg"] for s in state_diff.new])
+        self.assertEqual(["unittest-expiring"], [s["msg"] for s in state_diff.newly_expired])
+        self.assertEqual(["unittest-becoming-due"], [s["msg"] for s in state_diff.newly_due])
+        self.assertEqual(["unittest-resolved"], [s["msg"] for s in state_diff.resolved])
+        self.assertEqual(5, state_diff.newly_expired[0]["line_no"])
+
+    def test_diff_states_should_return_todo_items_whose_user_changed_as_reassigned(self):
+        previous_state = compute_state(TodoIndex({"unittest-module": [_todo("unittest-msg", "alice", CURR_DATE + timedelta(days=30))]}), CURR_DATE)
+        current_state = compute_state(TodoIndex({"unittest-module": [_todo("unittest-msg", "bob", CURR_DATE + timedelta(days=30))]}), CURR_DATE)
+
+        state_diff = diff_states(previous_state, current_state)
+
+        self.assertEqual([], state_diff.new)
+        self.assertEqual([], state_diff.resolved)
+        self.assertEqual([("bob", "alice")], [(s["user_name"], s["previous_user_name"]) for s in state_diff.reassigned])
+        self.assertEqual(["Reassigned TODOs"], [summary_name for summary_name, _ in render_state_diff(state_diff)])
+        self.assertIn("alice → bob", render_state_diff(state_diff)[0][1])
+
+    def test_diff_states_should_be_empty_if_nothing_changed(self):
+        state = compute_state(TodoIndex({"unittest-module": [_todo("unittest-msg", "alice", CURR_DATE)]}), CURR_DATE)
+
+        self.assertFalse(diff_states(state, state))
+
+    def test_render_state_diff_should_render_only_non_empty_categories(self):
+        state = compute_state(TodoIndex({"unittest-module": [_todo("unittest-msg", "alice", CURR_DATE)]}), CURR_DATE)
+
+        summary = render_state_diff(diff_states({}, state))
+
+        self.assertEqual(["New TODOs"], [summary_name for summary_name, _ in summary])
+        self.assertIn("unittest-msg", summary[0][1])
+
+
+class TestStateStore(unittest.TestCase):
+    def test_load_should_return_empty_state_if_nothing_was_saved(self):
+        with TemporaryDirectory() as tmpdir:
+            self.assertEqual({}, StateStore(os.path.join(tmpdir, "state.json")).load())
+
+    def test_save_should_record_state(self):
+        with TemporaryDirectory() as tmpdir:
+            state_store = StateStore(os.path.join(tmpdir, "unittest-dir", "state.json"))
+            state = compute_state(TodoIndex({"unittest-module": [_todo("unittest-msg", "alice", CURR_DATE)]}), CURR_DATE)
+
+            state_store.save(state)
+
+            self.assertEqual(state, state_store.load())
+            self.assertEqual(["state.json"], os.listdir(os.path.join(tmpdir, "unittest-dir")))
+
+
+class TestDeltaNotifier(unittest.TestCase):
+    def test_notify_should_pass_only_changes_since_last_notification(self):
+        with TemporaryDirectory() as tmpdir:
+            spy_notifier = Mock(pending_count=0)
+            delta_notifier = DeltaNotifier(spy_notifier, StateStore(os.path.join(tmpdir, "state.json")))
+            todo_index = TodoIndex({"unittest-module": [_todo("unittest-msg-1", "alice", date.today() + timedelta(days=30))]})
+
+            delta_notifier.todo_index = todo_index
+            delta_notifier.notify([])
+            delta_notifier.notify([])
+
+            spy_notifier.notify.assert_called_once()
+            self.assertEqual(["New TODOs"], [summary_name for summary_name, _ in spy_notifier.notify.call_args.args[0]])
+
+            delta_notifier.todo_index = TodoIndex({"unittest-module": [_todo("unittest-msg-2", "alice", date.today() + timedelta(days=30))]})
+            delta_notifier.notify([])
+
+            self.assertEqual(["New TODOs", "Resolved TODOs"], [summary_name for summary_name, _ in spy_notifier.notify.call_args.args[0]])
+
+    def test_notify_should_not_record_state_if_notifier_fails(self):
+        with TemporaryDirectory() as tmpdir:
+            stub_notifier = Mock()
+            stub_notifier.notify.side_effect = Exception("unittest-exception")
+            state_store = StateStore(os.path.join(tmpdir, "state.json"))
+            delta_notifier = DeltaNotifier(stub_notifier, state_store)
+            delta_notifier.todo_index = TodoIndex({"unittest-module": [_todo("unittest-msg", "alice", CURR_DATE)]})
+
+            with self.assertRaises(Exception):
+                delta_notifier.notify([])
+
+            self.assertEqual({}, state_store.load())
+
+    def test_flush_should_send_queued_changes_before_recording_state(self):
+        with TemporaryDirectory() as tmpdir:
+            spy_session = Mock()
+            spy_session.send.side_effect = [Exception("unittest-exception"), None]
+            email_notifier = EmailNotifier("unittest-sender-email", None, None, None, ["unittest-receiver"], session=spy_session, batch_size=5)
+            state_store = StateStore(os.path.join(tmpdir, "state.json"))
+            delta_notifier = DeltaNotifier(email_notifier, state_store)
+            delta_notifier.todo_index = TodoIndex({"unittest-module": [_todo("unittest-msg", "alice", CURR_DATE)]})
+
+            delta_notifier.notify([])
+            self.assertEqual(1, delta_notifier.pending_count)
+            self.assertEqual({}, state_store.load())
+
+            with self.assertRaises(Exception):
+                delta_notifier.flush()
+            self.assertEqual({}, state_store.load())
+
+            delta_notifier.flush()
+
+            self.assertEqual(0, delta_notifier.pending_count)
+            self.assertEqual(2, spy_session.send.call_count)
+            self.assertEqual(1, len(state_store.load()))
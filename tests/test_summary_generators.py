@@ -1,12 +1,73 @@
+import io
+import os
 import unittest
 from datetime import datetime, timedelta
+from typing import Dict, List
+from unittest.mock import patch
 
 from todonotifier.models import POSITION, TODO, USER
 from todonotifier.summary_generators import (
+    ROOT_SHARD_NAME,
+    BaseSummaryGenerator,
     ByModuleSummaryGenerator,
     ExpiredTodosByUserSummaryGenerator,
+    SummaryResult,
     UpcomingWeekTodosByUserSummaryGenerator,
+    shard_file_name,
 )
+from todonotifier.todo_index import TodoIndex
+
+
+class MockHtmlOnlySummaryGenerator(BaseSummaryGenerator):
+    """Summary generator that doesn't override `iter_html`"""
+
+    def generate_summary(self, all_todos_objs: Dict[str, List[TODO]]) -> None:
+        pass
+
+    def generate_html(self) -> None:
+        self._html = "<div>unittest-html</div>"
+
+
+class TestBaseSummaryGenerator(unittest.TestCase):
+    def test_iter_html_should_generate_html_if_not_generated_yet(self):
+        summary_generator = MockHtmlOnlySummaryGenerator("unittest-name", {})
+
+        self.assertEqual(["<div>unittest-html</div>"], list(summary_generator.iter_html()))
+
+    @patch.object(MockHtmlOnlySummaryGenerator, "generate_html")
+    def test_iter_html_should_not_generate_html_again_if_already_generated(self, spy_generate_html):
+        summary_generator = MockHtmlOnlySummaryGenerator("unittest-name", {}, html="<div>unittest-html</div>")
+
+        list(summary_generator.iter_html())
+
+        spy_generate_html.assert_not_called()
+
+    def test_reset_should_start_fresh_without_modifying_previous_container(self):
+        previous_container = {"unittest-key": ["unittest-value"]}
+        summary_generator = MockHtmlOnlySummaryGenerator("unittest-name", previous_container, html="<div>unittest-html</div>")
+        summary_generator.todo_index = TodoIndex({})
+
+        summary_generator.reset()
+
+        self.assertEqual({}, summary_generator.container)
+        self.assertEqual("", summary_generator.html)
+        self.assertIsNone(summary_generator.todo_index)
+        self.assertEqual({"unittest-key": ["unittest-value"]}, previous_container)
+
+    def test_result_should_return_immutable_result_of_current_run(self):
+        summary_generator = MockHtmlOnlySummaryGenerator("unittest-name", {"unittest-key": ["unittest-value"]}, html="<div>unittest-html</div>")
+
+        summary_result = summary_generator.result()
+        summary_generator.reset()
+
+        self.assertIsInstance(summary_result, SummaryResult)
+        self.assertEqual("unittest-name", summary_result.name)
+        self.assertEqual({"unittest-key": ["unittest-value"]}, dict(summary_result.container))
+        self.assertEqual("<div>unittest-html</div>", summary_result.html)
+        with self.assertRaises(TypeError):
+            summary_result.container["unittest-key"] = []
+        with self.assertRaises(AttributeError):
+            summary_result.html = ""
 
 
 class TestByModuleSummaryGenerator(unittest.TestCase):
@@ -34,6 +95,24 @@ class TestByModuleSummaryGenerator(unittest.TestCase):
 
         self.assertEqual(expected_value, self._by_module_summary_generator.container)
 
+    @patch("todonotifier.summary_generators.TodoIndex")
+    def test_generate_summary_should_use_bound_todo_index(self, spy_todo_index):
+        self._by_module_summary_generator.todo_index = TodoIndex(self._dummy_all_todo_objs)
+
+        self._by_module_summary_generator.generate_summary(self._dummy_all_todo_objs)
+
+        spy_todo_index.assert_not_called()
+        self.assertEqual(2, len(self._by_module_summary_generator.container[self._dummy_module]))
+
+    @patch("todonotifier.summary_generators.TodoIndex")
+    def test_generate_summary_should_not_use_todo_index_bound_to_other_todo_items(self, spy_todo_index):
+        self._by_module_summary_generator.todo_index = TodoIndex({})
+        spy_todo_index.return_value = TodoIndex(self._dummy_all_todo_objs)
+
+        self._by_module_summary_generator.generate_summary(self._dummy_all_todo_objs)
+
+        spy_todo_index.assert_called_once_with(self._dummy_all_todo_objs)
+
     def test_generate_html(self):
         self._by_module_summary_generator._container = {
             self._dummy_module: [
@@ -69,6 +148,77 @@ class TestByModuleSummaryGenerator(unittest.TestCase):
 
         self.assertEqual(expected_value, self._by_module_summary_generator.html)
 
+    def test_iter_html_should_yield_same_html_as_generate_html_in_chunks(self):
+        self._by_module_summary_generator.generate_summary(self._dummy_all_todo_objs)
+        self._by_module_summary_generator.generate_html()
+
+        chunks = list(self._by_module_summary_generator.iter_html())
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(self._by_module_summary_generator.html, "".join(chunks))
+
+    def test_write_html_should_write_html_into_stream(self):
+        self._by_module_summary_generator.generate_summary(self._dummy_all_todo_objs)
+        self._by_module_summary_generator.generate_html()
+        stream = io.StringIO()
+
+        self._by_module_summary_generator.write_html(stream)
+
+        self.assertEqual(self._by_module_summary_generator.html, stream.getvalue())
+
+
+class TestByModuleSummaryGeneratorSharding(unittest.TestCase):
+    def setUp(self):
+        self._dummy_row = ["unittest-dummy-user-name", "unittest-dummy-msg", 1, "2022-09-22"]
+        self._dummy_container = {
+            os.path.join("project", "pkg1", "module1.py"): [self._dummy_row, self._dummy_row],
+            os.path.join("project", "pkg1", "sub", "module2.py"): [self._dummy_row],
+            os.path.join("project", "pkg2", "module3.py"): [self._dummy_row],
+            os.path.join("project", "module4.py"): [self._dummy_row],
+        }
+
+    def test_shard_modules_should_shard_by_top_level_directory(self):
+        by_module_summary_generator = ByModuleSummaryGenerator(container=self._dummy_container, shard=True)
+        expected_value = {
+            "pkg1": [os.path.join("project", "pkg1", "module1.py"), os.path.join("project", "pkg1", "sub", "module2.py")],
+            "pkg2": [os.path.join("project", "pkg2", "module3.py")],
+            ROOT_SHARD_NAME: [os.path.join("project", "module4.py")],
+        }
+
+        actual_value = by_module_summary_generator.shard_modules()
+
+        self.assertEqual(expected_value, actual_value)
+
+    def test_shard_modules_should_shard_by_number_of_modules(self):
+        by_module_summary_generator = ByModuleSummaryGenerator(container=self._dummy_container, shard=True, modules_per_shard=3)
+        modules = list(self._dummy_container)
+        expected_value = {"part-1": modules[:3], "part-2": modules[3:]}
+
+        actual_value = by_module_summary_generator.shard_modules()
+
+        self.assertEqual(expected_value, actual_value)
+
+    def test_iter_shard_html_should_only_render_modules_of_shard(self):
+        by_module_summary_generator = ByModuleSummaryGenerator(container=self._dummy_container, shard=True)
+        shard_module = os.path.join("project", "pkg2", "module3.py")
+
+        actual_value = "".join(by_module_summary_generator.iter_shard_html([shard_module]))
+
+        self.assertIn(f"TODOs for module {shard_module}", actual_value)
+        self.assertEqual(1, actual_value.count("<h3>"))
+
+    def test_iter_html_should_render_index_page_if_shard_is_set(self):
+        by_module_summary_generator = ByModuleSummaryGenerator(container=self._dummy_container, shard=True)
+
+        actual_value = "".join(by_module_summary_generator.iter_html())
+
+        self.assertIn('<td><a href="00000-pkg1.html">pkg1</a></td>', actual_value)
+        self.assertIn("<td>2</td>\n                    <td>3</td>", actual_value)
+        self.assertNotIn("TODOs for module", actual_value)
+
+    def test_shard_file_name_should_sanitize_shard_name(self):
+        self.assertEqual("00003-some_shard_.html", shard_file_name(3, "some shard/"))
+
 
 class TestExpiredTodosByUserSummaryGenerator(unittest.TestCase):
     def setUp(self):
@@ -97,6 +247,16 @@ class TestExpiredTodosByUserSummaryGenerator(unittest.TestCase):
 
         self.assertEqual(expected_value, self._expired_todos_by_user_summary_generator.container)
 
+    def test_generate_summary_should_keep_parsed_order_of_todo_items(self):
+        later_todo_obj = TODO("unittest-msg-later", self._dummy_user, "2020-09-23", self._dummy_module, POSITION(1))
+        earlier_todo_obj = TODO("unittest-msg-earlier", self._dummy_user, "2020-09-21", self._dummy_module, POSITION(2))
+
+        self._expired_todos_by_user_summary_generator.generate_summary({self._dummy_module: [later_todo_obj, earlier_todo_obj]})
+
+        self.assertEqual(
+            ["unittest-msg-later", "unittest-msg-earlier"], [row[0] for row in self._expired_todos_by_user_summary_generator.container[self._dummy_user_name]]
+        )
+
     def test_generate_html(self):
         self._expired_todos_by_user_summary_generator._container = {
             self._dummy_user.user_name: [
@@ -161,6 +321,17 @@ class TestUpcomingWeekTodosByUserSummaryGenerator(unittest.TestCase):
 
         self.assertEqual(expected_value, self._upcoming_week_todos_by_user_summary_generator.container)
 
+    def test_generate_summary_should_keep_parsed_order_of_todo_items(self):
+        later_todo_obj = TODO("unittest-msg-later", self._dummy_user, str((datetime.today() + timedelta(days=5)).date()), self._dummy_module, POSITION(1))
+        earlier_todo_obj = TODO("unittest-msg-earlier", self._dummy_user, self._dummy_completion_date_str1, self._dummy_module, POSITION(2))
+
+        self._upcoming_week_todos_by_user_summary_generator.generate_summary({self._dummy_module: [later_todo_obj, earlier_todo_obj]})
+
+        self.assertEqual(
+            ["unittest-msg-later", "unittest-msg-earlier"],
+            [row[0] for row in self._upcoming_week_todos_by_user_summary_generator.container[self._dummy_user_name]],
+        )
+
     def test_generate_html(self):
         expected_completion_date = str((datetime.today() + timedelta(days=2)).date().strftime("%Y-%m-%d"))
         self._upcoming_week_todos_by_user_summary_generator._container = {
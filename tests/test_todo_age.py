@@ -0,0 +1,123 @@
+import json
+import os
+import unittest
+from datetime import datetime
+from tempfile import TemporaryDirectory
+
+from git import Actor
+from git.repo import Repo
+
+from todonotifier.todo_age import TodoAgeTracker, _iter_commit_diffs, format_age
+from todonotifier.todo_notifier import parse_files_for_todo_items
+
+GIT_LOG_OUTPUT = """\x001111111111111111111111111111111111111111 1700000000
+
+diff --git a/unittest.py b/unittest.py
+new file mode 100644
+--- /dev/null
++++ b/unittest.py
+@@ -0,0 +1,2 @@
++# TODO unittest-msg-1
++--- not a header
+\x002222222222222222222222222222222222222222 1700000100
+
+diff --git a/unittest.py b/unittest.py
+deleted file mode 100644
+--- a/unittest.py
++++ /dev/null
+@@ -1,2 +0,0 @@
+-# TODO unittest-msg-1
+----- not a header
+"""
+
+
+class TestFormatAge(unittest.TestCase):
+    def test_format_age_should_use_largest_fitting_unit(self):
+        curr_datetime = datetime(2024, 1, 1)
+
+        self.assertEqual("today", format_age(datetime(2023, 12, 31, 12), curr_datetime))
+        self.assertEqual("1 day ago", format_age(datetime(2023, 12, 31), curr_datetime))
+        self.assertEqual("2 months ago", format_age(datetime(2023, 10, 31), curr_datetime))
+        self.assertEqual("2 years ago", format_age(datetime(2021, 12, 1), curr_datetime))
+
+
+class TestIterCommitDiffs(unittest.TestCase):
+    def test_iter_commit_diffs_should_group_removed_and_added_lines_by_commit_and_file(self):
+        commit_diffs = list(_iter_commit_diffs(GIT_LOG_OUTPUT.splitlines(keepends=True)))
+
+        self.assertEqual(
+            [
+                ("1111111111111111111111111111111111111111", 1700000000, {"unittest.py": ([], ["# TODO unittest-msg-1", "--- not a header"])}),
+                ("2222222222222222222222222222222222222222", 1700000100, {"unittest.py": (["# TODO unittest-msg-1", "---- not a header"], [])}),
+            ],
+            commit_diffs,
+        )
+
+
+class TestTodoAgeTracker(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()
+        self._repo_dir = os.path.join(self._temp_dir.name, "unittest-project")
+        os.makedirs(self._repo_dir)
+        self._repo = Repo.init(self._repo_dir)
+        self._store_file = os.path.join(self._temp_dir.name, "unittest-dir", "ages.json")
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _commit(self, files, commit_time):
+        for file_name, content in files.items():
+            file = os.path.join(self._repo_dir, file_name)
+            if content is None:
+                self._repo.index.remove([file_name], working_tree=True)
+                continue
+            with open(file, "w") as f:
+                f.write(content)
+            self._repo.index.add([file_name])
+        actor = Actor("unittest-user", "unittest@example.com")
+        date = datetime.fromtimestamp(commit_time).isoformat()
+        return self._repo.index.commit("unittest-commit", author=actor, committer=actor, author_date=date, commit_date=date).hexsha
+
+    def _annotate(self, todo_age_tracker):
+        files = [os.path.join(self._repo_dir, file_name) for file_name in sorted(os.listdir(self._repo_dir)) if file_name.endswith(".py")]
+        all_todos_objs = parse_files_for_todo_items(self._temp_dir.name, files, False)
+        todo_age_tracker.annotate(self._repo_dir, self._temp_dir.name, all_todos_objs)
+        return {todo_obj.msg: todo_obj.introduction for todos in all_todos_objs.values() for todo_obj in todos}
+
+    def test_annotate_should_keep_introduction_of_edited_and_moved_todo_items(self):
+        commit_1 = self._commit({"a.py": "# TODO {2024-01-01} unittest-msg-1\n# TODO unittest-msg-2\n"}, 1700000000)
+        commit_2 = self._commit({"a.py": "x = 1\n# TODO {2024-02-01} @bob unittest-msg-1\n", "b.py": "# TODO unittest-msg-3\n"}, 1700000100)
+        self._commit({"a.py": None, "c.py": "# TODO unittest-msg-1\n"}, 1700000200)
+
+        introductions = self._annotate(TodoAgeTracker(self._store_file))
+
+        self.assertEqual(["unittest-msg-1", "unittest-msg-3"], sorted(introductions))
+        self.assertEqual(
+            (commit_1, datetime.fromtimestamp(1700000000)), (introductions["unittest-msg-1"].commit_sha, introductions["unittest-msg-1"].introduced_at)
+        )
+        self.assertEqual(commit_2, introductions["unittest-msg-3"].commit_sha)
+
+    def test_annotate_should_only_process_commits_since_last_run(self):
+        commit_1 = self._commit({"a.py": "# TODO unittest-msg-1\n"}, 1700000000)
+        todo_age_tracker = TodoAgeTracker(self._store_file)
+        self._annotate(todo_age_tracker)
+        with open(self._store_file) as f:
+            self.assertEqual(commit_1, json.load(f)["head"])
+
+        commit_2 = self._commit({"a.py": "# TODO unittest-msg-1\n# TODO unittest-msg-2\n"}, 1700000100)
+        introductions = self._annotate(TodoAgeTracker(self._store_file))
+
+        self.assertEqual(commit_1, introductions["unittest-msg-1"].commit_sha)
+        self.assertEqual(commit_2, introductions["unittest-msg-2"].commit_sha)
+        with open(self._store_file) as f:
+            self.assertEqual(commit_2, json.load(f)["head"])
+
+    def test_annotate_should_walk_complete_history_again_if_last_commit_processed_is_not_an_ancestor(self):
+        self._commit({"a.py": "# TODO unittest-msg-1\n"}, 1700000000)
+        todo_age_tracker = TodoAgeTracker(self._store_file)
+        self._annotate(todo_age_tracker)
+
+        self._repo.git.checkout("--orphan", "unittest-branch")
+        commit = self._commit({"a.py": "# TODO unittest-msg-1\n"}, 1700000100)
+
+        self.assertEqual(commit, self._annotate(todo_age_tracker)["unittest-msg-1"].commit_sha)
@@ -0,0 +1,77 @@
+import unittest
+from datetime import date
+
+from todonotifier.models import POSITION, TODO, USER
+from todonotifier.todo_index import TodoIndex
+
+
+class TestTodoIndex(unittest.TestCase):
+    def setUp(self):
+        self._dummy_module1 = "unittest-module-1"
+        self._dummy_module2 = "unittest-module-2"
+        self._dummy_todo_obj1 = TODO("unittest-msg-1", USER("unittest-user-1"), "2022-09-20", self._dummy_module1, POSITION(1))
+        self._dummy_todo_obj2 = TODO("unittest-msg-2", USER("unittest-user-2"), "2022-09-25", self._dummy_module1, POSITION(2))
+        self._dummy_todo_obj3 = TODO("unittest-msg-3", USER("unittest-user-1"), "2022-09-22", self._dummy_module2, POSITION(1))
+        self._dummy_todo_obj4 = TODO("unittest-msg-4", USER("unittest-user-2"), "2022-09-20", self._dummy_module2, POSITION(2))
+        self._dummy_all_todo_objs = {
+            self._dummy_module1: [self._dummy_todo_obj1, self._dummy_todo_obj2],
+            self._dummy_module2: [self._dummy_todo_obj3, self._dummy_todo_obj4],
+        }
+        self._todo_index = TodoIndex(self._dummy_all_todo_objs)
+
+    def test_len_should_return_number_of_todo_items(self):
+        self.assertEqual(4, len(self._todo_index))
+
+    def test_iter_should_iterate_todo_items_sorted_by_date_keeping_parsed_order_for_same_dates(self):
+        expected_value = [self._dummy_todo_obj1, self._dummy_todo_obj4, self._dummy_todo_obj3, self._dummy_todo_obj2]
+
+        self.assertEqual(expected_value, list(self._todo_index))
+
+    def test_users_should_return_users_in_order_of_first_appearance(self):
+        self.assertEqual(["unittest-user-1", "unittest-user-2"], self._todo_index.users)
+
+    def test_modules_should_return_modules_in_order_of_first_appearance(self):
+        self.assertEqual([self._dummy_module1, self._dummy_module2], self._todo_index.modules)
+
+    def test_by_user_should_return_todo_items_of_user(self):
+        self.assertEqual([self._dummy_todo_obj1, self._dummy_todo_obj3], self._todo_index.by_user("unittest-user-1"))
+
+    def test_by_user_should_return_empty_list_for_unknown_user(self):
+        self.assertEqual([], self._todo_index.by_user("unittest-unknown-user"))
+
+    def test_by_module_should_return_todo_items_of_module(self):
+        self.assertEqual([self._dummy_todo_obj3, self._dummy_todo_obj4], self._todo_index.by_module(self._dummy_module2))
+
+    def test_expired_should_return_todo_items_before_given_date(self):
+        expected_value = [self._dummy_todo_obj1, self._dummy_todo_obj4]
+
+        self.assertEqual(expected_value, self._todo_index.expired(date(2022, 9, 22)))
+
+    def test_in_parsed_order_should_sort_todo_items_in_order_they_were_parsed(self):
+        expected_value = [self._dummy_todo_obj1, self._dummy_todo_obj2, self._dummy_todo_obj3, self._dummy_todo_obj4]
+
+        self.assertEqual(expected_value, self._todo_index.in_parsed_order(list(self._todo_index)))
+
+    def test_due_within_should_return_todo_items_due_within_given_days_inclusive(self):
+        expected_value = [self._dummy_todo_obj3, self._dummy_todo_obj2]
+
+        self.assertEqual(expected_value, self._todo_index.due_within(3, date(2022, 9, 22)))
+
+    def test_due_between_should_return_todo_items_between_given_dates_inclusive(self):
+        expected_value = [self._dummy_todo_obj1, self._dummy_todo_obj4, self._dummy_todo_obj3]
+
+        self.assertEqual(expected_value, self._todo_index.due_between(date(2022, 9, 20), date(2022, 9, 22)))
+
+    def test_due_between_should_be_unbounded_if_dates_not_passed(self):
+        self.assertEqual(list(self._todo_index), self._todo_index.due_between())
+
+    def test_index_of_no_todo_items_should_return_empty_results(self):
+        todo_index = TodoIndex({})
+
+        self.assertEqual(0, len(todo_index))
+        self.assertEqual([], todo_index.expired())
+        self.assertEqual([], todo_index.due_within(7))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,18 @@
+import os
+import tempfile
 import unittest
 from typing import Dict, List
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from todonotifier.constants import DEFAULT_COMPLETION_DATE, UNKNOWN_USER_NAME
 from todonotifier.models import POSITION, TODO, USER
-from todonotifier.todo_notifier import parse_files_for_todo_items
+from todonotifier.todo_notifier import (
+    ParseCache,
+    ParseDiagnostics,
+    ScanOptions,
+    get_todo_regexes,
+    parse_files_for_todo_items,
+)
 
 
 class UnitTestCustomException(Exception):
@@ -225,7 +233,7 @@ class TestParseFilesForTodoItems(unittest.TestCase):
                     USER("ashutosh"),
                     "2022-05-07",
                     "sample_test_file.py",
-                    POSITION(53),  # Not sure why 53, should be 54
+                    POSITION(54),
                 ),
             ]
         }
@@ -309,6 +317,274 @@ class TestParseFilesForTodoItems(unittest.TestCase):
 
         self._compare_todos(expected_value, actual_value)
 
+    def test_parse_files_for_todo_items_should_call_on_todo_with_every_todo_item(self):
+        dummy_files = ["tests/sample_test_file.py", "tests/sample_test_file2.py"]
+        spy_todos = []
+
+        actual_value = parse_files_for_todo_items("tests", dummy_files, False, on_todo=spy_todos.append)
+
+        self.assertEqual([todo_obj for module in actual_value for todo_obj in actual_value[module]], spy_todos)
+
+    @patch("todonotifier.todo_notifier.compute_line_and_pos_given_span")
+    def test_parse_files_for_todo_items_should_record_errors_in_parsing_todo_items_into_diagnostics(self, stub_compute_line_and_pos_given_span):
+        stub_compute_line_and_pos_given_span.side_effect = ValueError("unittest-exception")
+        diagnostics = ParseDiagnostics(max_samples=2)
+
+        with self.assertLogs("todonotifier.todo_notifier", level="WARNING") as logs:
+            parse_files_for_todo_items("tests", ["tests/sample_test_file2.py"], False, diagnostics=diagnostics)
+
+        self.assertEqual({"ValueError": 2}, diagnostics.counts)
+        self.assertEqual([("ValueError", "sample_test_file2.py", 4), ("ValueError", "sample_test_file2.py", 5)], diagnostics.samples)
+        self.assertEqual(2, len(logs.records))
+
+    @patch("todonotifier.todo_notifier.compute_file_line_no_to_chars_map")
+    def test_parse_files_for_todo_items_should_record_errors_in_parsing_file_into_diagnostics(self, stub_compute_file_line_no_to_chars_map):
+        stub_compute_file_line_no_to_chars_map.side_effect = OSError("unittest-exception")
+        diagnostics = ParseDiagnostics()
+
+        parse_files_for_todo_items("tests", ["tests/sample_test_file2.py"], False, diagnostics=diagnostics)
+
+        self.assertEqual([("OSError", "sample_test_file2.py", None)], diagnostics.samples)
+
+    @patch("todonotifier.todo_notifier._get_todo")
+    def test_parse_files_for_todo_items_should_record_errors_only_of_attempt_decoding_file(self, stub_get_todo):
+        stub_get_todo.side_effect = ValueError("unittest-exception")
+        diagnostics = ParseDiagnostics()
+        scan_options = ScanOptions(chunk_size=64, chunked_scan_threshold=0, encoding_errors="strict", fallback_encodings=["latin-1"])
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dummy_file = os.path.join(temp_dir, "unittest-file.py")
+            # The undecodable character is read only after the todo item was parsed with the first encoding
+            with open(dummy_file, "wb") as f:
+                f.write(("# TODO unittest-msg\n" + "x = 1\n" * 10000 + "# caf\xe9\n").encode("latin-1"))
+
+            parse_files_for_todo_items(temp_dir, [dummy_file], False, scan_options=scan_options, diagnostics=diagnostics)
+
+        self.assertEqual({"ValueError": 1}, diagnostics.counts)
+        self.assertEqual([("ValueError", "unittest-file.py", 1)], diagnostics.samples)
+
+
+class TestGetTodoRegexes(unittest.TestCase):
+    def test_get_todo_regexes_should_compile_regexes_once(self):
+        self.assertIs(get_todo_regexes(True), get_todo_regexes(True))
+        self.assertIsNot(get_todo_regexes(True), get_todo_regexes(False))
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._dummy_file = os.path.join(self._temp_dir.name, "unittest-file.py")
+        self._write_dummy_file("# TODO unittest-msg\n")
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _write_dummy_file(self, content: str, mtime_ns: int = 1_000_000_000) -> None:
+        with open(self._dummy_file, "w") as f:
+            f.write(content)
+        os.utime(self._dummy_file, ns=(mtime_ns, mtime_ns))
+
+    def test_get_or_parse_should_not_parse_unchanged_file_again(self):
+        parse_cache = ParseCache()
+        spy_parse = Mock(return_value=["unittest-todo"])
+
+        first_value = parse_cache.get_or_parse(self._dummy_file, "unittest-file.py", False, spy_parse)
+        second_value = parse_cache.get_or_parse(self._dummy_file, "unittest-file.py", False, spy_parse)
+
+        self.assertEqual(["unittest-todo"], first_value)
+        self.assertEqual(["unittest-todo"], second_value)
+        spy_parse.assert_called_once_with()
+        self.assertEqual((1, 1), (parse_cache.hits, parse_cache.misses))
+
+    def test_get_or_parse_should_not_parse_file_rewritten_with_same_content_again(self):
+        parse_cache = ParseCache()
+        spy_parse = Mock(return_value=["unittest-todo"])
+        parse_cache.get_or_parse(self._dummy_file, "unittest-file.py", False, spy_parse)
+
+        self._write_dummy_file("# TODO unittest-msg\n", mtime_ns=2_000_000_000)
+        parse_cache.get_or_parse(self._dummy_file, "unittest-file.py", False, spy_parse)
+
+        spy_parse.assert_called_once_with()
+
+    def test_get_or_parse_should_parse_changed_file_again(self):
+        parse_cache = ParseCache()
+        spy_parse = Mock(return_value=["unittest-todo"])
+        parse_cache.get_or_parse(self._dummy_file, "unittest-file.py", False, spy_parse)
+
+        self._write_dummy_file("# TODO unittest-changed-msg\n", mtime_ns=2_000_000_000)
+        parse_cache.get_or_parse(self._dummy_file, "unittest-file.py", False, spy_parse)
+
+        self.assertEqual(2, spy_parse.call_count)
+
+    def test_get_or_parse_should_parse_file_again_for_different_todo_case(self):
+        parse_cache = ParseCache()
+        spy_parse = Mock(return_value=["unittest-todo"])
+
+        parse_cache.get_or_parse(self._dummy_file, "unittest-file.py", False, spy_parse)
+        parse_cache.get_or_parse(self._dummy_file, "unittest-file.py", True, spy_parse)
+
+        self.assertEqual(2, spy_parse.call_count)
+
+    def test_retain_should_evict_other_files(self):
+        parse_cache = ParseCache()
+        parse_cache.get_or_parse(self._dummy_file, "unittest-file.py", False, Mock(return_value=[]))
+
+        parse_cache.retain(["unittest-other-file.py"])
+
+        self.assertEqual(0, len(parse_cache))
+
+    def test_parse_files_for_todo_items_should_use_parse_cache_if_passed(self):
+        parse_cache = ParseCache()
+
+        first_value = parse_files_for_todo_items(self._temp_dir.name, [self._dummy_file], False, parse_cache=parse_cache)
+        second_value = parse_files_for_todo_items(self._temp_dir.name, [self._dummy_file], False, parse_cache=parse_cache)
+
+        self.assertEqual(["unittest-msg"], [todo.msg for todo in second_value["unittest-file.py"]])
+        self.assertEqual(first_value["unittest-file.py"], second_value["unittest-file.py"])
+        self.assertEqual((1, 1), (parse_cache.hits, parse_cache.misses))
+
+
+class TestParseDiagnostics(unittest.TestCase):
+    def test_record_should_count_errors_by_kind_and_cap_samples(self):
+        diagnostics = ParseDiagnostics(max_samples=2)
+
+        for line_no in range(3):
+            diagnostics.record(ValueError("unittest-exception"), "unittest-module.py", line_no)
+        diagnostics.record(OSError("unittest-exception"), "unittest-other-module.py")
+
+        self.assertEqual({"ValueError": 3, "OSError": 1}, diagnostics.counts)
+        self.assertEqual(4, diagnostics.error_count)
+        self.assertEqual([("ValueError", "unittest-module.py", 0), ("ValueError", "unittest-module.py", 1)], diagnostics.samples)
+
+    def test_record_should_log_only_sampled_errors_as_warnings_and_tracebacks_at_debug_level(self):
+        diagnostics = ParseDiagnostics(max_samples=1)
+
+        with self.assertLogs("todonotifier.todo_notifier", level="DEBUG") as logs:
+            for _ in range(3):
+                diagnostics.record(ValueError("unittest-exception"), "unittest-module.py", 1)
+
+        self.assertEqual(["WARNING", "DEBUG", "DEBUG", "DEBUG"], [record.levelname for record in logs.records])
+        self.assertIn("unittest-module.py:1: ValueError: unittest-exception", logs.records[0].getMessage())
+        self.assertIsNone(logs.records[0].exc_info)
+        self.assertIsNotNone(logs.records[1].exc_info)
+
+
+class TestScanOptions(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._dummy_file = os.path.join(self._temp_dir.name, "unittest-file.py")
+        with open(self._dummy_file, "w") as f:
+            f.write("import os\n# TODO unittest-msg-1\n\nx = 1  # TODO {2022-01-01} @unittest-user unittest-msg-2\n# TODO unittest-msg-3")
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _get_msgs_and_lines(self, all_todos_objs):
+        return [(todo.msg, todo.position.line_no) for todos in all_todos_objs.values() for todo in todos]
+
+    def test_scan_options_should_raise_value_error_for_non_positive_chunk_size(self):
+        self.assertRaises(ValueError, ScanOptions, chunk_size=0)
+
+    def test_parse_files_for_todo_items_should_scan_large_files_in_chunks_same_as_reading_at_once(self):
+        dummy_files = ["tests/sample_test_file.py", "tests/sample_test_file2.py"]
+        expected_value = self._get_msgs_and_lines(parse_files_for_todo_items("tests", dummy_files, False))
+
+        for chunk_size in (1, 7, 64, 1 << 20):
+            scan_options = ScanOptions(chunk_size=chunk_size, chunked_scan_threshold=0)
+            actual_value = self._get_msgs_and_lines(parse_files_for_todo_items("tests", dummy_files, False, scan_options=scan_options))
+
+            self.assertEqual(expected_value, actual_value)
+
+    def test_parse_files_for_todo_items_should_report_same_line_numbers_when_reading_at_once_or_in_chunks(self):
+        with open(self._dummy_file, "w") as f:
+            f.write("x = 1\nTODO {2020-01-01} @bob first\n\nTODO second\n  # TODO third\nTODO fourth")
+        expected_value = [("first", 2), ("second", 4), ("third", 5), ("fourth", 6)]
+
+        for scan_options in (ScanOptions(), ScanOptions(chunk_size=4, chunked_scan_threshold=0), ScanOptions(chunk_size=1 << 20, chunked_scan_threshold=0)):
+            actual_value = parse_files_for_todo_items(self._temp_dir.name, [self._dummy_file], False, scan_options=scan_options)
+
+            self.assertEqual(expected_value, self._get_msgs_and_lines(actual_value))
+
+    def test_parse_files_for_todo_items_should_not_split_todo_items_across_chunks(self):
+        scan_options = ScanOptions(chunk_size=5, chunked_scan_threshold=0)
+
+        actual_value = parse_files_for_todo_items(self._temp_dir.name, [self._dummy_file], False, scan_options=scan_options)
+
+        self.assertEqual(
+            [("unittest-msg-1", 2), ("unittest-msg-2", 4), ("unittest-msg-3", 5)],
+            self._get_msgs_and_lines(actual_value),
+        )
+        self.assertEqual("unittest-user", actual_value["unittest-file.py"][1].user.user_name)
+
+    def test_parse_files_for_todo_items_should_skip_and_report_files_larger_than_max_file_size(self):
+        spy_skipped_files = []
+
+        actual_value = parse_files_for_todo_items(
+            self._temp_dir.name, [self._dummy_file], False, scan_options=ScanOptions(max_file_size=10), on_skip=spy_skipped_files.append
+        )
+
+        self.assertEqual({"unittest-file.py": []}, actual_value)
+        self.assertEqual([("unittest-file.py", "File larger than 10 bytes")], [(file.module, file.reason) for file in spy_skipped_files])
+
+    def test_parse_files_for_todo_items_should_skip_and_report_files_with_lines_longer_than_max_line_length(self):
+        for chunked_scan_threshold in (0, 1 << 20):
+            spy_skipped_files = []
+            scan_options = ScanOptions(chunk_size=4, chunked_scan_threshold=chunked_scan_threshold, max_line_length=30)
+
+            actual_value = parse_files_for_todo_items(
+                self._temp_dir.name, [self._dummy_file], False, scan_options=scan_options, on_skip=spy_skipped_files.append
+            )
+
+            self.assertEqual({"unittest-file.py": []}, actual_value)
+            self.assertEqual(["Line longer than 30 characters"], [file.reason for file in spy_skipped_files])
+
+    def test_parse_files_for_todo_items_should_parse_files_within_limits(self):
+        scan_options = ScanOptions(max_file_size=1 << 10, max_line_length=1 << 10)
+
+        actual_value = parse_files_for_todo_items(self._temp_dir.name, [self._dummy_file], False, scan_options=scan_options)
+
+        self.assertEqual(3, len(actual_value["unittest-file.py"]))
+
+    def test_scan_options_should_raise_value_error_for_unknown_encoding_or_error_policy(self):
+        self.assertRaises(ValueError, ScanOptions, encoding="unittest-encoding")
+        self.assertRaises(ValueError, ScanOptions, fallback_encodings=["unittest-encoding"])
+        self.assertRaises(ValueError, ScanOptions, encoding_errors="unittest-policy")
+
+    def _parse_bytes(self, content, scan_options=None):
+        with open(self._dummy_file, "wb") as f:
+            f.write(content)
+        spy_skipped_files = []
+
+        all_todos_objs = parse_files_for_todo_items(self._temp_dir.name, [self._dummy_file], False, scan_options=scan_options, on_skip=spy_skipped_files.append)
+
+        return [todo.msg for todo in all_todos_objs["unittest-file.py"]], [file.reason for file in spy_skipped_files]
+
+    def test_parse_files_for_todo_items_should_skip_binary_files(self):
+        self.assertEqual(([], ["Binary file"]), self._parse_bytes(b"\x7fELF\0\0# TODO unittest-msg\n"))
+
+    def test_parse_files_for_todo_items_should_only_sniff_binary_sniff_size_bytes(self):
+        content = b"# TODO unittest-msg\n\0"
+
+        self.assertEqual((["unittest-msg"], []), self._parse_bytes(content, ScanOptions(binary_sniff_size=len(content) - 1)))
+        self.assertEqual((["unittest-msg"], []), self._parse_bytes(content, ScanOptions(binary_sniff_size=0)))
+
+    def test_parse_files_for_todo_items_should_keep_todo_items_of_files_with_undecodable_bytes(self):
+        content = "# caf\xe9\n# TODO unittest-msg\n".encode("latin-1")
+
+        self.assertEqual((["unittest-msg"], []), self._parse_bytes(content))
+        self.assertEqual((["unittest-msg"], []), self._parse_bytes(content, ScanOptions(chunk_size=3, chunked_scan_threshold=0)))
+
+    def test_parse_files_for_todo_items_should_try_fallback_encodings_with_strict_error_policy(self):
+        content = "# TODO unittest-caf\xe9\n".encode("latin-1")
+
+        self.assertEqual((["unittest-caf\xe9"], []), self._parse_bytes(content, ScanOptions(encoding_errors="strict", fallback_encodings=["latin-1"])))
+        self.assertEqual(([], ["Not decodable as utf-8"]), self._parse_bytes(content, ScanOptions(encoding_errors="strict")))
+
+    def test_parse_files_for_todo_items_should_detect_encoding_from_byte_order_mark(self):
+        content = "# TODO unittest-caf\xe9\n"
+
+        for encoding in ("utf-8-sig", "utf-16", "utf-32"):
+            self.assertEqual((["unittest-caf\xe9"], []), self._parse_bytes(content.encode(encoding), ScanOptions(encoding="latin-1")))
+
 
 if __name__ == "__main__":
     unittest.main()
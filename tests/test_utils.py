@@ -4,6 +4,9 @@ import unittest
 from unittest.mock import Mock, patch
 
 from todonotifier.constants import DEFAULT_EXCLUDE_DIRS, DEFAULT_EXCLUDE_FILES
+from todonotifier.models import POSITION, TODO, USER
+from todonotifier.summary_generators import ByModuleSummaryGenerator
+from todonotifier.todo_index import TodoIndex
 from todonotifier.utils import (
     InCompatibleTypesException,
     _ignore_dir_or_file,
@@ -13,6 +16,7 @@ from todonotifier.utils import (
     get_files_in_dir,
     recursive_update,
     store_html,
+    store_sharded_html,
 )
 
 
@@ -144,6 +148,16 @@ class TestGetFilesInDir(unittest.TestCase):
             actual_value = set(get_files_in_dir(temp_dir, dummy_extension, {}, {}))
             self.assertEqual(expected_value, actual_value)
 
+    def test_get_files_in_dir_should_give_files_of_all_extensions(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for file_name in ("file.py", "file.js", "file.txt"):
+                with open(os.path.join(temp_dir, file_name), "w") as f:
+                    f.write("unittest-content")
+
+            actual_value = set(get_files_in_dir(temp_dir, ["py", "js"], {}, {}))
+
+            self.assertEqual({os.path.join(temp_dir, "file.py"), os.path.join(temp_dir, "file.js")}, actual_value)
+
     @patch("todonotifier.utils._ignore_dir_or_file")
     def test_get_files_in_dir_should_not_throw_exception_if_caught_any(self, stub__ignore_dir_or_file):
         dummy_extension = "py"
@@ -192,6 +206,16 @@ class TestComputeFileLineNoToCharsMap(unittest.TestCase):
 
             self.assertEqual(expected_value, actual_value)
 
+    def test_compute_file_line_no_to_chars_map_should_decode_file_with_encoding_and_errors(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dummy_file_path = os.path.join(temp_dir, "unittest-file.py")
+            with open(dummy_file_path, "wb") as f:
+                f.write("caf\xe9\n\xe9".encode("latin-1"))
+
+            self.assertEqual({1: 5, 2: 1}, compute_file_line_no_to_chars_map(dummy_file_path, encoding="latin-1"))
+            self.assertEqual({1: 5, 2: 1}, compute_file_line_no_to_chars_map(dummy_file_path, encoding="utf-8", errors="replace"))
+            self.assertRaises(UnicodeDecodeError, compute_file_line_no_to_chars_map, dummy_file_path, encoding="utf-8")
+
 
 class TestComputeLineAndPosGivenSpan(unittest.TestCase):
     def test_compute_line_and_pos_given_span(self):
@@ -203,6 +227,14 @@ class TestComputeLineAndPosGivenSpan(unittest.TestCase):
 
         self.assertEqual(expected_value, actual_value)
 
+    def test_compute_line_and_pos_given_span_should_return_line_of_match_at_start_of_line(self):
+        dummy_line_no_to_chars_map = {1: 11, 2: 8, 3: 5, 4: 9}  # """Dummy file\ncontent\nfor \nunittests"""
+
+        self.assertEqual(
+            [1, 1, 2, 2, 3, 4],
+            [compute_line_and_pos_given_span(dummy_line_no_to_chars_map, (start, -1)) for start in (0, 10, 11, 18, 19, 24)],
+        )
+
 
 class TestGenerateSummary(unittest.TestCase):
     def test_generate_summary_should_call_all_summary_generators(self):
@@ -253,6 +285,55 @@ class TestGenerateSummary(unittest.TestCase):
         spy_summary_generator1.generate_html.assert_called_once_with()
         spy_summary_generator3.generate_html.assert_called_once_with()
 
+    def test_generate_summary_should_bind_same_todo_index_to_all_summary_generators(self):
+        dummy_all_todos_objs = {"unittest-key": []}
+        spy_summary_generator1 = Mock()
+        spy_summary_generator2 = Mock()
+
+        generate_summary(dummy_all_todos_objs, [spy_summary_generator1, spy_summary_generator2], False)
+
+        self.assertIsInstance(spy_summary_generator1.todo_index, TodoIndex)
+        self.assertIs(spy_summary_generator1.todo_index, spy_summary_generator2.todo_index)
+
+    def test_generate_summary_should_bind_passed_todo_index(self):
+        dummy_all_todos_objs = {"unittest-key": []}
+        dummy_todo_index = TodoIndex(dummy_all_todos_objs)
+        spy_summary_generator = Mock()
+
+        generate_summary(dummy_all_todos_objs, [spy_summary_generator], False, todo_index=dummy_todo_index)
+
+        self.assertIs(dummy_todo_index, spy_summary_generator.todo_index)
+
+    def test_generate_summary_should_reset_summary_generators_before_generating_summary(self):
+        dummy_all_todos_objs = {"unittest-key": []}
+        spy_summary_generator = Mock()
+
+        generate_summary(dummy_all_todos_objs, [spy_summary_generator], False)
+
+        self.assertEqual(["reset", "generate_summary", "result"], [method_call[0] for method_call in spy_summary_generator.method_calls])
+
+    def test_generate_summary_should_return_results_of_summary_generators_that_did_not_fail(self):
+        dummy_all_todos_objs = {"unittest-key": []}
+        spy_summary_generator1 = Mock()
+        spy_summary_generator2 = Mock()
+        spy_summary_generator2.generate_summary.side_effect = Exception("unittest-summary-generator2-exception")
+
+        actual_value = generate_summary(dummy_all_todos_objs, [spy_summary_generator1, spy_summary_generator2], False)
+
+        self.assertEqual([spy_summary_generator1.result.return_value], actual_value)
+
+    def test_generate_summary_should_not_accumulate_todo_items_across_runs(self):
+        dummy_module = "unittest-module"
+        dummy_all_todos_objs = {dummy_module: [TODO("unittest-msg", USER("unittest-user"), "2022-09-22", dummy_module, POSITION(1))]}
+        summary_generator = ByModuleSummaryGenerator()
+
+        first_summary_result = generate_summary(dummy_all_todos_objs, [summary_generator], True)[0]
+        second_summary_result = generate_summary(dummy_all_todos_objs, [summary_generator], True)[0]
+
+        self.assertEqual(1, len(summary_generator.container[dummy_module]))
+        self.assertEqual(1, len(first_summary_result.container[dummy_module]))
+        self.assertEqual(first_summary_result.html, second_summary_result.html)
+
 
 class TestStoreHtml(unittest.TestCase):
     def test_store_html_should_store_html_file_passed_without_extension(self):
@@ -265,6 +346,17 @@ class TestStoreHtml(unittest.TestCase):
 
             self.assertTrue(os.path.isfile(expected_file))
 
+    def test_store_html_should_store_html_passed_in_chunks(self):
+        dummy_html_chunks = iter(["<div>", "unittest-html", "</div>"])
+        dummy_report_name = "unittest-report"
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store_html(dummy_html_chunks, dummy_report_name, temp_dir)
+            with open(os.path.join(temp_dir, f"{dummy_report_name}.html")) as f:
+                actual_value = f.read()
+
+        self.assertEqual("<div>unittest-html</div>", actual_value)
+
     def test_store_html_should_store_html_file_passed_with_extension(self):
         dummy_html = "<div>unittest-html</div>"
         dummy_report_name = "unittest-report.html"
@@ -289,5 +381,21 @@ class TestStoreHtml(unittest.TestCase):
             self.assertTrue(os.path.isfile(expected_file))
 
 
+class TestStoreShardedHtml(unittest.TestCase):
+    def test_store_sharded_html_should_store_index_and_one_file_per_shard(self):
+        dummy_row = ["unittest-dummy-user-name", "unittest-dummy-msg", 1, "2022-09-22"]
+        dummy_container = {os.path.join("project", "pkg1", "module1.py"): [dummy_row], os.path.join("project", "pkg2", "module2.py"): [dummy_row]}
+        by_module_summary_generator = ByModuleSummaryGenerator(container=dummy_container, shard=True)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store_sharded_html(by_module_summary_generator, "unittest-report", temp_dir, max_workers=2)
+            actual_value = sorted(os.listdir(os.path.join(temp_dir, "unittest-report")))
+            with open(os.path.join(temp_dir, "unittest-report", "00001-pkg2.html")) as f:
+                shard_html = f.read()
+
+        self.assertEqual(["00000-pkg1.html", "00001-pkg2.html", "index.html"], actual_value)
+        self.assertIn(os.path.join("project", "pkg2", "module2.py"), shard_html)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,212 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from typing import Dict, List
+from unittest.mock import Mock, patch
+
+from tests.mocks import MockTestConfig
+from todonotifier.connect import Connect, ConnectMethod
+from todonotifier.todo_notifier import parse_files_for_todo_items
+from todonotifier.watch import (
+    InotifyWatcher,
+    PollingWatcher,
+    TodoWatcher,
+    WatcherException,
+    create_watcher,
+)
+
+
+def _write_file(file_path: str, content: str) -> None:
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, "w") as f:
+        f.write(content)
+
+
+class TestPollingWatcher(unittest.TestCase):
+    def test_read_changes_should_return_created_modified_and_deleted_files(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _write_file(os.path.join(temp_dir, "modified.py"), "# old")
+            _write_file(os.path.join(temp_dir, "deleted.py"), "# deleted")
+            _write_file(os.path.join(temp_dir, "unchanged.py"), "# unchanged")
+            watcher = PollingWatcher(temp_dir, {}, poll_interval=0)
+
+            _write_file(os.path.join(temp_dir, "modified.py"), "# new content")
+            os.remove(os.path.join(temp_dir, "deleted.py"))
+            _write_file(os.path.join(temp_dir, "sub_dir", "created.py"), "# created")
+            actual_value = watcher.read_changes(timeout=1)
+
+        expected_value = {os.path.join(temp_dir, "modified.py"), os.path.join(temp_dir, "deleted.py"), os.path.join(temp_dir, "sub_dir", "created.py")}
+        self.assertEqual(expected_value, actual_value)
+
+    def test_read_changes_should_not_scan_before_poll_interval(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            watcher = PollingWatcher(temp_dir, {}, poll_interval=60)
+            _write_file(os.path.join(temp_dir, "created.py"), "# created")
+
+            self.assertEqual(set(), watcher.read_changes(timeout=0))
+
+    def test_read_changes_should_ignore_excluded_dirs(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            watcher = PollingWatcher(temp_dir, {"NAME": [".git"]}, poll_interval=0)
+            _write_file(os.path.join(temp_dir, ".git", "index"), "unittest-index")
+
+            self.assertEqual(set(), watcher.read_changes(timeout=1))
+
+
+class TestInotifyWatcher(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        try:
+            self._watcher = InotifyWatcher(self._temp_dir.name, {"NAME": [".git"]})
+        except WatcherException as exc:
+            self._temp_dir.cleanup()
+            self.skipTest(f"inotify isn't available: {exc}")
+
+    def tearDown(self):
+        self._watcher.close()
+        self._temp_dir.cleanup()
+
+    def test_read_changes_should_return_changed_files(self):
+        dummy_file = os.path.join(self._temp_dir.name, "unittest-file.py")
+
+        _write_file(dummy_file, "# TODO unittest-msg")
+
+        self.assertIn(dummy_file, self._watcher.read_changes(timeout=1))
+
+    def test_read_changes_should_watch_created_dirs(self):
+        dummy_dir = os.path.join(self._temp_dir.name, "unittest-dir")
+        os.makedirs(dummy_dir)
+        self.assertIn(dummy_dir, self._watcher.read_changes(timeout=1))
+
+        _write_file(os.path.join(dummy_dir, "unittest-file.py"), "# TODO unittest-msg")
+
+        self.assertIn(os.path.join(dummy_dir, "unittest-file.py"), self._watcher.read_changes(timeout=1))
+
+    def test_read_changes_should_ignore_excluded_dirs(self):
+        _write_file(os.path.join(self._temp_dir.name, ".git", "index"), "unittest-index")
+        self._watcher.read_changes(timeout=1)
+
+        _write_file(os.path.join(self._temp_dir.name, ".git", "index"), "unittest-new-index")
+
+        self.assertEqual(set(), self._watcher.read_changes(timeout=0.1))
+
+
+class TestCreateWatcher(unittest.TestCase):
+    def test_create_watcher_should_use_polling_if_inotify_is_disabled(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.assertIsInstance(create_watcher(temp_dir, {}, use_inotify=False), PollingWatcher)
+
+    @patch("todonotifier.watch.InotifyWatcher")
+    def test_create_watcher_should_fall_back_to_polling_if_inotify_is_not_available(self, stub_inotify_watcher):
+        stub_inotify_watcher.side_effect = WatcherException("unittest-exception")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.assertIsInstance(create_watcher(temp_dir, {}), PollingWatcher)
+
+
+class TestTodoWatcher(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._project_dir = os.path.join(self._temp_dir.name, "unittest-project")
+        _write_file(os.path.join(self._project_dir, "module1.py"), "# TODO unittest-msg-1\n")
+        _write_file(os.path.join(self._project_dir, "pkg", "module2.py"), "# TODO unittest-msg-2\n")
+        self._connect = Connect(ConnectMethod.DRY_RUN_DIR, "unittest-project", self._project_dir)
+        self._config = MockTestConfig(exclude_dirs={"NAME": ["excluded"]}, save_html_reports=False)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _get_msgs(self, todo_watcher: TodoWatcher) -> Dict[str, List[str]]:
+        return {module: [todo.msg for todo in todos] for module, todos in todo_watcher.all_todos_objs.items()}
+
+    def test_todo_watcher_should_raise_value_error_for_other_connect_methods(self):
+        with self.assertRaises(ValueError):
+            TodoWatcher(Connect(ConnectMethod.GIT_CLONE, "unittest-project", "unittest-url"))
+
+    def test_scan_should_parse_all_files(self):
+        todo_watcher = TodoWatcher(self._connect, self._config)
+
+        todo_watcher.scan()
+
+        expected_value = {
+            os.path.join("unittest-project", "module1.py"): ["unittest-msg-1"],
+            os.path.join("unittest-project", "pkg", "module2.py"): ["unittest-msg-2"],
+        }
+        self.assertEqual(expected_value, self._get_msgs(todo_watcher))
+
+    def test_apply_changes_should_only_parse_changed_files(self):
+        todo_watcher = TodoWatcher(self._connect, self._config)
+        todo_watcher.scan()
+        changed_file = os.path.join(self._project_dir, "module1.py")
+        _write_file(changed_file, "# TODO unittest-msg-changed\n")
+
+        with patch("todonotifier.watch.parse_files_for_todo_items", wraps=parse_files_for_todo_items) as spy_parse:
+            result = todo_watcher.apply_changes({changed_file})
+
+        self.assertEqual([changed_file], spy_parse.call_args.args[1])
+        self.assertEqual(["unittest-msg-changed"], self._get_msgs(todo_watcher)[os.path.join("unittest-project", "module1.py")])
+        self.assertEqual(2, len(result.todo_index))
+
+    @patch("todonotifier.watch.store_reports")
+    def test_scan_should_store_reports_in_report_dir(self, spy_store_reports):
+        config = MockTestConfig(exclude_dirs={"NAME": ["excluded"]}, report_dir=os.path.join(self._temp_dir.name, "unittest-report-dir"))
+        todo_watcher = TodoWatcher(self._connect, config)
+
+        todo_watcher.scan()
+
+        self.assertEqual(config.report_dir, spy_store_reports.call_args.kwargs["target_dir"])
+
+    def test_apply_changes_should_drop_deleted_files_and_dirs(self):
+        todo_watcher = TodoWatcher(self._connect, self._config)
+        todo_watcher.scan()
+        os.remove(os.path.join(self._project_dir, "module1.py"))
+        shutil.rmtree(os.path.join(self._project_dir, "pkg"))
+
+        todo_watcher.apply_changes({os.path.join(self._project_dir, "module1.py"), os.path.join(self._project_dir, "pkg")})
+
+        self.assertEqual({}, todo_watcher.all_todos_objs)
+
+    def test_apply_changes_should_rescan_changed_dirs_and_skip_excluded_ones(self):
+        todo_watcher = TodoWatcher(self._connect, self._config)
+        todo_watcher.scan()
+        _write_file(os.path.join(self._project_dir, "new_pkg", "module3.py"), "# TODO unittest-msg-3\n")
+        _write_file(os.path.join(self._project_dir, "excluded", "module4.py"), "# TODO unittest-msg-4\n")
+
+        todo_watcher.apply_changes(
+            {
+                os.path.join(self._project_dir, "new_pkg"),
+                os.path.join(self._project_dir, "excluded"),
+                os.path.join(self._project_dir, "excluded", "module4.py"),
+            }
+        )
+
+        self.assertIn(os.path.join("unittest-project", "new_pkg", "module3.py"), todo_watcher.all_todos_objs)
+        self.assertNotIn(os.path.join("unittest-project", "excluded", "module4.py"), todo_watcher.all_todos_objs)
+
+    def test_watch_should_apply_batched_changes_until_stopped(self):
+        spy_on_update = Mock()
+        updated = threading.Event()
+        spy_on_update.side_effect = lambda result: updated.set() if len(result.todo_index) == 4 else None
+        todo_watcher = TodoWatcher(self._connect, self._config, debounce_seconds=0.2, poll_interval=0.05, on_update=spy_on_update)
+        watcher_thread = threading.Thread(target=todo_watcher.watch)
+        watcher_thread.start()
+        try:
+            while not spy_on_update.called:
+                threading.Event().wait(0.01)
+
+            for file_no in range(2):
+                _write_file(os.path.join(self._project_dir, f"new{file_no}.py"), f"# TODO unittest-new-msg-{file_no}\n")
+
+            self.assertTrue(updated.wait(timeout=5))
+        finally:
+            todo_watcher.stop()
+            watcher_thread.join(timeout=5)
+
+        self.assertFalse(watcher_thread.is_alive())
+        self.assertEqual(2, spy_on_update.call_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -104,3 +104,8 @@ pip install todonotifier
 
 For more examples and advanced usage, see the individual module documentation.
 """
+
+import logging
+
+# Library doesn't configure logging on import. `driver.run` configures it unless the host application already did.
+logging.getLogger(__name__).addHandler(logging.NullHandler())
@@ -0,0 +1,7 @@
+"""Allows running the command line interface as `python -m todonotifier`"""
+
+import sys
+
+from todonotifier.cli import main
+
+sys.exit(main())
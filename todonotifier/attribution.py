@@ -0,0 +1,285 @@
+"""This module provides attribution of todo items without a user i.e. those of `UNKNOWN_USER_NAME`
+to the author of their line as per `git blame`.
+
+Only lines holding unattributed todo items are blamed. Lines of a file are blamed together in one
+`git blame` call with one line range per todo item and files are blamed in parallel. Authors are
+cached by blob SHA of the file and line number, so files unchanged since an earlier run are never
+blamed again.
+"""
+
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple, Union
+
+from todonotifier.constants import UNKNOWN_USER_NAME
+from todonotifier.models import TODO, USER
+
+if TYPE_CHECKING:
+    from git.repo import Repo
+
+logger = logging.getLogger(__name__)
+
+# Author of lines not committed yet as reported by `git blame`
+NOT_COMMITTED_AUTHOR = "Not Committed Yet"
+
+
+class BlameCache:
+    """Cache of authors of lines keyed by blob SHA of the file and line number. Optionally kept in a JSON file across runs"""
+
+    def __init__(self, cache_file: Union[str, None] = None) -> None:
+        """Initializer for `BlameCache` class
+
+        Args:
+            cache_file (Union[str, None], optional): JSON file in which the cache is kept across runs. Loaded if it exists and created on
+                                                     first save. Defaults to None i.e. the cache is only kept in memory
+        """
+        self._cache_file = cache_file
+        # Maps blob SHA to line number to author
+        self._entries: Dict[str, Dict[int, str]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+        if cache_file is not None and os.path.isfile(cache_file):
+            with open(cache_file) as f:
+                self._entries = {blob_sha: {int(line_no): author for line_no, author in authors.items()} for blob_sha, authors in json.load(f).items()}
+
+    @property
+    def cache_file(self) -> Union[str, None]:
+        """Getter for `cache_file`
+
+        Returns:
+            Union[str, None]: JSON file in which the cache is kept. None if the cache is only kept in memory
+        """
+        return self._cache_file
+
+    @property
+    def hits(self) -> int:
+        """Getter for `hits`
+
+        Returns:
+            int: Number of lines whose author was served from the cache
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Getter for `misses`
+
+        Returns:
+            int: Number of lines that had to be blamed
+        """
+        return self._misses
+
+    def __len__(self) -> int:
+        """Returns the number of cached lines
+
+        Returns:
+            int: Number of cached lines
+        """
+        return sum(len(authors) for authors in self._entries.values())
+
+    def get(self, blob_sha: str, line_nos: Iterable[int]) -> Tuple[Dict[int, str], List[int]]:
+        """Returns the cached authors of `line_nos` of blob `blob_sha`
+
+        Args:
+            blob_sha (str): SHA of the blob of the file
+            line_nos (Iterable[int]): Line numbers whose authors are needed
+
+        Returns:
+            Tuple[Dict[int, str], List[int]]: Key-value pair of cached line numbers and their authors along with line numbers not cached
+        """
+        authors = self._entries.get(blob_sha, {})
+        cached, missing = {}, []
+        for line_no in line_nos:
+            if line_no in authors:
+                cached[line_no] = authors[line_no]
+            else:
+                missing.append(line_no)
+
+        with self._lock:
+            self._hits += len(cached)
+            self._misses += len(missing)
+
+        return cached, missing
+
+    def put(self, blob_sha: str, authors: Dict[int, str]) -> None:
+        """Caches `authors` of lines of blob `blob_sha`
+
+        Args:
+            blob_sha (str): SHA of the blob of the file
+            authors (Dict[int, str]): Key-value pair of line numbers and their authors
+        """
+        with self._lock:
+            self._entries.setdefault(blob_sha, {}).update(authors)
+
+    def retain(self, blob_shas: Iterable[str]) -> None:
+        """Evicts cached blobs not in `blob_shas` e.g. old versions of files changed since the last run
+
+        Args:
+            blob_shas (Iterable[str]): SHAs of blobs that need to be kept in the cache
+        """
+        blob_shas = set(blob_shas)
+        with self._lock:
+            for blob_sha in [blob_sha for blob_sha in self._entries if blob_sha not in blob_shas]:
+                del self._entries[blob_sha]
+
+    def save(self) -> None:
+        """Writes the cache into `cache_file` replacing the earlier one atomically. It is a no-op if the cache is only kept in memory"""
+        if self._cache_file is None:
+            return
+
+        os.makedirs(os.path.dirname(os.path.abspath(self._cache_file)), exist_ok=True)
+        with open(f"{self._cache_file}.tmp", "w") as f:
+            json.dump(self._entries, f)
+        os.replace(f"{self._cache_file}.tmp", self._cache_file)
+
+
+def _get_line_ranges(line_nos: List[int]) -> List[Tuple[int, int]]:
+    """Merges line numbers into ranges of consecutive lines
+
+    Args:
+        line_nos (List[int]): Line numbers
+
+    Returns:
+        List[Tuple[int, int]]: Sorted list of tuples of first and last line of each range
+    """
+    line_ranges = []
+    for line_no in sorted(set(line_nos)):
+        if line_ranges and line_ranges[-1][1] == line_no - 1:
+            line_ranges[-1] = (line_ranges[-1][0], line_no)
+        else:
+            line_ranges.append((line_no, line_no))
+
+    return line_ranges
+
+
+def _parse_line_porcelain(blame_output: str) -> Dict[int, str]:
+    """Parses the output of `git blame --line-porcelain` into authors of the blamed lines
+
+    Args:
+        blame_output (str): Output of `git blame --line-porcelain`
+
+    Returns:
+        Dict[int, str]: Key-value pair where key is line number and value is name of its author. Lines not committed yet are left out
+    """
+    authors = {}
+    line_no = None
+    expect_header = True
+    for line in blame_output.splitlines():
+        if expect_header:
+            # Header is "<commit sha> <line no. in original file> <line no. in final file> [<no. of lines in group>]"
+            line_no = int(line.split(" ")[2])
+            expect_header = False
+        elif line.startswith("\t"):
+            # Content of the line ends the information of the line
+            expect_header = True
+        elif line.startswith("author "):
+            author = line[len("author ") :]  # noqa: E203
+            if author != NOT_COMMITTED_AUTHOR:
+                authors[line_no] = author
+
+    return authors
+
+
+class BlameAttributor:
+    """Attributes todo items without a user to the author of their line as per `git blame` of HEAD of a cloned repository"""
+
+    def __init__(self, blame_cache: Union[BlameCache, None] = None, max_workers: int = 4) -> None:
+        """Initializer for `BlameAttributor` class
+
+        Args:
+            blame_cache (Union[BlameCache, None], optional): Cache of authors of lines kept across runs. Defaults to None i.e. a new in-memory cache
+            max_workers (int, optional): Maximum number of files blamed in parallel. Defaults to 4
+        """
+        self._blame_cache = blame_cache if blame_cache is not None else BlameCache()
+        self._max_workers = max_workers
+
+    @property
+    def blame_cache(self) -> BlameCache:
+        """Getter for `blame_cache`
+
+        Returns:
+            BlameCache: Cache of authors of lines
+        """
+        return self._blame_cache
+
+    def _blame(self, repo: "Repo", path: str, blob_sha: str, line_nos: List[int]) -> Dict[int, str]:
+        """Returns the authors of `line_nos` of file `path` serving cached lines from `blame_cache` and blaming the rest in one call
+
+        Args:
+            repo (Repo): Handle to the repository
+            path (str): Path of the file relative to the repository
+            blob_sha (str): SHA of the blob of the file at HEAD
+            line_nos (List[int]): Line numbers whose authors are needed
+
+        Returns:
+            Dict[int, str]: Key-value pair where key is line number and value is name of its author
+        """
+        authors, missing = self._blame_cache.get(blob_sha, line_nos)
+        if missing:
+            line_range_args = [arg for first, last in _get_line_ranges(missing) for arg in ("-L", f"{first},{last}")]
+            blamed = _parse_line_porcelain(repo.git.blame("--line-porcelain", *line_range_args, "HEAD", "--", path))
+            self._blame_cache.put(blob_sha, blamed)
+            authors.update(blamed)
+
+        return authors
+
+    def attribute(self, repo_dir: str, project_parent_dir: str, all_todos_objs: Dict[str, List[TODO]]) -> int:
+        """Replaces todo items of `UNKNOWN_USER_NAME` in `all_todos_objs` with ones attributed to the author of their line at HEAD
+
+        Todo items in files not tracked at HEAD or on lines not committed yet are left as they are
+
+        Args:
+            repo_dir (str): Directory of the cloned repository
+            project_parent_dir (str): Parent directory of the project folder to which modules of todo items are relative
+            all_todos_objs (Dict[str, List[TODO]]): Key-value pair where key is relative path of file parsed and value is list of todo objects in that file
+
+        Returns:
+            int: Number of todo items attributed
+        """
+        # GitPython is imported on first use as it is slow to import and not needed unless attributing
+        from git.repo import Repo
+
+        repo = Repo(repo_dir)
+        blob_shas = {}
+        for entry in repo.git.ls_tree("-r", "-z", "HEAD").split("\0"):
+            if entry:
+                # Entry is "<mode> blob <blob sha>\t<path>"
+                info, path = entry.split("\t", 1)
+                blob_shas[path] = info.split(" ")[2]
+
+        # Maps module to its path relative to the repository along with line numbers of its unattributed todo items
+        unattributed: Dict[str, Tuple[str, List[int]]] = {}
+        for module, todos in all_todos_objs.items():
+            line_nos = [todo_obj.position.line_no for todo_obj in todos if todo_obj.user.user_name == UNKNOWN_USER_NAME]
+            path = os.path.relpath(os.path.join(project_parent_dir, module), repo_dir).replace(os.sep, "/")
+            if line_nos and path in blob_shas:
+                unattributed[module] = (path, line_nos)
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            futures = {module: executor.submit(self._blame, repo, path, blob_shas[path], line_nos) for module, (path, line_nos) in unattributed.items()}
+
+        num_attributed = 0
+        for module, future in futures.items():
+            try:
+                authors = future.result()
+            except Exception:
+                logger.exception(f"Error in blaming module: {module}")
+                continue
+
+            todos = all_todos_objs[module]
+            for idx, todo_obj in enumerate(todos):
+                author = authors.get(todo_obj.position.line_no)
+                if todo_obj.user.user_name == UNKNOWN_USER_NAME and author:
+                    todos[idx] = TODO(todo_obj.msg, USER(author), str(todo_obj.completion_date), todo_obj.module, todo_obj.position, todo_obj.introduction)
+                    num_attributed += 1
+
+        self._blame_cache.retain(blob_shas.values())
+        self._blame_cache.save()
+        logger.info(f"Attributed {num_attributed} todo items blaming {len(unattributed)} modules. Blame cache hits: {self._blame_cache.hits}")
+
+        return num_attributed
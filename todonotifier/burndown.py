@@ -0,0 +1,109 @@
+"""This module provides a summary generator reporting the weekly burndown of todo items i.e.
+number of todo items opened, closed and expired per week, per module and per user. Counts are
+read from the aggregates kept by `HistoryStore`, which are only updated with the runs recorded
+since the last report, so it stays fast however long the history is.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+from todonotifier.history import HistoryStore
+from todonotifier.models import TODO
+from todonotifier.summary_generators import BaseSummaryGenerator, _iter_tables_html
+
+logger = logging.getLogger(__name__)
+
+BURNDOWN_TABLE_OPEN_TAG = """
+            <table>
+                <caption>Weekly burndown</caption>
+            <tr>
+                <th>Week</th>
+                <th>{}</th>
+                <th>Opened</th>
+                <th>Closed</th>
+                <th>Expired</th>
+            </tr>
+            """
+BURNDOWN_ROW_TEMPLATE = """
+                <tr>
+                    <td>{}</td>
+                    <td>{}</td>
+                    <td>{}</td>
+                    <td>{}</td>
+                    <td>{}</td>
+                </tr>
+                """
+GROUP_BY_TITLES = {"module": "Module", "user": "User Name"}
+
+
+class BurndownSummaryGenerator(BaseSummaryGenerator):
+    """Reports todo items opened, closed and expired per week, per module and per user using the history of `project`
+
+    The current run needs to be recorded into `history_store` before summaries are generated, which `driver.run` does if the same
+    history store is set as `history_store` of the configuration
+    """
+
+    def __init__(
+        self, history_store: HistoryStore, project: str, weeks: int = 12, name: str = "TODO Burndown", container: Dict[str, List[List]] = None
+    ) -> None:
+        """Initializer for `BurndownSummaryGenerator`
+
+        Args:
+            history_store (HistoryStore): Store keeping the history of runs
+            project (str): Name of the project whose burndown is reported i.e. `project_dir_name` of its `Connect`
+            weeks (int, optional): Number of weeks reported up to the current one. Defaults to 12
+            name (str, optional): Name of the summary generator. Defaults to "TODO Burndown"
+            container (Dict[str, List[List]], optional): A container in which `generate_summary` would add the weekly counts keyed by "module"
+                                                         and "user". Defaults to {}
+        """
+        self._history_store = history_store
+        self._project = project
+        self._weeks = weeks
+        super().__init__(name=name, container=container or {})
+
+    @property
+    def project(self) -> str:
+        """Getter for `project`
+
+        Returns:
+            str: Name of the project whose burndown is reported
+        """
+        return self._project
+
+    def generate_summary(self, all_todos_objs: Dict[str, List[TODO]]) -> None:
+        """Updates the burndown aggregates with runs recorded since the last update and collects the weekly counts of the reported weeks
+
+        Args:
+            all_todos_objs (Dict[str, List[TODO]]): Unused as the counts come from the history of runs
+        """
+        logger.info(f"Generating summary: {self.name}")
+
+        self._history_store.update_burndown(self._project)
+        since = datetime.today().date() - timedelta(weeks=self._weeks - 1)
+        for group_by in GROUP_BY_TITLES:
+            self._container[group_by] = [
+                [str(week), name, opened, closed, expired]
+                for week, name, opened, closed, expired in self._history_store.burndown(self._project, group_by, since)
+            ]
+
+        logger.info(f"Summary generated: {self.container}")
+
+    def generate_html(self) -> None:
+        """Generates the html representation of the weekly burndown per module and per user"""
+        logger.info(f"Generating html for: {self.name}")
+
+        html = "".join(self.iter_html())
+
+        logger.debug("HTML generated: %s", html)
+        self._html = html
+
+    def iter_html(self) -> Iterator[str]:
+        """Yields the html representation of the weekly burndown per module and per user in chunks
+
+        Yields:
+            Iterator[str]: Chunks of html which concatenated together form the html report
+        """
+        for group_by, title in GROUP_BY_TITLES.items():
+            if group_by in self._container:
+                yield from _iter_tables_html({title: self._container[group_by]}, "Burndown by {}", BURNDOWN_TABLE_OPEN_TAG.format(title), BURNDOWN_ROW_TEMPLATE)
@@ -0,0 +1,155 @@
+"""This module provides the `todonotifier` command line interface running `driver.run` on a
+repository, directory or file.
+
+Only `argparse` is imported before arguments are parsed, so that `todonotifier --help` and
+invalid invocations return immediately e.g. from shell hooks and CI steps.
+
+Usage: todonotifier SOURCE [--connect-method GIT_CLONE] [--branch main] [--extensions py js]
+                           [--workers 4] [--cache-dir .todonotifier] [--incremental]
+                           [--format html jsonl] [--output-dir reports] [--profile]
+"""
+
+import argparse
+import os
+import sys
+from typing import List, Union
+
+CONNECT_METHODS = ("GIT_CLONE", "DRY_RUN_DIR", "DRY_RUN_FILE")
+OUTPUT_FORMATS = ("html", "jsonl", "csv", "sqlite")
+WORKSPACE_DIR_NAME = "workspace"
+
+
+def _get_arg_parser() -> argparse.ArgumentParser:
+    """Returns the parser of command line arguments
+
+    Returns:
+        argparse.ArgumentParser: Parser of command line arguments
+    """
+    arg_parser = argparse.ArgumentParser(prog="todonotifier", description="Collects TODO items of a repository, directory or file and reports them")
+    arg_parser.add_argument("source", help="Git url of a repository, or path of a local directory or file")
+    arg_parser.add_argument(
+        "--connect-method",
+        choices=CONNECT_METHODS,
+        help="Method to pull the source. Defaults to DRY_RUN_DIR for local directories, DRY_RUN_FILE for local files and GIT_CLONE otherwise",
+    )
+    arg_parser.add_argument("--project-dir-name", help="Name of the project directory. Defaults to name of the source without `.git`")
+    arg_parser.add_argument("--branch", help="Branch checked out after cloning. Used only for GIT_CLONE")
+    arg_parser.add_argument("--extensions", nargs="+", default=["py"], metavar="EXTENSION", help="Extensions of files parsed, without dot. Defaults to py")
+    arg_parser.add_argument("--ignore-todo-case", action="store_true", help="Look for case insensitive todo items like todo, Todo etc.")
+    arg_parser.add_argument("--workers", type=int, default=1, help="Maximum number of workers of stages that can run in parallel. Defaults to 1")
+    arg_parser.add_argument("--cache-dir", help="Directory keeping state across runs i.e. the repository pulled in incremental mode. Requires --incremental")
+    arg_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Keep the repository in the cache directory and only update it i.e. `git pull` or copy changed files on later runs",
+    )
+    arg_parser.add_argument(
+        "--format",
+        nargs="+",
+        default=["html"],
+        choices=OUTPUT_FORMATS,
+        dest="formats",
+        help="Output formats. html stores the reports while the others export every todo item. Defaults to html",
+    )
+    arg_parser.add_argument("--output-dir", help="Directory in which outputs are stored. Defaults to folder `.report` in current location")
+    arg_parser.add_argument("--profile", action="store_true", help="Profile each stage of the run and store the profile next to the reports")
+    arg_parser.add_argument("--track-memory", action="store_true", help="Track peak memory of each stage and add it to the profile")
+
+    return arg_parser
+
+
+def _get_connect_method(source: str) -> str:
+    """Returns the connect method of `source` if none was passed
+
+    Args:
+        source (str): Git url of a repository, or path of a local directory or file
+
+    Returns:
+        str: "DRY_RUN_DIR" for local directories, "DRY_RUN_FILE" for local files and "GIT_CLONE" otherwise
+    """
+    if os.path.isdir(source):
+        return "DRY_RUN_DIR"
+    if os.path.isfile(source):
+        return "DRY_RUN_FILE"
+
+    return "GIT_CLONE"
+
+
+def _get_project_dir_name(source: str) -> str:
+    """Returns the name of project directory derived from `source`
+
+    Args:
+        source (str): Git url of a repository, or path of a local directory or file
+
+    Returns:
+        str: Last component of `source` without `.git`
+    """
+    name = os.path.basename(source.rstrip("/\\").replace(":", "/"))
+
+    return name[: -len(".git")] if name.endswith(".git") else name
+
+
+def main(argv: Union[List[str], None] = None) -> int:
+    """Runs TODO Notifier as per command line arguments
+
+    Args:
+        argv (Union[List[str], None], optional): Command line arguments. Defaults to None i.e. `sys.argv[1:]`
+
+    Returns:
+        int: Exit code. 0 if the run succeeded else 1
+    """
+    arg_parser = _get_arg_parser()
+    args = arg_parser.parse_args(argv)
+    if args.incremental and not args.cache_dir:
+        arg_parser.error("--incremental requires --cache-dir")
+    if args.cache_dir and not args.incremental:
+        arg_parser.error("--cache-dir requires --incremental")
+    if args.workers < 1:
+        arg_parser.error("--workers must be at least 1")
+
+    # Imported only after parsing arguments as they are slow to import
+    from todonotifier.config import DefaultConfig
+    from todonotifier.connect import Connect, ConnectMethod
+    from todonotifier.driver import TODOException, run
+    from todonotifier.exporters import CSVExporter, JSONLinesExporter, SQLiteExporter
+
+    exporter_classes = {"jsonl": JSONLinesExporter, "csv": CSVExporter, "sqlite": SQLiteExporter}
+    output_dir = os.path.abspath(args.output_dir) if args.output_dir else None
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+    config = DefaultConfig(
+        generate_html="html" in args.formats,
+        save_html_reports="html" in args.formats,
+        ignore_todo_case=args.ignore_todo_case,
+        max_workers=args.workers,
+        profile=args.profile,
+        track_memory=args.track_memory,
+        exporters=[exporter_classes[output_format](target_dir=output_dir) for output_format in args.formats if output_format in exporter_classes],
+        extensions=args.extensions,
+        report_dir=output_dir,
+    )
+    connect_method = ConnectMethod(args.connect_method or _get_connect_method(args.source))
+    # Local sources are made absolute so that e.g. `.` or a trailing slash still yield the name of the project directory
+    source = args.source if connect_method == ConnectMethod.GIT_CLONE else os.path.abspath(args.source)
+    connect = Connect(
+        connect_method=connect_method,
+        project_dir_name=args.project_dir_name or _get_project_dir_name(source),
+        url=source,
+        branch_name=args.branch,
+    )
+    workspace_dir = os.path.join(os.path.abspath(args.cache_dir), WORKSPACE_DIR_NAME) if args.incremental else None
+    if workspace_dir is not None:
+        os.makedirs(workspace_dir, exist_ok=True)
+
+    try:
+        run_result = run(connect, config, workspace_dir=workspace_dir)
+    except TODOException as exc:
+        print(f"todonotifier: {exc}", file=sys.stderr)
+        return 1
+
+    print(f"Found {len(run_result.todo_index)} todo items in {len(run_result.todo_index.modules)} modules")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,7 +6,10 @@ whistles of defining a configuration while being equally extensible.
 from copy import deepcopy
 from typing import Dict, List, Union
 
+from todonotifier.attribution import BlameAttributor
 from todonotifier.constants import DEFAULT_EXCLUDE_DIRS, DEFAULT_EXCLUDE_FILES
+from todonotifier.exporters import BaseExporter
+from todonotifier.history import HistoryStore
 from todonotifier.notifier import BaseNotifier
 from todonotifier.summary_generators import (
     BaseSummaryGenerator,
@@ -14,6 +17,8 @@ from todonotifier.summary_generators import (
     ExpiredTodosByUserSummaryGenerator,
     UpcomingWeekTodosByUserSummaryGenerator,
 )
+from todonotifier.todo_age import TodoAgeTracker
+from todonotifier.todo_notifier import ScanOptions
 from todonotifier.utils import recursive_update
 
 
@@ -29,6 +34,19 @@ class BaseConfig:
         save_html_reports: bool,
         ignore_todo_case: bool,
         notifier: Union[BaseNotifier, None],
+        stream_html_reports: bool = False,
+        max_workers: int = 1,
+        profile: bool = False,
+        track_memory: bool = False,
+        memory_budget: Union[int, None] = None,
+        memory_budget_action: str = "abort",
+        exporters: Union[List[BaseExporter], None] = None,
+        history_store: Union[HistoryStore, None] = None,
+        attributor: Union[BlameAttributor, None] = None,
+        age_tracker: Union[TodoAgeTracker, None] = None,
+        extensions: Union[List[str], None] = None,
+        report_dir: Union[str, None] = None,
+        scan_options: Union[ScanOptions, None] = None,
     ) -> None:
         """Initializer for `BaseConfig` class
 
@@ -40,6 +58,30 @@ class BaseConfig:
             save_html_reports (bool): Boolean to control whether to save html reports. Works only if `generate_html` is `True`
             ignore_todo_case (bool): Boolean whether to look for case insensitive todo items like todo, Todo etc.
             notifier (Union[BaseNotifier, None], optional): Object of class `BaseNotifier` to deal with sending notifications. Defaults to None
+            stream_html_reports (bool, optional): Boolean whether to render html reports in chunks while storing/notifying instead of holding
+                                                  them in memory. `html` of summary generators isn't populated if set. Defaults to False
+            max_workers (int, optional): Maximum number of workers used by stages that can run in parallel e.g. storing shards of a report. Defaults to 1
+            profile (bool, optional): Boolean whether to profile each stage of a run and write a pstats dump along with a table of wall/CPU time
+                                      of each stage next to the reports. Defaults to False
+            track_memory (bool, optional): Boolean whether to track peak memory of each stage with `tracemalloc` along with RSS of the process
+                                           and add it to the profile of stages. Defaults to False
+            memory_budget (Union[int, None], optional): Maximum RSS of the process in bytes checked after each stage. Defaults to None i.e. no budget
+            memory_budget_action (str, optional): Action on exceeding `memory_budget`. "abort" stops the run with a clear error while "degrade"
+                                                  switches to streaming html reports with a single worker. Defaults to "abort"
+            exporters (Union[List[BaseExporter], None], optional): Exporters to which todo items are streamed while files are parsed e.g. as
+                                                                   JSON Lines, CSV or a SQLite table. Defaults to None i.e. no export
+            history_store (Union[HistoryStore, None], optional): Store to which a snapshot of todo items of every run is appended. Defaults to
+                                                                 None i.e. no history is kept
+            attributor (Union[BlameAttributor, None], optional): Attributor of todo items without a user to the author of their line as per
+                                                                 `git blame`. Used only for `ConnectMethod.GIT_CLONE`. Defaults to None i.e. no attribution
+            age_tracker (Union[TodoAgeTracker, None], optional): Tracker of commits that introduced todo items, which are exposed to summary
+                                                                 generators as `introduction` of todo items. Used only for `ConnectMethod.GIT_CLONE`.
+                                                                 Defaults to None i.e. ages aren't tracked
+            extensions (Union[List[str], None], optional): Extensions of files parsed for todo items e.g. ["py", "js"]. Defaults to None i.e. ["py"]
+            report_dir (Union[str, None], optional): Directory in which html reports and profiles are stored. Defaults to None i.e. folder
+                                                     `.report` in current location
+            scan_options (Union[ScanOptions, None], optional): Options controlling how files are read e.g. chunked scan of large files and
+                                                               limits above which files are skipped. Defaults to None i.e. `ScanOptions()`
         """
         self._exclude_dirs = exclude_dirs
         self._exclude_files = exclude_files
@@ -48,6 +90,19 @@ class BaseConfig:
         self._save_html_reports = save_html_reports
         self._ignore_todo_case = ignore_todo_case
         self._notifier = notifier
+        self._stream_html_reports = stream_html_reports
+        self._max_workers = max_workers
+        self._profile = profile
+        self._track_memory = track_memory
+        self._memory_budget = memory_budget
+        self._memory_budget_action = memory_budget_action
+        self._exporters = exporters or []
+        self._history_store = history_store
+        self._attributor = attributor
+        self._age_tracker = age_tracker
+        self._extensions = extensions or ["py"]
+        self._report_dir = report_dir
+        self._scan_options = scan_options or ScanOptions()
 
     @property
     def exclude_dirs(self) -> Dict[str, List[str]]:
@@ -112,6 +167,123 @@ class BaseConfig:
         """
         return self._notifier
 
+    @property
+    def stream_html_reports(self) -> bool:
+        """Getter for `stream_html_reports`
+
+        Returns:
+            bool: Boolean whether to render html reports in chunks while storing/notifying instead of holding them in memory
+        """
+        return self._stream_html_reports
+
+    @property
+    def max_workers(self) -> int:
+        """Getter for `max_workers`
+
+        Returns:
+            int: Maximum number of workers used by stages that can run in parallel
+        """
+        return self._max_workers
+
+    @property
+    def profile(self) -> bool:
+        """Getter for `profile`
+
+        Returns:
+            bool: Boolean whether to profile each stage of a run
+        """
+        return self._profile
+
+    @property
+    def track_memory(self) -> bool:
+        """Getter for `track_memory`
+
+        Returns:
+            bool: Boolean whether to track peak memory of each stage
+        """
+        return self._track_memory
+
+    @property
+    def memory_budget(self) -> Union[int, None]:
+        """Getter for `memory_budget`
+
+        Returns:
+            Union[int, None]: Maximum RSS of the process in bytes. None if no budget is set
+        """
+        return self._memory_budget
+
+    @property
+    def memory_budget_action(self) -> str:
+        """Getter for `memory_budget_action`
+
+        Returns:
+            str: Action on exceeding `memory_budget` i.e. "abort" or "degrade"
+        """
+        return self._memory_budget_action
+
+    @property
+    def exporters(self) -> List[BaseExporter]:
+        """Getter for `exporters`
+
+        Returns:
+            List[BaseExporter]: Exporters to which todo items are streamed while files are parsed
+        """
+        return self._exporters
+
+    @property
+    def history_store(self) -> Union[HistoryStore, None]:
+        """Getter for `history_store`
+
+        Returns:
+            Union[HistoryStore, None]: Store to which a snapshot of todo items of every run is appended
+        """
+        return self._history_store
+
+    @property
+    def attributor(self) -> Union[BlameAttributor, None]:
+        """Getter for `attributor`
+
+        Returns:
+            Union[BlameAttributor, None]: Attributor of todo items without a user to the author of their line
+        """
+        return self._attributor
+
+    @property
+    def age_tracker(self) -> Union[TodoAgeTracker, None]:
+        """Getter for `age_tracker`
+
+        Returns:
+            Union[TodoAgeTracker, None]: Tracker of commits that introduced todo items
+        """
+        return self._age_tracker
+
+    @property
+    def extensions(self) -> List[str]:
+        """Getter for `extensions`
+
+        Returns:
+            List[str]: Extensions of files parsed for todo items
+        """
+        return self._extensions
+
+    @property
+    def report_dir(self) -> Union[str, None]:
+        """Getter for `report_dir`
+
+        Returns:
+            Union[str, None]: Directory in which html reports and profiles are stored. None for folder `.report` in current location
+        """
+        return self._report_dir
+
+    @property
+    def scan_options(self) -> ScanOptions:
+        """Getter for `scan_options`
+
+        Returns:
+            ScanOptions: Options controlling how files are read
+        """
+        return self._scan_options
+
 
 class DefaultConfig(BaseConfig):
     """Allows easy way to setup config by allowing to pass new dirs/files to exclude along with default ones
@@ -131,6 +303,21 @@ class DefaultConfig(BaseConfig):
         save_html_reports: bool = False,
         ignore_todo_case: bool = False,
         notifier: Union[BaseNotifier, None] = None,
+        stream_html_reports: bool = False,
+        shard_module_report: bool = False,
+        modules_per_shard: Union[int, None] = None,
+        max_workers: int = 1,
+        profile: bool = False,
+        track_memory: bool = False,
+        memory_budget: Union[int, None] = None,
+        memory_budget_action: str = "abort",
+        exporters: Union[List[BaseExporter], None] = None,
+        history_store: Union[HistoryStore, None] = None,
+        attributor: Union[BlameAttributor, None] = None,
+        age_tracker: Union[TodoAgeTracker, None] = None,
+        extensions: Union[List[str], None] = None,
+        report_dir: Union[str, None] = None,
+        scan_options: Union[ScanOptions, None] = None,
     ) -> None:
         """Initializer for `DefaultConfig` class
 
@@ -146,6 +333,33 @@ class DefaultConfig(BaseConfig):
             save_html_reports (bool, optional): Boolean controlling whether to store the generated HTML reports by each summary generator. Defaults to False
             ignore_todo_case (bool, optional): Boolean whether to look for case insensitive todo items like todo, Todo etc. Defaults to False
             notifier (Union[BaseNotifier, None], optional): Object of class `BaseNotifier` to deal with sending notifications. Defaults to None
+            stream_html_reports (bool, optional): Boolean whether to render html reports in chunks while storing/notifying instead of holding
+                                                  them in memory. `html` of summary generators isn't populated if set. Defaults to False
+            shard_module_report (bool, optional): Boolean whether default `ByModuleSummaryGenerator` splits its report into one page per shard
+                                                  along with an index page. Defaults to False
+            modules_per_shard (Union[int, None], optional): Number of modules per shard. If None, modules are sharded by top-level directory. Defaults to None
+            max_workers (int, optional): Maximum number of workers used by stages that can run in parallel e.g. storing shards of a report. Defaults to 1
+            profile (bool, optional): Boolean whether to profile each stage of a run and write a pstats dump along with a table of wall/CPU time
+                                      of each stage next to the reports. Defaults to False
+            track_memory (bool, optional): Boolean whether to track peak memory of each stage with `tracemalloc` along with RSS of the process
+                                           and add it to the profile of stages. Defaults to False
+            memory_budget (Union[int, None], optional): Maximum RSS of the process in bytes checked after each stage. Defaults to None i.e. no budget
+            memory_budget_action (str, optional): Action on exceeding `memory_budget`. "abort" stops the run with a clear error while "degrade"
+                                                  switches to streaming html reports with a single worker. Defaults to "abort"
+            exporters (Union[List[BaseExporter], None], optional): Exporters to which todo items are streamed while files are parsed e.g. as
+                                                                   JSON Lines, CSV or a SQLite table. Defaults to None i.e. no export
+            history_store (Union[HistoryStore, None], optional): Store to which a snapshot of todo items of every run is appended. Defaults to
+                                                                 None i.e. no history is kept
+            attributor (Union[BlameAttributor, None], optional): Attributor of todo items without a user to the author of their line as per
+                                                                 `git blame`. Used only for `ConnectMethod.GIT_CLONE`. Defaults to None i.e. no attribution
+            age_tracker (Union[TodoAgeTracker, None], optional): Tracker of commits that introduced todo items, which are exposed to summary
+                                                                 generators as `introduction` of todo items. Used only for `ConnectMethod.GIT_CLONE`.
+                                                                 Defaults to None i.e. ages aren't tracked
+            extensions (Union[List[str], None], optional): Extensions of files parsed for todo items e.g. ["py", "js"]. Defaults to None i.e. ["py"]
+            report_dir (Union[str, None], optional): Directory in which html reports and profiles are stored. Defaults to None i.e. folder
+                                                     `.report` in current location
+            scan_options (Union[ScanOptions, None], optional): Options controlling how files are read e.g. chunked scan of large files and
+                                                               limits above which files are skipped. Defaults to None i.e. `ScanOptions()`
         """
         exclude_dirs = exclude_dirs or {}
         exclude_files = exclude_files or {}
@@ -167,7 +381,7 @@ class DefaultConfig(BaseConfig):
             # Means include the default summary generator list of files
             # Instantiate the summary generators
             default_summary_generators = [
-                ByModuleSummaryGenerator(),
+                ByModuleSummaryGenerator(shard=shard_module_report, modules_per_shard=modules_per_shard),
                 ExpiredTodosByUserSummaryGenerator(),
                 UpcomingWeekTodosByUserSummaryGenerator(),
             ]
@@ -175,7 +389,28 @@ class DefaultConfig(BaseConfig):
             default_summary_generators.extend(summary_generators)
             summary_generators = default_summary_generators
 
-        super().__init__(exclude_dirs, exclude_files, summary_generators, generate_html, save_html_reports, ignore_todo_case, notifier)
+        super().__init__(
+            exclude_dirs,
+            exclude_files,
+            summary_generators,
+            generate_html,
+            save_html_reports,
+            ignore_todo_case,
+            notifier,
+            stream_html_reports=stream_html_reports,
+            max_workers=max_workers,
+            profile=profile,
+            track_memory=track_memory,
+            memory_budget=memory_budget,
+            memory_budget_action=memory_budget_action,
+            exporters=exporters,
+            history_store=history_store,
+            attributor=attributor,
+            age_tracker=age_tracker,
+            extensions=extensions,
+            report_dir=report_dir,
+            scan_options=scan_options,
+        )
 
 
 default_config = DefaultConfig()
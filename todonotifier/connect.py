@@ -5,17 +5,16 @@ cloning the repository to be able to run TODO Notifier.
 import logging
 import os
 from enum import Enum
-from shutil import copy, copytree, ignore_patterns
-from typing import TypeVar, Union
-
-from git.repo import Repo
+from shutil import copy, copy2, copytree, ignore_patterns, rmtree
+from typing import TYPE_CHECKING, Callable, List, Set, TypeVar, Union
 
 from todonotifier.constants import DEFAULT_EXCLUDE_DIRS
 
+if TYPE_CHECKING:
+    from git.repo import Repo
+
 P = TypeVar("P")
 
-# logging configuration
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(process)d - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
 
@@ -60,6 +59,24 @@ class Connect:
         """
         return self._project_dir_name
 
+    @property
+    def url(self) -> str:
+        """Getter for url of the repository, directory or file
+
+        Returns:
+            str: Returns value of `self._file_dir_url`
+        """
+        return self._file_dir_url
+
+    @property
+    def connect_method(self) -> ConnectMethod:
+        """Getter for connect method
+
+        Returns:
+            ConnectMethod: Returns value of `self._connect_method`
+        """
+        return self._connect_method
+
     def __str__(self) -> str:
         """Returns the string representation of the class `Connect`
 
@@ -94,7 +111,36 @@ class Connect:
             logger.exception(f"Error in pulling repository via {self._connect_method}")
             raise ConnectException(f"Error in pulling repository via {self._connect_method}")
 
-    def _pull_using_git_clone(self, target_dir: str, branch_name: Union[str, None] = None) -> Repo:
+    def update_repository(self, target_dir: str) -> P:
+        """Updates the repository previously pulled into `target_dir` by `pull_repository` or pulls it if `target_dir` doesn't exist yet
+
+        It allows keeping a warm copy of the repository across runs e.g. in the daemon so that only changes since the last run are
+        fetched/copied. Files that didn't change keep their modification time which allows caching their parsed todo items
+
+        Args:
+            target_dir (str): Directory into which the repository was pulled
+
+        Returns:
+            P: Returns whatever is returned by the respective method to which call is delegated to
+        """
+        if not os.path.isdir(target_dir):
+            return self.pull_repository(target_dir)
+
+        try:
+            logger.info(f"Updating repository: {self._project_dir_name} via {self._connect_method}")
+            if self._connect_method == ConnectMethod.GIT_CLONE:
+                return self._update_using_git_pull(target_dir)
+            elif self._connect_method == ConnectMethod.DRY_RUN_FILE:
+                return self._update_file_for_dry_run(target_dir)
+            elif self._connect_method == ConnectMethod.DRY_RUN_DIR:
+                return self._update_dir_for_dry_run(target_dir)
+            else:
+                raise ConnectException("Unsupported connect method passed")
+        except Exception:
+            logger.exception(f"Error in updating repository via {self._connect_method}")
+            raise ConnectException(f"Error in updating repository via {self._connect_method}")
+
+    def _pull_using_git_clone(self, target_dir: str, branch_name: Union[str, None] = None) -> "Repo":
         """Pulls the repository using GIT_CLONE method
 
         NOTE: This method used GitPython library that required Git to be installed on the system
@@ -107,8 +153,27 @@ class Connect:
             Returns:
                 Repo: Returns handle to the repository cloned
         """
+        # GitPython is imported on first use as it is slow to import and not needed for dry runs
+        from git.repo import Repo
+
         return Repo.clone_from(self._file_dir_url, target_dir, branch=branch_name)
 
+    def _update_using_git_pull(self, target_dir: str) -> "Repo":
+        """Updates the repository cloned into `target_dir` using git pull
+
+        Args:
+            target_dir (str): Directory into which the repository was cloned
+
+        Returns:
+            Repo: Returns handle to the repository updated
+        """
+        from git.repo import Repo
+
+        repo = Repo(target_dir)
+        repo.remotes.origin.pull()
+
+        return repo
+
     def _pull_file_for_dry_run(self, target_dir: str) -> None:
         """Copies the local file `test_file` into `target_dir` directory
 
@@ -131,3 +196,82 @@ class Connect:
         ignore_list = DEFAULT_EXCLUDE_DIRS["PATTERN"] + DEFAULT_EXCLUDE_DIRS["NAME"]
         target_dir = os.path.join(target_dir, test_dir_base_name)
         copytree(self._file_dir_url, target_dir, ignore=ignore_patterns(*ignore_list))
+
+    def _update_file_for_dry_run(self, target_dir: str) -> None:
+        """Copies the local file `url` into `target_dir` directory again if it changed since it was copied
+
+        Args:
+            target_dir (str): Directory into which the file from given `url` was copied into
+        """
+        target_dir = os.path.join(target_dir, self._project_dir_name)
+        target_file = os.path.join(target_dir, os.path.basename(self._file_dir_url))
+        if not _is_same_file_stat(self._file_dir_url, target_file):
+            if not os.path.isdir(target_dir):
+                os.makedirs(target_dir)
+            # Metadata is copied along so that the file isn't copied again until it changes
+            copy2(self._file_dir_url, target_file)
+
+    def _update_dir_for_dry_run(self, target_dir: str) -> None:
+        """Synchronizes the directory `url` copied into `target_dir` directory by copying only changed files and removing deleted ones
+
+        Args:
+            target_dir (str): Directory into which the folder from given `url` was copied into
+        """
+        test_dir_base_name = os.path.basename(self._file_dir_url)
+        ignore_list = DEFAULT_EXCLUDE_DIRS["PATTERN"] + DEFAULT_EXCLUDE_DIRS["NAME"]
+        _sync_dir(self._file_dir_url, os.path.join(target_dir, test_dir_base_name), ignore_patterns(*ignore_list))
+
+
+def _is_same_file_stat(src_file: str, dst_file: str) -> bool:
+    """Checks whether `dst_file` is an unchanged copy of `src_file` based on their size and modification time
+
+    Args:
+        src_file (str): Location of source file
+        dst_file (str): Location of copied file
+
+    Returns:
+        bool: True if `dst_file` exists with same size and modification time as `src_file` else False
+    """
+    try:
+        src_stat, dst_stat = os.stat(src_file), os.stat(dst_file)
+    except FileNotFoundError:
+        return False
+
+    return src_stat.st_size == dst_stat.st_size and src_stat.st_mtime_ns == dst_stat.st_mtime_ns
+
+
+def _sync_dir(src_dir: str, dst_dir: str, ignore: Callable[[str, List[str]], Set[str]]) -> None:
+    """Makes `dst_dir` a copy of `src_dir` copying only the changed files and removing files and directories not in `src_dir`
+
+    Files are copied along with their metadata so that unchanged files are detected by their size and modification time
+
+    Args:
+        src_dir (str): Source directory
+        dst_dir (str): Destination directory
+        ignore (Callable[[str, List[str]], Set[str]]): Callable returning names to be ignored in a directory as used by `shutil.copytree`
+    """
+    if not os.path.isdir(dst_dir):
+        os.makedirs(dst_dir)
+
+    src_names = os.listdir(src_dir)
+    ignored_names = ignore(src_dir, src_names)
+    src_names = {name for name in src_names if name not in ignored_names}
+
+    for dst_name in os.listdir(dst_dir):
+        if dst_name not in src_names:
+            dst_path = os.path.join(dst_dir, dst_name)
+            if os.path.isdir(dst_path) and not os.path.islink(dst_path):
+                rmtree(dst_path)
+            else:
+                os.remove(dst_path)
+
+    for name in src_names:
+        src_path, dst_path = os.path.join(src_dir, name), os.path.join(dst_dir, name)
+        if os.path.isdir(src_path):
+            if os.path.isfile(dst_path):
+                os.remove(dst_path)
+            _sync_dir(src_path, dst_path, ignore)
+        elif not _is_same_file_stat(src_path, dst_path):
+            if os.path.isdir(dst_path):
+                rmtree(dst_path)
+            copy2(src_path, dst_path)
@@ -91,6 +91,8 @@ UNKNOWN_USER_NAME = "JANE_DOE"
 
 DEFAULT_COMPLETION_DATE = "9999-12-25"
 
+LOGGING_FORMAT = "%(asctime)s - %(process)d - %(name)s - %(levelname)s - %(message)s"
+
 
 class DEFAULT_SUMMARY_GENERATORS_ENUM:
     EXPIRED_TODO_BY_USER = "Expired TODO Items"
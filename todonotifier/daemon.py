@@ -0,0 +1,300 @@
+"""This module provides a long-running daemon that runs TODO Notifier for many projects,
+each on its own interval. Unlike one-shot runs via `driver.run`, the daemon keeps state
+warm between runs: a workspace per project holding the repository which is only updated,
+a cache of parsed todo items so that only changed files are parsed and the compiled
+regular expressions. Runs are executed by a worker pool sized to the host.
+"""
+
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Union
+
+from todonotifier.config import BaseConfig, default_config
+from todonotifier.connect import Connect
+from todonotifier.driver import RunResult, TODOException, configure_logging, run
+from todonotifier.todo_notifier import ParseCache
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledProject:
+    """Project run by the daemon every `interval_seconds`"""
+
+    def __init__(self, connect: Connect, config: BaseConfig = default_config, interval_seconds: float = 24 * 60 * 60, name: Union[str, None] = None) -> None:
+        """Initializer for `ScheduledProject` class
+
+        Args:
+            connect (Connect): Object of type `Connect` to allow pulling the repository
+            config (BaseConfig, optional): Configuration to be used. Projects sharing a configuration are never run concurrently as
+                                           they share summary generators. Defaults to `default_config`
+            interval_seconds (float, optional): Interval between starts of two runs of the project in seconds. Defaults to a day
+            name (Union[str, None], optional): Unique name of the project used as its workspace directory. Defaults to None i.e.
+                                               `connect.project_dir_name`
+
+        Raises:
+            ValueError: Raised if `interval_seconds` isn't positive
+        """
+        if interval_seconds <= 0:
+            raise ValueError(f"Interval of project must be positive, got: {interval_seconds}")
+
+        self._connect = connect
+        self._config = config
+        self._interval_seconds = interval_seconds
+        self._name = name or connect.project_dir_name
+        self._parse_cache = ParseCache()
+        self._last_result = None
+
+    @property
+    def connect(self) -> Connect:
+        """Getter for `connect`
+
+        Returns:
+            Connect: Object of type `Connect` to allow pulling the repository
+        """
+        return self._connect
+
+    @property
+    def config(self) -> BaseConfig:
+        """Getter for `config`
+
+        Returns:
+            BaseConfig: Configuration to be used
+        """
+        return self._config
+
+    @property
+    def interval_seconds(self) -> float:
+        """Getter for `interval_seconds`
+
+        Returns:
+            float: Interval between starts of two runs of the project in seconds
+        """
+        return self._interval_seconds
+
+    @property
+    def name(self) -> str:
+        """Getter for `name`
+
+        Returns:
+            str: Unique name of the project
+        """
+        return self._name
+
+    @property
+    def parse_cache(self) -> ParseCache:
+        """Getter for `parse_cache`
+
+        Returns:
+            ParseCache: Cache of parsed todo items of the project kept across runs
+        """
+        return self._parse_cache
+
+    @property
+    def last_result(self) -> Union[RunResult, None]:
+        """Getter for `last_result`
+
+        Returns:
+            Union[RunResult, None]: Result of the last successful run of the project. None if it didn't run successfully yet
+        """
+        return self._last_result
+
+    @last_result.setter
+    def last_result(self, last_result: Union[RunResult, None]) -> None:
+        """Setter for `last_result`
+
+        Args:
+            last_result (Union[RunResult, None]): Result of the last successful run of the project
+        """
+        self._last_result = last_result
+
+    def __str__(self) -> str:
+        """Defines str representation of `ScheduledProject` class object
+
+        Returns:
+            str: Returns string representation of the class object
+        """
+        return f"ScheduledProject: {repr(self)} name: {self.name} interval_seconds: {self.interval_seconds}"
+
+
+class Daemon:
+    """Runs scheduled projects on their intervals until stopped"""
+
+    def __init__(self, projects: List[ScheduledProject], workspace_dir: str, max_workers: Union[int, None] = None) -> None:
+        """Initializer for `Daemon` class
+
+        Args:
+            projects (List[ScheduledProject]): Projects to be run
+            workspace_dir (str): Directory under which a workspace per project is kept across runs
+            max_workers (Union[int, None], optional): Maximum number of projects run in parallel. Defaults to None i.e. number of CPUs
+
+        Raises:
+            ValueError: Raised if names of `projects` aren't unique
+        """
+        names = [project.name for project in projects]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Names of scheduled projects must be unique, got: {names}")
+
+        self._projects = projects
+        self._workspace_dir = workspace_dir
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._counter = itertools.count()
+        # Number of runs submitted and not completed yet. Queued notifications are sent once it drops to 0 i.e. a round of runs completed
+        self._in_flight = 0
+        # Heap of (next run time, tie breaker, project). A project is pushed back only after its run completes, so it never runs concurrently
+        self._schedule: List[Tuple[float, int, ScheduledProject]] = []
+        self._config_locks: Dict[int, threading.Lock] = {id(project.config): threading.Lock() for project in projects}
+
+    @property
+    def projects(self) -> List[ScheduledProject]:
+        """Getter for `projects`
+
+        Returns:
+            List[ScheduledProject]: Projects to be run
+        """
+        return self._projects
+
+    @property
+    def max_workers(self) -> int:
+        """Getter for `max_workers`
+
+        Returns:
+            int: Maximum number of projects run in parallel
+        """
+        return self._max_workers
+
+    def _get_project_workspace_dir(self, project: ScheduledProject) -> str:
+        """Returns the workspace directory of `project`. Creates it if needed
+
+        Args:
+            project (ScheduledProject): Project whose workspace directory is needed
+
+        Returns:
+            str: Workspace directory of `project`
+        """
+        project_workspace_dir = os.path.join(self._workspace_dir, project.name)
+        if not os.path.isdir(project_workspace_dir):
+            os.makedirs(project_workspace_dir)
+
+        return project_workspace_dir
+
+    def run_project(self, project: ScheduledProject) -> Union[RunResult, None]:
+        """Runs `project` once using its warm workspace and parse cache
+
+        Args:
+            project (ScheduledProject): Project to be run
+
+        Returns:
+            Union[RunResult, None]: Result of the run. None if the run failed
+        """
+        started_at = time.perf_counter()
+        try:
+            with self._config_locks.setdefault(id(project.config), threading.Lock()):
+                run_result = run(
+                    project.connect,
+                    project.config,
+                    workspace_dir=self._get_project_workspace_dir(project),
+                    parse_cache=project.parse_cache,
+                    flush_notifier=False,
+                )
+        except TODOException:
+            logger.exception(f"Error in running project: {project.name}")
+            return None
+
+        project.last_result = run_result
+        logger.info(
+            f"Ran project: {project.name} in {time.perf_counter() - started_at:.2f}s. "
+            f"Parse cache hits: {project.parse_cache.hits} misses: {project.parse_cache.misses}"
+        )
+        return run_result
+
+    def _run_and_reschedule(self, project: ScheduledProject, scheduled_at: float) -> None:
+        """Runs `project` and schedules its next run `interval_seconds` after its scheduled start or immediately if the run overran it.
+        The last run of a round sends the notifications queued by all runs of the round
+
+        Args:
+            project (ScheduledProject): Project to be run
+            scheduled_at (float): Monotonic time at which the run was scheduled
+        """
+        try:
+            self.run_project(project)
+        finally:
+            with self._condition:
+                next_run_at = max(scheduled_at + project.interval_seconds, time.monotonic())
+                heapq.heappush(self._schedule, (next_run_at, next(self._counter), project))
+                self._in_flight -= 1
+                round_completed = not self._in_flight
+                self._condition.notify()
+
+            if round_completed:
+                self.flush_notifiers()
+
+    def flush_notifiers(self) -> None:
+        """Sends the notifications queued by notifiers of all projects e.g. emails batched across projects by `EmailNotifier`. A notifier
+        failing to send doesn't stop the others from sending
+        """
+        notifiers = {id(project.config.notifier): project.config.notifier for project in self._projects if project.config.notifier}
+        for notifier in notifiers.values():
+            if not notifier.pending_count:
+                continue
+            try:
+                notifier.flush()
+            except Exception:
+                logger.exception(f"Error in sending queued notifications of notifier: {notifier}")
+
+    def run_forever(self) -> None:
+        """Runs the scheduled projects on their intervals until `stop` is called. All projects are run once right away"""
+        configure_logging()
+
+        now = time.monotonic()
+        with self._condition:
+            self._stopped = False
+            self._schedule = [(now, next(self._counter), project) for project in self._projects]
+            heapq.heapify(self._schedule)
+
+        with ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="todonotifier") as executor:
+            with self._condition:
+                while not self._stopped:
+                    now = time.monotonic()
+                    while self._schedule and self._schedule[0][0] <= now:
+                        scheduled_at, _, project = heapq.heappop(self._schedule)
+                        self._in_flight += 1
+                        executor.submit(self._run_and_reschedule, project, scheduled_at)
+
+                    timeout = self._schedule[0][0] - now if self._schedule else None
+                    self._condition.wait(timeout)
+
+        # Runs in progress are completed once the executor shuts down and the last of them sends the notifications queued by all
+        logger.info("Daemon stopped")
+
+    def stop(self) -> None:
+        """Stops the daemon. Runs in progress are completed and notifications they queued are sent before `run_forever` returns"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+
+def run_daemon(projects: List[ScheduledProject], workspace_dir: str, max_workers: Union[int, None] = None) -> None:
+    """Entry point running the daemon for `projects` until interrupted e.g. by Ctrl+C
+
+    Args:
+        projects (List[ScheduledProject]): Projects to be run
+        workspace_dir (str): Directory under which a workspace per project is kept across runs
+        max_workers (Union[int, None], optional): Maximum number of projects run in parallel. Defaults to None i.e. number of CPUs
+    """
+    daemon = Daemon(projects, workspace_dir, max_workers=max_workers)
+    runner = threading.Thread(target=daemon.run_forever, name="todonotifier-daemon")
+    runner.start()
+    try:
+        while runner.is_alive():
+            runner.join(timeout=1)
+    except KeyboardInterrupt:
+        logger.info("Stopping daemon")
+        daemon.stop()
+        runner.join()
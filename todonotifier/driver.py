@@ -4,17 +4,44 @@
 import logging
 import os
 import tempfile
-from typing import TypeVar
+from contextlib import nullcontext
+from typing import Callable, Dict, Iterator, List, Tuple, TypeVar, Union
 
 from todonotifier.config import BaseConfig, default_config
-from todonotifier.connect import Connect
-from todonotifier.todo_notifier import parse_files_for_todo_items
-from todonotifier.utils import generate_summary, get_files_in_dir, store_html
+from todonotifier.connect import Connect, ConnectMethod
+from todonotifier.constants import LOGGING_FORMAT
+from todonotifier.exporters import BaseExporter
+from todonotifier.models import TODO
+from todonotifier.profiling import (
+    NULL_PROFILER,
+    MemoryBudget,
+    MemoryBudgetExceededException,
+    StageProfiler,
+    StageStats,
+)
+from todonotifier.summary_generators import (
+    BaseSummaryGenerator,
+    ByModuleSummaryGenerator,
+    SummaryResult,
+)
+from todonotifier.todo_index import TodoIndex
+from todonotifier.todo_notifier import (
+    ParseCache,
+    ParseDiagnostics,
+    ScanOptions,
+    SkippedFile,
+    parse_files_for_todo_items,
+)
+from todonotifier.utils import (
+    generate_summary,
+    get_files_in_dir,
+    get_report_dir,
+    store_html,
+    store_sharded_html,
+)
 
 P = TypeVar("P")
 
-# logging configuration
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(process)d - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
 
@@ -24,43 +51,368 @@ class TODOException(Exception):
     pass
 
 
-def run(connect: Connect, config: BaseConfig = default_config) -> None:
+class RunResult:
+    """Result of a run of TODO application"""
+
+    def __init__(
+        self,
+        summaries: List[SummaryResult],
+        todo_index: TodoIndex,
+        stages: List[StageStats],
+        skipped_files: Union[List[SkippedFile], None] = None,
+        diagnostics: Union[ParseDiagnostics, None] = None,
+    ) -> None:
+        """Initializer for `RunResult` class
+
+        Args:
+            summaries (List[SummaryResult]): Immutable results of the summary generators
+            todo_index (TodoIndex): Index over todo items of the run
+            stages (List[StageStats]): Stats of the stages of the run. Empty if neither profiling nor memory tracking was enabled
+            skipped_files (Union[List[SkippedFile], None], optional): Files skipped while parsing e.g. for exceeding limits of scan options.
+                                                                      Defaults to None
+            diagnostics (Union[ParseDiagnostics, None], optional): Errors in parsing files for todo items. Defaults to None i.e. no errors
+        """
+        self._summaries = tuple(summaries)
+        self._todo_index = todo_index
+        self._stages = tuple(stages)
+        self._skipped_files = tuple(skipped_files or [])
+        self._diagnostics = diagnostics if diagnostics is not None else ParseDiagnostics()
+
+    @property
+    def summaries(self) -> Tuple[SummaryResult, ...]:
+        """Getter for `summaries`
+
+        Returns:
+            Tuple[SummaryResult, ...]: Immutable results of the summary generators
+        """
+        return self._summaries
+
+    @property
+    def todo_index(self) -> TodoIndex:
+        """Getter for `todo_index`
+
+        Returns:
+            TodoIndex: Index over todo items of the run
+        """
+        return self._todo_index
+
+    @property
+    def stages(self) -> Tuple[StageStats, ...]:
+        """Getter for `stages`
+
+        Returns:
+            Tuple[StageStats, ...]: Stats of the stages of the run
+        """
+        return self._stages
+
+    @property
+    def skipped_files(self) -> Tuple[SkippedFile, ...]:
+        """Getter for `skipped_files`
+
+        Returns:
+            Tuple[SkippedFile, ...]: Files skipped while parsing
+        """
+        return self._skipped_files
+
+    @property
+    def diagnostics(self) -> ParseDiagnostics:
+        """Getter for `diagnostics`
+
+        Returns:
+            ParseDiagnostics: Errors in parsing files for todo items
+        """
+        return self._diagnostics
+
+    def __str__(self) -> str:
+        """Defines str representation of `RunResult` class object
+
+        Returns:
+            str: Returns string representation of the class object
+        """
+        return f"RunResult: {repr(self)} summaries: {[summary.name for summary in self.summaries]} todo items: {len(self.todo_index)}"
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Configures logging for the TODO application. It is a no-op if the root logger already has handlers i.e. if the host application
+    configured logging itself
+
+    Args:
+        level (int, optional): Logging level. Defaults to logging.INFO
+    """
+    logging.basicConfig(level=level, format=LOGGING_FORMAT)
+
+
+def _get_html(summary_generator: BaseSummaryGenerator, stream_html_reports: bool) -> Union[str, Iterator[str]]:
+    """Returns the html report of `summary_generator` either as generated html or as an iterator rendering it in chunks
+
+    Args:
+        summary_generator (BaseSummaryGenerator): Summary generator whose html report is needed
+        stream_html_reports (bool): Boolean whether to render the html report in chunks
+
+    Returns:
+        Union[str, Iterator[str]]: Generated html if `stream_html_reports` is False else an iterator yielding it in chunks
+    """
+    return summary_generator.iter_html() if stream_html_reports else summary_generator.html
+
+
+def store_reports(summary_generators: List[BaseSummaryGenerator], stream_html_reports: bool, max_workers: int = 1, target_dir: Union[str, None] = None) -> None:
+    """Stores the html reports of `summary_generators` into `target_dir`
+
+    Args:
+        summary_generators (List[BaseSummaryGenerator]): Summary generators whose html reports need to be stored
+        stream_html_reports (bool): Boolean whether to render the html reports in chunks while storing them
+        max_workers (int, optional): Maximum number of shards of a sharded report rendered in parallel. Defaults to 1
+        target_dir (Union[str, None], optional): Directory in which reports are stored. Defaults to None i.e. the default report directory
+    """
+    for summary_generator in summary_generators:
+        if isinstance(summary_generator, ByModuleSummaryGenerator) and summary_generator.shard:
+            store_sharded_html(summary_generator, summary_generator.name, target_dir=target_dir, max_workers=max_workers)
+        else:
+            store_html(_get_html(summary_generator, stream_html_reports), summary_generator.name, target_dir=target_dir)
+
+
+def _check_memory_budget(memory_budget: Union[MemoryBudget, None], stage_name: str) -> None:
+    """Checks `memory_budget` after stage `stage_name` if a budget is set
+
+    Args:
+        memory_budget (Union[MemoryBudget, None]): Memory budget of the run. None if no budget is set
+        stage_name (str): Name of the stage after which budget is checked
+    """
+    if memory_budget is not None:
+        memory_budget.check(stage_name)
+
+
+def _parse_and_export(
+    project_parent_dir: str,
+    files: List[str],
+    ignore_todo_case: bool,
+    parse_cache: Union[ParseCache, None],
+    exporters: List[BaseExporter],
+    scan_options: Union[ScanOptions, None] = None,
+    on_skip: Union[Callable[[SkippedFile], None], None] = None,
+    diagnostics: Union[ParseDiagnostics, None] = None,
+) -> Dict[str, List[TODO]]:
+    """Parses `files` for todo items streaming every todo item to `exporters` as soon as its file is parsed
+
+    Exports are completed only if parsing succeeded and discarded otherwise
+
+    Args:
+        project_parent_dir (str): Parent directory of the project folder
+        files (List[str]): List of all files that need to be parsed
+        ignore_todo_case (bool): Boolean whether to look for case insensitive todo items like todo, Todo etc.
+        parse_cache (Union[ParseCache, None]): Cache of todo items of files parsed in previous runs
+        exporters (List[BaseExporter]): Exporters to which todo items are streamed
+        scan_options (Union[ScanOptions, None], optional): Options controlling how files are read. Defaults to None
+        on_skip (Union[Callable[[SkippedFile], None], None], optional): Callback called with every skipped file. Defaults to None
+        diagnostics (Union[ParseDiagnostics, None], optional): Collector of errors in parsing. Defaults to None
+
+    Returns:
+        Dict[str, List[TODO]]: Returns a key-value pair where key is relative path of file parsed and value is list of todo objects in that file
+    """
+    if not exporters:
+        return parse_files_for_todo_items(
+            project_parent_dir, files, ignore_todo_case, parse_cache=parse_cache, scan_options=scan_options, on_skip=on_skip, diagnostics=diagnostics
+        )
+
+    def _export(todo_obj: TODO) -> None:
+        for exporter in exporters:
+            exporter.write(todo_obj)
+
+    opened_exporters = []
+    try:
+        for exporter in exporters:
+            exporter.open()
+            opened_exporters.append(exporter)
+        all_todos_items = parse_files_for_todo_items(
+            project_parent_dir,
+            files,
+            ignore_todo_case,
+            parse_cache=parse_cache,
+            on_todo=_export,
+            scan_options=scan_options,
+            on_skip=on_skip,
+            diagnostics=diagnostics,
+        )
+    except Exception:
+        for exporter in opened_exporters:
+            exporter.abort()
+        raise
+
+    for exporter in exporters:
+        exporter.close()
+
+    return all_todos_items
+
+
+def _export_todo_items(all_todos_items: Dict[str, List[TODO]], exporters: List[BaseExporter]) -> None:
+    """Exports all todo items at once to every exporter e.g. after attribution replaced todo items parsed from files
+
+    Args:
+        all_todos_items (Dict[str, List[TODO]]): Key-value pair where key is relative path of file parsed and value is list of todo objects in that file
+        exporters (List[BaseExporter]): Exporters to which todo items are written
+    """
+    for exporter in exporters:
+        exporter.export(todo_obj for todos in all_todos_items.values() for todo_obj in todos)
+
+
+def run(
+    connect: Connect,
+    config: BaseConfig = default_config,
+    profile: Union[bool, None] = None,
+    workspace_dir: Union[str, None] = None,
+    parse_cache: Union[ParseCache, None] = None,
+    flush_notifier: bool = True,
+) -> RunResult:
     """Main run method that would get triggered to generate summary and alerts
 
     This method can be imported and run accordingly on demand or as a scheduled task etc.
 
+    If profiling is enabled, each stage of the run i.e. clone/copy, walk, parse, attribute, age, export, index, history, summarize, render, store and notify is
+    profiled and a pstats dump along with a table of wall/CPU time of each stage is written next to the reports. If `config.track_memory` is set, peak
+    memory of each stage is added to the table.
+
+    If `config.memory_budget` is set, resident set size of the process is checked against it after each stage. On exceeding it, the run
+    either aborts with `TODOException` or degrades to streaming html reports with a single worker based on `config.memory_budget_action`
+
     Args:
         connect (Connect): Object of type `Connect` to allow pulling the repository
         config (BaseConfig, optional): Configuration to be used. Defaults to `default_config`
+        profile (Union[bool, None], optional): Boolean whether to profile each stage of the run. Defaults to None i.e. `config.profile` is used
+        workspace_dir (Union[str, None], optional): Directory in which the repository is kept across runs and only updated by later runs.
+                                                    Defaults to None i.e. repository is pulled into a temporary directory removed after the run
+        parse_cache (Union[ParseCache, None], optional): Cache of parsed todo items kept across runs so that only changed files are parsed.
+                                                         Defaults to None
+        flush_notifier (bool, optional): Boolean whether to send notifications queued by `config.notifier` e.g. by `EmailNotifier` with a
+                                         batch size at the end of the notify stage. Defaults to True. The daemon batches notifications of
+                                         many runs and flushes them itself
+
+    Returns:
+        RunResult: Result of the run holding immutable results of the summary generators. Summary generators start every run fresh, so
+                   calling `run` repeatedly with the same config doesn't accumulate todo items of previous runs
     """
+    configure_logging()
+
+    profile = config.profile if profile is None else profile
+    track_memory = config.track_memory
+    profiler = StageProfiler(use_cprofile=profile, track_memory=track_memory) if profile or track_memory else NULL_PROFILER
+    memory_budget = MemoryBudget(config.memory_budget, config.memory_budget_action) if config.memory_budget else None
+
     try:
-        with tempfile.TemporaryDirectory() as temp_dir:
+        with tempfile.TemporaryDirectory() if workspace_dir is None else nullcontext(workspace_dir) as temp_dir:
             project_dir_name = connect.project_dir_name
             project_dir = os.path.join(temp_dir, project_dir_name)
 
-            # Pull the respective repository into a temporary directory
-            logger.info(f"Pulling the repository into temporary directory: {project_dir} using connect instance: {connect}")
-            connect.pull_repository(target_dir=project_dir)
+            if workspace_dir is None:
+                # Pull the respective repository into a temporary directory
+                logger.info(f"Pulling the repository into temporary directory: {project_dir} using connect instance: {connect}")
+                pull_stage_name = "clone" if connect.connect_method == ConnectMethod.GIT_CLONE else "copy"
+                with profiler.stage(pull_stage_name):
+                    connect.pull_repository(target_dir=project_dir)
+            else:
+                # Update the respective repository kept in the workspace by previous runs
+                logger.info(f"Updating the repository in workspace directory: {project_dir} using connect instance: {connect}")
+                pull_stage_name = "update"
+                with profiler.stage(pull_stage_name):
+                    connect.update_repository(target_dir=project_dir)
+            _check_memory_budget(memory_budget, pull_stage_name)
 
-            all_files_in_project_dir = get_files_in_dir(
-                dir_path=project_dir, extension="py", exclude_subdirs=config.exclude_dirs, exclude_files=config.exclude_files
-            )
+            with profiler.stage("walk"):
+                all_files_in_project_dir = get_files_in_dir(
+                    dir_path=project_dir, extension=config.extensions, exclude_subdirs=config.exclude_dirs, exclude_files=config.exclude_files
+                )
+            _check_memory_budget(memory_budget, "walk")
 
             ignore_todo_case = config.ignore_todo_case
-            all_todos_items = parse_files_for_todo_items(temp_dir, all_files_in_project_dir, ignore_todo_case)
+            # Attribution and ages replace todo items after parsing, so exports are written afterwards instead of being streamed while parsing
+            attribute = config.attributor is not None and connect.connect_method == ConnectMethod.GIT_CLONE
+            annotate_ages = config.age_tracker is not None and connect.connect_method == ConnectMethod.GIT_CLONE
+            export_after_parse = attribute or annotate_ages
+            skipped_files: List[SkippedFile] = []
+            diagnostics = ParseDiagnostics()
+            with profiler.stage("parse"):
+                all_todos_items = _parse_and_export(
+                    temp_dir,
+                    all_files_in_project_dir,
+                    ignore_todo_case,
+                    parse_cache,
+                    [] if export_after_parse else config.exporters,
+                    config.scan_options,
+                    skipped_files.append,
+                    diagnostics,
+                )
+            if diagnostics.error_count:
+                logger.warning(f"{diagnostics.error_count} errors in parsing todo items by kind: {diagnostics.counts}")
+            _check_memory_budget(memory_budget, "parse")
+
+            # Attribution and ages need the cloned repository, so they run before the temporary directory is removed
+            if attribute:
+                with profiler.stage("attribute"):
+                    config.attributor.attribute(project_dir, temp_dir, all_todos_items)
+                _check_memory_budget(memory_budget, "attribute")
+
+            if annotate_ages:
+                with profiler.stage("age"):
+                    config.age_tracker.annotate(project_dir, temp_dir, all_todos_items, ignore_todo_case)
+                _check_memory_budget(memory_budget, "age")
+
+            if export_after_parse and config.exporters:
+                with profiler.stage("export"):
+                    _export_todo_items(all_todos_items, config.exporters)
+                _check_memory_budget(memory_budget, "export")
 
             summary_generators = config.summary_generators
 
+        # Build the index once so that all summary generators can query it
+        with profiler.stage("index"):
+            todo_index = TodoIndex(all_todos_items)
+        _check_memory_budget(memory_budget, "index")
+
+        if config.history_store is not None:
+            with profiler.stage("history"):
+                config.history_store.record_run(todo_index, connect.project_dir_name)
+            _check_memory_budget(memory_budget, "history")
+
+        # With streaming, html reports are rendered chunk by chunk while being stored/notified instead of being held in memory.
+        # Degraded mode always streams and renders with a single worker to keep memory in check
+        degrade = memory_budget is not None and memory_budget.degraded
+        stream_html_reports = config.generate_html and (config.stream_html_reports or degrade)
+        max_workers = 1 if degrade else config.max_workers
+
         # Generate summaries
-        generate_summary(all_todos_items, summary_generators, config.generate_html)
+        summary_results = generate_summary(
+            all_todos_items, summary_generators, config.generate_html and not stream_html_reports, todo_index=todo_index, profiler=profiler
+        )
+        _check_memory_budget(memory_budget, "summarize")
 
         # Store generated summaries
         if config.generate_html and config.save_html_reports:
-            [store_html(summary_generator.html, summary_generator.name) for summary_generator in summary_generators]
+            with profiler.stage("store"):
+                store_reports(summary_generators, stream_html_reports, max_workers=max_workers, target_dir=config.report_dir)
+            _check_memory_budget(memory_budget, "store")
 
         if config.notifier:
-            config.notifier.notify([(summary_generator.name, summary_generator.html) for summary_generator in summary_generators])
+            with profiler.stage("notify"):
+                config.notifier.todo_index = todo_index
+                config.notifier.notify(
+                    [(summary_generator.name, _get_html(summary_generator, stream_html_reports)) for summary_generator in summary_generators]
+                )
+                if flush_notifier and config.notifier.pending_count:
+                    config.notifier.flush()
+
+        return RunResult(summary_results, todo_index, profiler.stages, skipped_files, diagnostics)
+
+    except MemoryBudgetExceededException as exc:
+        logger.error(f"Aborting TODO application: {exc}")
+        raise TODOException(f"Aborting TODO application: {exc}") from exc
 
     except Exception:
         logger.exception("Error in TODO application")
         raise TODOException("Error in TODO application")
+
+    finally:
+        # Profile is dumped even if the run failed as it helps figuring out the failing stage
+        if profiler.enabled:
+            try:
+                profiler.dump(get_report_dir(config.report_dir))
+            except Exception:
+                logger.exception("Error in dumping profile of TODO application")
@@ -0,0 +1,285 @@
+"""This module provides exporters writing todo items as machine readable records so that
+downstream tools can load them in bulk instead of parsing the html reports. Exporters are
+fed one todo item at a time while files are parsed, so records are streamed out without
+holding them in memory. Three exporters are provided: JSON Lines, CSV and a SQLite table.
+"""
+
+import csv
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Union
+
+from todonotifier.models import TODO
+from todonotifier.utils import get_report_dir
+
+if TYPE_CHECKING:
+    from sqlite3 import Connection
+
+logger = logging.getLogger(__name__)
+
+RECORD_FIELDS = ("module", "line_no", "user_name", "msg", "completion_date", "introduction_sha", "introduced_at")
+
+
+def todo_to_record(todo_obj: TODO) -> Dict[str, Any]:
+    """Returns the record of a todo item as exported
+
+    Args:
+        todo_obj (TODO): Todo item
+
+    Returns:
+        Dict[str, Any]: Key-value pair of the fields in `RECORD_FIELDS` and their values. Introduction fields are None if the commit that
+                        introduced the todo item isn't known
+    """
+    introduction = todo_obj.introduction
+    return {
+        "module": todo_obj.module,
+        "line_no": todo_obj.position.line_no,
+        "user_name": todo_obj.user.user_name,
+        "msg": todo_obj.msg,
+        "completion_date": str(todo_obj.completion_date),
+        "introduction_sha": introduction.commit_sha if introduction is not None else None,
+        "introduced_at": introduction.introduced_at.isoformat() if introduction is not None else None,
+    }
+
+
+class BaseExporter(ABC):
+    """Base class of exporters. `open` is called before the first todo item is written and `close` after the last one.
+    If the export fails midway, `abort` is called instead of `close`. Readers therefore never see a partial export
+    """
+
+    @abstractmethod
+    def open(self) -> None:
+        """Prepares the exporter for writing todo items"""
+        pass
+
+    @abstractmethod
+    def write(self, todo_obj: TODO) -> None:
+        """Writes one todo item
+
+        Args:
+            todo_obj (TODO): Todo item to be written
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """Completes the export"""
+        pass
+
+    @abstractmethod
+    def abort(self) -> None:
+        """Discards the export keeping the previous one if any"""
+        pass
+
+    def export(self, todo_objs: Iterable[TODO]) -> None:
+        """Exports all `todo_objs` at once e.g. from `RunResult.todo_index`
+
+        Args:
+            todo_objs (Iterable[TODO]): Todo items to be exported
+        """
+        self.open()
+        try:
+            for todo_obj in todo_objs:
+                self.write(todo_obj)
+        except Exception:
+            self.abort()
+            raise
+        self.close()
+
+
+class _FileExporter(BaseExporter):
+    """Base class of exporters writing into a file replaced atomically on `close`"""
+
+    def __init__(self, file_name: str, target_dir: Union[str, None] = None) -> None:
+        """Initializer for `_FileExporter` class
+
+        Args:
+            file_name (str): Name of the file into which todo items are exported
+            target_dir (Union[str, None], optional): Target location(absolute path) where file needs to be stored. Defaults to folder `.report`
+                                                     in current location
+        """
+        self._file_name = file_name
+        self._target_dir = target_dir
+        self._file = None
+
+    @property
+    def file_path(self) -> str:
+        """Getter for `file_path`
+
+        Returns:
+            str: Location of the exported file
+        """
+        return os.path.join(get_report_dir(self._target_dir), self._file_name)
+
+    def open(self) -> None:
+        """Opens a temporary file next to `file_path` for writing"""
+        self._file = open(f"{self.file_path}.tmp", "w", newline="")
+
+    def close(self) -> None:
+        """Closes the temporary file and moves it to `file_path`"""
+        if self._file is None:
+            return
+
+        self._file.close()
+        self._file = None
+        os.replace(f"{self.file_path}.tmp", self.file_path)
+        logger.info(f"Exported todo items to: {self.file_path}")
+
+    def abort(self) -> None:
+        """Closes and removes the temporary file"""
+        if self._file is None:
+            return
+
+        self._file.close()
+        self._file = None
+        os.remove(f"{self.file_path}.tmp")
+
+
+class JSONLinesExporter(_FileExporter):
+    """Exports todo items as one JSON object per line"""
+
+    def __init__(self, file_name: str = "todos.jsonl", target_dir: Union[str, None] = None) -> None:
+        """Initializer for `JSONLinesExporter` class
+
+        Args:
+            file_name (str, optional): Name of the file into which todo items are exported. Defaults to "todos.jsonl"
+            target_dir (Union[str, None], optional): Target location(absolute path) where file needs to be stored. Defaults to folder `.report`
+                                                     in current location
+        """
+        super().__init__(file_name, target_dir)
+
+    def write(self, todo_obj: TODO) -> None:
+        """Writes one todo item as a JSON line
+
+        Args:
+            todo_obj (TODO): Todo item to be written
+        """
+        self._file.write(json.dumps(todo_to_record(todo_obj)))
+        self._file.write("\n")
+
+
+class CSVExporter(_FileExporter):
+    """Exports todo items as rows of a CSV file with a header row of `RECORD_FIELDS`"""
+
+    def __init__(self, file_name: str = "todos.csv", target_dir: Union[str, None] = None) -> None:
+        """Initializer for `CSVExporter` class
+
+        Args:
+            file_name (str, optional): Name of the file into which todo items are exported. Defaults to "todos.csv"
+            target_dir (Union[str, None], optional): Target location(absolute path) where file needs to be stored. Defaults to folder `.report`
+                                                     in current location
+        """
+        super().__init__(file_name, target_dir)
+        self._writer = None
+
+    def open(self) -> None:
+        """Opens the file and writes the header row"""
+        super().open()
+        self._writer = csv.DictWriter(self._file, fieldnames=RECORD_FIELDS)
+        self._writer.writeheader()
+
+    def write(self, todo_obj: TODO) -> None:
+        """Writes one todo item as a CSV row
+
+        Args:
+            todo_obj (TODO): Todo item to be written
+        """
+        self._writer.writerow(todo_to_record(todo_obj))
+
+
+class SQLiteExporter(BaseExporter):
+    """Exports todo items into a table of a SQLite database, replacing its rows
+
+    Rows are inserted with `executemany` in batches of `batch_size` within one transaction committed on `close`, so readers see either
+    the previous or the complete new set of todo items
+    """
+
+    def __init__(self, db_file_name: str = "todos.sqlite3", target_dir: Union[str, None] = None, table_name: str = "todos", batch_size: int = 1000) -> None:
+        """Initializer for `SQLiteExporter` class
+
+        Args:
+            db_file_name (str, optional): Name of the database file. Defaults to "todos.sqlite3"
+            target_dir (Union[str, None], optional): Target location(absolute path) where database needs to be stored. Defaults to folder
+                                                     `.report` in current location
+            table_name (str, optional): Name of the table into which todo items are exported. Defaults to "todos"
+            batch_size (int, optional): Number of rows inserted together. Defaults to 1000
+
+        Raises:
+            ValueError: Raised if `table_name` isn't a valid identifier
+        """
+        if not table_name.isidentifier():
+            raise ValueError(f"Table name must be a valid identifier, got: {table_name}")
+
+        self._db_file_name = db_file_name
+        self._target_dir = target_dir
+        self._table_name = table_name
+        self._batch_size = max(1, batch_size)
+        self._connection: Union["Connection", None] = None
+        self._batch: List[tuple] = []
+
+    @property
+    def db_file_path(self) -> str:
+        """Getter for `db_file_path`
+
+        Returns:
+            str: Location of the database file
+        """
+        return os.path.join(get_report_dir(self._target_dir), self._db_file_name)
+
+    def open(self) -> None:
+        """Connects to the database, creates the table if needed and starts a transaction replacing its rows"""
+        import sqlite3
+
+        self._connection = sqlite3.connect(self.db_file_path)
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {self._table_name} "
+            "(module TEXT NOT NULL, line_no INTEGER NOT NULL, user_name TEXT, msg TEXT, completion_date TEXT, introduction_sha TEXT, introduced_at TEXT)"
+        )
+        self._connection.commit()
+        # DELETE implicitly begins the transaction which the inserts join
+        self._connection.execute(f"DELETE FROM {self._table_name}")
+
+    def _flush(self) -> None:
+        """Inserts the batched rows"""
+        if self._batch:
+            placeholders = ", ".join("?" for _ in RECORD_FIELDS)
+            self._connection.executemany(f"INSERT INTO {self._table_name} ({', '.join(RECORD_FIELDS)}) VALUES ({placeholders})", self._batch)
+            self._batch = []
+
+    def write(self, todo_obj: TODO) -> None:
+        """Adds one todo item to the batch of rows, inserting the batch once it is full
+
+        Args:
+            todo_obj (TODO): Todo item to be written
+        """
+        record = todo_to_record(todo_obj)
+        self._batch.append(tuple(record[field] for field in RECORD_FIELDS))
+        if len(self._batch) >= self._batch_size:
+            self._flush()
+
+    def close(self) -> None:
+        """Inserts the remaining rows and commits the transaction"""
+        if self._connection is None:
+            return
+
+        try:
+            self._flush()
+            self._connection.commit()
+            logger.info(f"Exported todo items to table: {self._table_name} of: {self.db_file_path}")
+        finally:
+            self._connection.close()
+            self._connection = None
+
+    def abort(self) -> None:
+        """Rolls back the transaction"""
+        if self._connection is None:
+            return
+
+        try:
+            self._connection.rollback()
+        finally:
+            self._connection.close()
+            self._connection = None
+            self._batch = []
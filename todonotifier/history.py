@@ -0,0 +1,417 @@
+"""This module provides a history store appending a snapshot of the todo items of every run
+to a SQLite database, so that changes of todo items over time can be queried.
+
+The database is kept compact by storing every distinct todo item once in `todos` under its
+hashed identity including its user (see `todonotifier.state`) with users and modules
+dictionary encoded, while a snapshot only holds one row of integers per todo item and run:
+
+- `runs`: One row per recorded run
+- `users`, `modules`: Dictionary of user names and modules
+- `todos`: Distinct todo items by their 16 byte identity
+- `snapshots`: Todo items present in a run along with their line number and completion date
+  stored as a proleptic Gregorian ordinal
+- `burndown`, `burndown_state`: Weekly counts of opened, closed and expired todo items per module
+  and per user along with the last run counted into them. They are updated incrementally by
+  comparing each new run with the run before it, so historical snapshots are never read again
+
+A snapshot is written in one transaction using bulk inserts.
+"""
+
+import logging
+import os
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple, Union
+
+from todonotifier.state import iter_todo_identities
+from todonotifier.todo_index import TodoIndex
+
+if TYPE_CHECKING:
+    from sqlite3 import Connection
+
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of host parameters of a statement. Older versions allow 999
+MAX_QUERY_PARAMS = 900
+GROUP_BY_COLUMNS = {"module": "modules.name", "user": "users.name"}
+GROUP_BY_TABLES = {"module": ("modules", "module_id"), "user": ("users", "user_id")}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    project TEXT NOT NULL,
+    run_at TEXT NOT NULL,
+    todo_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS users (user_id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS modules (module_id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS todos (
+    todo_id INTEGER PRIMARY KEY,
+    identity BLOB NOT NULL UNIQUE,
+    module_id INTEGER NOT NULL REFERENCES modules (module_id),
+    user_id INTEGER NOT NULL REFERENCES users (user_id),
+    msg TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    todo_id INTEGER NOT NULL REFERENCES todos (todo_id),
+    line_no INTEGER NOT NULL,
+    completion_date INTEGER NOT NULL,
+    PRIMARY KEY (run_id, todo_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS burndown (
+    project TEXT NOT NULL,
+    week INTEGER NOT NULL,
+    group_by TEXT NOT NULL,
+    group_id INTEGER NOT NULL,
+    opened INTEGER NOT NULL,
+    closed INTEGER NOT NULL,
+    expired INTEGER NOT NULL,
+    PRIMARY KEY (project, group_by, week, group_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS burndown_state (project TEXT PRIMARY KEY, last_run_id INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS runs_project_run_at ON runs (project, run_at);
+CREATE INDEX IF NOT EXISTS todos_user_id ON todos (user_id);
+CREATE INDEX IF NOT EXISTS todos_module_id ON todos (module_id);
+CREATE INDEX IF NOT EXISTS snapshots_completion_date ON snapshots (completion_date);
+"""
+
+
+def _chunks(values: List, size: int = MAX_QUERY_PARAMS) -> Iterable[List]:
+    """Yields `values` in chunks of `size`
+
+    Args:
+        values (List): Values to be chunked
+        size (int, optional): Size of each chunk. Defaults to MAX_QUERY_PARAMS
+
+    Yields:
+        Iterable[List]: Chunks of `values`
+    """
+    for start in range(0, len(values), size):
+        yield values[start : start + size]  # noqa: E203
+
+
+class HistoryStore:
+    """Store of snapshots of todo items of runs kept in a SQLite database"""
+
+    def __init__(self, db_file: str) -> None:
+        """Initializer for `HistoryStore` class
+
+        Args:
+            db_file (str): SQLite database file. Created along with its schema if needed
+        """
+        self._db_file = db_file
+
+    @property
+    def db_file(self) -> str:
+        """Getter for `db_file`
+
+        Returns:
+            str: SQLite database file
+        """
+        return self._db_file
+
+    def _connect(self) -> "Connection":
+        """Opens a connection to the database creating its schema if needed
+
+        Returns:
+            Connection: Connection to the database
+        """
+        import sqlite3
+
+        db_dir = os.path.dirname(os.path.abspath(self._db_file))
+        os.makedirs(db_dir, exist_ok=True)
+
+        connection = sqlite3.connect(self._db_file)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        connection.executescript(SCHEMA)
+        return connection
+
+    def _get_ids(self, connection: "Connection", table: str, id_column: str, names: List[str]) -> Dict[str, int]:
+        """Adds `names` missing from dictionary table `table` and returns the ids of all `names`
+
+        Args:
+            connection (Connection): Connection to the database
+            table (str): Dictionary table i.e. `users` or `modules`
+            id_column (str): Id column of `table`
+            names (List[str]): Distinct names to look up
+
+        Returns:
+            Dict[str, int]: Key-value pair where key is a name and value is its id
+        """
+        connection.executemany(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)", [(name,) for name in names])
+        ids = {}
+        for chunk in _chunks(names):
+            ids.update(connection.execute(f"SELECT name, {id_column} FROM {table} WHERE name IN ({', '.join('?' * len(chunk))})", chunk))
+
+        return ids
+
+    def record_run(self, todo_index: TodoIndex, project: str, run_at: Union[datetime, None] = None) -> int:
+        """Appends the snapshot of todo items of a run
+
+        Args:
+            todo_index (TodoIndex): Index over todo items of the run
+            project (str): Name of the project of the run. Allows keeping history of many projects in one database
+            run_at (Union[datetime, None], optional): Time of the run. Defaults to None i.e. now
+
+        Returns:
+            int: Id of the recorded run
+        """
+        run_at = run_at or datetime.now()
+        # Todo items are stored along with their user, so a reassigned todo item is a distinct one
+        identities = list(iter_todo_identities(todo_index, include_user=True))
+
+        connection = self._connect()
+        try:
+            with connection:
+                run_id = connection.execute(
+                    "INSERT INTO runs (project, run_at, todo_count) VALUES (?, ?, ?)", (project, run_at.isoformat(timespec="seconds"), len(identities))
+                ).lastrowid
+
+                user_ids = self._get_ids(connection, "users", "user_id", list({todo_obj.user.user_name for _, todo_obj in identities}))
+                module_ids = self._get_ids(connection, "modules", "module_id", list({todo_obj.module for _, todo_obj in identities}))
+
+                connection.executemany(
+                    "INSERT OR IGNORE INTO todos (identity, module_id, user_id, msg) VALUES (?, ?, ?, ?)",
+                    (
+                        (bytes.fromhex(identity), module_ids[todo_obj.module], user_ids[todo_obj.user.user_name], todo_obj.msg)
+                        for identity, todo_obj in identities
+                    ),
+                )
+
+                todo_ids = {}
+                for chunk in _chunks([bytes.fromhex(identity) for identity, _ in identities]):
+                    todo_ids.update(connection.execute(f"SELECT identity, todo_id FROM todos WHERE identity IN ({', '.join('?' * len(chunk))})", chunk))
+
+                connection.executemany(
+                    "INSERT INTO snapshots (run_id, todo_id, line_no, completion_date) VALUES (?, ?, ?, ?)",
+                    (
+                        (run_id, todo_ids[bytes.fromhex(identity)], todo_obj.position.line_no, todo_obj.completion_date.toordinal())
+                        for identity, todo_obj in identities
+                    ),
+                )
+        finally:
+            connection.close()
+
+        logger.info(f"Recorded run: {run_id} of project: {project} with {len(identities)} todo items into history: {self._db_file}")
+        return run_id
+
+    def runs(self, project: Union[str, None] = None) -> List[Tuple[int, str, datetime, int]]:
+        """Returns the recorded runs
+
+        Args:
+            project (Union[str, None], optional): Name of the project whose runs are returned. Defaults to None i.e. all projects
+
+        Returns:
+            List[Tuple[int, str, datetime, int]]: Tuples of run id, project, time of the run and number of todo items in the order of time
+        """
+        query = "SELECT run_id, project, run_at, todo_count FROM runs"
+        params = ()
+        if project is not None:
+            query += " WHERE project = ?"
+            params = (project,)
+
+        connection = self._connect()
+        try:
+            rows = connection.execute(f"{query} ORDER BY run_at, run_id", params).fetchall()
+        finally:
+            connection.close()
+
+        return [(run_id, project, datetime.fromisoformat(run_at), todo_count) for run_id, project, run_at, todo_count in rows]
+
+    def run_todo_ids(self, run_id: int) -> Dict[int, date]:
+        """Returns the todo items present in a run
+
+        Args:
+            run_id (int): Id of the run
+
+        Returns:
+            Dict[int, date]: Key-value pair where key is id of a todo item and value is its completion date in the run
+        """
+        connection = self._connect()
+        try:
+            rows = connection.execute("SELECT todo_id, completion_date FROM snapshots WHERE run_id = ?", (run_id,)).fetchall()
+        finally:
+            connection.close()
+
+        return {todo_id: date.fromordinal(completion_date) for todo_id, completion_date in rows}
+
+    def todo_details(self, todo_ids: Iterable[int]) -> Dict[int, Tuple[str, str]]:
+        """Returns the module and user of todo items
+
+        Args:
+            todo_ids (Iterable[int]): Ids of todo items
+
+        Returns:
+            Dict[int, Tuple[str, str]]: Key-value pair where key is id of a todo item and value is a tuple of its module and user name
+        """
+        details = {}
+        connection = self._connect()
+        try:
+            for chunk in _chunks(list(todo_ids)):
+                details.update(
+                    (todo_id, (module, user_name))
+                    for todo_id, module, user_name in connection.execute(
+                        "SELECT todos.todo_id, modules.name, users.name FROM todos "
+                        "JOIN modules ON modules.module_id = todos.module_id JOIN users ON users.user_id = todos.user_id "
+                        f"WHERE todos.todo_id IN ({', '.join('?' * len(chunk))})",
+                        chunk,
+                    )
+                )
+        finally:
+            connection.close()
+
+        return details
+
+    def counts_over_time(self, group_by: str, project: Union[str, None] = None) -> List[Tuple[datetime, str, int]]:
+        """Returns the number of todo items per module or per user in every run
+
+        Args:
+            group_by (str): "module" or "user"
+            project (Union[str, None], optional): Name of the project whose runs are counted. Defaults to None i.e. all projects
+
+        Returns:
+            List[Tuple[datetime, str, int]]: Tuples of time of the run, module or user name and number of todo items in the order of time
+
+        Raises:
+            ValueError: Raised if `group_by` isn't "module" or "user"
+        """
+        if group_by not in GROUP_BY_COLUMNS:
+            raise ValueError(f"Counts can be grouped by one of {list(GROUP_BY_COLUMNS)}, got: {group_by}")
+
+        query = (
+            f"SELECT runs.run_at, {GROUP_BY_COLUMNS[group_by]}, COUNT(*) FROM snapshots "
+            "JOIN runs ON runs.run_id = snapshots.run_id JOIN todos ON todos.todo_id = snapshots.todo_id "
+            "JOIN modules ON modules.module_id = todos.module_id JOIN users ON users.user_id = todos.user_id"
+        )
+        params = ()
+        if project is not None:
+            query += " WHERE runs.project = ?"
+            params = (project,)
+
+        connection = self._connect()
+        try:
+            rows = connection.execute(f"{query} GROUP BY runs.run_id, {GROUP_BY_COLUMNS[group_by]} ORDER BY runs.run_at, runs.run_id", params).fetchall()
+        finally:
+            connection.close()
+
+        return [(datetime.fromisoformat(run_at), name, count) for run_at, name, count in rows]
+
+    def _read_snapshot(self, connection: "Connection", run_id: int) -> Dict[int, Tuple[int, int, int]]:
+        """Reads the todo items of a run for updating burndown
+
+        Args:
+            connection (Connection): Connection to the database
+            run_id (int): Id of the run
+
+        Returns:
+            Dict[int, Tuple[int, int, int]]: Key-value pair where key is id of a todo item and value is a tuple of its completion date as
+                                             ordinal, module id and user id
+        """
+        return {
+            todo_id: (completion_date, module_id, user_id)
+            for todo_id, completion_date, module_id, user_id in connection.execute(
+                "SELECT snapshots.todo_id, snapshots.completion_date, todos.module_id, todos.user_id FROM snapshots "
+                "JOIN todos ON todos.todo_id = snapshots.todo_id WHERE snapshots.run_id = ?",
+                (run_id,),
+            )
+        }
+
+    def update_burndown(self, project: str) -> int:
+        """Counts the runs of `project` recorded since the last update into the weekly burndown
+
+        Each run is compared with the run recorded before it. Todo items only in the run are counted as opened, todo items only in the run
+        before it as closed and todo items of the run whose completion date lies between the dates of both runs as expired. Counts are
+        added to the week of the run. The first run of a project counts all its todo items as opened and those already past their
+        completion date as expired
+
+        Args:
+            project (str): Name of the project
+
+        Returns:
+            int: Number of runs counted
+        """
+        connection = self._connect()
+        try:
+            last_run_id = connection.execute("SELECT last_run_id FROM burndown_state WHERE project = ?", (project,)).fetchone()
+            last_run_id = last_run_id[0] if last_run_id else None
+            query = "SELECT run_id, run_at FROM runs WHERE project = ?"
+            params = (project,)
+            if last_run_id is not None:
+                query += " AND run_id >= ?"
+                params = (project, last_run_id)
+            runs = [(run_id, datetime.fromisoformat(run_at).date()) for run_id, run_at in connection.execute(f"{query} ORDER BY run_id", params)]
+
+            previous_run_date, previous_snapshot = None, {}
+            if runs and runs[0][0] == last_run_id:
+                previous_run_date, previous_snapshot = runs[0][1], self._read_snapshot(connection, last_run_id)
+                runs = runs[1:]
+
+            for run_id, run_date in runs:
+                snapshot = self._read_snapshot(connection, run_id)
+                week = (run_date - timedelta(days=run_date.weekday())).toordinal()
+                # Counts keyed by (group_by, group_id) holding [opened, closed, expired]
+                counts: Dict[Tuple[str, int], List[int]] = {}
+
+                def _count(module_id: int, user_id: int, column: int) -> None:
+                    for key in (("module", module_id), ("user", user_id)):
+                        counts.setdefault(key, [0, 0, 0])[column] += 1
+
+                expired_from = previous_run_date.toordinal() if previous_run_date else date.min.toordinal()
+                for todo_id, (completion_date, module_id, user_id) in snapshot.items():
+                    if todo_id not in previous_snapshot:
+                        _count(module_id, user_id, 0)
+                    if expired_from <= completion_date < run_date.toordinal():
+                        _count(module_id, user_id, 2)
+                for todo_id, (_, module_id, user_id) in previous_snapshot.items():
+                    if todo_id not in snapshot:
+                        _count(module_id, user_id, 1)
+
+                with connection:
+                    connection.executemany(
+                        "INSERT INTO burndown (project, week, group_by, group_id, opened, closed, expired) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT (project, group_by, week, group_id) DO UPDATE SET opened = opened + excluded.opened, "
+                        "closed = closed + excluded.closed, expired = expired + excluded.expired",
+                        [(project, week, group_by, group_id, *group_counts) for (group_by, group_id), group_counts in counts.items()],
+                    )
+                    connection.execute("INSERT OR REPLACE INTO burndown_state (project, last_run_id) VALUES (?, ?)", (project, run_id))
+
+                previous_run_date, previous_snapshot = run_date, snapshot
+        finally:
+            connection.close()
+
+        logger.info(f"Counted {len(runs)} runs of project: {project} into burndown")
+        return len(runs)
+
+    def burndown(self, project: str, group_by: str, since: Union[date, None] = None) -> List[Tuple[date, str, int, int, int]]:
+        """Returns the weekly counts of opened, closed and expired todo items per module or per user as of the last `update_burndown`
+
+        Args:
+            project (str): Name of the project
+            group_by (str): "module" or "user"
+            since (Union[date, None], optional): Date from whose week counts are returned. Defaults to None i.e. all weeks
+
+        Returns:
+            List[Tuple[date, str, int, int, int]]: Tuples of first day of week, module or user name and number of todo items opened, closed
+                                                   and expired in the week, in the order of week and name
+
+        Raises:
+            ValueError: Raised if `group_by` isn't "module" or "user"
+        """
+        if group_by not in GROUP_BY_TABLES:
+            raise ValueError(f"Burndown can be grouped by one of {list(GROUP_BY_TABLES)}, got: {group_by}")
+
+        table, id_column = GROUP_BY_TABLES[group_by]
+        since_week = (since - timedelta(days=since.weekday())).toordinal() if since else 0
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                f"SELECT burndown.week, {table}.name, burndown.opened, burndown.closed, burndown.expired FROM burndown "
+                f"JOIN {table} ON {table}.{id_column} = burndown.group_id "
+                f"WHERE burndown.project = ? AND burndown.group_by = ? AND burndown.week >= ? ORDER BY burndown.week, {table}.name",
+                (project, group_by, since_week),
+            ).fetchall()
+        finally:
+            connection.close()
+
+        return [(date.fromordinal(week), name, opened, closed, expired) for week, name, opened, closed, expired in rows]
@@ -9,15 +9,43 @@ is considered as todo item and the rest are considered as message.
 No. of spaces between todo, date, user, message is NOT important.
 """
 
-from datetime import datetime
-from typing import TypeVar
-
-from dateutil import parser
+import re
+from datetime import date, datetime
+from typing import TypeVar, Union
 
 from todonotifier.constants import DEFAULT_COMPLETION_DATE
 
 T = TypeVar("T")
 
+ISO_DATE_REGEX = re.compile(r"\d{4}-\d{2}-\d{2}")
+DEFAULT_COMPLETION_DATE_OBJ = date.fromisoformat(DEFAULT_COMPLETION_DATE)
+
+
+def parse_completion_date(completion_date_str: str) -> date:
+    """Parses the completion date of a todo item
+
+    Dates in expected format "YYYY-MM-DD" are parsed directly. Only other formats fall back to `dateutil` which is imported on first use
+    as it is slow to import.
+
+    Args:
+        completion_date_str (str): Date by which the respective `todo` item is supposed to be completed
+
+    Returns:
+        date: Parsed completion date or `DEFAULT_COMPLETION_DATE` if `completion_date_str` is empty or not a valid date
+    """
+    if not completion_date_str:
+        return DEFAULT_COMPLETION_DATE_OBJ
+
+    try:
+        if ISO_DATE_REGEX.fullmatch(completion_date_str):
+            return date.fromisoformat(completion_date_str)
+
+        from dateutil import parser
+
+        return parser.parse(completion_date_str).date()
+    except Exception:
+        return DEFAULT_COMPLETION_DATE_OBJ
+
 
 class USER:
     def __init__(self, user_name: str) -> None:
@@ -73,6 +101,44 @@ class POSITION:
         return f"Position: {repr(self)} line_no: {self.line_no}"
 
 
+class INTRODUCTION:
+    def __init__(self, commit_sha: str, introduced_at: datetime) -> None:
+        """Initializer for introduction of a todo item into the repository
+
+        Args:
+            commit_sha (str): SHA of the commit that introduced the todo item
+            introduced_at (datetime): Commit time of the commit that introduced the todo item
+        """
+        self._commit_sha = commit_sha
+        self._introduced_at = introduced_at
+
+    @property
+    def commit_sha(self) -> str:
+        """Getter for `commit_sha`
+
+        Returns:
+            str: SHA of the commit that introduced the todo item
+        """
+        return self._commit_sha
+
+    @property
+    def introduced_at(self) -> datetime:
+        """Getter for `introduced_at`
+
+        Returns:
+            datetime: Commit time of the commit that introduced the todo item
+        """
+        return self._introduced_at
+
+    def __str__(self) -> str:
+        """Defines str representation of `INTRODUCTION` class object
+
+        Returns:
+            str: Returns string representation of the class object
+        """
+        return f"Introduction: {repr(self)} commit_sha: {self.commit_sha} introduced_at: {self.introduced_at}"
+
+
 class TODO:
     def __init__(
         self,
@@ -81,6 +147,7 @@ class TODO:
         completion_date_str: str,
         module: str,
         position: POSITION,
+        introduction: Union[INTRODUCTION, None] = None,
     ) -> None:
         """Initializer for `todo.upper()` class
 
@@ -90,18 +157,17 @@ class TODO:
             completion_date_str (str): Date by which the respective `todo` item is supposed to be completed
             module (str): Module in which todo item is present
             position (POSITION): Represents the position of the respective todo
+            introduction (Union[INTRODUCTION, None], optional): Commit that introduced the todo item. Defaults to None i.e. not known
 
         Raises:
             InvalidDateFormatException: Raised if the `completion_date_str` is not valid or doesn't conform to expected format of "YYYY-MM-DD"
         """
         self._msg = msg
         self._user = user
-        try:
-            self._completion_date = parser.parse(completion_date_str).date()
-        except Exception:
-            self._completion_date = parser.parse(DEFAULT_COMPLETION_DATE).date()
+        self._completion_date = parse_completion_date(completion_date_str)
         self._module = module
         self._position = position
+        self._introduction = introduction
 
     @property
     def msg(self) -> str:
@@ -148,6 +214,15 @@ class TODO:
         """
         return self._position
 
+    @property
+    def introduction(self) -> Union[INTRODUCTION, None]:
+        """Getter for `introduction`
+
+        Returns:
+            Union[INTRODUCTION, None]: Commit that introduced the respective todo item. None if not known
+        """
+        return self._introduction
+
     def __str__(self) -> str:
         """str representation of `todo` object
 
@@ -1,49 +1,131 @@
 """ This module provides interface to define a notifier that notifies the users. It also
-provides an EmailNotifier to notify over email.
+provides an EmailNotifier to notify over email, a PerUserEmailNotifier sending each user
+only their own todo items and an SMTPSession allowing to reuse one authenticated SMTP
+connection across many notifications.
 """
 
-import smtplib
-import ssl
+import io
+import itertools
+import logging
+import queue
+import re
+import threading
+import time
 from abc import ABC, abstractmethod
-from datetime import datetime
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from typing import List, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Tuple, Union
 
+from todonotifier.summary_generators import (
+    BY_USER_ROW_TEMPLATE,
+    EXPIRED_BY_USER_TABLE_OPEN_TAG,
+    UPCOMING_BY_USER_TABLE_OPEN_TAG,
+    _iter_tables_html,
+)
+from todonotifier.todo_index import TodoIndex
 
-class BaseNotifier(ABC):
-    def __init__(self) -> None:
-        """Initializer for `BaseNotifier`"""
-        pass
+if TYPE_CHECKING:
+    from smtplib import SMTP
 
-    def _aggregate_all_summaries(self, summary: List[Tuple[str, str]]) -> str:
-        """Abstract method allowing to aggregate all summaries together to be sent
-
-        Args:
-            summary (List[Tuple[str, str]]): List of tuples where each tuple consists of summary name and generated summary html
+logger = logging.getLogger(__name__)
 
-        Returns:
-            str: Returns the string representing aggregation of all summaries in their html format
-        """
-        html = """\
+ATTACHMENT_FORMATS = ("gzip", "zip")
+ATTACHMENT_SUMMARY_OPEN_TAG = """\
         <html>
         <body>
+            <h1>TODO Summary</h1>
+            <p>{}</p>
+            <table>
+            <tr>
+                <th>Report</th>
+                <th>Size (KiB)</th>
+            </tr>
+            """
+ATTACHMENT_SUMMARY_ROW_TEMPLATE = """
+            <tr>
+                <td>{}</td>
+                <td>{:.1f}</td>
+            </tr>
+            """
+ATTACHMENT_SUMMARY_CLOSE_TAG = """
+            </table>
+            <p>Full reports are attached as {}.</p>
+        </body>
+        </html>
         """
 
-        for summary_name, summary_html in summary:
-            html += f"""
-            <h1>{summary_name}</h1>
+AGGREGATED_HTML_OPEN_TAG = """\
+        <html>
+        <body>
+        """
+AGGREGATED_SUMMARY_OPEN_TEMPLATE = """
+            <h1>{}</h1>
             <p>
-                {summary_html}
+                """
+AGGREGATED_SUMMARY_CLOSE_TAG = """
             </p><br>
             """
-
-        html += """
+AGGREGATED_HTML_CLOSE_TAG = """
         </body>
         </html>
         """
 
-        return html
+
+class BaseNotifier(ABC):
+    def __init__(self) -> None:
+        """Initializer for `BaseNotifier`"""
+        self._todo_index = None
+
+    @property
+    def todo_index(self) -> Union[TodoIndex, None]:
+        """Getter for `todo_index`
+
+        Returns:
+            Union[TodoIndex, None]: Index over todo items of the current run bound before `notify` is called. None if not bound
+        """
+        return getattr(self, "_todo_index", None)
+
+    @todo_index.setter
+    def todo_index(self, todo_index: Union[TodoIndex, None]) -> None:
+        """Setter for `todo_index`
+
+        Args:
+            todo_index (Union[TodoIndex, None]): Index over todo items of the current run
+        """
+        self._todo_index = todo_index
+
+    def _iter_aggregated_summaries(self, summary: List[Tuple[str, Union[str, Iterable[str]]]]) -> Iterator[str]:
+        """Yields the aggregation of all summaries in chunks
+
+        Args:
+            summary (List[Tuple[str, Union[str, Iterable[str]]]]): List of tuples where each tuple consists of summary name and generated summary html.
+                                                                  Summary html can also be an iterable yielding the html in chunks
+
+        Yields:
+            Iterator[str]: Chunks of html which concatenated together form the aggregation of all summaries
+        """
+        yield AGGREGATED_HTML_OPEN_TAG
+        for summary_name, summary_html in summary:
+            yield AGGREGATED_SUMMARY_OPEN_TEMPLATE.format(summary_name)
+            # Summary html is yielded as is to avoid copying it into an intermediate formatted string
+            if isinstance(summary_html, str):
+                yield summary_html
+            else:
+                yield from summary_html
+            yield AGGREGATED_SUMMARY_CLOSE_TAG
+        yield AGGREGATED_HTML_CLOSE_TAG
+
+    def _aggregate_all_summaries(self, summary: List[Tuple[str, Union[str, Iterable[str]]]]) -> str:
+        """Abstract method allowing to aggregate all summaries together to be sent
+
+        Args:
+            summary (List[Tuple[str, Union[str, Iterable[str]]]]): List of tuples where each tuple consists of summary name and generated summary html.
+                                                                  Summary html can also be an iterable yielding the html in chunks
+
+        Returns:
+            str: Returns the string representing aggregation of all summaries in their html format
+        """
+        return "".join(self._iter_aggregated_summaries(summary))
 
     @abstractmethod
     def notify(self, summary: List[Tuple[str, str]]) -> None:
@@ -54,9 +136,197 @@ class BaseNotifier(ABC):
         """
         pass
 
+    @property
+    def pending_count(self) -> int:
+        """Getter for `pending_count`
+
+        Returns:
+            int: Number of notifications queued by `notify` and not sent yet. Always 0 for notifiers sending right away
+        """
+        return 0
+
+    def flush(self) -> None:
+        """Sends the notifications queued by `notify`. It is a no-op for notifiers sending right away"""
+        pass
+
+    def discard_pending(self) -> int:
+        """Drops the notifications queued by `notify` without sending them e.g. as they are retried by their caller instead
+
+        Returns:
+            int: Number of dropped notifications. Always 0 for notifiers sending right away
+        """
+        return 0
+
+
+class SMTPSession:
+    """Authenticated SMTP connection kept open and reused across messages, notifications and projects
+
+    The connection is opened on first use. If the server disconnects e.g. due to idle timeout, it is reconnected transparently and the
+    message is sent again. It is safe to share a session between threads, messages are sent one at a time
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Union[str, None] = None,
+        password: Union[str, None] = None,
+        use_ssl: bool = True,
+        timeout: float = 60,
+        max_messages_per_connection: Union[int, None] = None,
+    ) -> None:
+        """Initializer for `SMTPSession` class
+
+        Args:
+            host (str): Host for sending email for e.g. `smtp.gmail.com` for Gmail
+            port (int): Port for sending email for e.g. `465` for Gmail
+            username (Union[str, None], optional): Username to login with. Defaults to None i.e. no login
+            password (Union[str, None], optional): Password of `username`. Defaults to None
+            use_ssl (bool, optional): Boolean whether to connect over SSL. Plain SMTP is used otherwise e.g. for a local relay. Defaults to True
+            timeout (float, optional): Timeout of blocking operations on the connection in seconds. Defaults to 60
+            max_messages_per_connection (Union[int, None], optional): Number of messages after which the connection is renewed as some
+                                                                      providers limit messages per connection. Defaults to None i.e. no limit
+        """
+        self._host = host
+        self._port = port
+        self._username = username
+        self._password = password
+        self._use_ssl = use_ssl
+        self._timeout = timeout
+        self._max_messages_per_connection = max_messages_per_connection
+        self._server: Union["SMTP", None] = None
+        self._messages_on_connection = 0
+        self._num_connections = 0
+        self._lock = threading.RLock()
+
+    @property
+    def num_connections(self) -> int:
+        """Getter for `num_connections`
+
+        Returns:
+            int: Number of connections opened so far
+        """
+        return self._num_connections
+
+    @property
+    def connected(self) -> bool:
+        """Getter for `connected`
+
+        Returns:
+            bool: Boolean whether a connection is currently open
+        """
+        return self._server is not None
+
+    def _connect(self) -> "SMTP":
+        """Opens and authenticates a new connection
+
+        Returns:
+            SMTP: Connected SMTP client
+        """
+        # Email and SSL modules are imported on first use as they are slow to import and not needed unless emails are sent
+        import smtplib
+
+        if self._use_ssl:
+            import ssl
+
+            server = smtplib.SMTP_SSL(self._host, self._port, context=ssl.create_default_context(), timeout=self._timeout)
+        else:
+            server = smtplib.SMTP(self._host, self._port, timeout=self._timeout)
+
+        try:
+            if self._username:
+                server.login(self._username, self._password)
+        except Exception:
+            server.close()
+            raise
+
+        self._num_connections += 1
+        self._messages_on_connection = 0
+        logger.info(f"Opened SMTP connection no. {self._num_connections} to {self._host}:{self._port}")
+        return server
+
+    def _disconnect(self) -> None:
+        """Closes the current connection if any, ignoring errors as the server may have already dropped it"""
+        import smtplib
+
+        if self._server is None:
+            return
+
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            self._server.close()
+        self._server = None
+
+    def send(self, from_addr: str, to_addrs: List[str], message: str) -> None:
+        """Sends `message` over the open connection opening it first if needed
+
+        Args:
+            from_addr (str): Email id of the sender
+            to_addrs (List[str]): Email ids of the receivers
+            message (str): Message to be sent
+        """
+        self.send_batch([(from_addr, to_addrs, message)])
+
+    def send_batch(self, messages: List[Tuple[str, List[str], str]]) -> None:
+        """Sends `messages` one after another over the open connection opening it first if needed
+
+        A message failing due to a server disconnect is sent again once over a new connection
+
+        Args:
+            messages (List[Tuple[str, List[str], str]]): List of tuples where each tuple consists of sender, receivers and message
+        """
+        import smtplib
+
+        with self._lock:
+            for from_addr, to_addrs, message in messages:
+                if self._max_messages_per_connection and self._messages_on_connection >= self._max_messages_per_connection:
+                    self._disconnect()
+
+                for attempt in range(2):
+                    if self._server is None:
+                        self._server = self._connect()
+                    try:
+                        self._server.sendmail(from_addr, to_addrs, message)
+                        break
+                    except smtplib.SMTPServerDisconnected:
+                        logger.warning(f"SMTP server {self._host}:{self._port} disconnected. Reconnecting")
+                        self._server = None
+                        if attempt:
+                            raise
+                self._messages_on_connection += 1
+
+    def close(self) -> None:
+        """Closes the connection. A later message opens a new one"""
+        with self._lock:
+            self._disconnect()
+
+    def __enter__(self) -> "SMTPSession":
+        """Allows using the session as a context manager closing it on exit
+
+        Returns:
+            SMTPSession: The session itself
+        """
+        return self
+
+    def __exit__(self, *args, **kwargs) -> None:
+        """Closes the session"""
+        self.close()
+
 
 class EmailNotifier(BaseNotifier):
-    def __init__(self, sender_email: str, password: str, host: str, port: int, receivers: Union[List[str], None] = None) -> None:
+    def __init__(
+        self,
+        sender_email: str,
+        password: str,
+        host: str,
+        port: int,
+        receivers: Union[List[str], None] = None,
+        session: Union[SMTPSession, None] = None,
+        batch_size: int = 1,
+        attach_reports_above: Union[int, None] = None,
+        attachment_format: str = "gzip",
+    ) -> None:
         """Initializer for `EmailNotifier` class
 
         Args:
@@ -65,31 +335,461 @@ class EmailNotifier(BaseNotifier):
             host (str): Host for sending email for e.g. `smtp.gmail.com` for Gmail
             port (int): Port for sending email for e.g. `465` for Gmail
             receivers (Union[List[str], None], optional): List of receivers. Defaults to None.
+            session (Union[SMTPSession, None], optional): Session whose connection is reused for sending emails. It can be shared by notifiers
+                                                          of many projects. Defaults to None i.e. a new connection is opened for every email
+            batch_size (int, optional): Number of emails queued before sending them together over `session`. Queued emails are sent on
+                                        `flush` or `close`. Used only with `session`. Defaults to 1 i.e. emails are sent right away
+            attach_reports_above (Union[int, None], optional): Size in bytes of all reports together above which the email has a short summary
+                                                               as body and the reports compressed as attachments. Defaults to None i.e. reports
+                                                               are always inlined in the body
+            attachment_format (str, optional): Compression of attached reports. One of `ATTACHMENT_FORMATS` i.e. "gzip" attaching one
+                                               `.html.gz` file per report or "zip" attaching one `.zip` file with all reports. Defaults to "gzip"
+
+        Raises:
+            ValueError: Raised if `attachment_format` isn't one of `ATTACHMENT_FORMATS`
         """
+        if attachment_format not in ATTACHMENT_FORMATS:
+            raise ValueError(f"Attachment format must be one of {ATTACHMENT_FORMATS}, got: {attachment_format}")
+
         self._sender_email = sender_email
         self._receivers = receivers or []
         self._password = password
         self._host = host
         self._port = port
+        self._session = session
+        self._batch_size = max(1, batch_size)
+        self._pending_messages: List[Tuple[str, List[str], str]] = []
+        self._pending_lock = threading.Lock()
+        self._attach_reports_above = attach_reports_above
+        self._attachment_format = attachment_format
         super().__init__()
 
-    def notify(self, summary: List[Tuple[str, str]]) -> None:
-        """Sends email to `receivers_list` with `html` content
+    @property
+    def session(self) -> Union[SMTPSession, None]:
+        """Getter for `session`
+
+        Returns:
+            Union[SMTPSession, None]: Session whose connection is reused for sending emails
+        """
+        return self._session
+
+    @property
+    def pending_count(self) -> int:
+        """Getter for `pending_count`
+
+        Returns:
+            int: Number of emails queued and not sent yet
+        """
+        with self._pending_lock:
+            return len(self._pending_messages)
+
+    def _compress_reports(self, summary: List[Tuple[str, Union[str, Iterable[str]]]]) -> Tuple[List[int], List[Tuple[str, bytes]]]:
+        """Compresses the summaries as `attachment_format` chunk by chunk so that summaries given in chunks are never held uncompressed
 
         Args:
-            summary (List[Tuple[str, str]]): List of tuples where each tuple consists of summary name and generated summary html
+            summary (List[Tuple[str, Union[str, Iterable[str]]]]): List of tuples where each tuple consists of summary name and generated summary html.
+                                                                  Summary html can also be an iterable yielding the html in chunks
+
+        Returns:
+            Tuple[List[int], List[Tuple[str, bytes]]]: Uncompressed size in bytes of each summary and the attachments as tuples of file name and
+                                                       compressed content
         """
-        html = self._aggregate_all_summaries(summary)
+        import gzip
+        import zipfile
+
+        sizes = []
+        attachments = []
+        file_names = set()
+        zip_buffer = io.BytesIO()
+        zip_file = zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) if self._attachment_format == "zip" else None
+        for summary_name, summary_html in summary:
+            file_name_stem = re.sub(r"[^A-Za-z0-9._-]", "_", summary_name)
+            file_name = f"{file_name_stem}.html"
+            # Names which are sanitized to the same file name are suffixed as entries with the same name would overwrite each other
+            suffix = 0
+            while file_name in file_names:
+                suffix += 1
+                file_name = f"{file_name_stem}_{suffix}.html"
+            file_names.add(file_name)
+            gzip_buffer = io.BytesIO()
+            size = 0
+            with zip_file.open(file_name, "w") if zip_file else gzip.GzipFile(file_name, "wb", fileobj=gzip_buffer) as f:
+                for chunk in [summary_html] if isinstance(summary_html, str) else summary_html:
+                    size += f.write(chunk.encode())
+            sizes.append(size)
+            if not zip_file:
+                attachments.append((f"{file_name}.gz", gzip_buffer.getvalue()))
+
+        if zip_file:
+            zip_file.close()
+            attachments.append(("todo_reports.zip", zip_buffer.getvalue()))
+
+        return sizes, attachments
+
+    def _read_reports_up_to(
+        self, summary: List[Tuple[str, Union[str, Iterable[str]]]], max_size: int
+    ) -> Tuple[Union[List[Tuple[str, str]], None], List[Tuple[str, Union[str, Iterable[str]]]]]:
+        """Reads the summaries as long as they are together not larger than `max_size` so that they can be inlined without compressing them
+
+        Args:
+            summary (List[Tuple[str, Union[str, Iterable[str]]]]): List of tuples where each tuple consists of summary name and generated summary html.
+                                                                  Summary html can also be an iterable yielding the html in chunks
+            max_size (int): Size in bytes of all summaries together above which reading stops
+
+        Returns:
+            Tuple[Union[List[Tuple[str, str]], None], List[Tuple[str, Union[str, Iterable[str]]]]]: Summaries read if they are not larger than
+                `max_size` else None, and the summaries to use in place of `summary` as summaries given in chunks may have been partly consumed
+        """
+        read_summary: List[Tuple[str, str]] = []
+        size = 0
+        for next_idx, (summary_name, summary_html) in enumerate(summary, 1):
+            chunks_iter = iter([summary_html] if isinstance(summary_html, str) else summary_html)
+            chunks = []
+            for chunk in chunks_iter:
+                chunks.append(chunk)
+                size += len(chunk.encode())
+                if size > max_size:
+                    # The chunks consumed so far are given back in front of the ones not consumed yet
+                    remaining_summary: List[Tuple[str, Union[str, Iterable[str]]]] = [*read_summary, (summary_name, itertools.chain(chunks, chunks_iter))]
+                    return None, remaining_summary + summary[next_idx:]
+            read_summary.append((summary_name, "".join(chunks)))
+
+        return read_summary, read_summary
+
+    def _get_attachment_summary_html(self, summary: List[Tuple[str, Union[str, Iterable[str]]]], sizes: List[int]) -> str:
+        """Returns the short html body of an email with attached reports
+
+        Args:
+            summary (List[Tuple[str, Union[str, Iterable[str]]]]): Summaries which are attached
+            sizes (List[int]): Uncompressed size in bytes of each summary
+
+        Returns:
+            str: Html body with size of each report and, if `todo_index` is bound, counts of todo items
+        """
+        if self.todo_index is not None:
+            curr_date = datetime.today().date()
+            counts = (
+                f"{len(self.todo_index)} TODO items by {len(self.todo_index.users)} users in {len(self.todo_index.modules)} modules. "
+                f"{len(self.todo_index.expired(curr_date))} expired and {len(self.todo_index.due_within(7, curr_date))} due within a week."
+            )
+        else:
+            counts = f"{len(summary)} reports."
+
+        chunks = [ATTACHMENT_SUMMARY_OPEN_TAG.format(counts)]
+        for (summary_name, _), size in zip(summary, sizes):
+            chunks.append(ATTACHMENT_SUMMARY_ROW_TEMPLATE.format(summary_name, size / 1024))
+        chunks.append(ATTACHMENT_SUMMARY_CLOSE_TAG.format("a zip archive" if self._attachment_format == "zip" else "gzip files"))
+        return "".join(chunks)
+
+    def _build_message(self, summary: List[Tuple[str, Union[str, Iterable[str]]]]) -> str:
+        """Builds the email with aggregation of all summaries as its html content. If the summaries together are larger than
+        `attach_reports_above`, the email has a short summary as its html content and the summaries compressed as attachments
+
+        Args:
+            summary (List[Tuple[str, Union[str, Iterable[str]]]]): List of tuples where each tuple consists of summary name and generated summary html.
+                                                                  Summary html can also be an iterable yielding the html in chunks
+
+        Returns:
+            str: Email message as string
+        """
+        from email.mime.application import MIMEApplication
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.text import MIMEText
+
+        attachments = []
+        if self._attach_reports_above is not None:
+            # Reports are only compressed once they are known to be too large to be inlined
+            inline_summary, summary = self._read_reports_up_to(summary, self._attach_reports_above)
+            if inline_summary is not None:
+                html = self._aggregate_all_summaries(inline_summary)
+            else:
+                sizes, attachments = self._compress_reports(summary)
+                html = self._get_attachment_summary_html(summary, sizes)
+        else:
+            html = self._aggregate_all_summaries(summary)
         receivers_str = ", ".join(self._receivers)
 
-        message = MIMEMultipart("alternative")
+        message = MIMEMultipart("mixed" if attachments else "alternative")
         message["Subject"] = f"TODO Summary - {datetime.today().date()}"
         message["From"] = self._sender_email
         message["To"] = receivers_str
 
         html = MIMEText(html, "html")
         message.attach(html)
+        for file_name, content in attachments:
+            attachment = MIMEApplication(content, "zip" if file_name.endswith(".zip") else "gzip")
+            attachment.add_header("Content-Disposition", "attachment", filename=file_name)
+            message.attach(attachment)
+        return message.as_string()
+
+    def notify(self, summary: List[Tuple[str, str]]) -> None:
+        """Sends email to `receivers_list` with `html` content
+
+        Args:
+            summary (List[Tuple[str, str]]): List of tuples where each tuple consists of summary name and generated summary html
+        """
+        # Email and SSL modules are imported on first use as they are slow to import and not needed unless emails are sent
+        import smtplib
+        import ssl
+
+        message = self._build_message(summary)
+
+        if self._session is not None:
+            with self._pending_lock:
+                self._pending_messages.append((self._sender_email, self._receivers, message))
+                if len(self._pending_messages) < self._batch_size:
+                    return
+            self.flush()
+            return
+
         context = ssl.create_default_context()
         with smtplib.SMTP_SSL(self._host, self._port, context=context) as server:
             server.login(self._sender_email, self._password)
-            server.sendmail(self._sender_email, self._receivers, message.as_string())
+            server.sendmail(self._sender_email, self._receivers, message)
+
+    def flush(self) -> None:
+        """Sends all queued emails over `session`
+
+        If sending fails, the emails not sent yet are queued again ahead of emails queued meanwhile, so that they are sent by the next flush
+
+        Raises:
+            Exception: Raised if sending an email fails
+        """
+        with self._pending_lock:
+            pending_messages, self._pending_messages = self._pending_messages, []
+
+        for idx, (from_addr, to_addrs, message) in enumerate(pending_messages):
+            try:
+                self._session.send(from_addr, to_addrs, message)
+            except Exception:
+                unsent_messages = pending_messages[idx:]
+                with self._pending_lock:
+                    self._pending_messages[:0] = unsent_messages
+                logger.exception(f"Error in sending queued emails. Queued {len(unsent_messages)} unsent emails again for: {to_addrs}")
+                raise
+
+    def discard_pending(self) -> int:
+        """Drops the queued emails without sending them e.g. as they are retried by their caller instead
+
+        Returns:
+            int: Number of dropped emails
+        """
+        with self._pending_lock:
+            pending_messages, self._pending_messages = self._pending_messages, []
+
+        return len(pending_messages)
+
+    def close(self) -> None:
+        """Sends all queued emails and closes `session`"""
+        if self._session is not None:
+            self.flush()
+            self._session.close()
+
+
+class RateLimiter:
+    """Thread safe token bucket limiting the rate of an operation to `rate` per second with bursts of up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: Union[float, None] = None) -> None:
+        """Initializer for `RateLimiter` class
+
+        Args:
+            rate (float): Number of operations allowed per second
+            capacity (Union[float, None], optional): Number of operations allowed in a burst. Defaults to None i.e. `rate`
+
+        Raises:
+            ValueError: Raised if `rate` isn't positive
+        """
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got: {rate}")
+
+        self._rate = rate
+        self._capacity = max(1.0, capacity or rate)
+        self._tokens = self._capacity
+        self._last_refill_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """Getter for `rate`
+
+        Returns:
+            float: Number of operations allowed per second
+        """
+        return self._rate
+
+    def acquire(self) -> None:
+        """Takes a token waiting until one is available"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._last_refill_at) * self._rate)
+            self._last_refill_at = now
+            # Token is reserved right away, possibly going into debt, so that waiting callers are served in order
+            self._tokens -= 1
+            wait_seconds = -self._tokens / self._rate if self._tokens < 0 else 0
+
+        if wait_seconds:
+            time.sleep(wait_seconds)
+
+
+class PerUserEmailNotifier(BaseNotifier):
+    """Sends every user an email with only their own expired and upcoming todo items
+
+    Todo items are taken from the todo index of the run bound to `todo_index` by the driver, so the summaries passed to `notify`
+    aren't used. Users without an email address in `user_emails` and users with nothing expired or upcoming aren't notified.
+    Emails are sent concurrently over at most `max_workers` reused SMTP connections, optionally limited to `max_emails_per_second`
+    """
+
+    def __init__(
+        self,
+        sender_email: str,
+        password: str,
+        host: str,
+        port: int,
+        user_emails: Dict[str, str],
+        use_ssl: bool = True,
+        max_workers: int = 4,
+        max_emails_per_second: Union[float, None] = None,
+        upcoming_days: int = 7,
+    ) -> None:
+        """Initializer for `PerUserEmailNotifier` class
+
+        Args:
+            sender_email (str): Email id from which emails need to be sent
+            password (str): Password for email id `sender_email`
+            host (str): Host for sending email for e.g. `smtp.gmail.com` for Gmail
+            port (int): Port for sending email for e.g. `465` for Gmail
+            user_emails (Dict[str, str]): Key-value pair where key is user name in todo items and value is email id of the user
+            use_ssl (bool, optional): Boolean whether to connect over SSL. Defaults to True
+            max_workers (int, optional): Maximum number of emails sent concurrently, each over its own connection. Defaults to 4
+            max_emails_per_second (Union[float, None], optional): Maximum number of emails sent per second across all workers. Defaults to None
+                                                                  i.e. no limit
+            upcoming_days (int, optional): Number of days to look ahead for upcoming todo items. Defaults to 7
+        """
+        self._sender_email = sender_email
+        self._password = password
+        self._host = host
+        self._port = port
+        self._user_emails = user_emails
+        self._use_ssl = use_ssl
+        self._max_workers = max(1, max_workers)
+        self._rate_limiter = RateLimiter(max_emails_per_second) if max_emails_per_second else None
+        self._upcoming_days = upcoming_days
+        self._failed_users: List[str] = []
+        super().__init__()
+
+    @property
+    def user_emails(self) -> Dict[str, str]:
+        """Getter for `user_emails`
+
+        Returns:
+            Dict[str, str]: Key-value pair where key is user name in todo items and value is email id of the user
+        """
+        return self._user_emails
+
+    @property
+    def failed_users(self) -> List[str]:
+        """Getter for `failed_users`
+
+        Returns:
+            List[str]: User names whose email couldn't be sent in the last call of `notify`
+        """
+        return list(self._failed_users)
+
+    def _get_user_summary(self, user_name: str) -> List[Tuple[str, str]]:
+        """Renders the expired and upcoming todo items of `user_name`
+
+        Args:
+            user_name (str): User name whose todo items are rendered
+
+        Returns:
+            List[Tuple[str, str]]: List of tuples where each tuple consists of summary name and generated summary html. Empty if the user
+                                   has nothing expired or upcoming
+        """
+        curr_date = datetime.today().date()
+        upcoming_end_date = curr_date + timedelta(days=self._upcoming_days)
+
+        expired_rows, upcoming_rows = [], []
+        for todo_obj in self.todo_index.by_user(user_name):
+            if todo_obj.completion_date < curr_date:
+                rows = expired_rows
+            elif todo_obj.completion_date <= upcoming_end_date:
+                rows = upcoming_rows
+            else:
+                continue
+            rows.append([todo_obj.msg, todo_obj.module, todo_obj.position.line_no, str(todo_obj.completion_date)])
+
+        summary = []
+        if expired_rows:
+            html = "".join(_iter_tables_html({user_name: expired_rows}, "Expired TODOs for {}", EXPIRED_BY_USER_TABLE_OPEN_TAG, BY_USER_ROW_TEMPLATE))
+            summary.append(("Expired TODOs", html))
+        if upcoming_rows:
+            html = "".join(_iter_tables_html({user_name: upcoming_rows}, "Upcoming TODOs for {}", UPCOMING_BY_USER_TABLE_OPEN_TAG, BY_USER_ROW_TEMPLATE))
+            summary.append(("Upcoming TODOs", html))
+
+        return summary
+
+    def _build_message(self, user_name: str, summary: List[Tuple[str, str]]) -> str:
+        """Builds the email of `user_name` with aggregation of `summary` as its html content
+
+        Args:
+            user_name (str): User name to whom the email is sent
+            summary (List[Tuple[str, str]]): List of tuples where each tuple consists of summary name and generated summary html
+
+        Returns:
+            str: Email message as string
+        """
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.text import MIMEText
+
+        message = MIMEMultipart("alternative")
+        message["Subject"] = f"TODO Summary for {user_name} - {datetime.today().date()}"
+        message["From"] = self._sender_email
+        message["To"] = self._user_emails[user_name]
+        message.attach(MIMEText(self._aggregate_all_summaries(summary), "html"))
+        return message.as_string()
+
+    def notify(self, summary: List[Tuple[str, str]]) -> None:
+        """Sends every user in `user_emails` an email with their own expired and upcoming todo items
+
+        A failure to email a user is logged and doesn't stop emailing the other users. Such users are available in `failed_users`
+
+        Args:
+            summary (List[Tuple[str, str]]): Unused as every user gets their own summary rendered from `todo_index`
+        """
+        self._failed_users = []
+        if self.todo_index is None:
+            logger.warning("No todo index bound to the notifier. Skipping per user emails")
+            return
+
+        # Connections are handed out to workers through a queue so that each is used by one worker at a time and reused across emails
+        sessions: "queue.Queue[SMTPSession]" = queue.Queue()
+        for _ in range(self._max_workers):
+            sessions.put(SMTPSession(self._host, self._port, self._sender_email, self._password, use_ssl=self._use_ssl))
+
+        def send(user_name: str) -> None:
+            # Any failure, be it in rendering the summary, building or sending the email, only fails the email to this user
+            try:
+                user_summary = self._get_user_summary(user_name)
+                if not user_summary:
+                    return
+
+                message = self._build_message(user_name, user_summary)
+                if self._rate_limiter:
+                    self._rate_limiter.acquire()
+
+                session = sessions.get()
+                try:
+                    session.send(self._sender_email, [self._user_emails[user_name]], message)
+                finally:
+                    sessions.put(session)
+            except Exception:
+                logger.exception(f"Error in sending email to user: {user_name}")
+                self._failed_users.append(user_name)
+
+        users = set(self.todo_index.users)
+        try:
+            with ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="todonotifier-email") as executor:
+                list(executor.map(send, [user_name for user_name in self._user_emails if user_name in users]))
+        finally:
+            while not sessions.empty():
+                sessions.get().close()
@@ -0,0 +1,361 @@
+"""This module provides asynchronous notifications through a durable local outbox. The
+`OutboxNotifier` stores rendered summaries in an outbox directory and returns right away,
+while a background worker delivers them with the wrapped notifier retrying failures with
+exponential backoff. Entries failing too often are moved to a dead letter directory.
+
+Every entry is a directory holding one html file per summary along with its metadata. Entries
+are written under a temporary name and renamed into place with `os.replace`, so a crash never
+leaves a partially written entry behind and pending entries are delivered after a restart.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, List, Tuple, Union
+
+from todonotifier.notifier import BaseNotifier
+
+logger = logging.getLogger(__name__)
+
+PENDING_DIR_NAME = "pending"
+DEAD_DIR_NAME = "dead"
+TMP_DIR_NAME = "tmp"
+META_FILE_NAME = "meta.json"
+
+
+class Outbox:
+    """Durable outbox of rendered summaries kept in a directory"""
+
+    def __init__(self, outbox_dir: str) -> None:
+        """Initializer for `Outbox` class
+
+        Args:
+            outbox_dir (str): Directory in which the entries are kept. Created if needed
+        """
+        self._outbox_dir = outbox_dir
+        for dir_name in (PENDING_DIR_NAME, DEAD_DIR_NAME, TMP_DIR_NAME):
+            os.makedirs(os.path.join(outbox_dir, dir_name), exist_ok=True)
+
+    @property
+    def outbox_dir(self) -> str:
+        """Getter for `outbox_dir`
+
+        Returns:
+            str: Directory in which the entries are kept
+        """
+        return self._outbox_dir
+
+    def _entry_dir(self, entry_id: str, dir_name: str = PENDING_DIR_NAME) -> str:
+        """Returns the directory of an entry
+
+        Args:
+            entry_id (str): Id of the entry
+            dir_name (str, optional): Name of the directory the entry is in i.e. pending, dead or tmp. Defaults to pending
+
+        Returns:
+            str: Directory of the entry
+        """
+        return os.path.join(self._outbox_dir, dir_name, entry_id)
+
+    def _write_meta(self, entry_dir: str, meta: Dict) -> None:
+        """Writes metadata of an entry atomically
+
+        Args:
+            entry_dir (str): Directory of the entry
+            meta (Dict): Metadata of the entry
+        """
+        meta_file = os.path.join(entry_dir, META_FILE_NAME)
+        with open(f"{meta_file}.tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(f"{meta_file}.tmp", meta_file)
+
+    def put(self, summary: List[Tuple[str, Union[str, Iterable[str]]]]) -> str:
+        """Adds an entry with `summary` to the outbox. Summary html given in chunks is written chunk by chunk
+
+        Args:
+            summary (List[Tuple[str, Union[str, Iterable[str]]]]): List of tuples where each tuple consists of summary name and generated summary html.
+                                                                  Summary html can also be an iterable yielding the html in chunks
+
+        Returns:
+            str: Id of the added entry. Ids sort in the order entries were added
+        """
+        entry_id = f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+        tmp_entry_dir = self._entry_dir(entry_id, TMP_DIR_NAME)
+        os.makedirs(tmp_entry_dir)
+
+        names = []
+        for summary_no, (summary_name, summary_html) in enumerate(summary):
+            names.append(summary_name)
+            with open(os.path.join(tmp_entry_dir, f"{summary_no}.html"), "w") as f:
+                if isinstance(summary_html, str):
+                    f.write(summary_html)
+                else:
+                    f.writelines(summary_html)
+
+        self._write_meta(tmp_entry_dir, {"names": names, "attempts": 0, "next_attempt_at": 0, "last_error": None})
+        os.replace(tmp_entry_dir, self._entry_dir(entry_id))
+
+        return entry_id
+
+    def pending(self) -> List[str]:
+        """Returns the ids of pending entries
+
+        Returns:
+            List[str]: Ids of pending entries in the order they were added
+        """
+        return sorted(os.listdir(os.path.join(self._outbox_dir, PENDING_DIR_NAME)))
+
+    def dead(self) -> List[str]:
+        """Returns the ids of entries moved to the dead letter directory
+
+        Returns:
+            List[str]: Ids of dead entries in the order they were added
+        """
+        return sorted(os.listdir(os.path.join(self._outbox_dir, DEAD_DIR_NAME)))
+
+    def read_meta(self, entry_id: str, dir_name: str = PENDING_DIR_NAME) -> Dict:
+        """Reads metadata of an entry
+
+        Args:
+            entry_id (str): Id of the entry
+            dir_name (str, optional): Directory of the entry. Defaults to PENDING_DIR_NAME
+
+        Returns:
+            Dict: Metadata of the entry with keys `names`, `attempts`, `next_attempt_at` and `last_error`
+        """
+        with open(os.path.join(self._entry_dir(entry_id, dir_name), META_FILE_NAME)) as f:
+            return json.load(f)
+
+    def read_summary(self, entry_id: str) -> List[Tuple[str, str]]:
+        """Reads the summary of a pending entry
+
+        Args:
+            entry_id (str): Id of the entry
+
+        Returns:
+            List[Tuple[str, str]]: List of tuples where each tuple consists of summary name and generated summary html
+        """
+        entry_dir = self._entry_dir(entry_id)
+        summary = []
+        for summary_no, summary_name in enumerate(self.read_meta(entry_id)["names"]):
+            with open(os.path.join(entry_dir, f"{summary_no}.html")) as f:
+                summary.append((summary_name, f.read()))
+
+        return summary
+
+    def record_failure(self, entry_id: str, error: str, next_attempt_at: float) -> int:
+        """Records a failed delivery of a pending entry
+
+        Args:
+            entry_id (str): Id of the entry
+            error (str): Error due to which the delivery failed
+            next_attempt_at (float): Epoch time before which delivery isn't attempted again
+
+        Returns:
+            int: Number of attempts made so far
+        """
+        meta = self.read_meta(entry_id)
+        meta["attempts"] += 1
+        meta["next_attempt_at"] = next_attempt_at
+        meta["last_error"] = error
+        self._write_meta(self._entry_dir(entry_id), meta)
+
+        return meta["attempts"]
+
+    def remove(self, entry_id: str) -> None:
+        """Removes a delivered entry
+
+        Args:
+            entry_id (str): Id of the entry
+        """
+        # Entry is first moved out of pending so that it is never delivered again even if removal is interrupted
+        tmp_entry_dir = self._entry_dir(entry_id, TMP_DIR_NAME)
+        os.replace(self._entry_dir(entry_id), tmp_entry_dir)
+        shutil.rmtree(tmp_entry_dir)
+
+    def move_to_dead(self, entry_id: str) -> None:
+        """Moves a pending entry to the dead letter directory where it isn't delivered anymore
+
+        Args:
+            entry_id (str): Id of the entry
+        """
+        os.replace(self._entry_dir(entry_id), self._entry_dir(entry_id, DEAD_DIR_NAME))
+
+
+class OutboxNotifier(BaseNotifier):
+    """Notifier storing summaries in an `Outbox` and delivering them with `notifier` from a background worker
+
+    `notify` only writes the summaries to the outbox, so a slow or failing `notifier` neither delays nor fails the run. Entries left
+    pending e.g. by a crash are delivered once a worker is started again on the same outbox directory. As only the rendered summaries
+    are stored, `notifier` doesn't get the `todo_index` of the run
+    """
+
+    def __init__(
+        self,
+        notifier: BaseNotifier,
+        outbox_dir: str,
+        max_attempts: int = 5,
+        base_delay_seconds: float = 30,
+        max_delay_seconds: float = 60 * 60,
+        start_worker: bool = True,
+    ) -> None:
+        """Initializer for `OutboxNotifier` class
+
+        Args:
+            notifier (BaseNotifier): Notifier delivering the summaries
+            outbox_dir (str): Directory of the outbox
+            max_attempts (int, optional): Number of failed deliveries after which an entry is moved to the dead letter directory. Defaults to 5
+            base_delay_seconds (float, optional): Delay before retrying after the first failed delivery. It doubles with every further failure.
+                                                  Defaults to 30
+            max_delay_seconds (float, optional): Upper bound of delay between two deliveries of an entry. Defaults to an hour
+            start_worker (bool, optional): Boolean whether to start the background worker right away. Defaults to True
+        """
+        self._notifier = notifier
+        self._outbox = Outbox(outbox_dir)
+        self._max_attempts = max_attempts
+        self._base_delay_seconds = base_delay_seconds
+        self._max_delay_seconds = max_delay_seconds
+        self._deliver_lock = threading.Lock()
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._woken = False
+        self._worker = None
+        super().__init__()
+
+        if start_worker:
+            self.start()
+
+    @property
+    def notifier(self) -> BaseNotifier:
+        """Getter for `notifier`
+
+        Returns:
+            BaseNotifier: Notifier delivering the summaries
+        """
+        return self._notifier
+
+    @property
+    def outbox(self) -> Outbox:
+        """Getter for `outbox`
+
+        Returns:
+            Outbox: Outbox in which the summaries are stored
+        """
+        return self._outbox
+
+    def notify(self, summary: List[Tuple[str, Union[str, Iterable[str]]]]) -> None:
+        """Stores `summary` in the outbox and wakes up the worker to deliver it
+
+        Args:
+            summary (List[Tuple[str, Union[str, Iterable[str]]]]): List of tuples where each tuple consists of summary name and generated summary html.
+                                                                  Summary html can also be an iterable yielding the html in chunks
+        """
+        entry_id = self._outbox.put(summary)
+        logger.info(f"Added notification: {entry_id} to outbox: {self._outbox.outbox_dir}")
+
+        with self._condition:
+            self._woken = True
+            self._condition.notify()
+
+    def _get_retry_delay(self, attempts: int) -> float:
+        """Returns the delay before the next delivery of an entry which failed `attempts` times
+
+        Args:
+            attempts (int): Number of failed deliveries so far
+
+        Returns:
+            float: Delay in seconds
+        """
+        return min(self._max_delay_seconds, self._base_delay_seconds * 2 ** (attempts - 1))
+
+    def deliver_ready(self) -> Union[float, None]:
+        """Delivers the pending entries whose next attempt is due
+
+        Returns:
+            Union[float, None]: Epoch time at which the next pending entry is due. None if no entry is pending
+        """
+        next_attempt_at = None
+        with self._deliver_lock:
+            for entry_id in self._outbox.pending():
+                meta = self._outbox.read_meta(entry_id)
+                if meta["next_attempt_at"] > time.time():
+                    next_attempt_at = min(next_attempt_at or meta["next_attempt_at"], meta["next_attempt_at"])
+                    continue
+
+                try:
+                    self._notifier.notify(self._outbox.read_summary(entry_id))
+                    # Notifiers queueing notifications e.g. `EmailNotifier` with a batch size send them now so that failures are retried
+                    self._notifier.flush()
+                except Exception as exc:
+                    # The entry is retried from the outbox, so emails the notifier queued again for it would otherwise be sent twice
+                    self._notifier.discard_pending()
+                    attempts = meta["attempts"] + 1
+                    if attempts >= self._max_attempts:
+                        self._outbox.record_failure(entry_id, repr(exc), 0)
+                        self._outbox.move_to_dead(entry_id)
+                        logger.exception(f"Moved notification: {entry_id} to dead letter directory after {attempts} failed attempts")
+                        continue
+
+                    retry_at = time.time() + self._get_retry_delay(attempts)
+                    self._outbox.record_failure(entry_id, repr(exc), retry_at)
+                    next_attempt_at = min(next_attempt_at or retry_at, retry_at)
+                    logger.warning(f"Failed to deliver notification: {entry_id} in attempt {attempts}. Retrying in {retry_at - time.time():.1f}s: {exc}")
+                    continue
+
+                self._outbox.remove(entry_id)
+                logger.info(f"Delivered notification: {entry_id}")
+
+        return next_attempt_at
+
+    def _run_worker(self) -> None:
+        """Delivers entries as they are added or become due until `close` is called"""
+        while True:
+            try:
+                next_attempt_at = self.deliver_ready()
+            except Exception:
+                logger.exception(f"Error in delivering notifications from outbox: {self._outbox.outbox_dir}")
+                next_attempt_at = time.time() + self._base_delay_seconds
+
+            with self._condition:
+                if not self._woken and not self._stopped:
+                    self._condition.wait(None if next_attempt_at is None else max(0, next_attempt_at - time.time()))
+                self._woken = False
+                if self._stopped:
+                    return
+
+    def start(self) -> None:
+        """Starts the background worker if not running. Entries left pending by an earlier worker are delivered too"""
+        if self._worker is not None and self._worker.is_alive():
+            return
+
+        with self._condition:
+            self._stopped = False
+        # Worker is a daemon thread so that it never keeps the process alive. Undelivered entries stay in the outbox for the next start
+        self._worker = threading.Thread(target=self._run_worker, name="todonotifier-outbox", daemon=True)
+        self._worker.start()
+
+    def flush(self) -> bool:
+        """Delivers the pending entries which are due in the calling thread
+
+        Returns:
+            bool: Boolean whether the outbox has no pending entries left
+        """
+        self.deliver_ready()
+        return not self._outbox.pending()
+
+    def close(self, timeout: Union[float, None] = None) -> None:
+        """Stops the background worker waiting up to `timeout` seconds for a delivery in progress
+
+        Args:
+            timeout (Union[float, None], optional): Seconds to wait for the worker. Defaults to None i.e. until it stops
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+        if self._worker is not None:
+            self._worker.join(timeout)
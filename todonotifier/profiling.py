@@ -0,0 +1,414 @@
+"""This module provides profiling of the stages of a run of TODO Notifier. It records the
+wall and CPU time of each stage (clone/copy, walk, parse, summarize, render, store and
+notify), optionally their peak memory and a cProfile of all stages that can be dumped
+next to the reports. It also provides a memory budget that can be checked between stages.
+"""
+
+import cProfile
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Iterator, List, Union
+
+logger = logging.getLogger(__name__)
+
+PSTATS_FILE_NAME = "profile.pstats"
+STAGES_FILE_NAME = "profile_stages.txt"
+
+MEMORY_BUDGET_ACTIONS = ("abort", "degrade")
+
+# `tracemalloc` is global to the process, so stages of profilers tracking memory e.g. of runs in parallel in the daemon take turns
+_memory_tracking_lock = threading.Lock()
+
+
+class MemoryBudgetExceededException(Exception):
+    """Exception raised if memory used by the run exceeds the memory budget"""
+
+    pass
+
+
+def get_rss_bytes() -> Union[int, None]:
+    """Returns the resident set size of the current process
+
+    It is read from `/proc/self/statm` where available. Otherwise peak resident set size of the process reported by `resource` is used
+
+    Returns:
+        Union[int, None]: Resident set size in bytes. None if it can't be determined on the platform
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        import resource
+    except ImportError:  # e.g. on Windows
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # `ru_maxrss` is in bytes on macOS and in kilobytes elsewhere
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class StageStats:
+    """Resources consumed by one stage of a run"""
+
+    def __init__(
+        self,
+        name: str,
+        wall_seconds: float,
+        cpu_seconds: float,
+        peak_traced_bytes: Union[int, None] = None,
+        rss_bytes: Union[int, None] = None,
+    ) -> None:
+        """Initializer for `StageStats` class
+
+        Args:
+            name (str): Name of the stage
+            wall_seconds (float): Wall clock time taken by the stage in seconds
+            cpu_seconds (float): CPU time taken by the stage in seconds
+            peak_traced_bytes (Union[int, None], optional): Peak memory allocated by Python during the stage as traced by `tracemalloc`.
+                                                            Defaults to None i.e. memory wasn't tracked
+            rss_bytes (Union[int, None], optional): Resident set size of the process at the end of the stage. Defaults to None i.e. memory wasn't tracked
+        """
+        self._name = name
+        self._wall_seconds = wall_seconds
+        self._cpu_seconds = cpu_seconds
+        self._peak_traced_bytes = peak_traced_bytes
+        self._rss_bytes = rss_bytes
+
+    @property
+    def name(self) -> str:
+        """Getter for `name`
+
+        Returns:
+            str: Name of the stage
+        """
+        return self._name
+
+    @property
+    def wall_seconds(self) -> float:
+        """Getter for `wall_seconds`
+
+        Returns:
+            float: Wall clock time taken by the stage in seconds
+        """
+        return self._wall_seconds
+
+    @property
+    def cpu_seconds(self) -> float:
+        """Getter for `cpu_seconds`
+
+        Returns:
+            float: CPU time taken by the stage in seconds
+        """
+        return self._cpu_seconds
+
+    @property
+    def peak_traced_bytes(self) -> Union[int, None]:
+        """Getter for `peak_traced_bytes`
+
+        Returns:
+            Union[int, None]: Peak memory allocated by Python during the stage. None if memory wasn't tracked
+        """
+        return self._peak_traced_bytes
+
+    @property
+    def rss_bytes(self) -> Union[int, None]:
+        """Getter for `rss_bytes`
+
+        Returns:
+            Union[int, None]: Resident set size of the process at the end of the stage. None if memory wasn't tracked
+        """
+        return self._rss_bytes
+
+    def __str__(self) -> str:
+        """Defines str representation of `StageStats` class object
+
+        Returns:
+            str: Returns string representation of the class object
+        """
+        return (
+            f"StageStats: {repr(self)} name: {self.name} wall_seconds: {self.wall_seconds} cpu_seconds: {self.cpu_seconds} "
+            f"peak_traced_bytes: {self.peak_traced_bytes} rss_bytes: {self.rss_bytes}"
+        )
+
+
+class NullProfiler:
+    """Profiler used when profiling is disabled. Its stages are no-op context managers so that it costs nothing"""
+
+    _NULL_CONTEXT = nullcontext()
+
+    @property
+    def enabled(self) -> bool:
+        """Getter for `enabled`
+
+        Returns:
+            bool: Always False
+        """
+        return False
+
+    @property
+    def stages(self) -> List[StageStats]:
+        """Getter for `stages`
+
+        Returns:
+            List[StageStats]: Always empty list
+        """
+        return []
+
+    def stage(self, name: str) -> ContextManager[None]:
+        """Returns a no-op context manager
+
+        Args:
+            name (str): Name of the stage
+
+        Returns:
+            ContextManager[None]: Shared no-op context manager
+        """
+        return self._NULL_CONTEXT
+
+    def dump(self, target_dir: str) -> None:
+        """No-op as nothing is profiled
+
+        Args:
+            target_dir (str): Directory into which profile would have been dumped
+        """
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class StageProfiler(NullProfiler):
+    """Profiler recording wall and CPU time of each stage of a run along with a cProfile of all stages and optionally peak memory of each stage"""
+
+    def __init__(self, use_cprofile: bool = True, track_memory: bool = False) -> None:
+        """Initializer for `StageProfiler` class
+
+        Args:
+            use_cprofile (bool, optional): Boolean whether to run cProfile while a stage is running. Defaults to True
+            track_memory (bool, optional): Boolean whether to track peak memory allocated during each stage with `tracemalloc` along with
+                                           resident set size of the process at the end of each stage. As `tracemalloc` is global to the
+                                           process, stages of profilers tracking memory in parallel are run one at a time and allocations
+                                           by other threads are traced too. Defaults to False
+        """
+        self._stages: List[StageStats] = []
+        self._cprofile = cProfile.Profile() if use_cprofile else None
+        self._track_memory = track_memory
+        self._depth = 0
+        # Peak traced memory of each running stage. Peak of `tracemalloc` is reset when a stage starts, so peak seen so far is folded
+        # into the enclosing stages before resetting it
+        self._traced_peaks: List[int] = []
+        self._started_tracemalloc = False
+
+    @property
+    def enabled(self) -> bool:
+        """Getter for `enabled`
+
+        Returns:
+            bool: Always True
+        """
+        return True
+
+    @property
+    def track_memory(self) -> bool:
+        """Getter for `track_memory`
+
+        Returns:
+            bool: Boolean whether peak memory of each stage is tracked
+        """
+        return self._track_memory
+
+    @property
+    def stages(self) -> List[StageStats]:
+        """Getter for `stages`
+
+        Returns:
+            List[StageStats]: Stats of all completed stages in the order they were completed
+        """
+        return self._stages
+
+    def _start_memory_tracking(self) -> None:
+        """Starts tracing memory of the stage being entered"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        elif self._traced_peaks:
+            self._traced_peaks[-1] = max(self._traced_peaks[-1], tracemalloc.get_traced_memory()[1])
+        self._traced_peaks.append(0)
+        tracemalloc.reset_peak()
+
+    def _stop_memory_tracking(self) -> int:
+        """Stops tracing memory of the stage being exited
+
+        Returns:
+            int: Peak memory allocated during the stage in bytes
+        """
+        peak_traced_bytes = max(self._traced_peaks.pop(), tracemalloc.get_traced_memory()[1])
+        if self._traced_peaks:
+            self._traced_peaks[-1] = max(self._traced_peaks[-1], peak_traced_bytes)
+        elif self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+        return peak_traced_bytes
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Context manager profiling the code run inside it as stage `name`
+
+        Args:
+            name (str): Name of the stage
+
+        Yields:
+            Iterator[None]: Nothing
+        """
+        # Stages may be nested. cProfile is only enabled by the outermost stage as only one profiler can be active at a time
+        if self._track_memory and self._depth == 0:
+            _memory_tracking_lock.acquire()
+        if self._cprofile and self._depth == 0:
+            self._cprofile.enable()
+        self._depth += 1
+        if self._track_memory:
+            self._start_memory_tracking()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall_seconds, cpu_seconds = time.perf_counter() - wall_start, time.process_time() - cpu_start
+            peak_traced_bytes, rss_bytes = (self._stop_memory_tracking(), get_rss_bytes()) if self._track_memory else (None, None)
+            self._depth -= 1
+            if self._cprofile and self._depth == 0:
+                self._cprofile.disable()
+            if self._track_memory and self._depth == 0:
+                _memory_tracking_lock.release()
+            self._stages.append(StageStats(name, wall_seconds, cpu_seconds, peak_traced_bytes, rss_bytes))
+
+    def format_stages(self) -> str:
+        """Formats the stats of all stages as a table
+
+        Returns:
+            str: Table of wall and CPU time of each stage along with their peak memory if tracked
+        """
+        header = f"{'Stage':<60}{'Wall (s)':>12}{'CPU (s)':>12}"
+        if self._track_memory:
+            header += f"{'Peak traced (MiB)':>20}{'RSS (MiB)':>12}"
+
+        lines = [header]
+        for stage_stats in self._stages:
+            line = f"{stage_stats.name:<60}{stage_stats.wall_seconds:>12.4f}{stage_stats.cpu_seconds:>12.4f}"
+            if self._track_memory:
+                line += f"{_format_mib(stage_stats.peak_traced_bytes):>20}{_format_mib(stage_stats.rss_bytes):>12}"
+            lines.append(line)
+
+        return "\n".join(lines) + "\n"
+
+    def dump(self, target_dir: str) -> None:
+        """Writes the table of stats of all stages and the pstats dump of cProfile into `target_dir`
+
+        Args:
+            target_dir (str): Directory into which profile needs to be dumped
+        """
+        if not os.path.isdir(target_dir):
+            os.makedirs(target_dir)
+
+        stages_table = self.format_stages()
+        logger.info(f"Profile of stages:\n{stages_table}")
+        with open(os.path.join(target_dir, STAGES_FILE_NAME), "w") as f:
+            f.write(stages_table)
+
+        if self._cprofile:
+            self._cprofile.dump_stats(os.path.join(target_dir, PSTATS_FILE_NAME))
+
+
+class MemoryBudget:
+    """Memory budget of a run checked against resident set size of the process between stages"""
+
+    def __init__(self, max_rss_bytes: int, action: str = "abort") -> None:
+        """Initializer for `MemoryBudget` class
+
+        Args:
+            max_rss_bytes (int): Maximum resident set size of the process in bytes
+            action (str, optional): Action to take when budget is exceeded. "abort" raises `MemoryBudgetExceededException` while "degrade"
+                                    asks the caller to switch to a mode using less memory. Defaults to "abort"
+
+        Raises:
+            ValueError: Raised if `action` isn't one of `MEMORY_BUDGET_ACTIONS`
+        """
+        if action not in MEMORY_BUDGET_ACTIONS:
+            raise ValueError(f"Unsupported memory budget action: {action}. Supported actions: {MEMORY_BUDGET_ACTIONS}")
+
+        self._max_rss_bytes = max_rss_bytes
+        self._action = action
+        self._degraded = False
+
+    @property
+    def max_rss_bytes(self) -> int:
+        """Getter for `max_rss_bytes`
+
+        Returns:
+            int: Maximum resident set size of the process in bytes
+        """
+        return self._max_rss_bytes
+
+    @property
+    def action(self) -> str:
+        """Getter for `action`
+
+        Returns:
+            str: Action to take when budget is exceeded
+        """
+        return self._action
+
+    @property
+    def degraded(self) -> bool:
+        """Getter for `degraded`
+
+        Returns:
+            bool: Boolean whether budget was exceeded with action "degrade"
+        """
+        return self._degraded
+
+    def check(self, stage_name: str) -> bool:
+        """Checks resident set size of the process against the budget after stage `stage_name`
+
+        Args:
+            stage_name (str): Name of the stage after which budget is checked
+
+        Raises:
+            MemoryBudgetExceededException: Raised if budget is exceeded and action is "abort"
+
+        Returns:
+            bool: True if budget is exceeded and the caller should degrade else False
+        """
+        rss_bytes = get_rss_bytes()
+        if rss_bytes is None or rss_bytes <= self._max_rss_bytes:
+            return False
+
+        message = f"Memory budget of {_format_mib(self._max_rss_bytes)} MiB exceeded after stage: {stage_name}. RSS: {_format_mib(rss_bytes)} MiB"
+        if self._action == "abort":
+            raise MemoryBudgetExceededException(message)
+
+        if not self._degraded:
+            logger.warning(f"{message}. Switching to degraded mode")
+            self._degraded = True
+
+        return True
+
+
+def _format_mib(num_bytes: Union[int, None]) -> str:
+    """Formats `num_bytes` in MiB
+
+    Args:
+        num_bytes (Union[int, None]): Number of bytes
+
+    Returns:
+        str: `num_bytes` in MiB with 2 decimals or "-" if `num_bytes` is None
+    """
+    return "-" if num_bytes is None else f"{num_bytes / (1024 * 1024):.2f}"
@@ -0,0 +1,386 @@
+"""This module provides a state store recording the todo items which were already notified,
+allowing to notify only what changed since the last notification: new todo items, todo items
+which newly expired or became due, reassigned todo items and resolved todo items.
+
+Todo items are identified by a hash of their module and message along with the number of
+identical todo items before them in the module, so that an identity survives the todo item
+moving to another line or to another user. The diff is computed with one dictionary lookup
+per todo item.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Tuple, Union
+
+from todonotifier.models import TODO
+from todonotifier.notifier import BaseNotifier
+from todonotifier.summary_generators import _iter_tables_html
+from todonotifier.todo_index import TodoIndex
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATUS = "open"
+DUE_STATUS = "due"
+EXPIRED_STATUS = "expired"
+
+DELTA_TABLE_OPEN_TAG = """
+            <table>
+            <tr>
+                <th>User Name</th>
+                <th>Message</th>
+                <th>Module</th>
+                <th>Line No.</th>
+                <th>Completion Date</th>
+            </tr>
+            """
+DELTA_ROW_TEMPLATE = """
+                <tr>
+                    <td>{}</td>
+                    <td>{}</td>
+                    <td>{}</td>
+                    <td>{}</td>
+                    <td>{}</td>
+                </tr>
+                """
+
+
+def iter_todo_identities(todo_index: TodoIndex, include_user: bool = False) -> Iterator[Tuple[str, TODO]]:
+    """Yields the identity of every todo item in `todo_index`
+
+    Args:
+        todo_index (TodoIndex): Index over todo items
+        include_user (bool, optional): Whether the user is part of the identity i.e. a reassigned todo item gets a new identity. Defaults to False
+
+    Yields:
+        Iterator[Tuple[str, TODO]]: Tuples of identity and todo item
+    """
+    occurrences: Dict[Tuple[str, ...], int] = {}
+    for module, todo_objs in todo_index.all_todos_objs.items():
+        for todo_obj in todo_objs:
+            # By default user isn't part of the identity so that a reassigned todo item is reported as reassigned rather than resolved and new
+            key = (module, todo_obj.user.user_name, todo_obj.msg) if include_user else (module, todo_obj.msg)
+            occurrence = occurrences[key] = occurrences.get(key, -1) + 1
+            identity = hashlib.blake2b("\0".join((*key, str(occurrence))).encode(), digest_size=16).hexdigest()
+            yield identity, todo_obj
+
+
+def get_status(completion_date: date, curr_date: date, upcoming_days: int) -> str:
+    """Returns the status of a todo item on `curr_date`
+
+    Args:
+        completion_date (date): Completion date of the todo item
+        curr_date (date): Reference date
+        upcoming_days (int): Number of days to look ahead for due todo items
+
+    Returns:
+        str: `EXPIRED_STATUS`, `DUE_STATUS` or `OPEN_STATUS`
+    """
+    if completion_date < curr_date:
+        return EXPIRED_STATUS
+    if completion_date <= curr_date + timedelta(days=upcoming_days):
+        return DUE_STATUS
+    return OPEN_STATUS
+
+
+class StateDiff:
+    """Changes in todo items since the last recorded state. Every todo item is a dictionary of its recorded state"""
+
+    def __init__(
+        self, new: List[Dict], newly_expired: List[Dict], newly_due: List[Dict], resolved: List[Dict], reassigned: Union[List[Dict], None] = None
+    ) -> None:
+        """Initializer for `StateDiff` class
+
+        Args:
+            new (List[Dict]): Todo items not present in the last state
+            newly_expired (List[Dict]): Todo items which expired since the last state
+            newly_due (List[Dict]): Todo items which became due since the last state
+            resolved (List[Dict]): Todo items of the last state not present anymore
+            reassigned (Union[List[Dict], None], optional): Todo items whose user changed since the last state. Their previous user is
+                                                            kept as `previous_user_name`. Defaults to None i.e. no such todo items
+        """
+        self._new = new
+        self._newly_expired = newly_expired
+        self._newly_due = newly_due
+        self._resolved = resolved
+        self._reassigned = reassigned or []
+
+    @property
+    def new(self) -> List[Dict]:
+        """Getter for `new`
+
+        Returns:
+            List[Dict]: Todo items not present in the last state
+        """
+        return self._new
+
+    @property
+    def newly_expired(self) -> List[Dict]:
+        """Getter for `newly_expired`
+
+        Returns:
+            List[Dict]: Todo items which expired since the last state
+        """
+        return self._newly_expired
+
+    @property
+    def newly_due(self) -> List[Dict]:
+        """Getter for `newly_due`
+
+        Returns:
+            List[Dict]: Todo items which became due since the last state
+        """
+        return self._newly_due
+
+    @property
+    def resolved(self) -> List[Dict]:
+        """Getter for `resolved`
+
+        Returns:
+            List[Dict]: Todo items of the last state not present anymore
+        """
+        return self._resolved
+
+    @property
+    def reassigned(self) -> List[Dict]:
+        """Getter for `reassigned`
+
+        Returns:
+            List[Dict]: Todo items whose user changed since the last state
+        """
+        return self._reassigned
+
+    def __bool__(self) -> bool:
+        """Returns whether anything changed
+
+        Returns:
+            bool: Boolean whether any of the categories has a todo item
+        """
+        return bool(self._new or self._newly_expired or self._newly_due or self._resolved or self._reassigned)
+
+    def __str__(self) -> str:
+        """Defines str representation of `StateDiff` class object
+
+        Returns:
+            str: Returns string representation of the class object
+        """
+        return (
+            f"StateDiff: {repr(self)} new: {len(self.new)} newly_expired: {len(self.newly_expired)} "
+            f"newly_due: {len(self.newly_due)} resolved: {len(self.resolved)} reassigned: {len(self.reassigned)}"
+        )
+
+
+def compute_state(todo_index: TodoIndex, curr_date: Union[date, None] = None, upcoming_days: int = 7) -> Dict[str, Dict]:
+    """Computes the state of all todo items in `todo_index`
+
+    Args:
+        todo_index (TodoIndex): Index over todo items
+        curr_date (Union[date, None], optional): Reference date. Defaults to today
+        upcoming_days (int, optional): Number of days to look ahead for due todo items. Defaults to 7
+
+    Returns:
+        Dict[str, Dict]: Key-value pair where key is identity of a todo item and value is its state
+    """
+    curr_date = curr_date or datetime.today().date()
+    return {
+        identity: {
+            "status": get_status(todo_obj.completion_date, curr_date, upcoming_days),
+            "user_name": todo_obj.user.user_name,
+            "msg": todo_obj.msg,
+            "module": todo_obj.module,
+            "line_no": todo_obj.position.line_no,
+            "completion_date": str(todo_obj.completion_date),
+        }
+        for identity, todo_obj in iter_todo_identities(todo_index)
+    }
+
+
+def diff_states(previous_state: Dict[str, Dict], current_state: Dict[str, Dict]) -> StateDiff:
+    """Computes the changes from `previous_state` to `current_state` in O(n)
+
+    Args:
+        previous_state (Dict[str, Dict]): Last recorded state
+        current_state (Dict[str, Dict]): Current state
+
+    Returns:
+        StateDiff: Changes in todo items
+    """
+    new, newly_expired, newly_due, reassigned = [], [], [], []
+    for identity, todo_state in current_state.items():
+        previous_todo_state = previous_state.get(identity)
+        if previous_todo_state is None:
+            new.append(todo_state)
+        elif todo_state["status"] == EXPIRED_STATUS and previous_todo_state["status"] != EXPIRED_STATUS:
+            newly_expired.append(todo_state)
+        elif todo_state["status"] == DUE_STATUS and previous_todo_state["status"] == OPEN_STATUS:
+            newly_due.append(todo_state)
+        elif todo_state["user_name"] != previous_todo_state["user_name"]:
+            reassigned.append({**todo_state, "previous_user_name": previous_todo_state["user_name"]})
+
+    resolved = [todo_state for identity, todo_state in previous_state.items() if identity not in current_state]
+
+    return StateDiff(new, newly_expired, newly_due, resolved, reassigned)
+
+
+class StateStore:
+    """Recorded state of notified todo items kept in a JSON file"""
+
+    def __init__(self, state_file: str) -> None:
+        """Initializer for `StateStore` class
+
+        Args:
+            state_file (str): JSON file in which the state is kept. Created on first save
+        """
+        self._state_file = state_file
+
+    @property
+    def state_file(self) -> str:
+        """Getter for `state_file`
+
+        Returns:
+            str: JSON file in which the state is kept
+        """
+        return self._state_file
+
+    def load(self) -> Dict[str, Dict]:
+        """Loads the recorded state
+
+        Returns:
+            Dict[str, Dict]: Key-value pair where key is identity of a todo item and value is its state. Empty if nothing was recorded yet
+        """
+        if not os.path.isfile(self._state_file):
+            return {}
+
+        with open(self._state_file) as f:
+            return json.load(f)
+
+    def save(self, state: Dict[str, Dict]) -> None:
+        """Records `state` replacing the earlier one atomically
+
+        Args:
+            state (Dict[str, Dict]): Key-value pair where key is identity of a todo item and value is its state
+        """
+        state_dir = os.path.dirname(os.path.abspath(self._state_file))
+        os.makedirs(state_dir, exist_ok=True)
+        with open(f"{self._state_file}.tmp", "w") as f:
+            json.dump(state, f)
+        os.replace(f"{self._state_file}.tmp", self._state_file)
+
+
+def render_state_diff(state_diff: StateDiff) -> List[Tuple[str, str]]:
+    """Renders the non empty categories of `state_diff`
+
+    Args:
+        state_diff (StateDiff): Changes in todo items
+
+    Returns:
+        List[Tuple[str, str]]: List of tuples where each tuple consists of summary name and generated summary html
+    """
+    summary = []
+    for summary_name, todo_states in (
+        ("New TODOs", state_diff.new),
+        ("Newly Expired TODOs", state_diff.newly_expired),
+        ("Newly Due TODOs", state_diff.newly_due),
+        ("Resolved TODOs", state_diff.resolved),
+        ("Reassigned TODOs", state_diff.reassigned),
+    ):
+        if not todo_states:
+            continue
+        rows = [
+            [
+                f"{s['previous_user_name']} → {s['user_name']}" if "previous_user_name" in s else s["user_name"],
+                s["msg"],
+                s["module"],
+                s["line_no"],
+                s["completion_date"],
+            ]
+            for s in todo_states
+        ]
+        summary.append((summary_name, "".join(_iter_tables_html({summary_name: rows}, "{}", DELTA_TABLE_OPEN_TAG, DELTA_ROW_TEMPLATE))))
+
+    return summary
+
+
+class DeltaNotifier(BaseNotifier):
+    """Notifier passing `notifier` only the changes since the last notification instead of the full summaries
+
+    Changes are computed from the `todo_index` bound by the driver against the state recorded in `state_store`. The state is recorded
+    only once `notifier` delivered the changes so that they aren't lost if notifying fails. If `notifier` queues notifications e.g.
+    `EmailNotifier` with a batch size, the state is recorded by `flush` once they are sent. Nothing is sent if nothing changed
+    """
+
+    def __init__(self, notifier: BaseNotifier, state_store: StateStore, upcoming_days: int = 7) -> None:
+        """Initializer for `DeltaNotifier` class
+
+        Args:
+            notifier (BaseNotifier): Notifier to which the changes are passed
+            state_store (StateStore): Store of the state of notified todo items
+            upcoming_days (int, optional): Number of days to look ahead for due todo items. Defaults to 7
+        """
+        self._notifier = notifier
+        self._state_store = state_store
+        self._upcoming_days = upcoming_days
+        self._last_diff = None
+        # State recorded once the notifications queued by `notifier` are sent
+        self._pending_state: Union[Dict[str, Dict], None] = None
+        super().__init__()
+
+    @property
+    def last_diff(self) -> Union[StateDiff, None]:
+        """Getter for `last_diff`
+
+        Returns:
+            Union[StateDiff, None]: Changes computed in the last call of `notify`. None if not called yet
+        """
+        return self._last_diff
+
+    def notify(self, summary: List[Tuple[str, str]]) -> None:
+        """Passes the changes since the last notification to `notifier` and records the current state
+
+        Args:
+            summary (List[Tuple[str, str]]): Unused as only the changes computed from `todo_index` are passed on
+        """
+        if self.todo_index is None:
+            logger.warning("No todo index bound to the notifier. Skipping notification of changes")
+            return
+
+        current_state = compute_state(self.todo_index, upcoming_days=self._upcoming_days)
+        self._last_diff = diff_states(self._state_store.load(), current_state)
+        logger.info(f"Changes since last notification: {self._last_diff}")
+
+        if self._last_diff:
+            self._notifier.todo_index = self.todo_index
+            self._notifier.notify(render_state_diff(self._last_diff))
+            if self._notifier.pending_count:
+                self._pending_state = current_state
+                return
+
+        self._pending_state = None
+        self._state_store.save(current_state)
+
+    @property
+    def pending_count(self) -> int:
+        """Getter for `pending_count`
+
+        Returns:
+            int: Number of notifications queued by `notifier` and not sent yet
+        """
+        return self._notifier.pending_count
+
+    def flush(self) -> None:
+        """Sends the notifications queued by `notifier` and then records the state they notified"""
+        self._notifier.flush()
+        if self._pending_state is not None:
+            self._state_store.save(self._pending_state)
+            self._pending_state = None
+
+    def discard_pending(self) -> int:
+        """Drops the notifications queued by `notifier` without recording the state they notified
+
+        Returns:
+            int: Number of dropped notifications
+        """
+        self._pending_state = None
+        return self._notifier.discard_pending()
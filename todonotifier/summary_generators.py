@@ -3,23 +3,188 @@ summary generator. It also provides three default summary generators.
 """
 
 import logging
+import os
+import re
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Dict, List, TypeVar
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, TextIO, TypeVar, Union
 
 from todonotifier.constants import DEFAULT_SUMMARY_GENERATORS_ENUM, UNKNOWN_USER_NAME
 from todonotifier.models import TODO
+from todonotifier.todo_index import TodoIndex
 
 T = TypeVar("T")
 
-# logging configuration
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(process)d - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
 TABLE_CLOSE_TAG = """
             </table>
             """
 
+# HTML templates are defined once at module level and filled with `str.format` while building reports.
+# Reports are built as a list of chunks joined once at the end to keep building linear in number of rows.
+SECTION_OPEN_TEMPLATE = """
+            <h3>{}</h3>
+            <p>
+                """
+SECTION_CLOSE_TAG = """
+            </p><br>
+            """
+
+TABLE_HEADER_TEMPLATE = """
+            <table>
+                <caption>{}</caption>
+            <tr>
+                <th>{}</th>
+                <th>{}</th>
+                <th>{}</th>
+                <th>{}</th>
+            </tr>
+            """
+
+BY_MODULE_ROW_TEMPLATE = """
+                <tr>
+                    <td>{}</td>
+                    <td>{}</td>
+                    <td>{}</td>
+                    <td>{}</td>
+                </tr>
+                """
+BY_USER_ROW_TEMPLATE = """
+                    <tr>
+                        <td>{}</td>
+                        <td>{}</td>
+                        <td>{}</td>
+                        <td>{}</td>
+                    </tr>
+                    """
+
+BY_MODULE_TABLE_OPEN_TAG = TABLE_HEADER_TEMPLATE.format("Module wise summary", "User Name", "Message", "Line No.", "Completion Date")
+EXPIRED_BY_USER_TABLE_OPEN_TAG = TABLE_HEADER_TEMPLATE.format("User wise summary of expired todo item", "Message", "Module", "Line No.", "Completion Date")
+UPCOMING_BY_USER_TABLE_OPEN_TAG = TABLE_HEADER_TEMPLATE.format("User wise summary of upcoming todo items", "Message", "Module", "Line No.", "Completion Date")
+
+SHARD_INDEX_OPEN_TEMPLATE = """
+            <h3>{}</h3>
+            <p>
+                
+            <table>
+                <caption>Index of module wise summary shards</caption>
+            <tr>
+                <th>Shard</th>
+                <th>Modules</th>
+                <th>TODOs</th>
+            </tr>
+            """  # noqa: W293
+SHARD_INDEX_ROW_TEMPLATE = """
+                <tr>
+                    <td><a href="{}">{}</a></td>
+                    <td>{}</td>
+                    <td>{}</td>
+                </tr>
+                """
+ROOT_SHARD_NAME = "(root)"
+
+
+def shard_file_name(shard_no: int, shard_name: str) -> str:
+    """Returns the name of the html file storing a shard of a sharded report
+
+    Args:
+        shard_no (int): Position of the shard in the report. Keeps file names unique even if two shard names sanitize to same value
+        shard_name (str): Name of the shard
+
+    Returns:
+        str: File name of the shard with `.html` extension
+    """
+    return f"{shard_no:05d}-{re.sub(r'[^A-Za-z0-9._-]', '_', shard_name)}.html"
+
+
+def _iter_tables_html(container: Dict[str, List[List[str]]], section_title_template: str, table_open_tag: str, row_template: str) -> Iterator[str]:
+    """Yields the html chunks of one table per key of `container`
+
+    Args:
+        container (Dict[str, List[List[str]]]): Key-value pair where key titles the table and value is list of rows of the table
+        section_title_template (str): Template of the heading of each table. Formatted with the key of `container`
+        table_open_tag (str): Opening tag of the table along with its caption and header row
+        row_template (str): Template of a row of the table. Formatted with the values of the row
+
+    Yields:
+        Iterator[str]: Chunks of html which concatenated together form the html report
+    """
+    row_format = row_template.format
+    for key in container:
+        yield SECTION_OPEN_TEMPLATE.format(section_title_template.format(key))
+        yield table_open_tag
+        for row in container[key]:
+            yield row_format(*row)
+        yield TABLE_CLOSE_TAG
+        yield SECTION_CLOSE_TAG
+
+
+class SummaryResult:
+    """Immutable result of a summary generator for one run
+
+    A result keeps the container and html of the run it was created for. Summary generators start every run with a new container, so a
+    result isn't affected by later runs of the same summary generator
+    """
+
+    __slots__ = ("_name", "_container", "_html")
+
+    def __init__(self, name: str, container: Any, html: str) -> None:
+        """Initializer for `SummaryResult` class
+
+        Args:
+            name (str): Name of the summary generator
+            container (Any): Container of the summary generator. Dictionaries are exposed as read-only views
+            html (str): Generated html of the summary generator. Empty if html wasn't generated
+        """
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_container", MappingProxyType(container) if isinstance(container, dict) else container)
+        object.__setattr__(self, "_html", html)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Disallows setting attributes as the result is immutable
+
+        Raises:
+            AttributeError: Always raised
+        """
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @property
+    def name(self) -> str:
+        """Getter for `name`
+
+        Returns:
+            str: Name of the summary generator
+        """
+        return self._name
+
+    @property
+    def container(self) -> Any:
+        """Getter for `container`
+
+        Returns:
+            Any: Container of the summary generator. Read-only view if it's a dictionary
+        """
+        return self._container
+
+    @property
+    def html(self) -> str:
+        """Getter for `html`
+
+        Returns:
+            str: Generated html of the summary generator
+        """
+        return self._html
+
+    def __str__(self) -> str:
+        """Defines str representation of `SummaryResult` class object
+
+        Returns:
+            str: Returns string representation of the class object
+        """
+        return f"SummaryResult: {repr(self)} name: {self.name}"
+
 
 class BaseSummaryGenerator(ABC):
     def __init__(self, name: str, container: T, html: str = "") -> None:
@@ -33,6 +198,7 @@ class BaseSummaryGenerator(ABC):
         self._name = name
         self._container = container
         self._html = html
+        self._todo_index = None
 
     @property
     def name(self) -> str:
@@ -61,6 +227,56 @@ class BaseSummaryGenerator(ABC):
         """
         return self._html
 
+    @property
+    def todo_index(self) -> Union[TodoIndex, None]:
+        """Getter for `todo_index`
+
+        Returns:
+            Union[TodoIndex, None]: Index over todo items of the current run if one was bound else None
+        """
+        return self._todo_index
+
+    @todo_index.setter
+    def todo_index(self, todo_index: Union[TodoIndex, None]) -> None:
+        """Setter for `todo_index`. Allows binding the index built once per run so that summary generators don't rebuild it
+
+        Args:
+            todo_index (Union[TodoIndex, None]): Index over todo items of the current run
+        """
+        self._todo_index = todo_index
+
+    def _get_todo_index(self, all_todos_objs: Dict[str, List[TODO]]) -> TodoIndex:
+        """Returns the bound `todo_index` if it was built over `all_todos_objs` else builds a new one
+
+        Args:
+            all_todos_objs (Dict[str, List[TODO]]):  Key-value pair where key is relative path of file parsed and value is list of todo objects in that file
+
+        Returns:
+            TodoIndex: Index over `all_todos_objs`
+        """
+        if self._todo_index is not None and self._todo_index.all_todos_objs is all_todos_objs:
+            return self._todo_index
+
+        return TodoIndex(all_todos_objs)
+
+    def reset(self) -> None:
+        """Resets the summary generator so that the next run starts fresh instead of adding to the summary of previous runs
+
+        `container` is replaced with a new empty container of the same type so that results of previous runs aren't modified and
+        `html` and `todo_index` of the previous run are released. Summary generators keeping additional per run state should extend it
+        """
+        self._container = type(self._container)()
+        self._html = ""
+        self._todo_index = None
+
+    def result(self) -> SummaryResult:
+        """Returns the immutable result of the current run
+
+        Returns:
+            SummaryResult: Result holding `name`, `container` and `html` of the current run
+        """
+        return SummaryResult(self._name, self._container, self._html)
+
     @abstractmethod
     def generate_summary(self, all_todos_objs: Dict[str, List[TODO]]) -> None:
         """Abstract function to generate_summary summary
@@ -75,16 +291,69 @@ class BaseSummaryGenerator(ABC):
         """Generates the html representation of the respective summary to be sent as notifications to users"""
         pass
 
+    def iter_html(self) -> Iterator[str]:
+        """Yields the html representation of the respective summary in chunks without holding the complete report in memory
+
+        Summary generators that can render their report incrementally should override it. By default, it yields `html`
+        as generated by `generate_html`, calling `generate_html` first if it wasn't called yet
+
+        Yields:
+            Iterator[str]: Chunks of html which concatenated together form the html report
+        """
+        if not self._html:
+            self.generate_html()
+
+        yield self._html
+
+    def write_html(self, stream: TextIO) -> None:
+        """Writes the html representation of the respective summary into a writable text stream chunk by chunk
+
+        Args:
+            stream (TextIO): Writable text stream e.g. an opened file
+        """
+        for chunk in self.iter_html():
+            stream.write(chunk)
+
 
 class ByModuleSummaryGenerator(BaseSummaryGenerator):
-    def __init__(self, name: str = DEFAULT_SUMMARY_GENERATORS_ENUM.TODO_BY_MODULE, container: Dict[str, List[List[str]]] = None) -> None:
+    def __init__(
+        self,
+        name: str = DEFAULT_SUMMARY_GENERATORS_ENUM.TODO_BY_MODULE,
+        container: Dict[str, List[List[str]]] = None,
+        shard: bool = False,
+        modules_per_shard: Union[int, None] = None,
+    ) -> None:
         """Initializer for `ByModuleSummaryGenerator`
 
         Args:
             name (str, optional): Name of the respective Summary Generator. Defaults to DEFAULT_SUMMARY_GENERATORS_ENUM.TODO_BY_MODULE.
             container (Dict[str, List[List[str]], optional): A container in which `generate_summary` would add info of the current todo object. Defaults to {}.
+            shard (bool, optional): Boolean whether to split the report into one page per shard. If set, `html` is the index page of the shards
+                                    and shards are rendered independently via `iter_shard_html`. Defaults to False.
+            modules_per_shard (Union[int, None], optional): Number of modules per shard. If None, modules are sharded by their top-level
+                                                            directory below the directory common to all modules. Defaults to None.
         """
         super().__init__(name=name, container=container or {})
+        self._shard = shard
+        self._modules_per_shard = modules_per_shard
+
+    @property
+    def shard(self) -> bool:
+        """Getter for `shard`
+
+        Returns:
+            bool: Boolean whether the report is split into one page per shard along with an index page
+        """
+        return self._shard
+
+    @property
+    def modules_per_shard(self) -> Union[int, None]:
+        """Getter for `modules_per_shard`
+
+        Returns:
+            Union[int, None]: Number of modules per shard. None if modules are sharded by top-level directory
+        """
+        return self._modules_per_shard
 
     def generate_summary(self, all_todos_objs: Dict[str, List[TODO]]) -> None:
         """Generates summary for each module
@@ -94,29 +363,19 @@ class ByModuleSummaryGenerator(BaseSummaryGenerator):
         """
         logger.info(f"Generating summary: {self.name}")
 
-        for module in all_todos_objs:
+        todo_index = self._get_todo_index(all_todos_objs)
+        for module in todo_index.modules:
             logger.info(f"Generating summary: {self.name} for module: {module}")
-            for todo_obj in all_todos_objs[module]:
-                user_name = todo_obj.user.user_name
-
-                if todo_obj.module not in self._container:
-                    self._container[todo_obj.module] = [
-                        [
-                            user_name,
-                            todo_obj.msg,
-                            todo_obj.position.line_no,
-                            str(todo_obj.completion_date),
-                        ]
+            module_todos = self._container.setdefault(module, [])
+            for todo_obj in todo_index.by_module(module):
+                module_todos.append(
+                    [
+                        todo_obj.user.user_name,
+                        todo_obj.msg,
+                        todo_obj.position.line_no,
+                        str(todo_obj.completion_date),
                     ]
-                else:
-                    self._container[todo_obj.module].append(
-                        [
-                            user_name,
-                            todo_obj.msg,
-                            todo_obj.position.line_no,
-                            str(todo_obj.completion_date),
-                        ]
-                    )
+                )
 
         logger.info(f"Summary generated: {self.container}")
 
@@ -124,39 +383,75 @@ class ByModuleSummaryGenerator(BaseSummaryGenerator):
         """Generates the html representation showing module wise summary of todo items"""
         logger.info(f"Generating html for: {self.name}")
 
-        tables = ""
-        for module in self._container:
-            table = """
-            <table>
-                <caption>Module wise summary</caption>
-            <tr>
-                <th>User Name</th>
-                <th>Message</th>
-                <th>Line No.</th>
-                <th>Completion Date</th>
-            </tr>
-            """
+        html = "".join(self.iter_html())
 
-            for todo_item in self._container[module]:
-                table += f"""
-                <tr>
-                    <td>{todo_item[0]}</td>
-                    <td>{todo_item[1]}</td>
-                    <td>{todo_item[2]}</td>
-                    <td>{todo_item[3]}</td>
-                </tr>
-                """
-            table += TABLE_CLOSE_TAG
+        logger.debug("HTML generated: %s", html)
+        self._html = html
 
-            tables += f"""
-            <h3>TODOs for module {module}</h3>
-            <p>
-                {table}
-            </p><br>
-            """
+    def iter_html(self) -> Iterator[str]:
+        """Yields the html representation of the module wise summary of todo items in chunks. If `shard` is set, yields the index page of the shards
+
+        Yields:
+            Iterator[str]: Chunks of html which concatenated together form the html report
+        """
+        if self._shard:
+            return self.iter_index_html(self.shard_modules())
+
+        return _iter_tables_html(self._container, "TODOs for module {}", BY_MODULE_TABLE_OPEN_TAG, BY_MODULE_ROW_TEMPLATE)
+
+    def shard_modules(self) -> Dict[str, List[str]]:
+        """Splits the modules in the summary into shards
 
-        logger.info(f"HTML generated: {tables}")
-        self._html = tables
+        Modules are split into chunks of `modules_per_shard` modules if it is set. Otherwise, modules are grouped by their top-level directory
+        below the directory common to all modules. Modules directly inside the common directory go into shard `ROOT_SHARD_NAME`.
+
+        Returns:
+            Dict[str, List[str]]: Key-value pair where key is name of the shard and value is list of modules in that shard
+        """
+        modules = list(self._container)
+
+        shards = {}
+        if self._modules_per_shard:
+            for module_no, module in enumerate(modules):
+                shards.setdefault(f"part-{module_no // self._modules_per_shard + 1}", []).append(module)
+
+            return shards
+
+        common_dir = os.path.commonpath([os.path.dirname(module) for module in modules]) if modules else ""
+        for module in modules:
+            path_parts = os.path.relpath(module, common_dir).split(os.sep) if common_dir else module.split(os.sep)
+            shard_name = path_parts[0] if len(path_parts) > 1 else ROOT_SHARD_NAME
+            shards.setdefault(shard_name, []).append(module)
+
+        return shards
+
+    def iter_shard_html(self, modules: List[str]) -> Iterator[str]:
+        """Yields the html page of one shard in chunks. Each shard only reads its own modules so shards can be rendered in parallel
+
+        Args:
+            modules (List[str]): Modules in the shard as returned by `shard_modules`
+
+        Yields:
+            Iterator[str]: Chunks of html which concatenated together form the html page of the shard
+        """
+        shard_container = {module: self._container[module] for module in modules}
+        return _iter_tables_html(shard_container, "TODOs for module {}", BY_MODULE_TABLE_OPEN_TAG, BY_MODULE_ROW_TEMPLATE)
+
+    def iter_index_html(self, shards: Dict[str, List[str]]) -> Iterator[str]:
+        """Yields the index page of the shards listing count of modules and todo items in each shard along with link to its page
+
+        Args:
+            shards (Dict[str, List[str]]): Shards as returned by `shard_modules`
+
+        Yields:
+            Iterator[str]: Chunks of html which concatenated together form the index page
+        """
+        yield SHARD_INDEX_OPEN_TEMPLATE.format(f"Shards of {self.name}")
+        for shard_no, (shard_name, modules) in enumerate(shards.items()):
+            num_todos = sum(len(self._container[module]) for module in modules)
+            yield SHARD_INDEX_ROW_TEMPLATE.format(shard_file_name(shard_no, shard_name), shard_name, len(modules), num_todos)
+        yield TABLE_CLOSE_TAG
+        yield SECTION_CLOSE_TAG
 
 
 class ExpiredTodosByUserSummaryGenerator(BaseSummaryGenerator):
@@ -180,30 +475,18 @@ class ExpiredTodosByUserSummaryGenerator(BaseSummaryGenerator):
 
         curr_date = datetime.today().date()
 
-        for module in all_todos_objs:
-            logger.info(f"Generating summary: {self.name} for module: {module}")
-            for todo_obj in all_todos_objs[module]:
-                user_name = todo_obj.user.user_name
-
-                if curr_date > todo_obj.completion_date:
-                    if user_name not in self._container:
-                        self._container[user_name] = [
-                            [
-                                todo_obj.msg,
-                                todo_obj.module,
-                                todo_obj.position.line_no,
-                                str(todo_obj.completion_date),
-                            ]
-                        ]
-                    else:
-                        self._container[user_name].append(
-                            [
-                                todo_obj.msg,
-                                todo_obj.module,
-                                todo_obj.position.line_no,
-                                str(todo_obj.completion_date),
-                            ]
-                        )
+        todo_index = self._get_todo_index(all_todos_objs)
+        # Reported in parsed order like before the todo index was used
+        for todo_obj in todo_index.in_parsed_order(todo_index.expired(curr_date)):
+            user_name = todo_obj.user.user_name
+            self._container.setdefault(user_name, []).append(
+                [
+                    todo_obj.msg,
+                    todo_obj.module,
+                    todo_obj.position.line_no,
+                    str(todo_obj.completion_date),
+                ]
+            )
 
         logger.info(f"Summary generated: {self.container}")
 
@@ -211,39 +494,18 @@ class ExpiredTodosByUserSummaryGenerator(BaseSummaryGenerator):
         """Generates the html representation of the user-wise summary of expired todo items for all users"""
         logger.info(f"Generating html for: {self.name}")
 
-        tables = ""
-        for user_name in self._container:
-            table = """
-            <table>
-                <caption>User wise summary of expired todo item</caption>
-            <tr>
-                <th>Message</th>
-                <th>Module</th>
-                <th>Line No.</th>
-                <th>Completion Date</th>
-            </tr>
-            """
+        html = "".join(self.iter_html())
 
-            for todo_item in self._container[user_name]:
-                table += f"""
-                    <tr>
-                        <td>{todo_item[0]}</td>
-                        <td>{todo_item[1]}</td>
-                        <td>{todo_item[2]}</td>
-                        <td>{todo_item[3]}</td>
-                    </tr>
-                    """
-            table += TABLE_CLOSE_TAG
+        logger.debug("HTML generated: %s", html)
+        self._html = html
 
-            tables += f"""
-            <h3>Expired TODOs for {user_name}</h3>
-            <p>
-                {table}
-            </p><br>
-            """
+    def iter_html(self) -> Iterator[str]:
+        """Yields the html representation of the expired todo items of all users in chunks
 
-        logger.info(f"HTML generated: {tables}")
-        self._html = tables
+        Yields:
+            Iterator[str]: Chunks of html which concatenated together form the html report
+        """
+        return _iter_tables_html(self._container, "Expired TODOs for {}", EXPIRED_BY_USER_TABLE_OPEN_TAG, BY_USER_ROW_TEMPLATE)
 
 
 class UpcomingWeekTodosByUserSummaryGenerator(BaseSummaryGenerator):
@@ -266,30 +528,18 @@ class UpcomingWeekTodosByUserSummaryGenerator(BaseSummaryGenerator):
 
         curr_date = datetime.today().date()
 
-        for module in all_todos_objs:
-            logger.info(f"Generating summary: {self.name} for module: {module}")
-            for todo_obj in all_todos_objs[module]:
-                user_name = todo_obj.user.user_name if todo_obj.user.user_name else UNKNOWN_USER_NAME
-
-                if curr_date <= todo_obj.completion_date and (todo_obj.completion_date - curr_date).days <= 7:
-                    if user_name not in self._container:
-                        self._container[user_name] = [
-                            [
-                                todo_obj.msg,
-                                todo_obj.module,
-                                todo_obj.position.line_no,
-                                str(todo_obj.completion_date),
-                            ]
-                        ]
-                    else:
-                        self._container[user_name].append(
-                            [
-                                todo_obj.msg,
-                                todo_obj.module,
-                                todo_obj.position.line_no,
-                                str(todo_obj.completion_date),
-                            ]
-                        )
+        todo_index = self._get_todo_index(all_todos_objs)
+        # Reported in parsed order like before the todo index was used
+        for todo_obj in todo_index.in_parsed_order(todo_index.due_within(7, curr_date)):
+            user_name = todo_obj.user.user_name if todo_obj.user.user_name else UNKNOWN_USER_NAME
+            self._container.setdefault(user_name, []).append(
+                [
+                    todo_obj.msg,
+                    todo_obj.module,
+                    todo_obj.position.line_no,
+                    str(todo_obj.completion_date),
+                ]
+            )
 
         logger.info(f"Summary generated: {self.container}")
 
@@ -297,36 +547,15 @@ class UpcomingWeekTodosByUserSummaryGenerator(BaseSummaryGenerator):
         """Generates the html representation of the user-wise summary of the upcoming (within a week) todo items for all users"""
         logger.info(f"Generating html for: {self.name}")
 
-        tables = ""
-        for user_name in self._container:
-            table = """
-            <table>
-                <caption>User wise summary of upcoming todo items</caption>
-            <tr>
-                <th>Message</th>
-                <th>Module</th>
-                <th>Line No.</th>
-                <th>Completion Date</th>
-            </tr>
-            """
+        html = "".join(self.iter_html())
 
-            for todo_item in self._container.get(user_name):
-                table += f"""
-                    <tr>
-                        <td>{todo_item[0]}</td>
-                        <td>{todo_item[1]}</td>
-                        <td>{todo_item[2]}</td>
-                        <td>{todo_item[3]}</td>
-                    </tr>
-                    """
-            table += TABLE_CLOSE_TAG
+        logger.debug("HTML generated: %s", html)
+        self._html = html
 
-            tables += f"""
-            <h3>Upcoming TODOs for {user_name}</h3>
-            <p>
-                {table}
-            </p><br>
-            """
+    def iter_html(self) -> Iterator[str]:
+        """Yields the html representation of the upcoming (within a week) todo items of all users in chunks
 
-        logger.info(f"HTML generated: {tables}")
-        self._html = tables
+        Yields:
+            Iterator[str]: Chunks of html which concatenated together form the html report
+        """
+        return _iter_tables_html(self._container, "Upcoming TODOs for {}", UPCOMING_BY_USER_TABLE_OPEN_TAG, BY_USER_ROW_TEMPLATE)
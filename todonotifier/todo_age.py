@@ -0,0 +1,280 @@
+"""This module provides detection of the commit that introduced every todo item of a cloned
+repository, allowing reports to show how long each todo item has existed.
+
+History is walked once with `git log -p` from the oldest commit and only the commits added since
+the last walk are processed by later runs. Within a commit, removed and added todo items with the
+same message cancel out, so editing, moving or rescheduling a todo item keeps its introduction.
+Introductions are kept in a JSON file per file path and message.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+from todonotifier.models import INTRODUCTION, TODO
+from todonotifier.todo_notifier import get_todo_regexes
+
+logger = logging.getLogger(__name__)
+
+# Marks the line holding SHA and commit time of a commit in the output of `git log` i.e. "%x00" of its format
+COMMIT_LINE_PREFIX = "\0"
+STORE_VERSION = 1
+
+
+def format_age(introduced_at: datetime, curr_datetime: Union[datetime, None] = None) -> str:
+    """Formats the time since `introduced_at` e.g. "3 days ago" or "2 years ago"
+
+    Args:
+        introduced_at (datetime): Time of introduction
+        curr_datetime (Union[datetime, None], optional): Reference time. Defaults to None i.e. now
+
+    Returns:
+        str: Time since `introduced_at` in the largest fitting unit of days, months or years
+    """
+    days = ((curr_datetime or datetime.now()) - introduced_at).days
+    if days < 1:
+        return "today"
+
+    for unit, unit_days in (("year", 365), ("month", 30), ("day", 1)):
+        if days >= unit_days:
+            count = days // unit_days
+            return f"{count} {unit}{'s' if count > 1 else ''} ago"
+
+
+def _iter_commit_diffs(lines: Iterable[str]) -> Iterator[Tuple[str, int, Dict[str, Tuple[List[str], List[str]]]]]:
+    """Groups the output of `git log -p` by commit into lines removed from and added to every file
+
+    Args:
+        lines (Iterable[str]): Lines of the output of `git log -p` with every commit starting with `COMMIT_LINE_PREFIX` followed by its SHA
+                               and commit time as unix timestamp
+
+    Yields:
+        Iterator[Tuple[str, int, Dict[str, Tuple[List[str], List[str]]]]]: Tuples of commit SHA, commit time and key-value pair where key
+                                                                           is file path and value is tuple of removed and added lines
+    """
+    commit = None
+    files: Dict[str, Tuple[List[str], List[str]]] = {}
+    old_path = new_path = None
+    in_hunk = False
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line.startswith(COMMIT_LINE_PREFIX):
+            if commit is not None:
+                yield (*commit, files)
+            commit_sha, commit_time = line[len(COMMIT_LINE_PREFIX) :].split(" ")  # noqa: E203
+            commit, files = (commit_sha, int(commit_time)), {}
+            in_hunk = False
+        elif line.startswith("diff --git "):
+            old_path = new_path = None
+            in_hunk = False
+        elif not in_hunk:
+            # File header lines before the first hunk of a file. Git ends paths holding spaces with a tab
+            if line.startswith("--- "):
+                old_path = line[len("--- a/") :].rstrip("\t") if line != "--- /dev/null" else None  # noqa: E203
+            elif line.startswith("+++ "):
+                new_path = line[len("+++ b/") :].rstrip("\t") if line != "+++ /dev/null" else None  # noqa: E203
+            elif line.startswith("@@"):
+                in_hunk = True
+        elif line.startswith("-"):
+            files.setdefault(old_path, ([], []))[0].append(line[1:])
+        elif line.startswith("+"):
+            files.setdefault(new_path, ([], []))[1].append(line[1:])
+
+    if commit is not None:
+        yield (*commit, files)
+
+
+class TodoAgeTracker:
+    """Tracks the commit that introduced every todo item of a cloned repository by walking its history incrementally
+
+    Only the first parent of merge commits is followed and a merge commit is diffed against its first parent, so todo items
+    merged from a branch are introduced by the merge commit. Introductions are kept in `store_file` along with the last
+    commit processed, so that every run only processes commits added since the previous run
+    """
+
+    def __init__(self, store_file: str, pathspecs: Union[List[str], None] = None) -> None:
+        """Initializer for `TodoAgeTracker` class
+
+        Args:
+            store_file (str): JSON file in which introductions are kept across runs. Created on first save
+            pathspecs (Union[List[str], None], optional): Git pathspecs limiting the files walked e.g. ["*.py"]. Defaults to None i.e. all files
+        """
+        self._store_file = store_file
+        self._pathspecs = pathspecs or []
+
+    @property
+    def store_file(self) -> str:
+        """Getter for `store_file`
+
+        Returns:
+            str: JSON file in which introductions are kept
+        """
+        return self._store_file
+
+    def _load(self) -> Dict:
+        """Loads the store
+
+        Returns:
+            Dict: Store holding last commit processed, `ignore_todo_case` used and introductions keyed by file path and message. Empty if
+                  nothing was stored yet or stored with another version
+        """
+        if not os.path.isfile(self._store_file):
+            return {}
+
+        with open(self._store_file) as f:
+            store = json.load(f)
+
+        return store if store.get("version") == STORE_VERSION else {}
+
+    def _save(self, store: Dict) -> None:
+        """Writes `store` replacing the earlier one atomically
+
+        Args:
+            store (Dict): Store holding last commit processed, `ignore_todo_case` used and introductions keyed by file path and message
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self._store_file)), exist_ok=True)
+        with open(f"{self._store_file}.tmp", "w") as f:
+            json.dump(store, f)
+        os.replace(f"{self._store_file}.tmp", self._store_file)
+
+    def _get_todo_msgs(self, lines: List[str], ignore_todo_case: bool) -> List[str]:
+        """Returns the messages of todo items in `lines` parsed the same way as files are parsed
+
+        Args:
+            lines (List[str]): Lines of a file
+            ignore_todo_case (bool): Boolean whether to look for case insensitive todo items like todo, Todo etc.
+
+        Returns:
+            List[str]: Messages of todo items in `lines`
+        """
+        todo_line_regex, todo_regex = get_todo_regexes(ignore_todo_case)
+        msgs = []
+        for line in lines:
+            todo_item = todo_line_regex.search(line)
+            if todo_item:
+                todo_date_username = todo_regex.findall(todo_item.group())
+                msgs.append(todo_date_username[0][2] if todo_date_username else "")
+
+        return msgs
+
+    def update(self, repo_dir: str, ignore_todo_case: bool = False) -> Dict[str, Dict[str, List[List]]]:
+        """Processes the commits added to HEAD of `repo_dir` since the last update and stores the introductions
+
+        History is walked again from the oldest commit if the last commit processed isn't an ancestor of HEAD anymore e.g. after a
+        force push, or if `ignore_todo_case` changed
+
+        Args:
+            repo_dir (str): Directory of the cloned repository
+            ignore_todo_case (bool, optional): Boolean whether to look for case insensitive todo items like todo, Todo etc. Defaults to False
+
+        Returns:
+            Dict[str, Dict[str, List[List]]]: Key-value pair where key is file path and value is key-value pair of message and list of
+                                              [commit SHA, commit time] of todo items with that message, oldest first
+        """
+        # GitPython is imported on first use as it is slow to import and not needed unless tracking ages
+        from git.repo import Repo
+
+        repo = Repo(repo_dir)
+        head_sha = repo.head.commit.hexsha
+        store = self._load()
+        if store.get("ignore_todo_case") != ignore_todo_case or (store.get("head") and not repo.is_ancestor(store["head"], head_sha)):
+            logger.info(f"Walking complete history of repository: {repo_dir} for todo ages")
+            store = {}
+        if store.get("head") == head_sha:
+            return store["introductions"]
+
+        introductions: Dict[str, Dict[str, List[List]]] = store.get("introductions", {})
+        rev_range = f"{store['head']}..{head_sha}" if store.get("head") else head_sha
+        # Renames are diffed as removal and addition so that introductions move along with the todo items. Prefixes and quoting of
+        # paths are fixed as they can be changed by git configuration of the host
+        process = repo.git(c="core.quotePath=false").log(
+            "--reverse",
+            "--first-parent",
+            "-m",
+            "-p",
+            "--no-renames",
+            "--no-color",
+            "--src-prefix=a/",
+            "--dst-prefix=b/",
+            "--format=%x00%H %ct",
+            rev_range,
+            "--",
+            *self._pathspecs,
+            as_process=True,
+        )
+        lines = (line.decode("utf-8", errors="replace") for line in process.stdout)
+
+        num_commits = 0
+        for commit_sha, commit_time, files in _iter_commit_diffs(lines):
+            num_commits += 1
+            # Introductions of todo items removed in the commit by message so that todo items moved across files keep them
+            removed: Dict[str, List[List]] = {}
+            added: List[Tuple[str, str, int]] = []
+            for path, (removed_lines, added_lines) in files.items():
+                if path is None:
+                    continue
+                counts: Dict[str, int] = {}
+                for msg in self._get_todo_msgs(removed_lines, ignore_todo_case):
+                    counts[msg] = counts.get(msg, 0) - 1
+                for msg in self._get_todo_msgs(added_lines, ignore_todo_case):
+                    counts[msg] = counts.get(msg, 0) + 1
+
+                for msg, count in counts.items():
+                    if count > 0:
+                        added.append((path, msg, count))
+                    elif count < 0:
+                        path_introductions = introductions.get(path, {})
+                        msg_introductions = path_introductions.get(msg, [])
+                        removed.setdefault(msg, []).extend(msg_introductions[count:])
+                        del msg_introductions[count:]
+                        if not msg_introductions:
+                            path_introductions.pop(msg, None)
+                        if not path_introductions:
+                            introductions.pop(path, None)
+
+            for path, msg, count in added:
+                msg_introductions = introductions.setdefault(path, {}).setdefault(msg, [])
+                for _ in range(count):
+                    moved = removed.get(msg)
+                    msg_introductions.append(moved.pop(0) if moved else [commit_sha, commit_time])
+                msg_introductions.sort(key=lambda introduction: introduction[1])
+
+        process.wait()
+        self._save({"version": STORE_VERSION, "head": head_sha, "ignore_todo_case": ignore_todo_case, "introductions": introductions})
+        logger.info(f"Processed {num_commits} commits of repository: {repo_dir} for todo ages")
+
+        return introductions
+
+    def annotate(self, repo_dir: str, project_parent_dir: str, all_todos_objs: Dict[str, List[TODO]], ignore_todo_case: bool = False) -> int:
+        """Replaces todo items in `all_todos_objs` with ones holding the commit that introduced them after updating the introductions
+
+        Todo items of a file sharing the same message are matched with introductions of that message oldest first
+
+        Args:
+            repo_dir (str): Directory of the cloned repository
+            project_parent_dir (str): Parent directory of the project folder to which modules of todo items are relative
+            all_todos_objs (Dict[str, List[TODO]]): Key-value pair where key is relative path of file parsed and value is list of todo objects in that file
+            ignore_todo_case (bool, optional): Boolean whether todo items were looked for case insensitively. Defaults to False
+
+        Returns:
+            int: Number of todo items whose introduction was found
+        """
+        introductions = self.update(repo_dir, ignore_todo_case)
+
+        num_annotated = 0
+        for module, todos in all_todos_objs.items():
+            path_introductions = introductions.get(os.path.relpath(os.path.join(project_parent_dir, module), repo_dir).replace(os.sep, "/"), {})
+            occurrences: Dict[str, int] = {}
+            for idx, todo_obj in enumerate(todos):
+                occurrence = occurrences[todo_obj.msg] = occurrences.get(todo_obj.msg, -1) + 1
+                msg_introductions = path_introductions.get(todo_obj.msg, [])
+                if occurrence < len(msg_introductions):
+                    commit_sha, commit_time = msg_introductions[occurrence]
+                    introduction = INTRODUCTION(commit_sha, datetime.fromtimestamp(commit_time))
+                    todos[idx] = TODO(todo_obj.msg, todo_obj.user, str(todo_obj.completion_date), todo_obj.module, todo_obj.position, introduction)
+                    num_annotated += 1
+
+        logger.info(f"Found introduction of {num_annotated} todo items")
+        return num_annotated
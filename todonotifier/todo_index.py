@@ -0,0 +1,159 @@
+"""This module provides an in-memory index over the todo items parsed in a run. It is built
+once per run and allows summary generators to query todo items by user, by module or by
+completion date without scanning all todo items again.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Union
+
+from todonotifier.models import TODO
+
+
+class TodoIndex:
+    """Index over todo items with hash indexes by user and by module and a date sorted array
+
+    Range queries over completion date (expired, due within N days, due between two dates) are answered
+    using bisection in O(log n + k) where k is the number of todo items returned. Todo items sharing the
+    same completion date keep the order in which they were parsed.
+    """
+
+    def __init__(self, all_todos_objs: Dict[str, List[TODO]]) -> None:
+        """Initializer for `TodoIndex` class
+
+        Args:
+            all_todos_objs (Dict[str, List[TODO]]): Key-value pair where key is relative path of file parsed and value is list of todo objects in that file
+        """
+        self._all_todos_objs = all_todos_objs
+        self._by_module: Dict[str, List[TODO]] = {}
+        self._by_user: Dict[str, List[TODO]] = {}
+        # Position of every todo item in parsed order keyed by its id, allowing to restore parsed order of query results
+        self._parsed_positions: Dict[int, int] = {}
+
+        all_todos = []
+        for module in all_todos_objs:
+            for todo_obj in all_todos_objs[module]:
+                self._parsed_positions[id(todo_obj)] = len(all_todos)
+                all_todos.append(todo_obj)
+                self._by_module.setdefault(todo_obj.module, []).append(todo_obj)
+                self._by_user.setdefault(todo_obj.user.user_name, []).append(todo_obj)
+
+        # `sorted` is stable so todo items with same completion date retain their parsed order
+        self._todos_by_date: List[TODO] = sorted(all_todos, key=lambda todo_obj: todo_obj.completion_date)
+        self._dates: List[date] = [todo_obj.completion_date for todo_obj in self._todos_by_date]
+
+    @property
+    def all_todos_objs(self) -> Dict[str, List[TODO]]:
+        """Getter for `all_todos_objs`
+
+        Returns:
+            Dict[str, List[TODO]]: Todo items from which the index was built
+        """
+        return self._all_todos_objs
+
+    @property
+    def users(self) -> List[str]:
+        """Getter for the user names present in the index
+
+        Returns:
+            List[str]: User names in the order they were first seen
+        """
+        return list(self._by_user)
+
+    @property
+    def modules(self) -> List[str]:
+        """Getter for the modules present in the index
+
+        Returns:
+            List[str]: Modules in the order they were first seen
+        """
+        return list(self._by_module)
+
+    def __len__(self) -> int:
+        """Returns the number of todo items in the index
+
+        Returns:
+            int: Number of indexed todo items
+        """
+        return len(self._todos_by_date)
+
+    def __iter__(self) -> Iterator[TODO]:
+        """Iterates over all todo items sorted by completion date
+
+        Returns:
+            Iterator[TODO]: Iterator over todo items
+        """
+        return iter(self._todos_by_date)
+
+    def by_user(self, user_name: str) -> List[TODO]:
+        """Returns all todo items of the given user
+
+        Args:
+            user_name (str): User name to look up
+
+        Returns:
+            List[TODO]: Todo items of `user_name` in parsed order. Empty list if user is unknown
+        """
+        return list(self._by_user.get(user_name, []))
+
+    def by_module(self, module: str) -> List[TODO]:
+        """Returns all todo items of the given module
+
+        Args:
+            module (str): Relative path of the module to look up
+
+        Returns:
+            List[TODO]: Todo items of `module` in parsed order. Empty list if module is unknown
+        """
+        return list(self._by_module.get(module, []))
+
+    def in_parsed_order(self, todo_objs: List[TODO]) -> List[TODO]:
+        """Returns `todo_objs` e.g. results of a query by completion date in the order they were parsed
+
+        Args:
+            todo_objs (List[TODO]): Todo items of the index
+
+        Returns:
+            List[TODO]: Todo items sorted by the order they were parsed
+        """
+        return sorted(todo_objs, key=lambda todo_obj: self._parsed_positions[id(todo_obj)])
+
+    def due_between(self, start_date: Union[date, None] = None, end_date: Union[date, None] = None) -> List[TODO]:
+        """Returns todo items whose completion date lies within `start_date` and `end_date` (both inclusive)
+
+        Args:
+            start_date (Union[date, None], optional): Lower bound of completion date. Defaults to None i.e. unbounded
+            end_date (Union[date, None], optional): Upper bound of completion date. Defaults to None i.e. unbounded
+
+        Returns:
+            List[TODO]: Todo items sorted by completion date
+        """
+        lo = 0 if start_date is None else bisect_left(self._dates, start_date)
+        hi = len(self._dates) if end_date is None else bisect_right(self._dates, end_date)
+
+        return self._todos_by_date[lo:hi]
+
+    def expired(self, curr_date: Union[date, None] = None) -> List[TODO]:
+        """Returns todo items whose completion date is before `curr_date`
+
+        Args:
+            curr_date (Union[date, None], optional): Reference date. Defaults to today
+
+        Returns:
+            List[TODO]: Expired todo items sorted by completion date
+        """
+        curr_date = curr_date or datetime.today().date()
+        return self._todos_by_date[: bisect_left(self._dates, curr_date)]
+
+    def due_within(self, days: int, curr_date: Union[date, None] = None) -> List[TODO]:
+        """Returns todo items due from `curr_date` up to `days` days after it (both inclusive)
+
+        Args:
+            days (int): Number of days to look ahead
+            curr_date (Union[date, None], optional): Reference date. Defaults to today
+
+        Returns:
+            List[TODO]: Upcoming todo items sorted by completion date
+        """
+        curr_date = curr_date or datetime.today().date()
+        return self.due_between(curr_date, curr_date + timedelta(days=days))
@@ -1,10 +1,14 @@
 """This module contains the core logic of the application
 """
 
+import codecs
+import hashlib
 import logging
 import os
 import re
-from typing import Dict, List
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, List, Pattern, Tuple, Union
 
 from todonotifier.constants import UNKNOWN_USER_NAME
 from todonotifier.models import POSITION, TODO, USER
@@ -13,72 +17,754 @@ from todonotifier.utils import (
     compute_line_and_pos_given_span,
 )
 
-# logging configuration
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(process)d - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
 TODO_REGEX_PATTERN = r"TODO\s*(\{.*\})?\s*(@[^\s]*)?\s*(.*)?"
+TODO_LINE_REGEX_PATTERN = r"TODO.*"
 
 
-def parse_files_for_todo_items(project_parent_dir: str, files: List[str], ignore_todo_case: bool) -> Dict[str, List[TODO]]:
+@lru_cache(maxsize=None)
+def get_todo_regexes(ignore_todo_case: bool) -> Tuple[Pattern, Pattern]:
+    """Returns the compiled regular expressions used to parse todo items. They are compiled once per process and reused across runs
+
+    Args:
+        ignore_todo_case (bool): Boolean whether to look for case insensitive todo items like todo, Todo etc.
+
+    Returns:
+        Tuple[Pattern, Pattern]: Regular expression matching the todo items in a file and regular expression parsing date, user and message of a todo item
+    """
+    flags = re.MULTILINE
+    if ignore_todo_case:
+        flags |= re.IGNORECASE
+
+    return re.compile(TODO_LINE_REGEX_PATTERN, flags=flags), re.compile(TODO_REGEX_PATTERN, flags=flags)
+
+
+# Size of blocks in which file digests are computed
+DIGEST_BLOCK_SIZE = 1 << 20
+# Encodings detected from byte order mark at start of file. UTF-32 is checked first as its little endian mark starts with that of UTF-16
+BOM_ENCODINGS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+class ScanOptions:
+    """Options controlling how files are read while parsing them for todo items
+
+    Files larger than `chunked_scan_threshold` are read in blocks of `chunk_size` characters instead of at once. As a todo item never spans
+    lines, the incomplete last line of a block is carried over to the next block so that todo items are never split and only complete
+    lines are matched. Lines are counted incrementally, so memory stays bounded by the block size and the longest line
+
+    Before decoding a file, its first `binary_sniff_size` bytes are checked for NUL bytes to skip binary files cheaply and for a byte order
+    mark to detect its encoding. Other files are decoded with `encoding` and `encoding_errors`. With a strict error policy, files that can't
+    be decoded are tried again with `fallback_encodings` and skipped if none fits
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 1 << 20,
+        chunked_scan_threshold: int = 8 << 20,
+        max_file_size: Union[int, None] = None,
+        max_line_length: Union[int, None] = None,
+        binary_sniff_size: int = 8 << 10,
+        encoding: str = "utf-8",
+        encoding_errors: str = "replace",
+        fallback_encodings: Union[List[str], None] = None,
+    ) -> None:
+        """Initializer for `ScanOptions` class
+
+        Args:
+            chunk_size (int, optional): Number of characters read at once by the chunked scan. Defaults to 1 MiB
+            chunked_scan_threshold (int, optional): Size of file in bytes above which it is scanned in chunks. Defaults to 8 MiB
+            max_file_size (Union[int, None], optional): Size of file in bytes above which it is skipped. Defaults to None i.e. no limit
+            max_line_length (Union[int, None], optional): Length of line above which its file is skipped e.g. minified or generated files.
+                                                          Defaults to None i.e. no limit
+            binary_sniff_size (int, optional): Number of bytes at start of file checked for NUL bytes. Files holding one are skipped as binary.
+                                               Defaults to 8 KiB. 0 disables the check
+            encoding (str, optional): Encoding of files without byte order mark. Defaults to "utf-8"
+            encoding_errors (str, optional): Policy for handling decoding errors as in `open` e.g. "replace", "ignore" or "strict". Defaults to
+                                             "replace" i.e. undecodable bytes are replaced and todo items of the file are still collected
+            fallback_encodings (Union[List[str], None], optional): Encodings tried in order if a file can't be decoded with `encoding`. Only
+                                                                   used with "strict" `encoding_errors`. Defaults to None i.e. no fallback
+
+        Raises:
+            ValueError: Raised if `chunk_size` isn't positive or any of the encodings or `encoding_errors` is unknown
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"Chunk size must be positive, got: {chunk_size}")
+
+        fallback_encodings = fallback_encodings or []
+        for codec in (encoding, *fallback_encodings):
+            try:
+                codecs.lookup(codec)
+            except LookupError as exc:
+                raise ValueError(f"Unknown encoding: {codec}") from exc
+        try:
+            codecs.lookup_error(encoding_errors)
+        except LookupError as exc:
+            raise ValueError(f"Unknown encoding error policy: {encoding_errors}") from exc
+
+        self._chunk_size = chunk_size
+        self._chunked_scan_threshold = chunked_scan_threshold
+        self._max_file_size = max_file_size
+        self._max_line_length = max_line_length
+        self._binary_sniff_size = binary_sniff_size
+        self._encoding = encoding
+        self._encoding_errors = encoding_errors
+        self._fallback_encodings = fallback_encodings
+
+    @property
+    def chunk_size(self) -> int:
+        """Getter for `chunk_size`
+
+        Returns:
+            int: Number of characters read at once by the chunked scan
+        """
+        return self._chunk_size
+
+    @property
+    def chunked_scan_threshold(self) -> int:
+        """Getter for `chunked_scan_threshold`
+
+        Returns:
+            int: Size of file in bytes above which it is scanned in chunks
+        """
+        return self._chunked_scan_threshold
+
+    @property
+    def max_file_size(self) -> Union[int, None]:
+        """Getter for `max_file_size`
+
+        Returns:
+            Union[int, None]: Size of file in bytes above which it is skipped. None if there is no limit
+        """
+        return self._max_file_size
+
+    @property
+    def max_line_length(self) -> Union[int, None]:
+        """Getter for `max_line_length`
+
+        Returns:
+            Union[int, None]: Length of line above which its file is skipped. None if there is no limit
+        """
+        return self._max_line_length
+
+    @property
+    def binary_sniff_size(self) -> int:
+        """Getter for `binary_sniff_size`
+
+        Returns:
+            int: Number of bytes at start of file checked for NUL bytes. 0 if the check is disabled
+        """
+        return self._binary_sniff_size
+
+    @property
+    def encoding(self) -> str:
+        """Getter for `encoding`
+
+        Returns:
+            str: Encoding of files without byte order mark
+        """
+        return self._encoding
+
+    @property
+    def encoding_errors(self) -> str:
+        """Getter for `encoding_errors`
+
+        Returns:
+            str: Policy for handling decoding errors
+        """
+        return self._encoding_errors
+
+    @property
+    def fallback_encodings(self) -> List[str]:
+        """Getter for `fallback_encodings`
+
+        Returns:
+            List[str]: Encodings tried in order if a file can't be decoded with `encoding`
+        """
+        return self._fallback_encodings
+
+
+DEFAULT_SCAN_OPTIONS = ScanOptions()
+
+
+class SkippedFile:
+    """File skipped while parsing for todo items along with the reason"""
+
+    def __init__(self, module: str, reason: str) -> None:
+        """Initializer for `SkippedFile` class
+
+        Args:
+            module (str): Relative path of the file
+            reason (str): Reason why the file was skipped
+        """
+        self._module = module
+        self._reason = reason
+
+    @property
+    def module(self) -> str:
+        """Getter for `module`
+
+        Returns:
+            str: Relative path of the file
+        """
+        return self._module
+
+    @property
+    def reason(self) -> str:
+        """Getter for `reason`
+
+        Returns:
+            str: Reason why the file was skipped
+        """
+        return self._reason
+
+    def __str__(self) -> str:
+        """Defines str representation of `SkippedFile` class object
+
+        Returns:
+            str: Returns string representation of the class object
+        """
+        return f"SkippedFile: {repr(self)} module: {self.module} reason: {self.reason}"
+
+
+class ParseDiagnostics:
+    """Collector of errors in parsing files for todo items holding counts of errors by kind and a capped sample of their locations
+
+    Only sampled errors are logged as warnings, so that many bad lines in a large scan keep logs bounded. Tracebacks are logged at debug level
+    """
+
+    def __init__(self, max_samples: int = 20) -> None:
+        """Initializer for `ParseDiagnostics` class
+
+        Args:
+            max_samples (int, optional): Maximum number of error locations kept. Defaults to 20
+        """
+        self._max_samples = max_samples
+        self._counts: Dict[str, int] = {}
+        # List of (kind, module, line no.) of sampled errors. Line no. is None for errors in parsing a file as a whole
+        self._samples: List[Tuple[str, str, Union[int, None]]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def max_samples(self) -> int:
+        """Getter for `max_samples`
+
+        Returns:
+            int: Maximum number of error locations kept
+        """
+        return self._max_samples
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        """Getter for `counts`
+
+        Returns:
+            Dict[str, int]: Key-value pair where key is kind of error i.e. name of exception class and value is number of such errors
+        """
+        return dict(self._counts)
+
+    @property
+    def samples(self) -> List[Tuple[str, str, Union[int, None]]]:
+        """Getter for `samples`
+
+        Returns:
+            List[Tuple[str, str, Union[int, None]]]: List of kind, module and line no. of the first `max_samples` errors. Line no. is None
+                                                     for errors in parsing a file as a whole
+        """
+        return list(self._samples)
+
+    @property
+    def error_count(self) -> int:
+        """Getter for `error_count`
+
+        Returns:
+            int: Total number of errors
+        """
+        return sum(self._counts.values())
+
+    def record(self, exc: Exception, module: str, line_no: Union[int, None] = None) -> None:
+        """Records error `exc` in parsing `module`
+
+        Args:
+            exc (Exception): Error raised in parsing
+            module (str): Relative path of file being parsed
+            line_no (Union[int, None], optional): Line no. of the todo item being parsed. Defaults to None i.e. error in parsing the file as a whole
+        """
+        kind = type(exc).__name__
+        location = module if line_no is None else f"{module}:{line_no}"
+        with self._lock:
+            self._counts[kind] = self._counts.get(kind, 0) + 1
+            sampled = len(self._samples) < self._max_samples
+            if sampled:
+                self._samples.append((kind, module, line_no))
+
+        if sampled:
+            logger.warning(f"Error in parsing todo items at {location}: {kind}: {exc}")
+        logger.debug(f"Error in parsing todo items at {location}", exc_info=exc)
+
+    def __str__(self) -> str:
+        """Defines str representation of `ParseDiagnostics` class object
+
+        Returns:
+            str: Returns string representation of the class object
+        """
+        return f"ParseDiagnostics: {repr(self)} errors: {self.counts} samples: {len(self._samples)}"
+
+
+class _AttemptDiagnostics(ParseDiagnostics):
+    """Collector of errors in one attempt to parse a file, which records them into `diagnostics` only once the attempt succeeds
+
+    An attempt failing to decode the file is retried with the next encoding, whose errors would otherwise be counted on top of its own
+    """
+
+    def __init__(self, diagnostics: ParseDiagnostics) -> None:
+        """Initializer for `_AttemptDiagnostics` class
+
+        Args:
+            diagnostics (ParseDiagnostics): Collector into which errors are recorded once the attempt succeeds
+        """
+        super().__init__(diagnostics.max_samples)
+        self._diagnostics = diagnostics
+        self._errors: List[Tuple[Exception, str, Union[int, None]]] = []
+
+    def record(self, exc: Exception, module: str, line_no: Union[int, None] = None) -> None:
+        """Keeps error `exc` in parsing `module` until the attempt succeeds
+
+        Args:
+            exc (Exception): Error raised in parsing
+            module (str): Relative path of file being parsed
+            line_no (Union[int, None], optional): Line no. of the todo item being parsed. Defaults to None i.e. error in parsing the file as a whole
+        """
+        self._errors.append((exc, module, line_no))
+
+    def commit(self) -> None:
+        """Records the errors of the succeeded attempt into `diagnostics`"""
+        for exc, module, line_no in self._errors:
+            self._diagnostics.record(exc, module, line_no)
+
+
+class FileSkippedException(Exception):
+    """Raised if a file is skipped while being parsed e.g. because it exceeds a limit of `ScanOptions`"""
+
+    pass
+
+
+@lru_cache(maxsize=None)
+def _get_long_line_regex(max_line_length: int) -> Pattern:
+    """Returns the compiled regular expression matching a line longer than `max_line_length`
+
+    Args:
+        max_line_length (int): Maximum length of a line
+
+    Returns:
+        Pattern: Regular expression matching more than `max_line_length` characters without a line break
+    """
+    return re.compile(f"[^\\n]{{{max_line_length + 1}}}")
+
+
+def _check_line_length(text: str, max_line_length: Union[int, None]) -> None:
+    """Checks that no line of `text` is longer than `max_line_length`
+
+    Args:
+        text (str): Text to be checked
+        max_line_length (Union[int, None]): Maximum length of a line. None if there is no limit
+
+    Raises:
+        FileSkippedException: Raised if a line is longer than `max_line_length`
+    """
+    if max_line_length is not None and _get_long_line_regex(max_line_length).search(text):
+        raise FileSkippedException(f"Line longer than {max_line_length} characters")
+
+
+def _sniff_encoding(file: str, scan_options: ScanOptions) -> Union[str, None]:
+    """Reads the start of `file` to detect its encoding from byte order mark and to check whether it is binary
+
+    Args:
+        file (str): Location of file
+        scan_options (ScanOptions): Options of the scan
+
+    Returns:
+        Union[str, None]: Encoding detected from byte order mark. None if `file` has none
+
+    Raises:
+        FileSkippedException: Raised if `file` holds a NUL byte in its first `scan_options.binary_sniff_size` bytes
+    """
+    with open(file, "rb") as f:
+        head = f.read(max(scan_options.binary_sniff_size, 4))
+
+    for bom, encoding in BOM_ENCODINGS:
+        if head.startswith(bom):
+            return encoding
+
+    if b"\0" in head[: scan_options.binary_sniff_size]:  # noqa: E203
+        raise FileSkippedException("Binary file")
+
+    return None
+
+
+def _get_file_digest(file: str) -> bytes:
+    """Computes the digest of the content of `file` reading it in blocks
+
+    Args:
+        file (str): Location of file
+
+    Returns:
+        bytes: 16 bytes digest of the content of `file`
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file, "rb") as f:
+        for block in iter(lambda: f.read(DIGEST_BLOCK_SIZE), b""):
+            digest.update(block)
+
+    return digest.digest()
+
+
+class ParseCache:
+    """Cache of todo items parsed from files kept across runs e.g. by the daemon so that only changed files are parsed again
+
+    A file is considered unchanged if its size and modification time are same as when it was parsed. Otherwise, its content digest is
+    compared, so that files rewritten with the same content e.g. by `git checkout` aren't parsed again
+    """
+
+    def __init__(self) -> None:
+        """Initializer for `ParseCache` class"""
+        # Maps (relative file path, ignore_todo_case) to (size, modification time, content digest, todo items)
+        self._entries: Dict[Tuple[str, bool], Tuple[int, int, bytes, Tuple[TODO, ...]]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        """Getter for `hits`
+
+        Returns:
+            int: Number of files whose todo items were served from the cache
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Getter for `misses`
+
+        Returns:
+            int: Number of files that had to be parsed
+        """
+        return self._misses
+
+    def __len__(self) -> int:
+        """Returns the number of cached files
+
+        Returns:
+            int: Number of cached files
+        """
+        return len(self._entries)
+
+    def get_or_parse(self, file: str, rel_file_path: str, ignore_todo_case: bool, parse: Callable[[], List[TODO]]) -> List[TODO]:
+        """Returns the cached todo items of `file` if it is unchanged else parses it with `parse` and caches the result
+
+        Args:
+            file (str): Location of file
+            rel_file_path (str): Relative path of file used as key of the cache
+            ignore_todo_case (bool): Boolean whether todo items are looked for case insensitively
+            parse (Callable[[], List[TODO]]): Callable parsing `file` and returning its todo items
+
+        Returns:
+            List[TODO]: Todo items in `file`
+        """
+        key = (rel_file_path, ignore_todo_case)
+        file_stat = os.stat(file)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == file_stat.st_size and entry[1] == file_stat.st_mtime_ns:
+            self._hits += 1
+            return list(entry[3])
+
+        digest = _get_file_digest(file)
+
+        if entry is not None and entry[2] == digest:
+            todos = entry[3]
+            self._hits += 1
+        else:
+            todos = tuple(parse())
+            self._misses += 1
+
+        with self._lock:
+            self._entries[key] = (file_stat.st_size, file_stat.st_mtime_ns, digest, todos)
+
+        return list(todos)
+
+    def retain(self, rel_file_paths: List[str]) -> None:
+        """Evicts cached files not in `rel_file_paths` e.g. files deleted since the last run
+
+        Args:
+            rel_file_paths (List[str]): Relative paths of files that need to be kept in the cache
+        """
+        rel_file_paths = set(rel_file_paths)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] not in rel_file_paths]:
+                del self._entries[key]
+
+
+def _get_todo(todo_item_group: str, todo_regex: Pattern, module: str, line_no: int) -> TODO:
+    """Parses a todo item matched in a file
+
+    Args:
+        todo_item_group (str): Text of the todo item as matched by the regular expression matching the todo items in a file
+        todo_regex (Pattern): Compiled regular expression parsing date, user and message of a todo item
+        module (str): Relative path of file used as module of the todo item
+        line_no (int): Line number of the todo item
+
+    Returns:
+        TODO: Parsed todo item
+    """
+    todo_date_username = todo_regex.findall(todo_item_group)
+
+    if todo_date_username:
+        todo_date_username = todo_date_username[0]
+
+    msg = ""
+    if len(todo_date_username) > 2:
+        msg = todo_date_username[2]
+
+    user = USER(UNKNOWN_USER_NAME)  # By default we assume an unknown user
+    if len(todo_date_username) > 1:
+        user = USER(todo_date_username[1][1:] or UNKNOWN_USER_NAME)  # handle empty string
+
+    completion_date_str = ""
+    if len(todo_date_username) > 0:
+        completion_date_str = todo_date_username[0]
+        if completion_date_str:
+            completion_date_str = completion_date_str[1:-1]
+
+    return TODO(msg, user, completion_date_str, module, POSITION(line_no))
+
+
+def _scan_file_in_chunks(
+    file: str,
+    rel_file_path: str,
+    todo_line_regex: Pattern,
+    todo_regex: Pattern,
+    scan_options: ScanOptions,
+    encoding: str,
+    errors: str,
+    diagnostics: ParseDiagnostics,
+) -> List[TODO]:
+    """Parses `file` to collect its todo items reading it in blocks of `scan_options.chunk_size` characters
+
+    Only complete lines of a block are matched and the incomplete last line is carried over to the next block, so that todo items are never
+    split across blocks. Line numbers are counted incrementally from the line breaks of the matched lines
+
+    Args:
+        file (str): Location of file
+        rel_file_path (str): Relative path of file used as module of todo items
+        todo_line_regex (Pattern): Compiled regular expression matching the todo items in a file
+        todo_regex (Pattern): Compiled regular expression parsing date, user and message of a todo item
+        scan_options (ScanOptions): Options of the scan
+        encoding (str): Encoding of `file`
+        errors (str): Policy for handling decoding errors
+        diagnostics (ParseDiagnostics): Collector of errors in parsing todo items
+
+    Returns:
+        List[TODO]: List of todo objects in `file`
+
+    Raises:
+        FileSkippedException: Raised if a line is longer than `scan_options.max_line_length`
+    """
+    todos = []
+    max_line_length = scan_options.max_line_length
+    line_no = 1  # Line number of the start of `carry_over`
+    carry_over = ""
+    with open(file, "r", encoding=encoding, errors=errors) as f:
+        while True:
+            chunk = f.read(scan_options.chunk_size)
+            text = carry_over + chunk
+            # Complete lines end at the last line break of the block unless the file ended
+            end = len(text) if not chunk else text.rfind("\n") + 1
+            carry_over = text[end:]
+            _check_line_length(carry_over, max_line_length)
+            if end:
+                _check_line_length(text[:end], max_line_length)
+
+            pos = 0
+            for todo_item in todo_line_regex.finditer(text, 0, end):
+                line_no += text.count("\n", pos, todo_item.start())
+                pos = todo_item.start()
+                try:
+                    todos.append(_get_todo(todo_item.group(), todo_regex, rel_file_path, line_no))
+                except Exception as exc:
+                    diagnostics.record(exc, rel_file_path, line_no)
+            line_no += text.count("\n", pos, end)
+
+            if not chunk:
+                break
+
+    return todos
+
+
+def _read_file_for_todo_items(
+    file: str,
+    rel_file_path: str,
+    todo_line_regex: Pattern,
+    todo_regex: Pattern,
+    scan_options: ScanOptions,
+    encoding: str,
+    errors: str,
+    diagnostics: ParseDiagnostics,
+) -> List[TODO]:
+    """Parses `file` to collect its todo items reading it at once
+
+    Args:
+        file (str): Location of file
+        rel_file_path (str): Relative path of file used as module of todo items
+        todo_line_regex (Pattern): Compiled regular expression matching the todo items in a file
+        todo_regex (Pattern): Compiled regular expression parsing date, user and message of a todo item
+        scan_options (ScanOptions): Options of the scan
+        encoding (str): Encoding of `file`
+        errors (str): Policy for handling decoding errors
+        diagnostics (ParseDiagnostics): Collector of errors in parsing todo items
+
+    Returns:
+        List[TODO]: List of todo objects in `file`
+
+    Raises:
+        FileSkippedException: Raised if a line is longer than `scan_options.max_line_length`
+    """
+    todos = []
+    line_no_to_chars_map = compute_file_line_no_to_chars_map(file, encoding=encoding, errors=errors)
+    with open(file, "r", encoding=encoding, errors=errors) as f:
+        file_content = f.read()
+        _check_line_length(file_content, scan_options.max_line_length)
+
+        todo_items = todo_line_regex.finditer(file_content)
+        for todo_item in todo_items:
+            try:
+                line = compute_line_and_pos_given_span(line_no_to_chars_map, todo_item.span())
+                todos.append(_get_todo(todo_item.group(), todo_regex, rel_file_path, line))
+            except Exception as exc:
+                # Line is counted again as the failure may be in computing it. It's linear in size of file but only done on errors
+                diagnostics.record(exc, rel_file_path, file_content.count("\n", 0, todo_item.start()) + 1)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Todo items parsed before the error in module: {rel_file_path}: {todos}")
+
+    return todos
+
+
+def _parse_file_for_todo_items(
+    file: str, rel_file_path: str, todo_line_regex: Pattern, todo_regex: Pattern, scan_options: ScanOptions, diagnostics: ParseDiagnostics
+) -> List[TODO]:
+    """Parses `file` to collect its todo items
+
+    Binary files are skipped before decoding. Files larger than `scan_options.chunked_scan_threshold` are scanned in chunks by
+    `_scan_file_in_chunks` and others are read at once. Files with a byte order mark are decoded with its encoding, others with
+    `scan_options.encoding` and then `scan_options.fallback_encodings` until one decodes the file
+
+    Args:
+        file (str): Location of file
+        rel_file_path (str): Relative path of file used as module of todo items
+        todo_line_regex (Pattern): Compiled regular expression matching the todo items in a file
+        todo_regex (Pattern): Compiled regular expression parsing date, user and message of a todo item
+        scan_options (ScanOptions): Options of the scan
+        diagnostics (ParseDiagnostics): Collector of errors in parsing todo items. Only errors of the attempt decoding the file are recorded
+
+    Returns:
+        List[TODO]: List of todo objects in `file`
+
+    Raises:
+        FileSkippedException: Raised if `file` is binary, can't be decoded with any of the encodings or has a line longer than
+                              `scan_options.max_line_length`
+    """
+    bom_encoding = _sniff_encoding(file, scan_options)
+    encodings = [bom_encoding] if bom_encoding else [scan_options.encoding, *scan_options.fallback_encodings]
+    parse = _scan_file_in_chunks if os.path.getsize(file) > scan_options.chunked_scan_threshold else _read_file_for_todo_items
+
+    for encoding in encodings:
+        attempt_diagnostics = _AttemptDiagnostics(diagnostics)
+        try:
+            todos = parse(file, rel_file_path, todo_line_regex, todo_regex, scan_options, encoding, scan_options.encoding_errors, attempt_diagnostics)
+        except UnicodeDecodeError:
+            logger.debug(f"Couldn't decode file: {file} as {encoding}")
+            continue
+
+        attempt_diagnostics.commit()
+        return todos
+
+    raise FileSkippedException(f"Not decodable as {', '.join(encodings)}")
+
+
+def parse_files_for_todo_items(
+    project_parent_dir: str,
+    files: List[str],
+    ignore_todo_case: bool,
+    parse_cache: Union[ParseCache, None] = None,
+    on_todo: Union[Callable[[TODO], None], None] = None,
+    scan_options: Union[ScanOptions, None] = None,
+    on_skip: Union[Callable[[SkippedFile], None], None] = None,
+    diagnostics: Union[ParseDiagnostics, None] = None,
+) -> Dict[str, List[TODO]]:
     """Parses the list of `files` one by one to collect all todo items
 
+    Errors in parsing a todo item or a file are recorded into `diagnostics` and the rest of the todo items or files are still parsed
+
+    Files skipped e.g. because they are binary or exceed a limit of `scan_options` are logged, passed to `on_skip` and have no todo items
+
     Args:
         project_parent_dir (str): Parent directory of the project folder (required to get relative path of files and avoid exposing temporary paths)
         files (List[str]): List of all files that need to be parsed
         ignore_todo_case (bool): Boolean whether to look for case insensitive todo items like todo, Todo etc.
+        parse_cache (Union[ParseCache, None], optional): Cache of todo items of files parsed in previous runs. Only changed files are parsed
+                                                         if passed. Defaults to None
+        on_todo (Union[Callable[[TODO], None], None], optional): Callback called with every todo item as soon as its file is parsed e.g. to
+                                                                 stream todo items to exporters. Defaults to None
+        scan_options (Union[ScanOptions, None], optional): Options controlling how files are read and decoded. Defaults to None i.e.
+                                                           `DEFAULT_SCAN_OPTIONS`
+        on_skip (Union[Callable[[SkippedFile], None], None], optional): Callback called with every skipped file e.g. to report them.
+                                                                        Defaults to None
+        diagnostics (Union[ParseDiagnostics, None], optional): Collector of errors in parsing. Defaults to None i.e. errors are only logged
 
     Returns:
         Dict[str, List[TODO]]: Returns a key-value pair where key is relative path of file parsed and value is list of todo objects in that file
     """
+    todo_line_regex, todo_regex = get_todo_regexes(ignore_todo_case)
+    scan_options = scan_options if scan_options is not None else DEFAULT_SCAN_OPTIONS
+    diagnostics = diagnostics if diagnostics is not None else ParseDiagnostics()
+
     all_todos_objs = {}
     for file in files:
+        rel_file_path = os.path.relpath(file, project_parent_dir)
         try:
-            rel_file_path = os.path.relpath(file, project_parent_dir)
             all_todos_objs[rel_file_path] = []
-            line_no_to_chars_map = compute_file_line_no_to_chars_map(file)
-            with open(file, "r") as f:
-                file_content = f.read()
-
-                flags = re.MULTILINE
-                if ignore_todo_case:
-                    flags |= re.IGNORECASE
-
-                todo_items = re.finditer(r"TODO.*", file_content, flags=flags)
-                for todo_item_idx, todo_item in enumerate(todo_items):
-                    try:
-                        todo_item_group = todo_item.group()
-                        todo_date_username = re.findall(TODO_REGEX_PATTERN, todo_item_group, flags=flags)
-
-                        if todo_date_username:
-                            todo_date_username = todo_date_username[0]
-
-                        msg = ""
-                        if len(todo_date_username) > 2:
-                            msg = todo_date_username[2]
-
-                        user = USER(UNKNOWN_USER_NAME)  # By default we assume an unknown user
-                        if len(todo_date_username) > 1:
-                            user = USER(todo_date_username[1][1:] or UNKNOWN_USER_NAME)  # handle empty string
-
-                        completion_date_str = ""
-                        if len(todo_date_username) > 0:
-                            completion_date_str = todo_date_username[0]
-                            if completion_date_str:
-                                completion_date_str = completion_date_str[1:-1]
-
-                        module = rel_file_path
-                        todo_position = todo_item.span()
-
-                        line = compute_line_and_pos_given_span(line_no_to_chars_map, todo_position)
-                        position = POSITION(line)
-
-                        todo = TODO(msg, user, completion_date_str, module, position)
-
-                        all_todos_objs[rel_file_path].append(todo)
-                    except Exception:
-                        logger.exception(f"Error in parsing todo item: {todo_item}, idx: {todo_item_idx}, all_todos: {all_todos_objs}")
-        except Exception:
-            logger.exception(f"Error in parsing todo items in file: {file}")
+            if scan_options.max_file_size is not None and os.path.getsize(file) > scan_options.max_file_size:
+                raise FileSkippedException(f"File larger than {scan_options.max_file_size} bytes")
+
+            if parse_cache is None:
+                all_todos_objs[rel_file_path] = _parse_file_for_todo_items(file, rel_file_path, todo_line_regex, todo_regex, scan_options, diagnostics)
+            else:
+                all_todos_objs[rel_file_path] = parse_cache.get_or_parse(
+                    file,
+                    rel_file_path,
+                    ignore_todo_case,
+                    lambda: _parse_file_for_todo_items(file, rel_file_path, todo_line_regex, todo_regex, scan_options, diagnostics),
+                )
+        except FileSkippedException as exc:
+            logger.warning(f"Skipped file: {file}. {exc}")
+            if on_skip is not None:
+                on_skip(SkippedFile(rel_file_path, str(exc)))
+            continue
+        except Exception as exc:
+            diagnostics.record(exc, rel_file_path)
+            continue
+
+        if on_todo is not None:
+            for todo_obj in all_todos_objs[rel_file_path]:
+                on_todo(todo_obj)
+
+    if parse_cache is not None:
+        parse_cache.retain(list(all_todos_objs))
 
     return all_todos_objs
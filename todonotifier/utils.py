@@ -4,13 +4,19 @@
 import logging
 import os
 import re
-from typing import Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Tuple, Union
 
 from todonotifier.models import TODO
-from todonotifier.summary_generators import BaseSummaryGenerator
+from todonotifier.profiling import NULL_PROFILER, NullProfiler
+from todonotifier.summary_generators import (
+    BaseSummaryGenerator,
+    ByModuleSummaryGenerator,
+    SummaryResult,
+    shard_file_name,
+)
+from todonotifier.todo_index import TodoIndex
 
-# logging configuration
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(process)d - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
 
@@ -48,17 +54,17 @@ def _ignore_dir_or_file(dir_or_file_path: str, exclude_dirs_or_files: dict) -> b
     return False
 
 
-def get_files_in_dir(dir_path: str, extension: str, exclude_subdirs: dict, exclude_files: dict) -> List[str]:
+def get_files_in_dir(dir_path: str, extension: Union[str, List[str]], exclude_subdirs: dict, exclude_files: dict) -> List[str]:
     """Provides a list of files in the give directory `path` and its subdirectories
 
     Args:
         dir_path (str): Path of the directory
-        extension (str): Extension of file that needs to be looked for e.g. "py" (without dot and quotations)
+        extension (Union[str, List[str]]): Extension or list of extensions of files that need to be looked for e.g. "py" (without dot and quotations)
         exclude_subdirs (dict): Sub directories of `parent_dir_name` that shouldn't be considered
         exclude_files (dict): Files in directory `parent_dir_name` or its sub-directories that shouldn't be considered
     """
     all_files = []
-    file_extension = f".{extension}"
+    file_extension = tuple(f".{ext}" for ext in ([extension] if isinstance(extension, str) else extension))
 
     for sub_dir_or_file in os.listdir(dir_path):
         try:
@@ -99,20 +105,22 @@ def recursive_update(base_dict: dict, new_dict: dict) -> None:
             base_dict[key] = new_dict[key]
 
 
-def compute_file_line_no_to_chars_map(file: str) -> Dict[int, int]:
+def compute_file_line_no_to_chars_map(file: str, encoding: Union[str, None] = None, errors: Union[str, None] = None) -> Dict[int, int]:
     """Takes a file location and returns a dict representing number of characters in each line no.
 
     Line numbers are 1-indexed
 
     Args:
         file (str): Location of file
+        encoding (Union[str, None], optional): Encoding of `file`. Defaults to None i.e. platform default encoding
+        errors (Union[str, None], optional): Policy for handling decoding errors as in `open`. Defaults to None i.e. "strict"
 
     Returns:
         dict: Dictionary mapping line no. ot no. of characters in that line in `file`
     """
     line_no_to_chars_map = {}
-    with open(file, "r") as f:
-        for line_no, line in enumerate(f.readlines()):
+    with open(file, "r", encoding=encoding, errors=errors) as f:
+        for line_no, line in enumerate(f):
             line_no_to_chars_map[line_no + 1] = len(line)
 
     return line_no_to_chars_map
@@ -131,47 +139,73 @@ def compute_line_and_pos_given_span(line_no_to_chars_map: dict, span: Tuple[int,
     curr_count = 0
     for line_no in range(len(line_no_to_chars_map)):
         curr_count += line_no_to_chars_map[line_no + 1]
-        if curr_count >= span[0]:
+        # A line of `n` characters holds positions up to `curr_count - 1`, so a match starting at `curr_count` is on the next line
+        if curr_count > span[0]:
             todo_line_no = line_no + 1
             break
 
     return todo_line_no
 
 
-def generate_summary(all_todos_objs: Dict[str, List[TODO]], summary_generators: List[BaseSummaryGenerator], generate_html: bool) -> None:
+def generate_summary(
+    all_todos_objs: Dict[str, List[TODO]],
+    summary_generators: List[BaseSummaryGenerator],
+    generate_html: bool,
+    todo_index: Union[TodoIndex, None] = None,
+    profiler: NullProfiler = NULL_PROFILER,
+) -> List[SummaryResult]:
     """Function to generate multiple kind of summaries from given list of todo items
 
     It allows users to pass a function/callable. It will call each summary generator `callable` and pass it with
     the `all_todos_objs`. The respective callable function can read the passed todo objects and save relevant information
     in their containers accessible via `{callable}.container`
 
+    Each summary generator is reset before generating the summary so that summary generators reused across runs e.g. those of
+    `default_config` don't accumulate todo items of previous runs
+
     Args:
         all_todos_objs (Dict[str, List[TODO]]): Key-value pair where key is relative path of file parsed and value is list of todo objects in that file
         summary_generators (List[BaseSummaryGenerator]): List of summary generators objects
         generate_html (bool): Boolean to control whether to generate the html report for the respective summary generator
+        todo_index (Union[TodoIndex, None], optional): Index over `all_todos_objs` shared by all summary generators. Built if not passed. Defaults to None
+        profiler (NullProfiler, optional): Profiler recording summarizing and rendering html of each summary generator as separate stages.
+                                           Defaults to `NULL_PROFILER` i.e. no profiling
+
+    Returns:
+        List[SummaryResult]: Immutable results of the summary generators that didn't fail in the order of `summary_generators`
     """
+    if todo_index is None:
+        todo_index = TodoIndex(all_todos_objs)
+
+    summary_results = []
     for summary_generator_class_instance in summary_generators:
         try:
-            summary_generator_class_instance.generate_summary(all_todos_objs)
+            summary_generator_class_instance.reset()
+            summary_generator_class_instance.todo_index = todo_index
+            with profiler.stage(f"summarize:{summary_generator_class_instance.name}"):
+                summary_generator_class_instance.generate_summary(all_todos_objs)
             if generate_html:
-                summary_generator_class_instance.generate_html()
+                with profiler.stage(f"render:{summary_generator_class_instance.name}"):
+                    summary_generator_class_instance.generate_html()
+            summary_results.append(summary_generator_class_instance.result())
         except Exception:
             logger.exception(f"Error in generating summary from: {summary_generator_class_instance}")
 
+    return summary_results
+
 
-def store_html(html: str, report_name: str, target_dir: str = None) -> None:
+def store_html(html: Union[str, Iterable[str]], report_name: str, target_dir: str = None) -> None:
     """Function to store html report into files in location `target_dir`
 
+    `html` can either be the complete report or an iterable yielding the report in chunks, e.g. `BaseSummaryGenerator.iter_html()`.
+    Chunks are written to the file as they are yielded so that the complete report is never held in memory.
+
     Args:
-        html (str): HTML content of the report
+        html (Union[str, Iterable[str]]): HTML content of the report or an iterable yielding it in chunks
         report_name (str): Name with which `html` content needs to be stored into a file with/without extension. Default extension is `.html`
         target_dir (str, optional): Target location(absolute path) where file needs to be stored. Defaults to folder `.reports` in current location.
     """
-    default_folder_name = ".report"
-    if not target_dir:
-        target_dir = os.path.join(os.getcwd(), default_folder_name)
-        if not os.path.isdir(target_dir):
-            os.makedirs(target_dir)
+    target_dir = get_report_dir(target_dir)
 
     report_name_lst = report_name.split(".")
     if len(report_name_lst) > 1:
@@ -182,6 +216,65 @@ def store_html(html: str, report_name: str, target_dir: str = None) -> None:
         report_name += ".html"
 
     file_path = os.path.join(target_dir, report_name)
+    _write_html(html, file_path)
+
+
+def store_sharded_html(summary_generator: ByModuleSummaryGenerator, report_name: str, target_dir: str = None, max_workers: int = 1) -> None:
+    """Function to store a sharded report as one html file per shard along with an index page linking them
+
+    Files are stored into a directory named `report_name` inside `target_dir`. Index page is stored as `index.html`. Each shard is rendered
+    and written independently and in parallel if `max_workers` is more than 1
+
+    Args:
+        summary_generator (ByModuleSummaryGenerator): Summary generator whose report needs to be stored
+        report_name (str): Name of the directory into which the shards and the index page are stored
+        target_dir (str, optional): Target location(absolute path) where directory needs to be created. Defaults to folder `.reports` in current location.
+        max_workers (int, optional): Maximum number of shards rendered in parallel. Defaults to 1.
+    """
+    report_dir = os.path.join(get_report_dir(target_dir), report_name)
+    if not os.path.isdir(report_dir):
+        os.makedirs(report_dir)
+
+    shards = summary_generator.shard_modules()
+    _write_html(summary_generator.iter_index_html(shards), os.path.join(report_dir, "index.html"))
+
+    def _store_shard(shard_no: int, shard_name: str, modules: List[str]) -> None:
+        _write_html(summary_generator.iter_shard_html(modules), os.path.join(report_dir, shard_file_name(shard_no, shard_name)))
 
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = [executor.submit(_store_shard, shard_no, shard_name, modules) for shard_no, (shard_name, modules) in enumerate(shards.items())]
+        for future in futures:
+            future.result()
+
+
+def get_report_dir(target_dir: Union[str, None]) -> str:
+    """Returns the directory in which reports need to be stored. Creates the default directory if needed
+
+    Args:
+        target_dir (Union[str, None]): Target location(absolute path) where reports need to be stored
+
+    Returns:
+        str: `target_dir` if passed else folder `.report` in current location
+    """
+    default_folder_name = ".report"
+    if not target_dir:
+        target_dir = os.path.join(os.getcwd(), default_folder_name)
+        if not os.path.isdir(target_dir):
+            os.makedirs(target_dir)
+
+    return target_dir
+
+
+def _write_html(html: Union[str, Iterable[str]], file_path: str) -> None:
+    """Writes `html` into file `file_path` chunk by chunk
+
+    Args:
+        html (Union[str, Iterable[str]]): HTML content or an iterable yielding it in chunks
+        file_path (str): Location of the file
+    """
     with open(file_path, "w") as f:
-        f.write(html)
+        if isinstance(html, str):
+            f.write(html)
+        else:
+            for chunk in html:
+                f.write(chunk)
@@ -0,0 +1,524 @@
+"""This module provides a watch mode for `ConnectMethod.DRY_RUN_DIR` projects. It keeps the
+todo items of a local directory in memory and reacts to file change events instead of
+rescanning the directory: only touched files are parsed again and the reports are
+regenerated from the in-memory todo items. Changes are debounced so that a burst of
+events e.g. from `git checkout` results in one batched update.
+
+Events come from inotify on Linux and from polling the directory elsewhere or if inotify
+isn't available e.g. when the limit of inotify watches is reached.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterator, List, Set, Tuple, Union
+
+from todonotifier.config import BaseConfig, default_config
+from todonotifier.connect import Connect, ConnectMethod
+from todonotifier.driver import RunResult, configure_logging, store_reports
+from todonotifier.models import TODO
+from todonotifier.todo_index import TodoIndex
+from todonotifier.todo_notifier import parse_files_for_todo_items
+from todonotifier.utils import _ignore_dir_or_file, generate_summary, get_files_in_dir
+
+logger = logging.getLogger(__name__)
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+INOTIFY_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR
+INOTIFY_EVENT_HEADER = struct.Struct("iIII")
+
+
+class WatcherException(Exception):
+    """Exception raised if a watcher can't watch the directory"""
+
+    pass
+
+
+class BaseWatcher(ABC):
+    """Watches a directory and its sub directories not excluded for changes
+
+    Changes are reported as paths of changed files or directories. A changed directory means that everything under it may have changed
+    e.g. when a directory is moved in or when events were lost, and it needs to be rescanned
+    """
+
+    def __init__(self, root_dir: str, exclude_dirs: Dict[str, List[str]]) -> None:
+        """Initializer for `BaseWatcher` class
+
+        Args:
+            root_dir (str): Directory that needs to be watched
+            exclude_dirs (Dict[str, List[str]]): Dictionary containing details about directories that shouldn't be watched
+        """
+        self._root_dir = root_dir
+        self._exclude_dirs = exclude_dirs
+
+    @property
+    def root_dir(self) -> str:
+        """Getter for `root_dir`
+
+        Returns:
+            str: Directory being watched
+        """
+        return self._root_dir
+
+    def _iter_dirs(self, dir_path: str) -> Iterator[str]:
+        """Yields `dir_path` and its sub directories that aren't excluded
+
+        Args:
+            dir_path (str): Directory to start with
+
+        Yields:
+            Iterator[str]: Paths of directories
+        """
+        yield dir_path
+        try:
+            entries = list(os.scandir(dir_path))
+        except OSError:
+            return
+
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False) and not _ignore_dir_or_file(entry.path, self._exclude_dirs):
+                yield from self._iter_dirs(entry.path)
+
+    @abstractmethod
+    def read_changes(self, timeout: float) -> Set[str]:
+        """Waits up to `timeout` seconds for changes and returns the changed paths
+
+        Args:
+            timeout (float): Maximum number of seconds to wait for changes
+
+        Returns:
+            Set[str]: Paths of changed files or directories. Empty if nothing changed
+        """
+        pass
+
+    def close(self) -> None:
+        """Releases resources held by the watcher"""
+        pass
+
+
+class PollingWatcher(BaseWatcher):
+    """Watcher comparing size and modification time of files between periodic scans of the directory"""
+
+    def __init__(self, root_dir: str, exclude_dirs: Dict[str, List[str]], poll_interval: float = 1.0) -> None:
+        """Initializer for `PollingWatcher` class
+
+        Args:
+            root_dir (str): Directory that needs to be watched
+            exclude_dirs (Dict[str, List[str]]): Dictionary containing details about directories that shouldn't be watched
+            poll_interval (float, optional): Seconds between two scans of the directory. Defaults to 1.0
+        """
+        super().__init__(root_dir, exclude_dirs)
+        self._poll_interval = poll_interval
+        self._snapshot = self._take_snapshot()
+        self._last_poll_at = time.monotonic()
+
+    def _take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """Returns size and modification time of all files in the watched directories
+
+        Returns:
+            Dict[str, Tuple[int, int]]: Mapping of file path to its size and modification time
+        """
+        snapshot = {}
+        for dir_path in self._iter_dirs(self._root_dir):
+            try:
+                entries = list(os.scandir(dir_path))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_file(follow_symlinks=False):
+                        entry_stat = entry.stat(follow_symlinks=False)
+                        snapshot[entry.path] = (entry_stat.st_size, entry_stat.st_mtime_ns)
+                except OSError:
+                    continue
+
+        return snapshot
+
+    def read_changes(self, timeout: float) -> Set[str]:
+        """Waits up to `timeout` seconds for the next scan and returns files changed, created or deleted since the previous scan
+
+        Args:
+            timeout (float): Maximum number of seconds to wait for changes
+
+        Returns:
+            Set[str]: Paths of changed files. Empty if nothing changed or it isn't time for the next scan yet
+        """
+        wait_seconds = self._last_poll_at + self._poll_interval - time.monotonic()
+        if wait_seconds > timeout:
+            time.sleep(max(timeout, 0))
+            return set()
+
+        time.sleep(max(wait_seconds, 0))
+        snapshot = self._take_snapshot()
+        self._last_poll_at = time.monotonic()
+
+        changes = {path for path, file_stat in snapshot.items() if self._snapshot.get(path) != file_stat}
+        changes.update(path for path in self._snapshot if path not in snapshot)
+        self._snapshot = snapshot
+
+        return changes
+
+
+class InotifyWatcher(BaseWatcher):
+    """Watcher using inotify of Linux. A watch is added for each directory not excluded"""
+
+    def __init__(self, root_dir: str, exclude_dirs: Dict[str, List[str]]) -> None:
+        """Initializer for `InotifyWatcher` class
+
+        Args:
+            root_dir (str): Directory that needs to be watched
+            exclude_dirs (Dict[str, List[str]]): Dictionary containing details about directories that shouldn't be watched
+
+        Raises:
+            WatcherException: Raised if inotify isn't available or the directory can't be watched e.g. limit of inotify watches is reached
+        """
+        super().__init__(root_dir, exclude_dirs)
+        if not sys.platform.startswith("linux"):
+            raise WatcherException(f"inotify isn't available on platform: {sys.platform}")
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise WatcherException(f"Error in initializing inotify: {os.strerror(ctypes.get_errno())}")
+
+        self._wd_to_dir: Dict[int, str] = {}
+        try:
+            self._add_watches(root_dir)
+        except WatcherException:
+            self.close()
+            raise
+
+    def _add_watches(self, dir_path: str) -> None:
+        """Adds watches for `dir_path` and its sub directories that aren't excluded
+
+        Args:
+            dir_path (str): Directory to start with
+
+        Raises:
+            WatcherException: Raised if inotify watch can't be added for a reason other than directory being removed meanwhile
+        """
+        for sub_dir_path in self._iter_dirs(dir_path):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(sub_dir_path), INOTIFY_WATCH_MASK)
+            if wd < 0:
+                error_no = ctypes.get_errno()
+                if error_no in (errno.ENOENT, errno.ENOTDIR):
+                    continue
+                raise WatcherException(f"Error in watching directory: {sub_dir_path}: {os.strerror(error_no)}")
+            self._wd_to_dir[wd] = sub_dir_path
+
+    def read_changes(self, timeout: float) -> Set[str]:
+        """Waits up to `timeout` seconds for inotify events and returns the changed paths
+
+        Args:
+            timeout (float): Maximum number of seconds to wait for changes
+
+        Returns:
+            Set[str]: Paths of changed files or directories. Empty if nothing changed
+        """
+        readable, _, _ = select.select([self._fd], [], [], max(timeout, 0))
+        if not readable:
+            return set()
+
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changes = set()
+        offset = 0
+        while offset + INOTIFY_EVENT_HEADER.size <= len(data):
+            wd, mask, _, name_len = INOTIFY_EVENT_HEADER.unpack_from(data, offset)
+            offset += INOTIFY_EVENT_HEADER.size
+            name = os.fsdecode(struct.unpack_from(f"{name_len}s", data, offset)[0].rstrip(b"\0"))
+            offset += name_len
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost, so everything needs to be rescanned
+                logger.warning(f"inotify event queue overflowed. Rescanning: {self._root_dir}")
+                changes.add(self._root_dir)
+                continue
+
+            dir_path = self._wd_to_dir.get(wd)
+            if dir_path is None:
+                continue
+
+            if mask & IN_IGNORED:
+                # Watch was removed as the directory was deleted or moved away
+                del self._wd_to_dir[wd]
+                continue
+
+            path = os.path.join(dir_path, name) if name else dir_path
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                if _ignore_dir_or_file(path, self._exclude_dirs):
+                    continue
+                # Files may have been created in the new directory before its watch was added, so it needs to be rescanned
+                self._add_watches(path)
+            changes.add(path)
+
+        return changes
+
+    def close(self) -> None:
+        """Closes the inotify file descriptor which removes all its watches"""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(root_dir: str, exclude_dirs: Dict[str, List[str]], poll_interval: float = 1.0, use_inotify: Union[bool, None] = None) -> BaseWatcher:
+    """Creates the watcher for `root_dir`. inotify is used where available and polling otherwise
+
+    Args:
+        root_dir (str): Directory that needs to be watched
+        exclude_dirs (Dict[str, List[str]]): Dictionary containing details about directories that shouldn't be watched
+        poll_interval (float, optional): Seconds between two scans of the directory if polling is used. Defaults to 1.0
+        use_inotify (Union[bool, None], optional): Boolean whether to use inotify. Defaults to None i.e. use inotify if available
+
+    Returns:
+        BaseWatcher: Watcher for `root_dir`
+    """
+    if use_inotify is not False:
+        try:
+            return InotifyWatcher(root_dir, exclude_dirs)
+        except (WatcherException, OSError, AttributeError) as exc:
+            if use_inotify:
+                raise
+            logger.info(f"Falling back to polling as inotify can't be used: {exc}")
+
+    return PollingWatcher(root_dir, exclude_dirs, poll_interval=poll_interval)
+
+
+class TodoWatcher:
+    """Keeps todo items and reports of a local directory up to date by reacting to changes of its files"""
+
+    def __init__(
+        self,
+        connect: Connect,
+        config: BaseConfig = default_config,
+        debounce_seconds: float = 0.5,
+        max_batch_seconds: float = 5.0,
+        poll_interval: float = 1.0,
+        use_inotify: Union[bool, None] = None,
+        on_update: Union[Callable[[RunResult], None], None] = None,
+    ) -> None:
+        """Initializer for `TodoWatcher` class
+
+        Args:
+            connect (Connect): Object of type `Connect` with `ConnectMethod.DRY_RUN_DIR` pointing to the directory that needs to be watched
+            config (BaseConfig, optional): Configuration to be used. Defaults to `default_config`
+            debounce_seconds (float, optional): Changes are batched until no change happened for these many seconds. Defaults to 0.5
+            max_batch_seconds (float, optional): Maximum seconds a batch of changes is held while changes keep happening. Defaults to 5.0
+            poll_interval (float, optional): Seconds between two scans of the directory if polling is used. Defaults to 1.0
+            use_inotify (Union[bool, None], optional): Boolean whether to use inotify. Defaults to None i.e. use inotify if available
+            on_update (Union[Callable[[RunResult], None], None], optional): Callback called with the result after each update. Defaults to None
+
+        Raises:
+            ValueError: Raised if `connect` doesn't use `ConnectMethod.DRY_RUN_DIR`
+        """
+        if connect.connect_method != ConnectMethod.DRY_RUN_DIR:
+            raise ValueError(f"Watch mode supports only {ConnectMethod.DRY_RUN_DIR}, got: {connect.connect_method}")
+
+        self._connect = connect
+        self._config = config
+        self._root_dir = os.path.abspath(connect.url)
+        # Modules are relative to the parent of the watched directory as done for the copy made by `driver.run`
+        self._parent_dir = os.path.dirname(self._root_dir)
+        self._debounce_seconds = debounce_seconds
+        self._max_batch_seconds = max_batch_seconds
+        self._poll_interval = poll_interval
+        self._use_inotify = use_inotify
+        self._on_update = on_update
+        self._all_todos_objs: Dict[str, List[TODO]] = {}
+        self._last_result: Union[RunResult, None] = None
+        self._stop_event = threading.Event()
+
+    @property
+    def all_todos_objs(self) -> Dict[str, List[TODO]]:
+        """Getter for `all_todos_objs`
+
+        Returns:
+            Dict[str, List[TODO]]: Todo items of the watched directory kept up to date
+        """
+        return self._all_todos_objs
+
+    @property
+    def last_result(self) -> Union[RunResult, None]:
+        """Getter for `last_result`
+
+        Returns:
+            Union[RunResult, None]: Result of the last update. None if no update happened yet
+        """
+        return self._last_result
+
+    def _is_watched_dir(self, dir_path: str) -> bool:
+        """Checks whether neither `dir_path` nor any of its parent directories below the watched directory are excluded
+
+        Args:
+            dir_path (str): Path of the directory
+
+        Returns:
+            bool: True if files in `dir_path` are collected else False
+        """
+        while len(dir_path) > len(self._root_dir):
+            if _ignore_dir_or_file(dir_path, self._config.exclude_dirs):
+                return False
+            dir_path = os.path.dirname(dir_path)
+
+        return True
+
+    def _is_watched_file(self, file_path: str) -> bool:
+        """Checks whether todo items of `file_path` are collected i.e. it has one of `extensions` of configuration, it isn't excluded and it is in a
+        watched directory
+
+        Args:
+            file_path (str): Path of the file
+
+        Returns:
+            bool: True if todo items of `file_path` are collected else False
+        """
+        if not file_path.endswith(tuple(f".{extension}" for extension in self._config.extensions)) or _ignore_dir_or_file(
+            file_path, self._config.exclude_files
+        ):
+            return False
+
+        return self._is_watched_dir(os.path.dirname(file_path))
+
+    def _parse_files(self, files: List[str]) -> None:
+        """Parses `files` and updates their todo items
+
+        Args:
+            files (List[str]): Paths of files that need to be parsed
+        """
+        self._all_todos_objs.update(parse_files_for_todo_items(self._parent_dir, files, self._config.ignore_todo_case, scan_options=self._config.scan_options))
+
+    def scan(self) -> RunResult:
+        """Parses all files of the watched directory and generates the reports
+
+        Returns:
+            RunResult: Result of the scan
+        """
+        self._all_todos_objs.clear()
+        self._parse_files(get_files_in_dir(self._root_dir, self._config.extensions, self._config.exclude_dirs, self._config.exclude_files))
+
+        return self._update_reports()
+
+    def apply_changes(self, changed_paths: Set[str]) -> RunResult:
+        """Parses only the changed files again, drops todo items of deleted files and regenerates the reports
+
+        Args:
+            changed_paths (Set[str]): Paths of changed files or directories
+
+        Returns:
+            RunResult: Result of the update
+        """
+        files_to_parse = set()
+        for path in changed_paths:
+            rel_path = os.path.relpath(path, self._parent_dir)
+            if os.path.isdir(path):
+                # Everything under the directory is rescanned
+                rel_dir_prefix = rel_path + os.sep
+                for module in [module for module in self._all_todos_objs if module.startswith(rel_dir_prefix)]:
+                    del self._all_todos_objs[module]
+                if self._is_watched_dir(path):
+                    files_to_parse.update(get_files_in_dir(path, self._config.extensions, self._config.exclude_dirs, self._config.exclude_files))
+            elif os.path.isfile(path):
+                if self._is_watched_file(path):
+                    files_to_parse.add(path)
+            else:
+                # Deleted file or directory
+                self._all_todos_objs.pop(rel_path, None)
+                rel_dir_prefix = rel_path + os.sep
+                for module in [module for module in self._all_todos_objs if module.startswith(rel_dir_prefix)]:
+                    del self._all_todos_objs[module]
+
+        logger.info(f"Parsing {len(files_to_parse)} changed files out of {len(changed_paths)} changed paths")
+        self._parse_files(sorted(files_to_parse))
+
+        return self._update_reports()
+
+    def _update_reports(self) -> RunResult:
+        """Regenerates summaries and reports from the in-memory todo items
+
+        Returns:
+            RunResult: Result of the update
+        """
+        todo_index = TodoIndex(self._all_todos_objs)
+        stream_html_reports = self._config.generate_html and self._config.stream_html_reports
+        summary_results = generate_summary(
+            self._all_todos_objs, self._config.summary_generators, self._config.generate_html and not stream_html_reports, todo_index=todo_index
+        )
+        if self._config.generate_html and self._config.save_html_reports:
+            store_reports(self._config.summary_generators, stream_html_reports, max_workers=self._config.max_workers, target_dir=self._config.report_dir)
+
+        self._last_result = RunResult(summary_results, todo_index, [])
+        if self._on_update:
+            self._on_update(self._last_result)
+
+        return self._last_result
+
+    def _read_batch(self, watcher: BaseWatcher) -> Set[str]:
+        """Waits for changes and collects them until no change happened for `debounce_seconds` or `max_batch_seconds` passed
+
+        Args:
+            watcher (BaseWatcher): Watcher reporting the changes
+
+        Returns:
+            Set[str]: Paths changed in the batch. Empty if watching was stopped before any change
+        """
+        changes = set()
+        while not changes:
+            if self._stop_event.is_set():
+                return changes
+            changes = watcher.read_changes(timeout=self._poll_interval)
+
+        batch_started_at = time.monotonic()
+        while not self._stop_event.is_set():
+            remaining_seconds = batch_started_at + self._max_batch_seconds - time.monotonic()
+            if remaining_seconds <= 0:
+                break
+            new_changes = watcher.read_changes(timeout=min(self._debounce_seconds, remaining_seconds))
+            if not new_changes:
+                break
+            changes.update(new_changes)
+
+        return changes
+
+    def watch(self) -> None:
+        """Scans the watched directory and then keeps todo items and reports up to date until `stop` is called"""
+        configure_logging()
+
+        watcher = create_watcher(self._root_dir, self._config.exclude_dirs, poll_interval=self._poll_interval, use_inotify=self._use_inotify)
+        logger.info(f"Watching: {self._root_dir} using {type(watcher).__name__}")
+        try:
+            self.scan()
+            while not self._stop_event.is_set():
+                changes = self._read_batch(watcher)
+                if changes:
+                    try:
+                        self.apply_changes(changes)
+                    except Exception:
+                        logger.exception(f"Error in applying changes: {changes}")
+        finally:
+            watcher.close()
+
+    def stop(self) -> None:
+        """Stops watching. `watch` returns after the current batch of changes is applied"""
+        self._stop_event.set()